@@ -0,0 +1,39 @@
+"""add dispatch wave state to blood_requests
+
+Revision ID: 20260316_0900
+Revises: 20260315_1100
+Create Date: 2026-03-16 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260316_0900"
+down_revision = "20260315_1100"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "blood_requests",
+        sa.Column("dispatch_radius_meters", sa.Integer(), nullable=True),
+    )
+    op.add_column(
+        "blood_requests",
+        sa.Column("next_dispatch_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "idx_blood_requests_next_dispatch_at",
+        "blood_requests",
+        ["next_dispatch_at"],
+        postgresql_where=sa.text("next_dispatch_at IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_blood_requests_next_dispatch_at", table_name="blood_requests")
+    op.drop_column("blood_requests", "next_dispatch_at")
+    op.drop_column("blood_requests", "dispatch_radius_meters")
@@ -0,0 +1,58 @@
+"""add has_active_commitment to users and eligible donor index
+
+Revision ID: 20260316_1000
+Revises: 20260316_0900
+Create Date: 2026-03-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260316_1000"
+down_revision = "20260316_0900"
+branch_labels = None
+depends_on = None
+
+
+ELIGIBLE_DONOR_PREDICATE = (
+    "deleted_at IS NULL AND is_active AND location IS NOT NULL "
+    "AND fcm_token IS NOT NULL AND blood_type IS NOT NULL AND NOT has_active_commitment"
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column(
+            "has_active_commitment",
+            sa.Boolean(),
+            nullable=False,
+            server_default="false"
+        ),
+    )
+
+    # Mevcut aktif taahhütlerden doldur
+    op.execute(
+        """
+        UPDATE users SET has_active_commitment = true
+        WHERE id IN (
+            SELECT donor_id FROM donation_commitments
+            WHERE status IN ('ON_THE_WAY', 'ARRIVED')
+        )
+        """
+    )
+
+    op.create_index(
+        "idx_users_eligible_donor_location",
+        "users",
+        ["location"],
+        postgresql_using="gist",
+        postgresql_where=sa.text(ELIGIBLE_DONOR_PREDICATE),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_users_eligible_donor_location", table_name="users")
+    op.drop_column("users", "has_active_commitment")
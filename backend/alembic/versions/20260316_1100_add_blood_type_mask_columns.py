@@ -0,0 +1,43 @@
+"""add generated blood_type_mask columns to users and blood_requests
+
+Revision ID: 20260316_1100
+Revises: 20260316_1000
+Create Date: 2026-03-16 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260316_1100"
+down_revision = "20260316_1000"
+branch_labels = None
+depends_on = None
+
+
+# app.constants.blood_types.BLOOD_TYPE_BITS ile aynı bitler
+BLOOD_TYPE_MASK_SQL = (
+    "CASE blood_type "
+    "WHEN 'A+' THEN 1 WHEN 'A-' THEN 2 WHEN 'B+' THEN 4 WHEN 'B-' THEN 8 "
+    "WHEN 'AB+' THEN 16 WHEN 'AB-' THEN 32 WHEN 'O+' THEN 64 WHEN 'O-' THEN 128 "
+    "ELSE 0 END"
+)
+
+
+def upgrade() -> None:
+    for table in ("users", "blood_requests"):
+        op.add_column(
+            table,
+            sa.Column(
+                "blood_type_mask",
+                sa.SmallInteger(),
+                sa.Computed(BLOOD_TYPE_MASK_SQL, persisted=True),
+                nullable=False,
+            ),
+        )
+
+
+def downgrade() -> None:
+    for table in ("blood_requests", "users"):
+        op.drop_column(table, "blood_type_mask")
@@ -0,0 +1,48 @@
+"""add notification_counters table and unread notifications partial index
+
+Revision ID: 20260316_1200
+Revises: 20260316_1100
+Create Date: 2026-03-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260316_1200"
+down_revision = "20260316_1100"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notification_counters",
+        sa.Column("user_id", sa.String(36), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("unread_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.CheckConstraint("unread_count >= 0", name="check_unread_count_non_negative"),
+    )
+
+    op.create_index(
+        "idx_notifications_user_unread",
+        "notifications",
+        ["user_id"],
+        postgresql_where=sa.text("is_read = false"),
+    )
+
+    # Mevcut okunmamış bildirimlerden doldur
+    op.execute(
+        """
+        INSERT INTO notification_counters (user_id, unread_count)
+        SELECT user_id, count(*) FROM notifications
+        WHERE is_read = false
+        GROUP BY user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_notifications_user_unread", table_name="notifications")
+    op.drop_table("notification_counters")
@@ -0,0 +1,31 @@
+"""replace notifications user_id index with composite (user_id, created_at DESC)
+
+Revision ID: 20260316_1300
+Revises: 20260316_1200
+Create Date: 2026-03-16 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260316_1300"
+down_revision = "20260316_1200"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_notifications_user_created_at",
+        "notifications",
+        ["user_id", sa.text("created_at DESC")],
+    )
+    # Composite index'in user_id ön eki aynı sorguları karşılar
+    op.drop_index("idx_notifications_user", table_name="notifications")
+
+
+def downgrade() -> None:
+    op.create_index("idx_notifications_user", "notifications", ["user_id"])
+    op.drop_index("idx_notifications_user_created_at", table_name="notifications")
@@ -0,0 +1,110 @@
+"""convert notifications into a monthly range-partitioned table on created_at
+
+Revision ID: 20260316_1400
+Revises: 20260316_1300
+Create Date: 2026-03-16 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20260316_1400"
+down_revision = "20260316_1300"
+branch_labels = None
+depends_on = None
+
+
+# app.config NOTIFICATION_PARTITION_MONTHS_AHEAD varsayılanı; sonrası
+# notification partition maintainer tarafından oluşturulur
+MONTHS_AHEAD = 3
+
+INDEXES = (
+    "idx_notifications_user_created_at",
+    "idx_notifications_is_read",
+    "idx_notifications_created_at",
+    "idx_notifications_user_unread",
+)
+
+
+def _create_constraints_and_indexes(primary_key: str) -> None:
+    op.execute(f"ALTER TABLE notifications ADD CONSTRAINT notifications_pkey PRIMARY KEY ({primary_key})")
+    op.create_foreign_key(
+        "fk_notifications_user", "notifications", "users",
+        ["user_id"], ["id"], ondelete="CASCADE",
+    )
+    op.create_foreign_key(
+        "fk_notifications_blood_request", "notifications", "blood_requests",
+        ["blood_request_id"], ["id"], ondelete="SET NULL",
+    )
+    op.create_foreign_key(
+        "fk_notifications_donation", "notifications", "donations",
+        ["donation_id"], ["id"], ondelete="SET NULL",
+    )
+    op.execute("CREATE INDEX idx_notifications_user_created_at ON notifications (user_id, created_at DESC)")
+    op.execute("CREATE INDEX idx_notifications_is_read ON notifications (is_read)")
+    op.execute("CREATE INDEX idx_notifications_created_at ON notifications (created_at)")
+    op.execute("CREATE INDEX idx_notifications_user_unread ON notifications (user_id) WHERE is_read = false")
+
+
+def _retire_current_table() -> None:
+    """Mevcut tabloyu notifications_old olarak kenara alır (isimler yeniden kullanılacak)."""
+    op.execute("ALTER TABLE notifications RENAME TO notifications_old")
+    op.execute("ALTER TABLE notifications_old RENAME CONSTRAINT notifications_pkey TO notifications_old_pkey")
+    for index in INDEXES:
+        op.execute(f"DROP INDEX {index}")
+
+
+def upgrade() -> None:
+    _retire_current_table()
+
+    # Kolonlar, default'lar ve CHECK constraint'leri (bildirim türleri) aynen kopyalanır
+    op.execute(
+        "CREATE TABLE notifications "
+        "(LIKE notifications_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    # Partition key primary key'e dahil olmak zorunda
+    _create_constraints_and_indexes("id, created_at")
+
+    # Mevcut en eski bildirimin ayından MONTHS_AHEAD ay sonrasına kadar aylık partition'lar
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            month_start date := date_trunc(
+                'month', coalesce((SELECT min(created_at) FROM notifications_old), now()) AT TIME ZONE 'UTC'
+            )::date;
+            last_month date := (date_trunc('month', now() AT TIME ZONE 'UTC')
+                                + interval '{MONTHS_AHEAD} months')::date;
+        BEGIN
+            WHILE month_start <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF notifications FOR VALUES FROM (%L) TO (%L)',
+                    'notifications_y' || to_char(month_start, 'YYYY"m"MM'),
+                    to_char(month_start, 'YYYY-MM-DD') || ' 00:00:00+00',
+                    to_char(month_start + interval '1 month', 'YYYY-MM-DD') || ' 00:00:00+00'
+                );
+                month_start := (month_start + interval '1 month')::date;
+            END LOOP;
+        END $$;
+        """
+    )
+    op.execute("CREATE TABLE notifications_default PARTITION OF notifications DEFAULT")
+
+    op.execute("INSERT INTO notifications SELECT * FROM notifications_old")
+    op.execute("DROP TABLE notifications_old")
+
+
+def downgrade() -> None:
+    _retire_current_table()
+
+    op.execute(
+        "CREATE TABLE notifications "
+        "(LIKE notifications_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    )
+    _create_constraints_and_indexes("id")
+
+    op.execute("INSERT INTO notifications SELECT * FROM notifications_old")
+    # Partition'lar parent ile birlikte silinir
+    op.execute("DROP TABLE notifications_old")
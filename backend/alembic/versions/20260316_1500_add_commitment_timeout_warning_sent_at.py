@@ -0,0 +1,27 @@
+"""add donation_commitments.timeout_warning_sent_at for the deadline scheduler
+
+Revision ID: 20260316_1500
+Revises: 20260316_1400
+Create Date: 2026-03-16 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260316_1500"
+down_revision = "20260316_1400"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "donation_commitments",
+        sa.Column("timeout_warning_sent_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("donation_commitments", "timeout_warning_sent_at")
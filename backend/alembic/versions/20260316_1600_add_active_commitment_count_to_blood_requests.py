@@ -0,0 +1,52 @@
+"""add blood_requests.active_commitment_count for atomic slot claiming
+
+Revision ID: 20260316_1600
+Revises: 20260316_1500
+Create Date: 2026-03-16 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260316_1600"
+down_revision = "20260316_1500"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "blood_requests",
+        sa.Column(
+            "active_commitment_count",
+            sa.Integer(),
+            nullable=False,
+            server_default="0"
+        ),
+    )
+
+    # Mevcut aktif taahhütlerden doldur
+    op.execute(
+        """
+        UPDATE blood_requests r SET active_commitment_count = c.active
+        FROM (
+            SELECT blood_request_id, count(*) AS active FROM donation_commitments
+            WHERE status IN ('ON_THE_WAY', 'ARRIVED')
+            GROUP BY blood_request_id
+        ) c
+        WHERE c.blood_request_id = r.id
+        """
+    )
+
+    op.create_check_constraint(
+        "check_active_commitment_count_non_negative",
+        "blood_requests",
+        "active_commitment_count >= 0",
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("check_active_commitment_count_non_negative", "blood_requests", type_="check")
+    op.drop_column("blood_requests", "active_commitment_count")
@@ -0,0 +1,49 @@
+"""drop the notifications default partition so expired months can be detached concurrently
+
+Revision ID: 20260316_1700
+Revises: 20260316_1600
+Create Date: 2026-03-16 17:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20260316_1700"
+down_revision = "20260316_1600"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # DETACH PARTITION ... CONCURRENTLY default partition varken kullanılamaz.
+    # Default'a düşmüş satırlar için aylık partition'lar açılıp satırlar taşınır;
+    # gelecek aylar notification partition maintainer tarafından önceden, bu ay ve
+    # sonraki ay ayrıca her worker'da startup'ta ve ilk yazımda oluşturulur.
+    op.execute("ALTER TABLE notifications DETACH PARTITION notifications_default")
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            month_start date;
+        BEGIN
+            FOR month_start IN
+                SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC')::date
+                FROM notifications_default
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF notifications FOR VALUES FROM (%L) TO (%L)',
+                    'notifications_y' || to_char(month_start, 'YYYY"m"MM'),
+                    to_char(month_start, 'YYYY-MM-DD') || ' 00:00:00+00',
+                    to_char(month_start + interval '1 month', 'YYYY-MM-DD') || ' 00:00:00+00'
+                );
+            END LOOP;
+        END $$;
+        """
+    )
+    op.execute("INSERT INTO notifications SELECT * FROM notifications_default")
+    op.execute("DROP TABLE notifications_default")
+
+
+def downgrade() -> None:
+    op.execute("CREATE TABLE notifications_default PARTITION OF notifications DEFAULT")
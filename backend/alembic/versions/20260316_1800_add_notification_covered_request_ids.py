@@ -0,0 +1,29 @@
+"""add notifications.covered_request_ids for requests collapsed into a notification
+
+Revision ID: 20260316_1800
+Revises: 20260316_1700
+Create Date: 2026-03-16 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "20260316_1800"
+down_revision = "20260316_1700"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Nullable, default'suz kolon partition'lara yalnızca katalog değişikliğiyle eklenir
+    op.add_column(
+        "notifications",
+        sa.Column("covered_request_ids", postgresql.ARRAY(sa.String(36)), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("notifications", "covered_request_ids")
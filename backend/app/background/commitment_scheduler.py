@@ -0,0 +1,107 @@
+"""Background task for firing commitment timeouts and warnings at their deadlines."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.background.jobs import job_runner
+from app.core.logging import get_logger
+from app.database import AsyncSessionLocal
+from app.services.commitment_scheduler_service import commitment_scheduler, load_commitment_deadlines
+from app.services.donation_service import check_timeouts, send_timeout_warnings
+
+logger = get_logger(__name__)
+
+MAX_IDLE_SECONDS = 60  # Deadline yokken en fazla bu kadar uyu
+TASK_RUNNING = False  # Task durumunu takip et
+
+
+async def fire_due_commitments() -> tuple:
+    """
+    Zamanı gelen TIMEOUT_WARNING ve timeout'ları tek transaction'da işler.
+
+    Yalnızca job leader'ında çağrılır. Durum koşulları SQL tarafında tekrar
+    kontrol edilir; bu arada ARRIVED olmuş ya da timeout checker'ca işlenmiş
+    taahhütler atlanır. Hata olursa kaçan deadline'lar timeout checker'ın
+    uzlaştırmasında yakalanır.
+
+    Returns:
+        (uyarı gönderilen sayı, timeout edilen sayı)
+    """
+    warnings, timeouts = commitment_scheduler.pop_due(datetime.now(timezone.utc))
+    if not warnings and not timeouts:
+        return 0, 0
+
+    async with AsyncSessionLocal() as db:
+        warned = await send_timeout_warnings(db, commitment_ids=warnings) if warnings else 0
+        timed_out = await check_timeouts(db, commitment_ids=timeouts) if timeouts else 0
+        await db.commit()
+    return warned, timed_out
+
+
+async def refresh_commitment_deadlines(loaded_at: Optional[datetime]) -> datetime:
+    """
+    Zamanlayıcıyı DB'deki ON_THE_WAY taahhütlerle günceller.
+
+    İlk yüklemede (loaded_at None) tüm taahhütler, sonrakilerde yalnızca
+    son yüklemeden beri oluşturulanlar okunur; diğer worker'larda açılan
+    taahhütler böylece leader'ın zamanlayıcısına girer. Pencere, geç commit
+    edilen kayıtlar kaçmasın diye MAX_IDLE_SECONDS kadar geriye genişletilir.
+
+    Args:
+        loaded_at: Son başarılı yüklemenin zamanı
+
+    Returns:
+        Bu yüklemenin zamanı
+    """
+    now = datetime.now(timezone.utc)
+    created_after = loaded_at - timedelta(seconds=MAX_IDLE_SECONDS) if loaded_at else None
+    async with AsyncSessionLocal() as db:
+        loaded = await load_commitment_deadlines(db, commitment_scheduler, created_after=created_after)
+    if loaded_at is None:
+        logger.info(f"Commitment scheduler: {loaded} commitment deadline(s) loaded")
+    return now
+
+
+async def run_commitment_scheduler():
+    """
+    En yakın taahhüt deadline'ına kadar uyur ve zamanı gelenleri işler.
+
+    FastAPI lifespan'da her worker'da başlatılır ama deadline'ları yalnızca
+    job leader'ı işler; aksi halde her worker aynı TIMEOUT_WARNING'i ayrı ayrı
+    gönderirdi. Leader olmayan worker zamanlayıcısını boşaltıp bekler, leader
+    olduğunda deadline'ları DB'den baştan yükler.
+    """
+    global TASK_RUNNING
+    TASK_RUNNING = True
+    logger.info("Commitment scheduler started")
+    loaded_at: Optional[datetime] = None
+
+    while TASK_RUNNING:
+        try:
+            if not await job_runner.is_leader():
+                if loaded_at is not None:
+                    logger.info("Commitment scheduler: not the job leader, deadlines released")
+                commitment_scheduler.clear()
+                loaded_at = None
+                await asyncio.sleep(MAX_IDLE_SECONDS)
+                continue
+
+            if loaded_at is None or datetime.now(timezone.utc) - loaded_at >= timedelta(seconds=MAX_IDLE_SECONDS):
+                loaded_at = await refresh_commitment_deadlines(loaded_at)
+
+            await commitment_scheduler.wait(MAX_IDLE_SECONDS)
+            warned, timed_out = await fire_due_commitments()
+            if warned or timed_out:
+                logger.info(
+                    f"Commitment scheduler: {warned} warning(s) sent, {timed_out} commitment(s) timed out"
+                )
+        except Exception as e:
+            logger.error(f"Commitment scheduler error: {e}")
+            await asyncio.sleep(1)
+
+
+def stop_commitment_scheduler():
+    """Task'ı durdur (shutdown için)."""
+    global TASK_RUNNING
+    TASK_RUNNING = False
+    logger.info("Commitment scheduler stopped")
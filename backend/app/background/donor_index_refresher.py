@@ -0,0 +1,30 @@
+"""Periodic job for rebuilding the in-process donor index."""
+from app.core.logging import get_logger
+from app.database import AsyncSessionLocal
+from app.services.donor_index_service import donor_index, rebuild_donor_index
+
+logger = get_logger(__name__)
+
+
+async def refresh_donor_index() -> int:
+    """
+    Donor index'i DB'den yeniden kurar.
+
+    Commit sonrası hook'lar yalnızca değişikliği yapan worker'ın index'ini
+    günceller; diğer worker'lardaki sapmalar (token temizliği, cooldown,
+    başka worker'da başlayan taahhüt) bu job ile en fazla bir aralıkta
+    düzelir. Job runner'da her worker'da çalışır (app/background/jobs.py).
+
+    Returns:
+        Index'e alınan bağışçı sayısı
+
+    Raises:
+        Exception: DB hatası (index sıfırlanır, find_nearby_donors SQL
+            yoluna düşer; job runner tekrar dener)
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            return await rebuild_donor_index(db)
+    except Exception:
+        donor_index.reset()
+        raise
@@ -0,0 +1,30 @@
+"""Periodic job for reloading the in-process hospital registry."""
+from app.core.logging import get_logger
+from app.database import AsyncSessionLocal
+from app.services.hospital_registry_service import hospital_registry, rebuild_hospital_registry
+
+logger = get_logger(__name__)
+
+
+async def refresh_hospital_registry() -> int:
+    """
+    Hospital registry'yi DB'den yeniden yükler.
+
+    create_hospital/update_hospital yalnızca isteği işleyen worker'ın
+    registry'sini günceller; diğer worker'lar yeni hastaneleri, konum ve
+    geofence değişikliklerini bu job ile en fazla bir aralıkta alır. Job
+    runner'da her worker'da çalışır (app/background/jobs.py).
+
+    Returns:
+        Registry'ye alınan hastane sayısı
+
+    Raises:
+        Exception: DB hatası (registry sıfırlanır, çağıranlar DB'ye düşer;
+            job runner tekrar dener)
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            return await rebuild_hospital_registry(db)
+    except Exception:
+        hospital_registry.reset()
+        raise
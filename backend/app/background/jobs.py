@@ -0,0 +1,298 @@
+"""
+Periodic background job framework for KanVer API.
+
+Bu dosya, periyodik job'ları tek bir runner altında toplar:
+- Job'lar PeriodicJob ile tanımlanır (isim, fonksiyon, aralık, jitter)
+- Aralıklara jitter eklenir; worker'lar aynı anda DB'ye yüklenmez
+- Hata alan job üstel bekleme ile (JOB_ERROR_BACKOFF_*) tekrar denenir
+- Her job için çalışma sayısı, süre ve son hata tutulur (/health/detailed)
+- leader_only job'ları yalnızca Postgres advisory lock'unu tutan worker
+  çalıştırır; böylece birden fazla uvicorn worker'ında her job tek kez çalışır
+
+Leader, lock'u kendi bağlantısında tutar. Worker kapanır ya da bağlantı
+koparsa lock Postgres tarafından bırakılır ve ilk deneyen worker leader olur.
+"""
+import asyncio
+import inspect
+import random
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class PeriodicJob:
+    """Periyodik job tanımı."""
+
+    name: str
+    func: Callable[[], Any]  # async ya da senkron
+    interval_seconds: float
+    jitter: float = 0.1  # Aralığın ± bu oranı kadar rastgele sapma
+    leader_only: bool = True  # False: her worker çalıştırır (process-içi durum)
+    run_at_start: bool = True  # False: ilk çalışma bir aralık sonra (startup'ta zaten yapıldıysa)
+
+
+@dataclass
+class JobStats:
+    """Bir job'ın çalışma metrikleri."""
+
+    runs: int = 0
+    failures: int = 0
+    skipped: int = 0  # Leader olunmadığı için atlanan çalışmalar
+    consecutive_failures: int = 0
+    last_started_at: Optional[datetime] = None
+    last_duration_seconds: float = 0.0
+    max_duration_seconds: float = 0.0
+    total_duration_seconds: float = 0.0
+    last_error: Optional[str] = None
+
+    def record(self, duration: float, error: Optional[Exception] = None) -> None:
+        """Tamamlanan bir çalışmayı kaydeder."""
+        self.runs += 1
+        self.last_duration_seconds = duration
+        self.max_duration_seconds = max(self.max_duration_seconds, duration)
+        self.total_duration_seconds += duration
+        if error is None:
+            self.consecutive_failures = 0
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_error = str(error)
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["last_started_at"] = self.last_started_at.isoformat() if self.last_started_at else None
+        data["avg_duration_seconds"] = self.total_duration_seconds / self.runs if self.runs else 0.0
+        return data
+
+
+class LeaderElector:
+    """
+    pg_try_advisory_lock ile leader seçimi.
+
+    Lock session seviyesindedir ve ayrılmış bir bağlantıda (AUTOCOMMIT)
+    tutulur; her kontrolde bağlantının hâlâ canlı olduğu doğrulanır.
+    """
+
+    def __init__(self, lock_key: int, engine: Optional[AsyncEngine] = None):
+        self.lock_key = lock_key
+        self._engine = engine
+        self._connection: Optional[AsyncConnection] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_leader(self) -> bool:
+        """Son kontrolde lock tutuluyorsa True."""
+        return self._connection is not None
+
+    def _get_engine(self) -> AsyncEngine:
+        if self._engine is None:
+            from app.database import engine
+
+            self._engine = engine
+        return self._engine
+
+    async def _discard(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            try:
+                await connection.invalidate()
+            except Exception:
+                pass
+
+    async def acquire(self) -> bool:
+        """
+        Leader'lığı doğrular ya da almaya çalışır.
+
+        Returns:
+            Bu worker leader ise True (DB hatasında False)
+        """
+        async with self._lock:
+            if self._connection is not None:
+                try:
+                    await self._connection.execute(text("SELECT 1"))
+                    return True
+                except Exception as e:
+                    logger.warning(f"Job leader connection lost: {e}")
+                    await self._discard()
+
+            connection = None
+            try:
+                connection = await self._get_engine().connect()
+                connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+                result = await connection.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {"key": self.lock_key}
+                )
+                acquired = bool(result.scalar())
+            except Exception as e:
+                logger.warning(f"Job leader election failed: {e}")
+                acquired = False
+
+            if not acquired:
+                if connection is not None:
+                    try:
+                        await connection.close()
+                    except Exception:
+                        pass
+                return False
+
+            self._connection = connection
+            logger.info(f"This worker is now the job leader (lock {self.lock_key})")
+            return True
+
+    async def release(self) -> None:
+        """Lock'u bırakır ve bağlantıyı kapatır (shutdown için)."""
+        async with self._lock:
+            connection, self._connection = self._connection, None
+            if connection is None:
+                return
+            try:
+                await connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": self.lock_key}
+                )
+                await connection.close()
+            except Exception as e:
+                logger.warning(f"Job leader lock could not be released: {e}")
+
+
+class JobRunner:
+    """
+    Kayıtlı periyodik job'ları ayrı task'larda çalıştırır.
+
+    Job'lar startup'ta register edilir ve start() ile başlatılır; stop()
+    task'ları iptal eder ve leader lock'unu bırakır.
+    """
+
+    def __init__(self, elector: Optional[LeaderElector] = None):
+        self.elector = elector
+        self._jobs: Dict[str, PeriodicJob] = {}
+        self._stats: Dict[str, JobStats] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def register(self, job: PeriodicJob) -> None:
+        """
+        Job'ı kaydeder.
+
+        Raises:
+            ValueError: Aynı isimde job zaten kayıtlıysa
+        """
+        if job.name in self._jobs:
+            raise ValueError(f"Job already registered: {job.name}")
+        self._jobs[job.name] = job
+        self._stats[job.name] = JobStats()
+
+    async def is_leader(self) -> bool:
+        """
+        Bu worker leader_only işleri çalıştırabilir mi (lock'u doğrular ya da almaya çalışır).
+
+        Leader seçimi kapalıysa (tek worker) her zaman True.
+        """
+        return self.elector is None or await self.elector.acquire()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Job metriklerinin anlık görüntüsü."""
+        return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+    def next_delay(self, job: PeriodicJob) -> float:
+        """
+        Job'ın bir sonraki çalışmasına kadar beklenecek süre (saniye).
+
+        Art arda hata alan job JOB_ERROR_BACKOFF_SECONDS'tan başlayıp her
+        hatada ikiye katlanan (JOB_ERROR_BACKOFF_MAX_SECONDS ile sınırlı)
+        sürede tekrar denenir; aksi halde aralığa jitter eklenir.
+
+        Args:
+            job: Job tanımı
+
+        Returns:
+            Bekleme süresi (saniye)
+        """
+        failures = self._stats[job.name].consecutive_failures
+        if failures:
+            return min(
+                settings.JOB_ERROR_BACKOFF_SECONDS * 2 ** (failures - 1),
+                settings.JOB_ERROR_BACKOFF_MAX_SECONDS,
+            )
+        return max(0.0, job.interval_seconds * (1 + random.uniform(-job.jitter, job.jitter)))
+
+    async def run_once(self, job: PeriodicJob) -> bool:
+        """
+        Job'ı bir kez çalıştırır (leader değilse atlar) ve metrikleri günceller.
+
+        Args:
+            job: Job tanımı
+
+        Returns:
+            Job çalıştıysa True, atlandıysa False
+        """
+        stats = self._stats[job.name]
+        if job.leader_only and not await self.is_leader():
+            stats.skipped += 1
+            return False
+
+        stats.last_started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        error: Optional[Exception] = None
+        try:
+            result = job.func()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            error = e
+            logger.error(f"Job {job.name} failed: {e}")
+        duration = time.perf_counter() - started
+        stats.record(duration, error)
+        logger.debug(f"Job {job.name} finished in {duration:.3f}s")
+        return True
+
+    async def _run_forever(self, job: PeriodicJob) -> None:
+        if not job.run_at_start:
+            await asyncio.sleep(self.next_delay(job))
+        while True:
+            await self.run_once(job)
+            await asyncio.sleep(self.next_delay(job))
+
+    def start(self) -> None:
+        """Her job için task başlatır (run_at_start ise ilk çalışma hemen yapılır)."""
+        for job in self._jobs.values():
+            self._tasks.append(asyncio.create_task(self._run_forever(job), name=f"job:{job.name}"))
+            logger.info(
+                f"Job {job.name} started - every {job.interval_seconds:g} seconds"
+                + (" (leader only)" if job.leader_only and self.elector is not None else "")
+            )
+
+    async def stop(self) -> None:
+        """Task'ları iptal eder ve leader lock'unu bırakır (shutdown için)."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self.elector is not None:
+            await self.elector.release()
+
+    def reset(self) -> None:
+        """Kayıtlı job'ları ve metrikleri atar."""
+        self._jobs.clear()
+        self._stats.clear()
+
+
+# Process-genel job runner instance'ı
+job_runner = JobRunner(
+    elector=LeaderElector(settings.JOB_LEADER_LOCK_KEY) if settings.JOB_LEADER_ELECTION_ENABLED else None,
+)
@@ -0,0 +1,63 @@
+"""Background task for writing buffered donor locations."""
+import asyncio
+
+from app.config import settings
+from app.core.logging import get_logger
+from app.database import AsyncSessionLocal
+from app.services.location_buffer_service import location_buffer, write_locations
+
+logger = get_logger(__name__)
+
+TASK_RUNNING = False  # Task durumunu takip et
+
+
+async def flush_locations() -> int:
+    """
+    Buffer'daki konumları tek transaction'da yazar.
+
+    Yazma başarısız olursa konumlar buffer'a geri konur.
+
+    Returns:
+        Yazılan konum sayısı
+    """
+    entries = location_buffer.drain()
+    if not entries:
+        return 0
+
+    try:
+        async with AsyncSessionLocal() as db:
+            count = await write_locations(db, entries)
+            await db.commit()
+            return count
+    except Exception:
+        location_buffer.requeue(entries)
+        raise
+
+
+async def run_location_flusher():
+    """
+    Periyodik olarak buffer'daki konumları DB'ye yazar.
+
+    FastAPI lifespan'da başlatılır.
+    """
+    global TASK_RUNNING
+    TASK_RUNNING = True
+    interval = settings.LOCATION_FLUSH_INTERVAL_SECONDS
+    logger.info(f"Location flusher started - flushing every {interval} seconds")
+
+    while TASK_RUNNING:
+        try:
+            count = await flush_locations()
+            if count > 0:
+                logger.debug(f"Location flusher: {count} location(s) written")
+        except Exception as e:
+            logger.error(f"Location flusher error: {e}")
+
+        await asyncio.sleep(interval)
+
+
+def stop_location_flusher():
+    """Task'ı durdur (shutdown için)."""
+    global TASK_RUNNING
+    TASK_RUNNING = False
+    logger.info("Location flusher stopped")
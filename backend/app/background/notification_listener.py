@@ -0,0 +1,65 @@
+"""Background task that relays Postgres NOTIFY events to SSE subscribers."""
+import asyncio
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.config import settings
+from app.core.logging import get_logger
+from app.services.notification_stream_service import NOTIFICATION_CHANNEL, dispatch_notify_payload
+
+logger = get_logger(__name__)
+
+TASK_RUNNING = False  # Task durumunu takip et
+
+
+def _listen_dsn() -> str:
+    """DATABASE_URL'i asyncpg'nin doğrudan kabul ettiği DSN'e çevirir."""
+    url = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+def _on_notification(connection, pid, channel, payload) -> None:
+    """NOTIFY olayını bu worker'daki bağlantılara dağıtır."""
+    try:
+        dispatch_notify_payload(payload)
+    except Exception as e:
+        logger.error(f"Notification listener: invalid payload: {e}")
+
+
+async def run_notification_listener():
+    """
+    NOTIFICATION_CHANNEL'ı ayrı bir asyncpg bağlantısıyla dinler.
+
+    Bağlantı koparsa NOTIFICATION_STREAM_RECONNECT_SECONDS sonra yeniden
+    bağlanır; aradaki olayları istemciler Last-Event-ID ile tamamlar.
+    FastAPI lifespan'da başlatılır.
+    """
+    global TASK_RUNNING
+    TASK_RUNNING = True
+    logger.info(f"Notification listener started - channel {NOTIFICATION_CHANNEL}")
+
+    while TASK_RUNNING:
+        connection = None
+        try:
+            connection = await asyncpg.connect(_listen_dsn())
+            await connection.add_listener(NOTIFICATION_CHANNEL, _on_notification)
+            while TASK_RUNNING and not connection.is_closed():
+                await asyncio.sleep(settings.NOTIFICATION_STREAM_RECONNECT_SECONDS)
+                # Sessizce kopmuş bağlantıyı fark etmek için
+                await connection.execute("SELECT 1")
+        except Exception as e:
+            logger.error(f"Notification listener error: {e}")
+        finally:
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+
+        if TASK_RUNNING:
+            await asyncio.sleep(settings.NOTIFICATION_STREAM_RECONNECT_SECONDS)
+
+
+def stop_notification_listener():
+    """Task'ı durdur (shutdown için)."""
+    global TASK_RUNNING
+    TASK_RUNNING = False
+    logger.info("Notification listener stopped")
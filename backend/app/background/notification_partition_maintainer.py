@@ -0,0 +1,45 @@
+"""Periodic job for notifications partition maintenance and retention."""
+from typing import List, Tuple
+
+from app.config import settings
+from app.core.logging import get_logger
+from app.database import AsyncSessionLocal, engine
+from app.services.notification_partition_service import (
+    drop_expired_notification_partitions,
+    ensure_notification_partitions,
+)
+from app.services.notification_service import reconcile_unread_counts
+
+logger = get_logger(__name__)
+
+
+async def maintain_notification_partitions() -> Tuple[List[str], List[str]]:
+    """
+    Gelecek ayların partition'larını oluşturur, süresi dolanları siler.
+
+    Job runner'da leader worker tarafından periyodik çalıştırılır
+    (app/background/jobs.py); DDL'ler worker'lar arasında yarışmaz.
+    Partition'lar DETACH ... CONCURRENTLY ile ayrıldığından silme işlemi
+    transaction dışında, AUTOCOMMIT bağlantıda yapılır. Silinen
+    partition'larda okunmamış bildirim olabileceğinden sayaçlar ardından
+    uzlaştırılır.
+
+    Returns:
+        (oluşturulan partition'lar, silinen partition'lar)
+    """
+    async with AsyncSessionLocal() as db:
+        created = await ensure_notification_partitions(db, settings.NOTIFICATION_PARTITION_MONTHS_AHEAD)
+        await db.commit()
+    if created:
+        logger.info(f"Notification partitions created: {', '.join(created)}")
+
+    async with engine.connect() as connection:
+        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        dropped = await drop_expired_notification_partitions(connection, settings.NOTIFICATION_RETENTION_MONTHS)
+
+    if dropped:
+        logger.info(f"Notification partitions dropped: {', '.join(dropped)}")
+        async with AsyncSessionLocal() as db:
+            await reconcile_unread_counts(db)
+            await db.commit()
+    return created, dropped
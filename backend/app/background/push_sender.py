@@ -0,0 +1,67 @@
+"""Background task for sending queued FCM push notifications."""
+import asyncio
+
+from app.config import settings
+from app.core.logging import get_logger
+from app.database import AsyncSessionLocal
+from app.services.push_dispatch_service import push_queue, send_pushes
+
+logger = get_logger(__name__)
+
+TASK_RUNNING = False  # Task durumunu takip et
+
+
+async def flush_push_queue() -> int:
+    """
+    Kuyruktaki push'ları PUSH_BATCH_SIZE'lık parçalar halinde gönderir.
+
+    Geçici hatayla dönen push'lar üstel bekleme ile ertelenir. Gönderilmiş
+    push'lar tekrar gönderilmemesi için, işaretleme başarısız olsa bile
+    kuyruğa geri konmaz.
+
+    Returns:
+        Başarıyla gönderilen push sayısı
+    """
+    sent = 0
+    while True:
+        entries = push_queue.drain(settings.PUSH_BATCH_SIZE)
+        if not entries:
+            return sent
+
+        async with AsyncSessionLocal() as db:
+            report = await send_pushes(db, entries)
+            await db.commit()
+
+        sent += report.sent
+        if report.pruned:
+            logger.info(f"Push sender: {report.pruned} unregistered FCM token(s) removed")
+        if report.retry:
+            push_queue.retry_later(report.retry, settings.PUSH_RETRY_BASE_SECONDS)
+
+
+async def run_push_sender():
+    """
+    Kuyruğa push geldikçe toplu olarak gönderir.
+
+    FastAPI lifespan'da başlatılır.
+    """
+    global TASK_RUNNING
+    TASK_RUNNING = True
+    logger.info(f"Push sender started - batches of up to {settings.PUSH_BATCH_SIZE}")
+
+    while TASK_RUNNING:
+        try:
+            await push_queue.wait(settings.PUSH_IDLE_WAIT_SECONDS)
+            count = await flush_push_queue()
+            if count > 0:
+                logger.debug(f"Push sender: {count} push notification(s) sent")
+        except Exception as e:
+            logger.error(f"Push sender error: {e}")
+            await asyncio.sleep(settings.PUSH_IDLE_WAIT_SECONDS)
+
+
+def stop_push_sender():
+    """Task'ı durdur (shutdown için)."""
+    global TASK_RUNNING
+    TASK_RUNNING = False
+    logger.info("Push sender stopped")
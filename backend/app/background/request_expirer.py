@@ -0,0 +1,24 @@
+"""Periodic job for expiring stale blood requests."""
+from app.core.logging import get_logger
+from app.database import AsyncSessionLocal
+from app.services.blood_request_service import expire_stale_requests
+
+logger = get_logger(__name__)
+
+
+async def expire_requests() -> int:
+    """
+    Süresi dolmuş ACTIVE talepleri EXPIRED yapar.
+
+    Job runner'da leader worker tarafından periyodik çalıştırılır
+    (app/background/jobs.py).
+
+    Returns:
+        Expire edilen talep sayısı
+    """
+    async with AsyncSessionLocal() as db:
+        count = await expire_stale_requests(db)
+        await db.commit()
+    if count > 0:
+        logger.info(f"Request expirer: {count} request(s) expired")
+    return count
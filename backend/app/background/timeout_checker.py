@@ -1,43 +1,77 @@
-"""Background task for checking commitment timeouts."""
-import asyncio
-
+"""Periodic job for checking commitment timeouts."""
 from app.config import settings
 from app.core.logging import get_logger
 from app.database import AsyncSessionLocal
-from app.services.donation_service import check_timeouts
+from app.services.commitment_scheduler_service import commitment_scheduler, load_commitment_deadlines
+from app.services.donation_service import check_timeouts, send_timeout_warnings
 
 logger = get_logger(__name__)
 
 # Configuration
-TIMEOUT_CHECK_INTERVAL_MINUTES = 5  # Her 5 dakikada bir kontrol et
-TASK_RUNNING = False  # Task durumunu takip et
+TIMEOUT_CHECK_INTERVAL_MINUTES = 5  # Her 5 dakikada bir kontrol et (scheduler kapalıyken)
+
+
+async def expire_overdue_commitments() -> int:
+    """
+    Timeout olmuş taahhütleri TIMEOUT_BATCH_SIZE'lık batch'ler halinde işler.
+
+    Her batch ayrı transaction'da commit edilir; satırlar SKIP LOCKED ile
+    seçildiğinden birden fazla worker yükü paylaşabilir.
+
+    Returns:
+        Timeout edilen toplam taahhüt sayısı
+    """
+    total = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            count = await check_timeouts(db)
+            await db.commit()
+        total += count
+        if count < settings.TIMEOUT_BATCH_SIZE:
+            return total
+
 
+async def reconcile_commitment_deadlines() -> int:
+    """
+    Commitment scheduler'ın kaçırdığı uyarıları gönderir ve ON_THE_WAY
+    taahhütleri zamanlayıcıya yeniden yükler.
+
+    Başka bir instance'ta oluşturulan ya da commit sonrası zamanlanamayan
+    taahhütler bu sayede zamanlayıcıya girer.
+
+    Returns:
+        Gönderilen uyarı sayısı
+    """
+    async with AsyncSessionLocal() as db:
+        warned = await send_timeout_warnings(db)
+        await load_commitment_deadlines(db, commitment_scheduler)
+        await db.commit()
+    return warned
 
-async def run_timeout_checker():
+
+def timeout_check_interval_minutes() -> int:
+    """Scheduler çalışıyorsa tarama yalnızca uzlaştırmadır, daha seyrek yapılır."""
+    if commitment_scheduler.is_running:
+        return settings.COMMITMENT_RECONCILE_INTERVAL_MINUTES
+    return TIMEOUT_CHECK_INTERVAL_MINUTES
+
+
+async def check_commitment_timeouts() -> int:
     """
-    Periyodik olarak timeout kontrolü yapar.
+    Timeout olmuş taahhütleri işler; commitment scheduler çalışıyorsa
+    deadline'ları uzlaştırır.
+
+    Job runner'da leader worker tarafından periyodik çalıştırılır
+    (app/background/jobs.py). Hatalar runner'a iletilir.
 
-    FastAPI lifespan'da başlatılır.
+    Returns:
+        Timeout edilen taahhüt sayısı
     """
-    global TASK_RUNNING
-    TASK_RUNNING = True
-    logger.info(f"Timeout checker started - checking every {TIMEOUT_CHECK_INTERVAL_MINUTES} minutes")
-
-    while TASK_RUNNING:
-        try:
-            async with AsyncSessionLocal() as db:
-                count = await check_timeouts(db)
-                await db.commit()
-                if count > 0:
-                    logger.info(f"Timeout checker: {count} commitment(s) timed out")
-        except Exception as e:
-            logger.error(f"Timeout checker error: {e}")
-
-        await asyncio.sleep(TIMEOUT_CHECK_INTERVAL_MINUTES * 60)
-
-
-def stop_timeout_checker():
-    """Task'ı durdur (shutdown için)."""
-    global TASK_RUNNING
-    TASK_RUNNING = False
-    logger.info("Timeout checker stopped")
\ No newline at end of file
+    count = await expire_overdue_commitments()
+    if count > 0:
+        logger.info(f"Timeout checker: {count} commitment(s) timed out")
+    if commitment_scheduler.is_running:
+        warned = await reconcile_commitment_deadlines()
+        if warned > 0:
+            logger.info(f"Timeout checker: {warned} missed timeout warning(s) sent")
+    return count
@@ -0,0 +1,25 @@
+"""Periodic job for expanding new-request notification waves."""
+from app.core.logging import get_logger
+from app.database import AsyncSessionLocal
+from app.services.blood_request_service import advance_dispatch_waves
+
+logger = get_logger(__name__)
+
+
+async def dispatch_waves() -> int:
+    """
+    Bekleme penceresi dolan taleplerin bildirim halkasını genişletir.
+
+    Job runner'da leader worker tarafından periyodik çalıştırılır
+    (app/background/jobs.py); aynı dalga birden fazla worker'dan
+    gönderilmez.
+
+    Returns:
+        Halkası genişletilen talep sayısı
+    """
+    async with AsyncSessionLocal() as db:
+        count = await advance_dispatch_waves(db)
+        await db.commit()
+    if count > 0:
+        logger.info(f"Wave dispatcher: {count} request(s) expanded to next ring")
+    return count
@@ -29,6 +29,38 @@ class Settings(BaseSettings):
     # Firebase
     FIREBASE_CREDENTIALS: str = "/app/firebase-credentials.json"
 
+    # Push kuyruğu (bildirimler commit sonrası kuyruğa alınıp send_each ile toplu gönderilir)
+    PUSH_DISPATCH_ENABLED: bool = True
+    PUSH_BATCH_SIZE: int = 500  # send_each çağrısı başına en fazla mesaj (FCM sınırı 500)
+    PUSH_IDLE_WAIT_SECONDS: int = 5  # Kuyruk boşken kontrol aralığı
+    PUSH_MAX_ATTEMPTS: int = 3  # Geçici FCM hatalarında toplam deneme sayısı
+    PUSH_RETRY_BASE_SECONDS: float = 2.0  # Üstel bekleme: 2s, 4s, ...
+    PUSH_TRANSPORT: str = "firebase"  # firebase, http (yerel FCM stand-in), memory
+    PUSH_HTTP_URL: str = "http://localhost:8089"  # PUSH_TRANSPORT=http için (scripts/fake_fcm_server.py)
+    PUSH_HTTP_TIMEOUT_SECONDS: float = 10.0
+
+    # Okunmamış bildirim sayaçları (notification_counters) startup'ta uzlaştırılır
+    UNREAD_COUNTER_RECONCILE_ON_STARTUP: bool = True
+
+    # Uygulama içi bildirim akışı (SSE; worker'lar arası Postgres LISTEN/NOTIFY)
+    NOTIFICATION_STREAM_ENABLED: bool = True
+    NOTIFICATION_STREAM_HEARTBEAT_SECONDS: int = 15  # Boşta bağlantıya ping aralığı
+    NOTIFICATION_STREAM_QUEUE_SIZE: int = 100  # Bağlantı başına bekleyen olay sınırı
+    NOTIFICATION_STREAM_REPLAY_LIMIT: int = 100  # Last-Event-ID ile tekrar gönderilecek en fazla bildirim
+    NOTIFICATION_STREAM_RECONNECT_SECONDS: int = 5  # LISTEN bağlantısı koparsa bekleme
+
+    # notifications aylık partition'ları ve saklama süresi
+    NOTIFICATION_PARTITION_MAINTENANCE_ENABLED: bool = True
+    NOTIFICATION_PARTITION_MONTHS_AHEAD: int = 3  # Önceden oluşturulacak partition sayısı
+    NOTIFICATION_RETENTION_MONTHS: int = 6  # Bu aydan önce saklanacak tam ay sayısı
+    NOTIFICATION_PARTITION_MAINTENANCE_INTERVAL_HOURS: int = 6
+
+    # NEW_REQUEST throttle: pencere içinde aynı hastane + kan grubu bildirimi
+    # tekilleştirilir, bağışçı başına push sayısı sınırlanır
+    NOTIFICATION_THROTTLE_CACHE_ENABLED: bool = True  # Son gönderim durumu bellekte (kapalıysa DB'den)
+    NOTIFICATION_THROTTLE_WINDOW_MINUTES: int = 60
+    NOTIFICATION_THROTTLE_MAX_PUSHES: int = 3  # Pencere başına bağışçıya en fazla push
+
     # App
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:8000"
 
@@ -36,12 +68,57 @@ class Settings(BaseSettings):
     MAX_SEARCH_RADIUS_KM: int = 100
     DEFAULT_SEARCH_RADIUS_KM: int = 100
 
+    # Donor spatial index (process-içi, startup'ta ve periyodik olarak DB'den doldurulur)
+    DONOR_INDEX_ENABLED: bool = True
+    DONOR_INDEX_CELL_SIZE_METERS: int = 2000
+    DONOR_INDEX_REFRESH_INTERVAL_MINUTES: int = 5  # Diğer worker'ların değişiklikleri için yeniden kurulum
+
+    # Hospital registry (process-içi, startup'ta ve periyodik olarak DB'den doldurulur)
+    HOSPITAL_REGISTRY_ENABLED: bool = True
+    HOSPITAL_REGISTRY_REFRESH_INTERVAL_MINUTES: int = 5  # Diğer worker'ların değişiklikleri için yeniden yükleme
+
+    # Konum ingestion buffer'ı (GPS ping'leri birleştirilip toplu yazılır)
+    LOCATION_BUFFER_ENABLED: bool = True
+    LOCATION_MIN_MOVEMENT_METERS: int = 50  # Bu mesafeden az hareket yok sayılır
+    LOCATION_FLUSH_INTERVAL_SECONDS: int = 5
+
+    # Donor fan-out (yeni talepte kaç bağışçıya bildirim gideceği)
+    DONOR_CANDIDATE_POOL_SIZE: int = 200  # Skorlanacak en yakın aday sayısı
+    DONOR_FANOUT_MIN: int = 10
+    DONOR_FANOUT_MAX: int = 50
+    DONOR_FANOUT_SAFETY_FACTOR: float = 2.0  # Ünite başına beklenen gelen bağışçı
+    DONOR_NOTIFICATION_LOAD_HOURS: int = 24  # Bildirim yükü penceresi
+
+    # Kademeli bildirim (wave dispatch): en yakın halkadan başlayıp
+    # taahhüt gelmezse yarıçapı MAX_SEARCH_RADIUS_KM'e kadar büyütür
+    DISPATCH_WAVES_ENABLED: bool = True
+    DISPATCH_INITIAL_RADIUS_METERS: int = 2000
+    DISPATCH_RADIUS_GROWTH_FACTOR: float = 2.0
+    DISPATCH_WAVE_WINDOW_MINUTES: int = 10  # Genişlemeden önce taahhüt bekleme süresi
+    DISPATCH_CHECK_INTERVAL_SECONDS: int = 60
+
     # Cooldown
     WHOLE_BLOOD_COOLDOWN_DAYS: int = 90
     APHERESIS_COOLDOWN_HOURS: int = 48
 
     # Timeout
     COMMITMENT_TIMEOUT_MINUTES: int = 60
+    TIMEOUT_BATCH_SIZE: int = 500  # check_timeouts transaction'ı başına en fazla taahhüt
+    # Deadline scheduler'ı timeout ve TIMEOUT_WARNING'i tam zamanında işler;
+    # açıkken periyodik tarama yalnızca uzlaştırma yapar
+    COMMITMENT_SCHEDULER_ENABLED: bool = True
+    COMMITMENT_TIMEOUT_WARNING_MINUTES: int = 10  # Timeout'tan bu kadar önce uyarı
+    COMMITMENT_RECONCILE_INTERVAL_MINUTES: int = 30
+
+    # Periyodik job'lar (app/background/jobs.py)
+    # Leader election açıkken DB'ye yazan job'ları yalnızca advisory lock'u
+    # tutan worker çalıştırır; kapalıysa her worker çalıştırır
+    JOB_LEADER_ELECTION_ENABLED: bool = True
+    JOB_LEADER_LOCK_KEY: int = 5_262_837  # pg_try_advisory_lock anahtarı
+    JOB_ERROR_BACKOFF_SECONDS: int = 5  # Hatadan sonraki ilk tekrar, her hatada ikiye katlanır
+    JOB_ERROR_BACKOFF_MAX_SECONDS: int = 300
+    REQUEST_EXPIRY_INTERVAL_MINUTES: int = 5
+    RATE_LIMIT_CLEANUP_INTERVAL_MINUTES: int = 10
 
     # Gamification
     HERO_POINTS_WHOLE_BLOOD: int = 50
@@ -7,8 +7,14 @@ Bu paket, uygulamada kullanılan tüm sabit değerleri ve enum'ları içerir.
 from app.constants.blood_types import (
     BloodType,
     DONATION_COMPATIBILITY,
+    BLOOD_TYPE_BITS,
+    COMPATIBLE_DONOR_MASKS,
+    COMPATIBLE_RECIPIENT_MASKS,
+    BLOOD_TYPE_MASK_SQL,
     can_donate,
     get_compatible_donors,
+    blood_types_to_mask,
+    mask_to_blood_types,
     BLOOD_TYPE_DESCRIPTIONS,
 )
 from app.constants.roles import (
@@ -22,6 +28,7 @@ from app.constants.status import (
     CommitmentStatus,
     DonationStatus,
     NotificationType,
+    LocationUpdateStatus,
     REQUEST_STATUS_DESCRIPTIONS,
     REQUEST_TYPE_DESCRIPTIONS,
     PRIORITY_DESCRIPTIONS,
@@ -35,8 +42,14 @@ __all__ = [
     # Blood types
     "BloodType",
     "DONATION_COMPATIBILITY",
+    "BLOOD_TYPE_BITS",
+    "COMPATIBLE_DONOR_MASKS",
+    "COMPATIBLE_RECIPIENT_MASKS",
+    "BLOOD_TYPE_MASK_SQL",
     "can_donate",
     "get_compatible_donors",
+    "blood_types_to_mask",
+    "mask_to_blood_types",
     "BLOOD_TYPE_DESCRIPTIONS",
     # Roles
     "UserRole",
@@ -48,6 +61,7 @@ __all__ = [
     "CommitmentStatus",
     "DonationStatus",
     "NotificationType",
+    "LocationUpdateStatus",
     # Status descriptions
     "REQUEST_STATUS_DESCRIPTIONS",
     "REQUEST_TYPE_DESCRIPTIONS",
@@ -6,10 +6,17 @@ Tıbbi Gerçekler:
 - AB+ (Universal Recipient): Herkesten alabilir, SADECE AB+'ya verebilir
 
 Matris Formatı: Recipient (Alıcı) → Compatible Donors (Verenler)
+
+Bitmask Gösterimi:
+- Her kan grubu 8 bitlik maskede tek bir bit'tir (BLOOD_TYPE_BITS)
+- Uyumluluk tabloları önceden hesaplanmış maskelerdir; kontrol tek bir
+  bit testine (donor_bit & recipient_mask) indirgenir
+- users ve blood_requests tablolarındaki blood_type_mask kolonları aynı
+  bitleri kullanır (BLOOD_TYPE_MASK_SQL)
 """
 
 from enum import Enum
-from typing import Dict, List
+from typing import Dict, Iterable, List
 
 
 class BloodType(str, Enum):
@@ -50,6 +57,65 @@ DONATION_COMPATIBILITY: Dict[str, List[str]] = {
 }
 
 
+# Kan grubu → bit (BloodType sırasıyla: A+ = 1, A- = 2, ..., O- = 128)
+BLOOD_TYPE_BITS: Dict[str, int] = {
+    blood_type.value: 1 << position for position, blood_type in enumerate(BloodType)
+}
+
+
+def blood_types_to_mask(blood_types: Iterable[str]) -> int:
+    """
+    Kan grubu listesini bitmask'e çevirir.
+
+    Args:
+        blood_types: Kan grupları (geçersiz değerler yok sayılır)
+
+    Returns:
+        Kan gruplarının bitlerinin OR'u
+    """
+    mask = 0
+    for blood_type in blood_types:
+        mask |= BLOOD_TYPE_BITS.get(blood_type, 0)
+    return mask
+
+
+def mask_to_blood_types(mask: int) -> List[str]:
+    """
+    Bitmask'i BloodType sırasıyla kan grubu listesine çevirir.
+
+    Args:
+        mask: Kan grubu bitmask'i
+
+    Returns:
+        Maskedeki kan grupları
+    """
+    return [blood_type for blood_type, bit in BLOOD_TYPE_BITS.items() if mask & bit]
+
+
+# Alıcı → bu alıcıya bağış yapabilecek bağışçı grupları maskesi
+COMPATIBLE_DONOR_MASKS: Dict[str, int] = {
+    recipient: blood_types_to_mask(donors)
+    for recipient, donors in DONATION_COMPATIBILITY.items()
+}
+
+# Bağışçı → bu bağışçının bağış yapabileceği alıcı grupları maskesi
+COMPATIBLE_RECIPIENT_MASKS: Dict[str, int] = {
+    donor: blood_types_to_mask(
+        recipient
+        for recipient, donors in DONATION_COMPATIBILITY.items()
+        if donor in donors
+    )
+    for donor in BLOOD_TYPE_BITS
+}
+
+# blood_type_mask generated kolonlarının ifadesi (NULL/geçersiz → 0)
+BLOOD_TYPE_MASK_SQL = (
+    "CASE blood_type "
+    + " ".join(f"WHEN '{blood_type}' THEN {bit}" for blood_type, bit in BLOOD_TYPE_BITS.items())
+    + " ELSE 0 END"
+)
+
+
 def can_donate(donor: str, recipient: str) -> bool:
     """
     Verenin, alıcıya bağış yapıp yapamayacağını kontrol eder.
@@ -69,13 +135,8 @@ def can_donate(donor: str, recipient: str) -> bool:
         >>> can_donate("AB+", "O-")  # AB+ sadece AB+'ya verir
         False
     """
-    if not BloodType.is_valid(donor) or not BloodType.is_valid(recipient):
-        return False
-
-    # Alıcının kabul edebildiği bağışçı listesini al
-    compatible_donors = DONATION_COMPATIBILITY.get(recipient, [])
-    # Bağışçı bu listede var mı?
-    return donor in compatible_donors
+    # Geçersiz değerlerin biti/maskesi 0 olduğundan sonuç False olur
+    return bool(BLOOD_TYPE_BITS.get(donor, 0) & COMPATIBLE_DONOR_MASKS.get(recipient, 0))
 
 
 def get_compatible_donors(recipient: str) -> List[str]:
@@ -8,6 +8,7 @@ Bu dosya, tüm modellerde kullanılan status enum'larını içerir:
 - CommitmentStatus: Bağış taahhüdü durumu
 - DonationStatus: Tamamlanan bağış durumu
 - NotificationType: Bildirim türü
+- LocationUpdateStatus: Konum ping'inin işlenme durumu
 """
 
 from enum import Enum
@@ -169,6 +170,24 @@ class NotificationType(str, Enum):
         return value in cls.all_values()
 
 
+class LocationUpdateStatus(str, Enum):
+    """Konum ping'inin işlenme durumu."""
+
+    ACCEPTED = "ACCEPTED"   # Konum DB'ye yazıldı
+    PENDING = "PENDING"     # Buffer'da, location flusher ile yazılacak
+    IGNORED = "IGNORED"     # Hareket eşiğin altında, kayıtlı/bekleyen konum geçerli
+
+    @classmethod
+    def all_values(cls) -> List[str]:
+        """Tüm durumları döndürür."""
+        return [status.value for status in cls]
+
+    @classmethod
+    def is_valid(cls, value: str) -> bool:
+        """Verilen değerin geçerli bir durum olup olmadığını kontrol eder."""
+        return value in cls.all_values()
+
+
 # Status açıklamaları (UI için)
 REQUEST_STATUS_DESCRIPTIONS: dict[str, str] = {
     "ACTIVE": "Aktif",
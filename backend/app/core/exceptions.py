@@ -64,6 +64,13 @@ class UnauthorizedException(KanVerException):
         super().__init__(message, status_code=401, detail=detail)
 
 
+class ServiceUnavailableException(KanVerException):
+    """Service temporarily unavailable (503)."""
+
+    def __init__(self, message: str = "Service unavailable", detail: Optional[Dict[str, Any]] = None):
+        super().__init__(message, status_code=503, detail=detail)
+
+
 class CooldownActiveException(KanVerException):
     """
     Donor cooldown active.
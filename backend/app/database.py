@@ -1,7 +1,12 @@
+from typing import Callable
+
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import text
+from sqlalchemy import event, text
 from app.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
 
 # Async SQLAlchemy engine
 engine = create_async_engine(
@@ -40,6 +45,48 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+_AFTER_COMMIT_KEY = "kanver_after_commit_callbacks"
+
+
+def run_after_commit(db: AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    Callback'i session'ın transaction'ı commit edildikten sonra çalıştırır.
+
+    Process-içi cache ve kuyrukların (donor index, push kuyruğu vb.)
+    sadece kalıcı hale gelmiş değişiklikleri görmesini sağlar.
+    Transaction rollback olursa callback'ler sessizce atılır. Hata veren
+    callback stack trace ile loglanır, sonrakiler yine çalışır.
+
+    Args:
+        db: AsyncSession
+        callback: Argümansız, senkron fonksiyon
+    """
+    sync_session = db.sync_session
+    callbacks = sync_session.info.get(_AFTER_COMMIT_KEY)
+
+    if callbacks is None:
+        callbacks = []
+        sync_session.info[_AFTER_COMMIT_KEY] = callbacks
+
+        @event.listens_for(sync_session, "after_commit")
+        def _run_callbacks(session):
+            pending = list(callbacks)
+            callbacks.clear()
+            for pending_callback in pending:
+                try:
+                    pending_callback()
+                except Exception:
+                    logger.exception("After-commit callback failed")
+
+        @event.listens_for(sync_session, "after_transaction_end")
+        def _discard_callbacks(session, transaction):
+            # Root transaction commit edilmeden bittiyse (rollback) callback'leri at
+            if transaction.parent is None:
+                callbacks.clear()
+
+    callbacks.append(callback)
+
+
 async def test_db_connection() -> bool:
     """Test database connection with simple ping."""
     try:
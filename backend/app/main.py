@@ -6,11 +6,11 @@ from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from app.config import settings
-from app.database import test_db_connection, verify_postgis_extension, engine
+from app.database import test_db_connection, verify_postgis_extension, engine, AsyncSessionLocal
 from app.core.logging import setup_logging, get_logger
 from app.core.exceptions import KanVerException
 from app.middleware.logging_middleware import LoggingMiddleware
-from app.middleware.rate_limiter import RateLimiterMiddleware
+from app.middleware.rate_limiter import RateLimiterMiddleware, cleanup_rate_limiters
 from app.middleware.security_headers import SecurityHeadersMiddleware
 from app.middleware.error_handler import (
     kanver_exception_handler,
@@ -19,7 +19,27 @@ from app.middleware.error_handler import (
     generic_exception_handler,
 )
 from app.routers import auth, users, hospitals, requests, donors, donations, notifications, admin
-from app.background.timeout_checker import run_timeout_checker, stop_timeout_checker
+from app.background.jobs import PeriodicJob, job_runner
+from app.background.timeout_checker import check_commitment_timeouts, timeout_check_interval_minutes
+from app.background.request_expirer import expire_requests
+from app.background.donor_index_refresher import refresh_donor_index
+from app.background.hospital_registry_refresher import refresh_hospital_registry
+from app.background.wave_dispatcher import dispatch_waves
+from app.background.location_flusher import flush_locations, run_location_flusher, stop_location_flusher
+from app.background.commitment_scheduler import run_commitment_scheduler, stop_commitment_scheduler
+from app.background.push_sender import flush_push_queue, run_push_sender, stop_push_sender
+from app.background.notification_listener import run_notification_listener, stop_notification_listener
+from app.background.notification_partition_maintainer import maintain_notification_partitions
+from app.services.donor_index_service import rebuild_donor_index, donor_index
+from app.services.hospital_registry_service import rebuild_hospital_registry, hospital_registry
+from app.services.location_buffer_service import location_buffer
+from app.services.push_dispatch_service import push_queue
+from app.services.notification_stream_service import notification_broker
+from app.services.notification_throttle_service import notification_throttle
+from app.services.commitment_scheduler_service import commitment_scheduler
+from app.services.notification_service import reconcile_unread_counts
+from app.services.notification_partition_service import ensure_current_notification_partitions
+from app.utils.fcm import close_push_transport
 import logging
 
 # Setup application logging
@@ -42,22 +62,158 @@ async def lifespan(app: FastAPI):
             logger.info("PostGIS extension verified")
         else:
             logger.warning("PostGIS extension not found - spatial queries will fail")
+
+        # Bağışçı spatial index'ini doldur (başarısız olursa SQL yoluna düşülür)
+        if settings.DONOR_INDEX_ENABLED:
+            try:
+                async with AsyncSessionLocal() as session:
+                    await rebuild_donor_index(session)
+            except Exception as e:
+                donor_index.reset()
+                logger.warning(f"Donor index could not be built: {e}")
+
+        # Hospital registry'yi doldur (başarısız olursa DB yoluna düşülür)
+        if settings.HOSPITAL_REGISTRY_ENABLED:
+            try:
+                async with AsyncSessionLocal() as session:
+                    await rebuild_hospital_registry(session)
+            except Exception as e:
+                hospital_registry.reset()
+                logger.warning(f"Hospital registry could not be built: {e}")
+
+        # NEW_REQUEST throttle durumu bellekte tutulur (bağışçılar ilk kullanımda DB'den yüklenir)
+        if settings.NOTIFICATION_THROTTLE_CACHE_ENABLED:
+            notification_throttle.start()
+
+        # Taahhüt deadline zamanlayıcısı; deadline'ları yalnızca job leader'ı
+        # DB'den yükleyip işler (app/background/commitment_scheduler.py)
+        if settings.COMMITMENT_SCHEDULER_ENABLED:
+            commitment_scheduler.start()
+
+        # Default partition yok: bakım job'ından bağımsız olarak her worker
+        # bu ay ve sonraki ayın partition'larını garanti eder
+        try:
+            async with AsyncSessionLocal() as session:
+                await ensure_current_notification_partitions(session)
+                await session.commit()
+        except Exception as e:
+            logger.error(f"Notification partitions could not be ensured: {e}")
+
+        # Okunmamış bildirim sayaçlarındaki sapmaları düzelt
+        if settings.UNREAD_COUNTER_RECONCILE_ON_STARTUP:
+            try:
+                async with AsyncSessionLocal() as session:
+                    fixed = await reconcile_unread_counts(session)
+                    await session.commit()
+                if fixed:
+                    logger.info(f"Reconciled {fixed} unread notification counter(s)")
+            except Exception as e:
+                logger.warning(f"Unread counters could not be reconciled: {e}")
     else:
         logger.warning("Database connection failed")
 
+    # Periyodik job'lar (DB'ye yazanlar yalnızca leader worker'da çalışır)
+    job_runner.register(PeriodicJob(
+        name="commitment_timeouts",
+        func=check_commitment_timeouts,
+        interval_seconds=timeout_check_interval_minutes() * 60,
+    ))
+    job_runner.register(PeriodicJob(
+        name="request_expiry",
+        func=expire_requests,
+        interval_seconds=settings.REQUEST_EXPIRY_INTERVAL_MINUTES * 60,
+    ))
+    if settings.DISPATCH_WAVES_ENABLED:
+        job_runner.register(PeriodicJob(
+            name="dispatch_waves",
+            func=dispatch_waves,
+            interval_seconds=settings.DISPATCH_CHECK_INTERVAL_SECONDS,
+        ))
+    if settings.NOTIFICATION_PARTITION_MAINTENANCE_ENABLED and db_ok:
+        job_runner.register(PeriodicJob(
+            name="notification_partitions",
+            func=maintain_notification_partitions,
+            interval_seconds=settings.NOTIFICATION_PARTITION_MAINTENANCE_INTERVAL_HOURS * 3600,
+        ))
+    # Process-içi cache'ler her worker'da; diğer worker'ların değişikliklerini alır
+    if settings.DONOR_INDEX_ENABLED:
+        job_runner.register(PeriodicJob(
+            name="donor_index_refresh",
+            func=refresh_donor_index,
+            interval_seconds=settings.DONOR_INDEX_REFRESH_INTERVAL_MINUTES * 60,
+            leader_only=False,
+            run_at_start=False,
+        ))
+    if settings.HOSPITAL_REGISTRY_ENABLED:
+        job_runner.register(PeriodicJob(
+            name="hospital_registry_refresh",
+            func=refresh_hospital_registry,
+            interval_seconds=settings.HOSPITAL_REGISTRY_REFRESH_INTERVAL_MINUTES * 60,
+            leader_only=False,
+            run_at_start=False,
+        ))
+    job_runner.register(PeriodicJob(
+        name="rate_limiter_cleanup",
+        func=cleanup_rate_limiters,
+        interval_seconds=settings.RATE_LIMIT_CLEANUP_INTERVAL_MINUTES * 60,
+        leader_only=False,
+    ))
+    job_runner.start()
+
     # Start background tasks
-    timeout_task = asyncio.create_task(run_timeout_checker())
-    logger.info("Background timeout checker task started")
+    background_tasks = []
+    if commitment_scheduler.is_running:
+        background_tasks.append(asyncio.create_task(run_commitment_scheduler()))
+        logger.info("Background commitment scheduler task started")
+    if settings.LOCATION_BUFFER_ENABLED and db_ok:
+        location_buffer.start()
+        background_tasks.append(asyncio.create_task(run_location_flusher()))
+        logger.info("Background location flusher task started")
+    if settings.PUSH_DISPATCH_ENABLED and db_ok:
+        push_queue.start()
+        background_tasks.append(asyncio.create_task(run_push_sender()))
+        logger.info("Background push sender task started")
+    if settings.NOTIFICATION_STREAM_ENABLED and db_ok:
+        notification_broker.start()
+        background_tasks.append(asyncio.create_task(run_notification_listener()))
+        logger.info("Background notification listener task started")
 
     yield
 
     # Shutdown
-    stop_timeout_checker()
-    timeout_task.cancel()
+    await job_runner.stop()
+    job_runner.reset()
+    stop_commitment_scheduler()
+    commitment_scheduler.reset()
+    donor_index.reset()
+    hospital_registry.reset()
+    notification_throttle.reset()
+    location_buffer.stop()
+    stop_location_flusher()
+    push_queue.stop()
+    stop_push_sender()
+    notification_broker.stop()
+    stop_notification_listener()
+    for task in background_tasks:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    # Buffer'da kalan konumları yaz
     try:
-        await timeout_task
-    except asyncio.CancelledError:
-        pass
+        await flush_locations()
+    except Exception as e:
+        logger.warning(f"Pending locations could not be written: {e}")
+    # Kuyrukta kalan push'ları (ertelenmiş tekrarlar dahil) gönder
+    try:
+        await flush_push_queue()
+    except Exception as e:
+        logger.warning(f"Pending push notifications could not be sent: {e}")
+    if len(push_queue):
+        logger.warning(f"Dropping {len(push_queue)} push notification(s) still pending at shutdown")
+        push_queue.clear()
+    close_push_transport()
     logger.info("KanVer API shutting down...")
     # Dispose database engine
     await engine.dispose()
@@ -136,6 +292,10 @@ async def detailed_health_check():
             "connected": db_status,
             "postgis_enabled": postgis_status
         },
+        "jobs": {
+            "leader": job_runner.elector.is_leader if job_runner.elector else None,
+            "stats": job_runner.stats(),
+        },
     }
 
 
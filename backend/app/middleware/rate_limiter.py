@@ -13,6 +13,7 @@ Headers Added:
 - Retry-After: Seconds until rate limit resets (when limited)
 """
 import time
+import weakref
 from collections import defaultdict
 from typing import Callable, Dict, List, Tuple
 
@@ -26,6 +27,9 @@ from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Uygulamadaki limiter instance'ları (periyodik temizlik için)
+_limiters: "weakref.WeakSet[RateLimiterMiddleware]" = weakref.WeakSet()
+
 
 class RateLimiterMiddleware(BaseHTTPMiddleware):
     """
@@ -63,6 +67,7 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
         # IP -> List of timestamps
         # Using defaultdict to automatically create empty lists
         self._requests: Dict[str, List[float]] = defaultdict(list)
+        _limiters.add(self)
 
     def _get_client_ip(self, request: Request) -> str:
         """
@@ -232,4 +237,23 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
         for ip in ips_to_remove:
             del self._requests[ip]
 
-        return len(ips_to_remove)
\ No newline at end of file
+        return len(ips_to_remove)
+
+
+def cleanup_rate_limiters() -> int:
+    """
+    Tüm limiter instance'larında süresi geçmiş kayıtları temizler.
+
+    Limit penceresinden eski timestamp'ler sayılmadığından pencere dışı
+    kayıtlar silinir. Durum process-içi olduğundan her worker'da çalışır
+    (job runner, leader_only=False).
+
+    Returns:
+        Silinen IP sayısı
+    """
+    removed = 0
+    for limiter in list(_limiters):
+        removed += limiter.cleanup_old_entries(max_age_seconds=limiter.period_seconds)
+    if removed:
+        logger.debug(f"Rate limiter cleanup: {removed} IP(s) removed")
+    return removed
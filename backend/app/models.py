@@ -10,6 +10,7 @@ Bu dosya, KanVer uygulamasının tüm veritabanı modellerini içerir:
 - QRCode: QR kodları
 - Donation: Tamamlanan bağışlar
 - Notification: Bildirimler
+- NotificationCounter: Kullanıcı başına okunmamış bildirim sayacı
 """
 
 from datetime import datetime
@@ -23,21 +24,26 @@ from sqlalchemy import (
     Integer,
     Float,
     Boolean,
+    SmallInteger,
     Text,
+    Computed,
     ForeignKey,
     CheckConstraint,
     Index,
     UniqueConstraint,
     func,
+    text,
 )
 from sqlalchemy.orm import (
     Mapped,
     mapped_column,
     relationship,
 )
+from sqlalchemy.dialects.postgresql import ARRAY
 from geoalchemy2 import Geography
 
 from app.constants import (
+    BLOOD_TYPE_MASK_SQL,
     BloodType,
     UserRole,
     RequestStatus,
@@ -73,6 +79,13 @@ class TimestampMixin:
 # 1. USER
 # =============================================================================
 
+# idx_users_eligible_donor_location koşulu; find_nearby_donors sorgusu bunu kapsamalı
+ELIGIBLE_DONOR_PREDICATE = (
+    "deleted_at IS NULL AND is_active AND location IS NOT NULL "
+    "AND fcm_token IS NOT NULL AND blood_type IS NOT NULL AND NOT has_active_commitment"
+)
+
+
 class User(Base, TimestampMixin):
     """
     Kullanıcı modeli.
@@ -105,6 +118,10 @@ class User(Base, TimestampMixin):
 
     # Kan bilgileri
     blood_type: Mapped[Optional[str]] = mapped_column(String(5), nullable=True)
+    # Uyumluluk bit testi için blood_type'tan üretilen maske (bkz. BLOOD_TYPE_BITS)
+    blood_type_mask: Mapped[int] = mapped_column(
+        SmallInteger, Computed(BLOOD_TYPE_MASK_SQL, persisted=True), nullable=False
+    )
 
     # Gamification
     hero_points: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -124,6 +141,12 @@ class User(Base, TimestampMixin):
     total_donations: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     no_show_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
+    # Aktif (ON_THE_WAY/ARRIVED) taahhüdü var mı? Taahhüt yaşam döngüsünde
+    # refresh_active_commitment_flags ile güncellenir (denormalize)
+    has_active_commitment: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False, server_default="false"
+    )
+
     # Konum (PostGIS)
     location: Mapped[Optional[str]] = mapped_column(
         Geography(geometry_type="POINT", srid=4326),
@@ -158,6 +181,10 @@ class User(Base, TimestampMixin):
         ),
         # PostGIS GIST index for location queries
         Index("idx_users_location", location, postgresql_using="gist"),
+        # Bildirim alabilecek bağışçılar için partial GIST index (find_nearby_donors)
+        Index("idx_users_eligible_donor_location", location,
+              postgresql_using="gist",
+              postgresql_where=ELIGIBLE_DONOR_PREDICATE),
         # Partial unique index'ler (soft delete korumalı)
         Index("idx_users_phone_unique", phone_number,
               unique=True,
@@ -335,12 +362,20 @@ class BloodRequest(Base, TimestampMixin):
 
     # Kan bilgileri
     blood_type: Mapped[str] = mapped_column(String(5), nullable=False)
+    blood_type_mask: Mapped[int] = mapped_column(
+        SmallInteger, Computed(BLOOD_TYPE_MASK_SQL, persisted=True), nullable=False
+    )
     request_type: Mapped[str] = mapped_column(String(20), nullable=False)
     priority: Mapped[str] = mapped_column(String(20), nullable=False, default=Priority.NORMAL.value)
 
     # Miktar
     units_needed: Mapped[int] = mapped_column(Integer, nullable=False)
     units_collected: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Aktif (ON_THE_WAY/ARRIVED) taahhüt sayısı; N+1 slotu bu sayaç üzerinden
+    # tek bir koşullu UPDATE ile alınır
+    active_commitment_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
 
     # Durum
     status: Mapped[str] = mapped_column(String(20), nullable=False, default=RequestStatus.ACTIVE.value)
@@ -361,10 +396,18 @@ class BloodRequest(Base, TimestampMixin):
     patient_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
+    # Kademeli bildirim (wave dispatch): son bildirilen halka ve sonraki genişleme zamanı
+    dispatch_radius_meters: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    next_dispatch_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
     __table_args__ = (
         CheckConstraint("units_needed > 0", name="check_units_needed_positive"),
         CheckConstraint("units_collected >= 0", name="check_units_collected_non_negative"),
         CheckConstraint("units_collected <= units_needed", name="check_units_collected_not_exceed_needed"),
+        CheckConstraint("active_commitment_count >= 0", name="check_active_commitment_count_non_negative"),
         CheckConstraint(
             "blood_type IN ('A+', 'A-', 'B+', 'B-', 'AB+', 'AB-', 'O+', 'O-')",
             name="check_blood_type_valid"
@@ -385,6 +428,8 @@ class BloodRequest(Base, TimestampMixin):
         Index("idx_blood_requests_status", status),
         Index("idx_blood_requests_blood_type", blood_type),
         Index("idx_blood_requests_expires_at", expires_at),
+        Index("idx_blood_requests_next_dispatch_at", next_dispatch_at,
+              postgresql_where="next_dispatch_at IS NOT NULL"),
     )
 
     # Relationships
@@ -450,6 +495,11 @@ class DonationCommitment(Base, TimestampMixin):
         DateTime(timezone=True),
         nullable=True,
     )
+    # TIMEOUT_WARNING bildirimi gönderildiyse zamanı (tekrar gönderimi önler)
+    timeout_warning_sent_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
 
     __table_args__ = (
         CheckConstraint("timeout_minutes > 0", name="check_timeout_minutes_positive"),
@@ -658,6 +708,10 @@ class Notification(Base, TimestampMixin):
     Bildirim modeli.
 
     Kullanıcılara gönderilen bildirimleri tutar.
+
+    Tablo created_at üzerinde aylık RANGE partition'lıdır (migration
+    20260316_1400); DB'deki primary key (id, created_at)'dir. ORM kimliği
+    için UUID id tek başına yeterlidir.
     """
     __tablename__ = "notifications"
 
@@ -684,6 +738,12 @@ class Notification(Base, TimestampMixin):
         ForeignKey("donations.id", ondelete="SET NULL"),
         nullable=True,
     )
+    # Throttle ile bu bildirime taşınmış (collapse) önceki talepler;
+    # bağışçı o talepler için de bildirilmiş sayılır
+    covered_request_ids: Mapped[Optional[List[str]]] = mapped_column(
+        ARRAY(String(36)),
+        nullable=True,
+    )
 
     # İçerik
     title: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -705,12 +765,48 @@ class Notification(Base, TimestampMixin):
             "notification_type IN ('NEW_REQUEST', 'DONOR_FOUND', 'DONOR_ON_WAY', 'DONOR_ARRIVED', 'DONATION_COMPLETE', 'REQUEST_FULFILLED', 'TIMEOUT_WARNING', 'NO_SHOW', 'REDIRECT_TO_BANK')",
             name="check_notification_type_valid"
         ),
-        Index("idx_notifications_user", user_id),
+        # Bildirim listesi (user_id eşitliği + created_at DESC sıralı sayfa);
+        # user_id ön eki tek başına user_id sorgularını da karşılar
+        Index("idx_notifications_user_created_at", user_id, text("created_at DESC")),
         Index("idx_notifications_is_read", is_read),
         Index("idx_notifications_created_at", "created_at"),
+        # Okunmamış sayaç uzlaştırması (reconcile_unread_counts) için partial index
+        Index("idx_notifications_user_unread", user_id,
+              postgresql_where="is_read = false"),
     )
 
     # Relationships
     user: Mapped["User"] = relationship(back_populates="notifications")
     blood_request: Mapped["BloodRequest"] = relationship(back_populates="notifications")
     donation: Mapped["Donation"] = relationship(back_populates="notifications")
+
+
+# =============================================================================
+# 9. NOTIFICATION COUNTER
+# =============================================================================
+
+class NotificationCounter(Base):
+    """
+    Okunmamış bildirim sayacı modeli.
+
+    notification_service bildirim oluşturma ve okundu işaretleme ile aynı
+    transaction'da günceller; badge sayısı notifications taranmadan okunur.
+    """
+    __tablename__ = "notification_counters"
+
+    user_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    unread_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        CheckConstraint("unread_count >= 0", name="check_unread_count_non_negative"),
+    )
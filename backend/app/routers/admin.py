@@ -4,7 +4,6 @@ Admin Router.
 Bu router, admin yönetimi endpoint'lerini sağlar.
 Tüm endpoint'ler ADMIN rolü gerektirir.
 """
-import math
 from datetime import datetime, timezone
 from typing import Optional
 
@@ -32,6 +31,7 @@ from app.services.admin_service import (
     list_all_requests,
     list_all_donations,
 )
+from app.utils.pagination import next_cursor_for, page_count, should_count
 
 router = APIRouter(tags=["Admin"])
 
@@ -83,6 +83,8 @@ async def list_users(
     search: Optional[str] = Query(None, description="İsim veya telefon numarasında arama"),
     page: int = Query(1, ge=1, description="Sayfa numarası"),
     size: int = Query(20, ge=1, le=100, description="Sayfa başına kayıt"),
+    cursor: Optional[str] = Query(None, description="Keyset pagination cursor'u (önceki yanıttaki next_cursor)"),
+    include_total: Optional[bool] = Query(None, description="Toplam kayıt sayısını hesapla (cursor modunda varsayılan false)"),
     db: AsyncSession = Depends(get_db),
     _: User = Depends(require_role([UserRole.ADMIN.value])),
 ):
@@ -103,6 +105,8 @@ async def list_users(
         search=search,
         page=page,
         size=size,
+        cursor=cursor,
+        with_total=should_count(cursor, include_total),
     )
 
     items = [
@@ -123,14 +127,13 @@ async def list_users(
         for user in users
     ]
 
-    pages = math.ceil(total / size) if total > 0 else 0
-
     return AdminUserListResponse(
         items=items,
         total=total,
         page=page,
         size=size,
-        pages=pages,
+        pages=page_count(total, size),
+        next_cursor=next_cursor_for(users, size),
     )
 
 
@@ -190,6 +193,8 @@ async def list_requests(
     hospital_id: Optional[str] = Query(None, description="Hastane ID filtresi"),
     page: int = Query(1, ge=1, description="Sayfa numarası"),
     size: int = Query(20, ge=1, le=100, description="Sayfa başına kayıt"),
+    cursor: Optional[str] = Query(None, description="Keyset pagination cursor'u (önceki yanıttaki next_cursor)"),
+    include_total: Optional[bool] = Query(None, description="Toplam kayıt sayısını hesapla (cursor modunda varsayılan false)"),
     db: AsyncSession = Depends(get_db),
     _: User = Depends(require_role([UserRole.ADMIN.value])),
 ):
@@ -208,6 +213,8 @@ async def list_requests(
         hospital_id=hospital_id,
         page=page,
         size=size,
+        cursor=cursor,
+        with_total=should_count(cursor, include_total),
     )
 
     items = [
@@ -227,14 +234,13 @@ async def list_requests(
         for req in requests
     ]
 
-    pages = math.ceil(total / size) if total > 0 else 0
-
     return AdminRequestListResponse(
         items=items,
         total=total,
         page=page,
         size=size,
-        pages=pages,
+        pages=page_count(total, size),
+        next_cursor=next_cursor_for(requests, size),
     )
 
 
@@ -254,6 +260,8 @@ async def list_donations(
     end_date: Optional[datetime] = Query(None, description="Bitiş tarihi (ISO format)"),
     page: int = Query(1, ge=1, description="Sayfa numarası"),
     size: int = Query(20, ge=1, le=100, description="Sayfa başına kayıt"),
+    cursor: Optional[str] = Query(None, description="Keyset pagination cursor'u (önceki yanıttaki next_cursor)"),
+    include_total: Optional[bool] = Query(None, description="Toplam kayıt sayısını hesapla (cursor modunda varsayılan false)"),
     db: AsyncSession = Depends(get_db),
     _: User = Depends(require_role([UserRole.ADMIN.value])),
 ):
@@ -270,6 +278,8 @@ async def list_donations(
         end_date=end_date,
         page=page,
         size=size,
+        cursor=cursor,
+        with_total=should_count(cursor, include_total),
     )
 
     items = [
@@ -287,12 +297,11 @@ async def list_donations(
         for don in donations
     ]
 
-    pages = math.ceil(total / size) if total > 0 else 0
-
     return AdminDonationListResponse(
         items=items,
         total=total,
         page=page,
         size=size,
-        pages=pages,
+        pages=page_count(total, size),
+        next_cursor=next_cursor_for(donations, size),
     )
\ No newline at end of file
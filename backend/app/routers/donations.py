@@ -5,7 +5,7 @@ Bu dosya, bağış doğrulama ve geçmiş ile ilgili endpoint'leri içerir.
 """
 from fastapi import APIRouter, Depends, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 
 from app.dependencies import get_db, get_current_active_user, require_role
 from app.models import User
@@ -19,22 +19,27 @@ from app.schemas import (
 )
 from app.services.donation_service import verify_and_complete_donation, get_donor_donations
 from app.services.user_service import get_user_stats
+from app.services.hospital_registry_service import get_hospital_info
 from app.constants import UserRole
 from app.utils.cooldown import is_in_cooldown
+from app.utils.pagination import next_cursor_for, page_count, should_count
 
 router = APIRouter(tags=["Donations"])
 
 
-def _build_donation_response(donation) -> DonationResponse:
+def _build_donation_response(donation, hospital=None) -> DonationResponse:
     """
     Donation model'den DonationResponse şeması oluşturur.
 
     Args:
         donation: Donation model instance (with relationships loaded)
+        hospital: Hastane bilgisi (verilmezse donation.hospital kullanılır)
 
     Returns:
         DonationResponse şeması
     """
+    hospital = hospital or donation.hospital
+
     donor_info = DonationDonorInfo(
         id=str(donation.donor.id),
         full_name=donation.donor.full_name,
@@ -43,10 +48,10 @@ def _build_donation_response(donation) -> DonationResponse:
     )
 
     hospital_info = DonationHospitalInfo(
-        id=str(donation.hospital.id),
-        name=donation.hospital.name,
-        district=donation.hospital.district,
-        city=donation.hospital.city,
+        id=str(hospital.id),
+        name=hospital.name,
+        district=hospital.district,
+        city=hospital.city,
     )
 
     return DonationResponse(
@@ -91,7 +96,8 @@ async def verify_donation(
     """
     donation = await verify_and_complete_donation(db, current_user.id, data.qr_token)
     await db.commit()
-    return _build_donation_response(donation)
+    hospital = await get_hospital_info(db, donation.hospital_id)
+    return _build_donation_response(donation, hospital)
 
 
 @router.get(
@@ -102,29 +108,37 @@ async def verify_donation(
 async def get_donation_history(
     page: int = Query(1, ge=1, description="Sayfa numarası"),
     size: int = Query(20, ge=1, le=100, description="Sayfa başına kayıt sayısı"),
+    cursor: Optional[str] = Query(None, description="Keyset pagination cursor'u (önceki yanıttaki next_cursor)"),
+    include_total: Optional[bool] = Query(None, description="Toplam kayıt sayısını hesapla (cursor modunda varsayılan false)"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Kullanıcının bağış geçmişini listeler.
 
-    Pagination destekler. En son bağışlar ilk sırada.
+    Pagination destekler (page veya cursor). En son bağışlar ilk sırada.
 
     Returns:
         DonationListResponse: Bağış geçmişi listesi
     """
-    donations, total = await get_donor_donations(db, current_user.id, page, size)
+    donations, total = await get_donor_donations(
+        db,
+        current_user.id,
+        page,
+        size,
+        cursor=cursor,
+        with_total=should_count(cursor, include_total),
+    )
 
     items = [_build_donation_response(d) for d in donations]
 
-    pages = (total + size - 1) // size  # Ceiling division
-
     return DonationListResponse(
         items=items,
         total=total,
         page=page,
         size=size,
-        pages=pages,
+        pages=page_count(total, size),
+        next_cursor=next_cursor_for(donations, size),
     )
 
 
@@ -1,6 +1,5 @@
 """Donors router for donor-facing nearby request listing and commitment management."""
 
-import math
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Query, status
@@ -8,7 +7,7 @@ from sqlalchemy import select, func, and_, or_, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
-from app.constants import BloodType, CommitmentStatus, RequestStatus
+from app.constants import CommitmentStatus, RequestStatus
 from app.core.exceptions import BadRequestException
 from app.dependencies import get_current_active_user, get_db
 from app.models import BloodRequest, DonationCommitment, Hospital, User
@@ -31,21 +30,21 @@ from app.services.donation_service import (
 	get_active_commitment,
 	get_commitment_by_id,
 )
+from app.services.hospital_registry_service import get_hospital_info
 from app.utils.cooldown import is_in_cooldown
-from app.utils.validators import can_donate_to
+from app.utils.validators import compatible_recipient_mask
 from app.utils.qr_code import format_qr_content
+from app.utils.pagination import (
+	decode_cursor,
+	keyset_condition,
+	next_cursor_for,
+	page_count,
+	should_count,
+)
 
 router = APIRouter(tags=["Donors"])
 
 
-def _compatible_request_blood_types(donor_blood_type: str) -> list[str]:
-	return [
-		recipient
-		for recipient in BloodType.all_values()
-		if can_donate_to(donor_blood_type, recipient)
-	]
-
-
 def _build_request_response(
 	request_obj: BloodRequest,
 	hospital: Hospital,
@@ -95,6 +94,8 @@ async def list_nearby_requests_for_donor(
 	page: int = Query(1, ge=1),
 	size: int = Query(20, ge=1, le=100),
 	radius_km: float = Query(settings.DEFAULT_SEARCH_RADIUS_KM, gt=0),
+	cursor: Optional[str] = Query(None),
+	include_total: Optional[bool] = Query(None),
 	db: AsyncSession = Depends(get_db),
 	current_user: User = Depends(get_current_active_user),
 ):
@@ -129,8 +130,8 @@ async def list_nearby_requests_for_donor(
 			pages=0,
 		)
 
-	compatible_blood_types = _compatible_request_blood_types(current_user.blood_type or "")
-	if not compatible_blood_types:
+	recipient_mask = compatible_recipient_mask(current_user.blood_type or "")
+	if not recipient_mask:
 		return BloodRequestListResponse(
 			items=[],
 			total=0,
@@ -145,28 +146,40 @@ async def list_nearby_requests_for_donor(
 
 	conditions = [
 		BloodRequest.status == RequestStatus.ACTIVE.value,
-		BloodRequest.blood_type.in_(compatible_blood_types),
+		BloodRequest.blood_type_mask.bitwise_and(recipient_mask) != 0,
 		BloodRequest.requester_id != current_user.id,
 		or_(BloodRequest.expires_at.is_(None), BloodRequest.expires_at >= now),
 		func.ST_DWithin(BloodRequest.location, current_user.location, radius_meters),
 	]
 
-	offset = (page - 1) * size
 	stmt = (
 		select(BloodRequest, Hospital, User, distance_expr)
 		.join(Hospital, Hospital.id == BloodRequest.hospital_id)
 		.join(User, User.id == BloodRequest.requester_id)
 		.where(and_(*conditions))
-		.order_by(distance_expr)
-		.offset(offset)
-		.limit(size)
 	)
+	# Keyset pagination: (distance, id) artan sırada
+	if cursor:
+		distance_meters, row_id = decode_cursor(cursor, float)
+		stmt = stmt.where(
+			keyset_condition(
+				func.ST_Distance(BloodRequest.location, current_user.location),
+				BloodRequest.id,
+				distance_meters,
+				row_id,
+				descending=False,
+			)
+		)
+	else:
+		stmt = stmt.offset((page - 1) * size)
+	stmt = stmt.order_by(distance_expr, BloodRequest.id).limit(size)
 	result = await db.execute(stmt)
 	rows = result.all()
 
-	count_result = await db.execute(select(func.count(BloodRequest.id)).where(and_(*conditions)))
-	total = count_result.scalar() or 0
-	pages = math.ceil(total / size) if total > 0 else 0
+	total = None
+	if should_count(cursor, include_total):
+		count_result = await db.execute(select(func.count(BloodRequest.id)).where(and_(*conditions)))
+		total = count_result.scalar() or 0
 
 	requests_with_context: list[tuple[BloodRequest, Hospital, User]] = []
 	for req, hospital, requester, distance_meters in rows:
@@ -183,7 +196,8 @@ async def list_nearby_requests_for_donor(
 		total=total,
 		page=page,
 		size=size,
-		pages=pages,
+		pages=page_count(total, size),
+		next_cursor=next_cursor_for(rows, size, key=lambda row: (row[3], row[0].id)),
 	)
 
 
@@ -220,10 +234,7 @@ async def _build_commitment_response(
 	)
 	blood_request = request_result.scalar_one()
 
-	hospital_result = await db.execute(
-		select(Hospital).where(Hospital.id == blood_request.hospital_id)
-	)
-	hospital = hospital_result.scalar_one()
+	hospital = await get_hospital_info(db, blood_request.hospital_id)
 
 	# Build nested schemas
 	donor_info = CommitmentDonorInfo(
@@ -392,6 +403,8 @@ async def update_my_commitment_status(
 async def get_donor_history(
 	page: int = Query(1, ge=1),
 	size: int = Query(20, ge=1, le=100),
+	cursor: Optional[str] = Query(None),
+	include_total: Optional[bool] = Query(None),
 	db: AsyncSession = Depends(get_db),
 	current_user: User = Depends(get_current_active_user),
 ):
@@ -402,28 +415,36 @@ async def get_donor_history(
 	Tarihe göre descending sıralı.
 
 	Args:
-		page: Sayfa numarası (1'den başlar)
+		page: Sayfa numarası (1'den başlar, cursor verilirse yok sayılır)
 		size: Sayfa başına kayıt sayısı
+		cursor: Keyset pagination cursor'u (önceki yanıttaki next_cursor)
+		include_total: Toplam kayıt sayısını hesapla (cursor modunda varsayılan false)
 
 	Returns:
 		Pagination metadata ile birlikte taahhüt listesi
 	"""
 	# Count total
-	count_result = await db.execute(
-		select(func.count(DonationCommitment.id)).where(
-			DonationCommitment.donor_id == current_user.id
+	total = None
+	if should_count(cursor, include_total):
+		count_result = await db.execute(
+			select(func.count(DonationCommitment.id)).where(
+				DonationCommitment.donor_id == current_user.id
+			)
 		)
-	)
-	total = count_result.scalar() or 0
-	pages = math.ceil(total / size) if total > 0 else 0
+		total = count_result.scalar() or 0
 
 	# Fetch commitments with pagination
-	offset = (page - 1) * size
+	stmt = select(DonationCommitment).where(DonationCommitment.donor_id == current_user.id)
+	if cursor:
+		created_at, row_id = decode_cursor(cursor)
+		stmt = stmt.where(
+			keyset_condition(DonationCommitment.created_at, DonationCommitment.id, created_at, row_id)
+		)
+	else:
+		stmt = stmt.offset((page - 1) * size)
 	result = await db.execute(
-		select(DonationCommitment)
-		.where(DonationCommitment.donor_id == current_user.id)
-		.order_by(desc(DonationCommitment.created_at))
-		.offset(offset)
+		stmt
+		.order_by(desc(DonationCommitment.created_at), desc(DonationCommitment.id))
 		.limit(size)
 	)
 	commitments = list(result.scalars().all())
@@ -439,5 +460,6 @@ async def get_donor_history(
 		total=total,
 		page=page,
 		size=size,
-		pages=pages,
+		pages=page_count(total, size),
+		next_cursor=next_cursor_for(commitments, size),
 	)
@@ -27,7 +27,7 @@ from app.schemas import (
 )
 from app.services.hospital_service import (
     create_hospital,
-    get_hospital,
+    get_hospital_cached,
     list_hospitals,
     update_hospital,
     get_nearby_hospitals,
@@ -106,7 +106,7 @@ async def get_hospital_detail(
     db: AsyncSession = Depends(get_db),
 ):
     """Belirtilen ID'ye sahip hastaneyi döndürür. Bulunamazsa 404 döner. Auth gerektirmez."""
-    return await get_hospital(db, hospital_id)
+    return await get_hospital_cached(db, hospital_id)
 
 
 # =============================================================================
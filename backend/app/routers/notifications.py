@@ -3,9 +3,14 @@ Notification Router.
 
 Bu router, kullanıcı bildirim endpoint'lerini sağlar.
 """
-from fastapi import APIRouter, Depends, status, Query
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+from app.core.exceptions import ServiceUnavailableException
 from app.dependencies import get_current_active_user, get_db
 from app.models import User
 from app.schemas import (
@@ -19,6 +24,11 @@ from app.services.notification_service import (
     mark_as_read,
     mark_all_as_read,
 )
+from app.services.notification_stream_service import (
+    get_notifications_since,
+    notification_broker,
+    stream_notification_events,
+)
 import math
 
 router = APIRouter(tags=["Notifications"])
@@ -39,7 +49,7 @@ async def list_notifications(
     db: AsyncSession = Depends(get_db),
 ):
     """Kullanıcının bildirimlerini listeler."""
-    notifications, total, unread_count = await get_user_notifications(
+    rows, total, unread_count = await get_user_notifications(
         db=db,
         user_id=str(current_user.id),
         page=page,
@@ -47,20 +57,20 @@ async def list_notifications(
         unread_only=unread_only,
     )
 
-    # Response oluştur
+    # Response doğrudan sorgu satırlarından oluşturulur
     items = [
         NotificationResponse(
-            id=str(n.id),
-            notification_type=n.notification_type,
-            title=n.title,
-            message=n.message,
-            request_id=str(n.blood_request_id) if n.blood_request_id else None,
-            donation_id=str(n.donation_id) if n.donation_id else None,
-            is_read=n.is_read,
-            read_at=n.read_at,
-            created_at=n.created_at,
+            id=str(row.id),
+            notification_type=row.notification_type,
+            title=row.title,
+            message=row.message,
+            request_id=str(row.blood_request_id) if row.blood_request_id else None,
+            donation_id=str(row.donation_id) if row.donation_id else None,
+            is_read=row.is_read,
+            read_at=row.read_at,
+            created_at=row.created_at,
         )
-        for n in notifications
+        for row in rows
     ]
 
     return NotificationListResponse(
@@ -73,6 +83,47 @@ async def list_notifications(
     )
 
 
+@router.get(
+    "/stream",
+    status_code=status.HTTP_200_OK,
+    summary="Bildirim akışı (SSE)",
+    description=(
+        "Yeni bildirimleri Server-Sent Events ile anlık iletir. "
+        "Yeniden bağlanırken Last-Event-ID başlığı ile kaçırılan bildirimler alınır."
+    ),
+    response_class=StreamingResponse,
+)
+async def stream_notifications(
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Kullanıcının bildirimlerini SSE ile akıtır."""
+    if not notification_broker.is_running:
+        raise ServiceUnavailableException("Bildirim akışı şu anda kullanılamıyor")
+
+    user_id = str(current_user.id)
+    # Tekrar sorgusundan önce abone ol: aradaki bildirimler kaçırılmaz
+    subscription = notification_broker.subscribe(user_id, settings.NOTIFICATION_STREAM_QUEUE_SIZE)
+    try:
+        replay = await get_notifications_since(
+            db, user_id, last_event_id, settings.NOTIFICATION_STREAM_REPLAY_LIMIT
+        )
+    except Exception:
+        notification_broker.unsubscribe(subscription)
+        raise
+    # Akış boyunca DB bağlantısı tutulmasın
+    await db.close()
+
+    return StreamingResponse(
+        stream_notification_events(
+            subscription, replay, settings.NOTIFICATION_STREAM_HEARTBEAT_SECONDS
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get(
     "/unread-count",
     response_model=dict,
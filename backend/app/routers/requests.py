@@ -3,17 +3,16 @@ Blood Request Router.
 
 Kan talebi oluşturma, listeleme, detay, güncelleme ve iptal endpoint'lerini sağlar.
 """
-import math
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Query, status
-from sqlalchemy import select, func, update, and_, or_
+from sqlalchemy import select, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.constants import UserRole, CommitmentStatus, RequestStatus
 from app.core.exceptions import BadRequestException, ForbiddenException, GeofenceException
 from app.dependencies import get_db, get_current_active_user
-from app.models import User, BloodRequest, Hospital, DonationCommitment
+from app.models import User, BloodRequest, DonationCommitment
 from app.schemas import (
 	BloodRequestCreateRequest,
 	BloodRequestUpdateRequest,
@@ -26,19 +25,21 @@ from app.schemas import (
 from app.services.blood_request_service import (
 	create_request,
 	list_requests,
+	count_requests,
 	get_request,
 	update_request,
 	cancel_request,
 )
+from app.services.donor_index_service import track_commitments_ended
+from app.services.hospital_registry_service import get_hospital_info
+from app.utils.pagination import next_cursor_for, page_count, should_count
 
 router = APIRouter(tags=["Blood Requests"])
 
 
 async def _build_response(db: AsyncSession, request_obj: BloodRequest) -> BloodRequestResponse:
-	hospital_result = await db.execute(
-		select(Hospital).where(Hospital.id == request_obj.hospital_id)
-	)
-	hospital = hospital_result.scalar_one()
+	# Hastane bilgisi hospital registry'den (registry soğuksa DB'den)
+	hospital = await get_hospital_info(db, request_obj.hospital_id)
 
 	requester_result = await db.execute(
 		select(User).where(User.id == request_obj.requester_id)
@@ -112,48 +113,24 @@ async def list_requests_endpoint(
 	city: Optional[str] = Query(None),
 	page: int = Query(1, ge=1),
 	size: int = Query(20, ge=1, le=100),
+	cursor: Optional[str] = Query(None),
+	include_total: Optional[bool] = Query(None),
 	db: AsyncSession = Depends(get_db),
 	_: User = Depends(get_current_active_user),
 ):
-	items = await list_requests(
-		db,
+	filters = dict(
 		status=status_filter,
 		blood_type=blood_type,
 		request_type=request_type,
 		hospital_id=hospital_id,
 		city=city,
-		page=page,
-		size=size,
 	)
+	items = await list_requests(db, page=page, size=size, cursor=cursor, **filters)
 
-	# Toplam kayıt sayısı (pagination metadata için)
-	conditions = []
-	if status_filter:
-		conditions.append(BloodRequest.status == status_filter.upper())
-	else:
-		now = func.now()
-		conditions.append(BloodRequest.status != RequestStatus.EXPIRED.value)
-		conditions.append(
-			or_(
-				BloodRequest.expires_at.is_(None),
-				BloodRequest.expires_at >= now,
-			)
-		)
-	if blood_type:
-		conditions.append(BloodRequest.blood_type == blood_type.upper())
-	if request_type:
-		conditions.append(BloodRequest.request_type == request_type.upper())
-	if hospital_id:
-		conditions.append(BloodRequest.hospital_id == hospital_id)
-
-	count_stmt = select(func.count(BloodRequest.id))
-	if city:
-		count_stmt = count_stmt.join(Hospital, Hospital.id == BloodRequest.hospital_id)
-		conditions.append(Hospital.city.ilike(f"%{city}%"))
-
-	total_result = await db.execute(count_stmt.where(and_(*conditions)))
-	total = total_result.scalar() or 0
-	pages = math.ceil(total / size) if total > 0 else 0
+	# Toplam kayıt sayısı (pagination metadata için, cursor modunda opsiyonel)
+	total = None
+	if should_count(cursor, include_total):
+		total = await count_requests(db, **filters)
 
 	response_items = [await _build_response(db, item) for item in items]
 
@@ -162,7 +139,8 @@ async def list_requests_endpoint(
 		total=total,
 		page=page,
 		size=size,
-		pages=pages,
+		pages=page_count(total, size),
+		next_cursor=next_cursor_for(items, size),
 		filtered_by_status=status_filter,
 		filtered_by_blood_type=blood_type,
 		filtered_by_request_type=request_type,
@@ -236,7 +214,8 @@ async def cancel_request_endpoint(
 			raise BadRequestException("Bu durumdaki talep iptal edilemez")
 
 		request_obj.status = RequestStatus.CANCELLED.value
-		await db.execute(
+		request_obj.active_commitment_count = 0
+		cancelled_result = await db.execute(
 			update(DonationCommitment)
 			.where(
 				DonationCommitment.blood_request_id == request_id,
@@ -245,7 +224,9 @@ async def cancel_request_endpoint(
 				),
 			)
 			.values(status=CommitmentStatus.CANCELLED.value)
+			.returning(DonationCommitment.donor_id)
 		)
+		await track_commitments_ended(db, cancelled_result.scalars().all())
 		await db.commit()
 		return MessageResponse(message="Talep iptal edildi")
 
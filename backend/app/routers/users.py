@@ -12,12 +12,13 @@ from app.schemas import (
     UserResponse,
     UserUpdateRequest,
     LocationUpdateRequest,
+    LocationUpdateResponse,
     UserStatsResponse,
     MessageResponse,
 )
 from app.services.user_service import (
     update_user_profile,
-    update_user_location,
+    ingest_user_location,
     soft_delete_user,
     get_user_stats,
 )
@@ -78,10 +79,10 @@ async def delete_account(
 
 @router.patch(
     "/me/location",
-    response_model=UserResponse,
+    response_model=LocationUpdateResponse,
     status_code=status.HTTP_200_OK,
     summary="Konum güncelleme",
-    description="Kullanıcının konumunu günceller.",
+    description="Kullanıcının konumunu günceller; gönderilen konum ve işlenme durumu döner.",
 )
 async def update_location(
     data: LocationUpdateRequest,
@@ -89,11 +90,16 @@ async def update_location(
     db: AsyncSession = Depends(get_db),
 ):
     """Kullanıcının konumunu günceller."""
-    updated_user = await update_user_location(
+    updated_user, location_status = await ingest_user_location(
         db, current_user, data.latitude, data.longitude
     )
     await db.commit()
-    return updated_user
+    return LocationUpdateResponse(
+        **UserResponse.model_validate(updated_user).model_dump(),
+        latitude=data.latitude,
+        longitude=data.longitude,
+        location_status=location_status,
+    )
 
 
 @router.get(
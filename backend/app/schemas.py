@@ -225,6 +225,20 @@ class UserResponse(BaseSchema):
     created_at: datetime = Field(..., description="Kayıt tarihi")
 
 
+class LocationUpdateResponse(UserResponse):
+    """
+    Konum güncelleme response şeması.
+
+    Konum buffer'a alındığında DB'deki konum henüz eski olabilir; bu yüzden
+    gönderilen koordinatlar işlenme durumuyla birlikte döner.
+    """
+    latitude: float = Field(..., description="Gönderilen enlem")
+    longitude: float = Field(..., description="Gönderilen boylam")
+    location_status: str = Field(
+        ..., description="Konum durumu (ACCEPTED: yazıldı, PENDING: buffer'da, IGNORED: hareket eşiğin altında)"
+    )
+
+
 class RegisterResponse(BaseSchema):
     """
     Kayıt response şeması.
@@ -597,10 +611,11 @@ class BloodRequestListResponse(BaseSchema):
     Pagination metadata ve uygulanan filtrelerle birlikte talep listesi döner.
     """
     items: List[BloodRequestResponse] = Field(..., description="Talep listesi")
-    total: int = Field(..., description="Toplam kayıt sayısı (filtre uygulandıktan sonra)")
+    total: Optional[int] = Field(None, description="Toplam kayıt sayısı (filtre uygulandıktan sonra) (include_total=false ise null)")
     page: int = Field(..., description="Mevcut sayfa numarası (1'den başlar)")
     size: int = Field(..., description="Sayfa başına kayıt sayısı")
-    pages: int = Field(..., description="Toplam sayfa sayısı")
+    pages: Optional[int] = Field(None, description="Toplam sayfa sayısı")
+    next_cursor: Optional[str] = Field(None, description="Sonraki sayfa için cursor (son sayfada null)")
     # Uygulanan filtreler (isteğe bağlı — şeffaflık için)
     filtered_by_status: Optional[str] = Field(None, description="Uygulanan durum filtresi")
     filtered_by_blood_type: Optional[str] = Field(None, description="Uygulanan kan grubu filtresi")
@@ -766,10 +781,11 @@ class CommitmentListResponse(BaseSchema):
     Pagination metadata ile birlikte taahhüt listesi döner.
     """
     items: List[CommitmentResponse] = Field(..., description="Taahhüt listesi")
-    total: int = Field(..., description="Toplam kayıt sayısı")
+    total: Optional[int] = Field(None, description="Toplam kayıt sayısı (include_total=false ise null)")
     page: int = Field(..., description="Mevcut sayfa numarası (1'den başlar)")
     size: int = Field(..., description="Sayfa başına kayıt sayısı")
-    pages: int = Field(..., description="Toplam sayfa sayısı")
+    pages: Optional[int] = Field(None, description="Toplam sayfa sayısı")
+    next_cursor: Optional[str] = Field(None, description="Sonraki sayfa için cursor (son sayfada null)")
 
 
 # =============================================================================
@@ -833,10 +849,11 @@ class DonationListResponse(BaseSchema):
     Pagination metadata ile birlikte bağış listesi döner.
     """
     items: List[DonationResponse] = Field(..., description="Bağış listesi")
-    total: int = Field(..., description="Toplam kayıt sayısı")
+    total: Optional[int] = Field(None, description="Toplam kayıt sayısı (include_total=false ise null)")
     page: int = Field(..., description="Mevcut sayfa numarası (1'den başlar)")
     size: int = Field(..., description="Sayfa başına kayıt sayısı")
-    pages: int = Field(..., description="Toplam sayfa sayısı")
+    pages: Optional[int] = Field(None, description="Toplam sayfa sayısı")
+    next_cursor: Optional[str] = Field(None, description="Sonraki sayfa için cursor (son sayfada null)")
 
 
 # =============================================================================
@@ -926,10 +943,11 @@ class AdminUserListResponse(BaseSchema):
     Pagination metadata ile birlikte kullanıcı listesi döner.
     """
     items: List[AdminUserInfo] = Field(..., description="Kullanıcı listesi")
-    total: int = Field(..., description="Toplam kayıt sayısı")
+    total: Optional[int] = Field(None, description="Toplam kayıt sayısı (include_total=false ise null)")
     page: int = Field(..., description="Mevcut sayfa numarası")
     size: int = Field(..., description="Sayfa başına kayıt sayısı")
-    pages: int = Field(..., description="Toplam sayfa sayısı")
+    pages: Optional[int] = Field(None, description="Toplam sayfa sayısı")
+    next_cursor: Optional[str] = Field(None, description="Sonraki sayfa için cursor (son sayfada null)")
 
 
 class AdminUserUpdateRequest(BaseSchema):
@@ -978,10 +996,11 @@ class AdminRequestListResponse(BaseSchema):
     Pagination metadata ile birlikte tüm talepleri döner.
     """
     items: List[AdminRequestInfo] = Field(..., description="Talep listesi")
-    total: int = Field(..., description="Toplam kayıt sayısı")
+    total: Optional[int] = Field(None, description="Toplam kayıt sayısı (include_total=false ise null)")
     page: int = Field(..., description="Mevcut sayfa numarası")
     size: int = Field(..., description="Sayfa başına kayıt sayısı")
-    pages: int = Field(..., description="Toplam sayfa sayısı")
+    pages: Optional[int] = Field(None, description="Toplam sayfa sayısı")
+    next_cursor: Optional[str] = Field(None, description="Sonraki sayfa için cursor (son sayfada null)")
 
 
 class AdminDonationInfo(BaseSchema):
@@ -1006,7 +1025,8 @@ class AdminDonationListResponse(BaseSchema):
     Pagination metadata ile birlikte tüm bağışları döner.
     """
     items: List[AdminDonationInfo] = Field(..., description="Bağış listesi")
-    total: int = Field(..., description="Toplam kayıt sayısı")
+    total: Optional[int] = Field(None, description="Toplam kayıt sayısı (include_total=false ise null)")
     page: int = Field(..., description="Mevcut sayfa numarası")
     size: int = Field(..., description="Sayfa başına kayıt sayısı")
-    pages: int = Field(..., description="Toplam sayfa sayısı")
+    pages: Optional[int] = Field(None, description="Toplam sayfa sayısı")
+    next_cursor: Optional[str] = Field(None, description="Sonraki sayfa için cursor (son sayfada null)")
@@ -11,6 +11,7 @@ from app.services.user_service import (
     get_user_by_phone,
     update_user_profile,
     update_user_location,
+    ingest_user_location,
     soft_delete_user,
     get_user_stats,
 )
@@ -21,6 +22,7 @@ __all__ = [
     "get_user_by_phone",
     "update_user_profile",
     "update_user_location",
+    "ingest_user_location",
     "soft_delete_user",
     "get_user_stats",
 ]
@@ -17,6 +17,7 @@ from app.constants.roles import UserRole
 from app.constants.status import RequestStatus, DonationStatus
 from app.core.exceptions import NotFoundException, BadRequestException
 from app.schemas import AdminUserUpdateRequest
+from app.utils.pagination import decode_cursor, keyset_condition
 
 
 async def get_admin_stats(db: AsyncSession) -> dict:
@@ -103,7 +104,9 @@ async def list_users_for_admin(
     search: Optional[str] = None,
     page: int = 1,
     size: int = 20,
-) -> tuple[list[User], int]:
+    cursor: Optional[str] = None,
+    with_total: bool = True,
+) -> tuple[list[User], Optional[int]]:
     """
     Admin için filtreli kullanıcı listesi.
 
@@ -113,8 +116,10 @@ async def list_users_for_admin(
         blood_type: Kan grubu filtresi
         is_verified: Doğrulama durumu filtresi
         search: full_name veya phone_number'da arama (case-insensitive)
-        page: Sayfa numarası (1'den başlar)
+        page: Sayfa numarası (1'den başlar, cursor verilirse yok sayılır)
         size: Sayfa başına kayıt sayısı
+        cursor: Keyset pagination cursor'u (created_at, id)
+        with_total: False ise COUNT sorgusu atlanır ve total None döner
 
     Returns:
         (kullanıcı_listesi, toplam_kayıt_sayısı) tuple'ı
@@ -144,19 +149,20 @@ async def list_users_for_admin(
         )
 
     # Toplam kayıt sayısı
-    count_stmt = select(func.count(User.id)).where(and_(*conditions))
-    total_result = await db.execute(count_stmt)
-    total = total_result.scalar() or 0
-
-    # Sayfalı liste
-    offset = (page - 1) * size
-    stmt = (
-        select(User)
-        .where(and_(*conditions))
-        .order_by(User.created_at.desc())
-        .offset(offset)
-        .limit(size)
-    )
+    total = None
+    if with_total:
+        count_stmt = select(func.count(User.id)).where(and_(*conditions))
+        total_result = await db.execute(count_stmt)
+        total = total_result.scalar() or 0
+
+    # Sayfalı liste (cursor varsa keyset, yoksa offset)
+    stmt = select(User).where(and_(*conditions))
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(keyset_condition(User.created_at, User.id, created_at, row_id))
+    else:
+        stmt = stmt.offset((page - 1) * size)
+    stmt = stmt.order_by(User.created_at.desc(), User.id.desc()).limit(size)
     result = await db.execute(stmt)
     users = list(result.scalars().all())
 
@@ -218,7 +224,9 @@ async def list_all_requests(
     hospital_id: Optional[str] = None,
     page: int = 1,
     size: int = 20,
-) -> tuple[list[BloodRequest], int]:
+    cursor: Optional[str] = None,
+    with_total: bool = True,
+) -> tuple[list[BloodRequest], Optional[int]]:
     """
     Tüm talepler (tüm status'lar dahil).
 
@@ -227,8 +235,10 @@ async def list_all_requests(
         status: Durum filtresi (ACTIVE, FULFILLED, CANCELLED, EXPIRED)
         blood_type: Kan grubu filtresi
         hospital_id: Hastane ID filtresi
-        page: Sayfa numarası (1'den başlar)
+        page: Sayfa numarası (1'den başlar, cursor verilirse yok sayılır)
         size: Sayfa başına kayıt sayısı
+        cursor: Keyset pagination cursor'u (created_at, id)
+        with_total: False ise COUNT sorgusu atlanır ve total None döner
 
     Returns:
         (talep_listesi, toplam_kayıt_sayısı) tuple'ı
@@ -248,14 +258,15 @@ async def list_all_requests(
         conditions.append(BloodRequest.hospital_id == hospital_id)
 
     # Toplam kayıt sayısı
-    count_stmt = select(func.count(BloodRequest.id))
-    if conditions:
-        count_stmt = count_stmt.where(and_(*conditions))
-    total_result = await db.execute(count_stmt)
-    total = total_result.scalar() or 0
-
-    # Sayfalı liste
-    offset = (page - 1) * size
+    total = None
+    if with_total:
+        count_stmt = select(func.count(BloodRequest.id))
+        if conditions:
+            count_stmt = count_stmt.where(and_(*conditions))
+        total_result = await db.execute(count_stmt)
+        total = total_result.scalar() or 0
+
+    # Sayfalı liste (cursor varsa keyset, yoksa offset)
     stmt = (
         select(BloodRequest)
         .options(
@@ -265,7 +276,14 @@ async def list_all_requests(
     )
     if conditions:
         stmt = stmt.where(and_(*conditions))
-    stmt = stmt.order_by(BloodRequest.created_at.desc()).offset(offset).limit(size)
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            keyset_condition(BloodRequest.created_at, BloodRequest.id, created_at, row_id)
+        )
+    else:
+        stmt = stmt.offset((page - 1) * size)
+    stmt = stmt.order_by(BloodRequest.created_at.desc(), BloodRequest.id.desc()).limit(size)
 
     result = await db.execute(stmt)
     requests = list(result.scalars().all())
@@ -279,7 +297,9 @@ async def list_all_donations(
     end_date: Optional[datetime] = None,
     page: int = 1,
     size: int = 20,
-) -> tuple[list[Donation], int]:
+    cursor: Optional[str] = None,
+    with_total: bool = True,
+) -> tuple[list[Donation], Optional[int]]:
     """
     Tüm bağışlar (tarih aralığı filtresi).
 
@@ -287,8 +307,10 @@ async def list_all_donations(
         db: AsyncSession
         start_date: Başlangıç tarihi (created_at >= start_date)
         end_date: Bitiş tarihi (created_at <= end_date)
-        page: Sayfa numarası (1'den başlar)
+        page: Sayfa numarası (1'den başlar, cursor verilirse yok sayılır)
         size: Sayfa başına kayıt sayısı
+        cursor: Keyset pagination cursor'u (created_at, id)
+        with_total: False ise COUNT sorgusu atlanır ve total None döner
 
     Returns:
         (bağış_listesi, toplam_kayıt_sayısı) tuple'ı
@@ -302,14 +324,15 @@ async def list_all_donations(
         conditions.append(Donation.created_at <= end_date)
 
     # Toplam kayıt sayısı
-    count_stmt = select(func.count(Donation.id))
-    if conditions:
-        count_stmt = count_stmt.where(and_(*conditions))
-    total_result = await db.execute(count_stmt)
-    total = total_result.scalar() or 0
-
-    # Sayfalı liste
-    offset = (page - 1) * size
+    total = None
+    if with_total:
+        count_stmt = select(func.count(Donation.id))
+        if conditions:
+            count_stmt = count_stmt.where(and_(*conditions))
+        total_result = await db.execute(count_stmt)
+        total = total_result.scalar() or 0
+
+    # Sayfalı liste (cursor varsa keyset, yoksa offset)
     stmt = (
         select(Donation)
         .options(
@@ -319,7 +342,14 @@ async def list_all_donations(
     )
     if conditions:
         stmt = stmt.where(and_(*conditions))
-    stmt = stmt.order_by(Donation.created_at.desc()).offset(offset).limit(size)
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            keyset_condition(Donation.created_at, Donation.id, created_at, row_id)
+        )
+    else:
+        stmt = stmt.offset((page - 1) * size)
+    stmt = stmt.order_by(Donation.created_at.desc(), Donation.id.desc()).limit(size)
 
     result = await db.execute(stmt)
     donations = list(result.scalars().all())
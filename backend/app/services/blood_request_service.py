@@ -3,6 +3,7 @@ Blood Request Service for KanVer API.
 
 Bu dosya, kan talebi yönetimi ile ilgili business logic fonksiyonlarını içerir.
 """
+import math
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -17,11 +18,15 @@ from app.core.exceptions import (
 	BadRequestException,
 	GeofenceException,
 )
-from app.models import BloodRequest, Hospital, DonationCommitment, User
+from app.models import BloodRequest, Hospital, DonationCommitment, Notification, User
 from app.utils.helpers import generate_request_code
-from app.utils.location import validate_geofence, create_point
-from app.utils.validators import get_compatible_donors
-from app.services.notification_service import create_notification
+from app.utils.location import resolve_geofence, create_point, extract_coordinates
+from app.utils.validators import compatible_donor_mask, get_compatible_donors
+from app.utils.pagination import decode_cursor, keyset_condition
+from app.utils.donor_scoring import rank_donors
+from app.services.notification_partition_service import recent_notification_cutoff
+from app.services.notification_throttle_service import create_request_notifications
+from app.services.donor_index_service import donor_index, track_commitments_ended
 
 
 async def create_request(db: AsyncSession, requester_id: str, data: dict) -> BloodRequest:
@@ -33,21 +38,20 @@ async def create_request(db: AsyncSession, requester_id: str, data: dict) -> Blo
 	- Request code #KAN-XXX formatında üretilmeli
 	- expires_at request_type'a göre belirlenmeli
 	- Talep konumu hastane konumu olarak kaydedilmeli
+	- Bağışçılar en yakın halkadan başlayarak kademeli bildirilir
+	  (sonraki halkalar advance_dispatch_waves ile)
 	"""
-	hospital_result = await db.execute(
-		select(Hospital).where(Hospital.id == data["hospital_id"])
-	)
-	hospital = hospital_result.scalar_one_or_none()
-	if not hospital:
-		raise NotFoundException("Hastane bulunamadı")
-
-	inside_geofence = await validate_geofence(
+	# Hastane, koordinatları ve geofence kararı tek sorguda
+	geofence = await resolve_geofence(
 		db,
 		user_lat=data["latitude"],
 		user_lng=data["longitude"],
 		hospital_id=data["hospital_id"],
 	)
-	if not inside_geofence:
+	hospital = geofence.hospital
+	if not hospital:
+		raise NotFoundException("Hastane bulunamadı")
+	if not geofence.inside:
 		raise GeofenceException()
 
 	request_type = data["request_type"].upper()
@@ -57,16 +61,14 @@ async def create_request(db: AsyncSession, requester_id: str, data: dict) -> Blo
 	else:
 		expires_at = now + timedelta(hours=6)
 
-	location_result = await db.execute(
-		select(func.ST_AsText(Hospital.location)).where(Hospital.id == hospital.id)
-	)
-	location_wkt = location_result.scalar_one_or_none()
+	# Talep konumu hastane konumudur
+	request_location = create_point(geofence.latitude, geofence.longitude)
 
-	request_location = create_point(data["latitude"], data["longitude"])
-	if location_wkt and location_wkt.startswith("POINT(") and location_wkt.endswith(")"):
-		point_str = location_wkt[6:-1]
-		lng_str, lat_str = point_str.split(" ")
-		request_location = create_point(float(lat_str), float(lng_str))
+	# İlk bildirim halkası; waves kapalıysa hastanenin arama yarıçapı
+	if settings.DISPATCH_WAVES_ENABLED:
+		dispatch_radius = min(settings.DISPATCH_INITIAL_RADIUS_METERS, _dispatch_radius_limit())
+	else:
+		dispatch_radius = _search_radius(hospital)
 
 	blood_request = BloodRequest(
 		request_code=await generate_request_code(db),
@@ -82,31 +84,193 @@ async def create_request(db: AsyncSession, requester_id: str, data: dict) -> Blo
 		patient_name=data.get("patient_name"),
 		notes=data.get("notes"),
 		location=request_location,
+		dispatch_radius_meters=dispatch_radius,
+		next_dispatch_at=_next_dispatch_at(dispatch_radius, now),
 	)
 
 	db.add(blood_request)
 	await db.flush()
 	await db.refresh(blood_request)
 
-	# Yakındaki bağışçılara NEW_REQUEST bildirimi
-	nearby_donors = await find_nearby_donors(db, str(blood_request.id))
-
-	for donor in nearby_donors:
-		await create_notification(
-			db=db,
-			user_id=str(donor.id),
-			notification_type=NotificationType.NEW_REQUEST.value,
-			context={
-				"blood_type": blood_request.blood_type,
-				"hospital_name": hospital.name,
-			},
-			request_id=str(blood_request.id),
-			fcm_token=donor.fcm_token,
-		)
+	# İlk halkadaki bağışçılara NEW_REQUEST bildirimi
+	await notify_donor_ring(db, blood_request, hospital.name, dispatch_radius)
 
 	return blood_request
 
 
+def _search_radius(hospital: Hospital) -> int:
+	"""Hastanenin bağışçı arama yarıçapı (metre)."""
+	if hospital.geofence_radius_meters:
+		return hospital.geofence_radius_meters
+	return settings.DEFAULT_SEARCH_RADIUS_KM * 1000
+
+
+def _dispatch_radius_limit() -> int:
+	"""Kademeli bildirimde ulaşılabilecek en büyük yarıçap (metre)."""
+	return settings.MAX_SEARCH_RADIUS_KM * 1000
+
+
+def _next_dispatch_radius(current_radius: int) -> Optional[int]:
+	"""Bir sonraki bildirim halkasının yarıçapı; sınıra ulaşıldıysa None."""
+	limit = _dispatch_radius_limit()
+	if current_radius >= limit:
+		return None
+	grown = math.ceil(current_radius * settings.DISPATCH_RADIUS_GROWTH_FACTOR)
+	return min(max(grown, current_radius + 1), limit)
+
+
+def _next_dispatch_at(radius_meters: int, now: datetime) -> Optional[datetime]:
+	"""Halka genişletilebilecekse bir sonraki kontrol zamanı, değilse None."""
+	if not settings.DISPATCH_WAVES_ENABLED or _next_dispatch_radius(radius_meters) is None:
+		return None
+	return now + timedelta(minutes=settings.DISPATCH_WAVE_WINDOW_MINUTES)
+
+
+async def notify_donor_ring(
+	db: AsyncSession,
+	blood_request: BloodRequest,
+	hospital_name: str,
+	radius_meters: float,
+) -> int:
+	"""
+	Yarıçap içindeki, bu talep için henüz bildirim almamış bağışçılara
+	NEW_REQUEST bildirimi gönderir.
+
+	Mevcut bildirimi bu talebe taşınan (collapse) bağışçılar yeni kişi
+	sayılmaz; boşalan fan-out yerleri sıradaki adaylarla doldurulur.
+
+	Args:
+		db: AsyncSession
+		blood_request: Kan talebi
+		hospital_name: Bildirim metnindeki hastane adı
+		radius_meters: Halka yarıçapı (metre)
+
+	Returns:
+		Yeni bildirim gönderilen bağışçı sayısı
+	"""
+	context = {
+		"blood_type": blood_request.blood_type,
+		"hospital_name": hospital_name,
+	}
+
+	notified = 0
+	slots: Optional[int] = None
+	while slots is None or slots > 0:
+		donors = await find_nearby_donors(
+			db, str(blood_request.id), radius_meters=radius_meters, exclude_notified=True
+		)
+		if slots is not None:
+			donors = donors[:slots]
+		if not donors:
+			break
+
+		# Aynı hastane + kan grubu bildirimleri tekilleştirilir, push'lar sınırlanır
+		decision = await create_request_notifications(
+			db,
+			blood_request,
+			[(str(donor.id), donor.fcm_token) for donor in donors],
+			context=context,
+		)
+		notified += len(decision.deliver)
+		# Taşınan bildirimler artık bu talebe ait; sonraki aramada elenirler
+		slots = len(decision.collapse)
+
+	return notified
+
+
+async def advance_dispatch_waves(db: AsyncSession, now: Optional[datetime] = None) -> int:
+	"""
+	Bekleme penceresi dolan taleplerin bildirim halkasını genişletir.
+
+	Her vadesi gelen ACTIVE talep için:
+	- Aktif taahhütler kalan N+1 slotu doldurduysa kademeli bildirim durur
+	- Son halkadan sonra taahhüt geldiyse genişleme bir pencere ertelenir
+	- Aksi halde yarıçap büyütülür ve yeni halkadaki bağışçılar bildirilir;
+	  yeni halkada bağışçı yoksa sınıra kadar hemen bir sonrakine geçilir
+
+	Periyodik olarak wave dispatcher tarafından çağrılır.
+
+	Args:
+		db: AsyncSession
+		now: Referans zaman (test için)
+
+	Returns:
+		Halkası genişletilen talep sayısı
+	"""
+	now = now or datetime.now(timezone.utc)
+	window = timedelta(minutes=settings.DISPATCH_WAVE_WINDOW_MINUTES)
+
+	# Artık aktif olmayan taleplerin zamanlayıcısını temizle
+	await db.execute(
+		update(BloodRequest)
+		.where(
+			BloodRequest.next_dispatch_at.is_not(None),
+			BloodRequest.status != RequestStatus.ACTIVE.value,
+		)
+		.values(next_dispatch_at=None)
+	)
+
+	due_result = await db.execute(
+		select(BloodRequest, Hospital.name)
+		.join(Hospital, Hospital.id == BloodRequest.hospital_id)
+		.where(
+			BloodRequest.next_dispatch_at.is_not(None),
+			BloodRequest.next_dispatch_at <= now,
+			BloodRequest.status == RequestStatus.ACTIVE.value,
+		)
+		.order_by(BloodRequest.next_dispatch_at)
+		.with_for_update(of=BloodRequest, skip_locked=True)
+	)
+	due = due_result.all()
+	if not due:
+		return 0
+
+	active_statuses = [CommitmentStatus.ON_THE_WAY.value, CommitmentStatus.ARRIVED.value]
+	commitment_result = await db.execute(
+		select(
+			DonationCommitment.blood_request_id,
+			func.count(DonationCommitment.id).filter(DonationCommitment.status.in_(active_statuses)),
+			func.max(DonationCommitment.created_at),
+		)
+		.where(DonationCommitment.blood_request_id.in_([blood_request.id for blood_request, _ in due]))
+		.group_by(DonationCommitment.blood_request_id)
+	)
+	commitment_stats = {
+		request_id: (active_count, last_commitment_at)
+		for request_id, active_count, last_commitment_at in commitment_result.all()
+	}
+
+	expanded = 0
+	for blood_request, hospital_name in due:
+		active_count, last_commitment_at = commitment_stats.get(blood_request.id, (0, None))
+		remaining_slots = blood_request.units_needed - blood_request.units_collected + 1
+		last_wave_at = blood_request.next_dispatch_at - window
+
+		if active_count >= remaining_slots:
+			blood_request.next_dispatch_at = None
+			continue
+
+		if last_commitment_at is not None and last_commitment_at >= last_wave_at:
+			blood_request.next_dispatch_at = now + window
+			continue
+
+		radius = _next_dispatch_radius(blood_request.dispatch_radius_meters)
+		notified = 0
+		while radius is not None:
+			blood_request.dispatch_radius_meters = radius
+			notified = await notify_donor_ring(db, blood_request, hospital_name, radius)
+			if notified:
+				break
+			radius = _next_dispatch_radius(radius)
+
+		blood_request.next_dispatch_at = _next_dispatch_at(blood_request.dispatch_radius_meters, now)
+		if notified:
+			expanded += 1
+
+	await db.flush()
+	return expanded
+
+
 async def get_request(db: AsyncSession, request_id: str) -> BloodRequest:
 	"""ID ile kan talebi getirir, bulunamazsa 404 fırlatır."""
 	result = await db.execute(
@@ -118,21 +282,14 @@ async def get_request(db: AsyncSession, request_id: str) -> BloodRequest:
 	return blood_request
 
 
-async def list_requests(
-	db: AsyncSession,
+def _list_request_conditions(
 	status: Optional[str] = None,
 	blood_type: Optional[str] = None,
 	request_type: Optional[str] = None,
 	hospital_id: Optional[str] = None,
 	city: Optional[str] = None,
-	page: int = 1,
-	size: int = 20,
-) -> list[BloodRequest]:
-	"""
-	Kan taleplerini filtreleyerek ve sayfalayarak döndürür.
-
-	Varsayılan davranış: expired olmayan kayıtlar döner.
-	"""
+) -> list:
+	"""list_requests ve count_requests için ortak filtre koşullarını üretir."""
 	conditions = []
 	now = datetime.now(timezone.utc)
 
@@ -153,17 +310,46 @@ async def list_requests(
 		conditions.append(BloodRequest.request_type == request_type.upper())
 	if hospital_id:
 		conditions.append(BloodRequest.hospital_id == hospital_id)
+	if city:
+		conditions.append(Hospital.city.ilike(f"%{city}%"))
+
+	return conditions
+
+
+async def list_requests(
+	db: AsyncSession,
+	status: Optional[str] = None,
+	blood_type: Optional[str] = None,
+	request_type: Optional[str] = None,
+	hospital_id: Optional[str] = None,
+	city: Optional[str] = None,
+	page: int = 1,
+	size: int = 20,
+	cursor: Optional[str] = None,
+) -> list[BloodRequest]:
+	"""
+	Kan taleplerini filtreleyerek ve sayfalayarak döndürür.
+
+	Varsayılan davranış: expired olmayan kayıtlar döner.
+	cursor verilirse page yok sayılır ve keyset pagination (created_at, id) uygulanır.
+	"""
+	conditions = _list_request_conditions(status, blood_type, request_type, hospital_id, city)
 
 	stmt = select(BloodRequest)
 	if city:
 		stmt = stmt.join(Hospital, Hospital.id == BloodRequest.hospital_id)
-		conditions.append(Hospital.city.ilike(f"%{city}%"))
 
-	offset = (page - 1) * size
+	if cursor:
+		created_at, row_id = decode_cursor(cursor)
+		conditions.append(
+			keyset_condition(BloodRequest.created_at, BloodRequest.id, created_at, row_id)
+		)
+	else:
+		stmt = stmt.offset((page - 1) * size)
+
 	stmt = (
 		stmt.where(and_(*conditions))
-		.order_by(BloodRequest.created_at.desc())
-		.offset(offset)
+		.order_by(BloodRequest.created_at.desc(), BloodRequest.id.desc())
 		.limit(size)
 	)
 
@@ -171,8 +357,43 @@ async def list_requests(
 	return list(result.scalars().all())
 
 
-async def find_nearby_donors(db: AsyncSession, request_id: str) -> list[User]:
-	"""Verilen talep için yakındaki uygun bağışçıları döndürür."""
+async def count_requests(
+	db: AsyncSession,
+	status: Optional[str] = None,
+	blood_type: Optional[str] = None,
+	request_type: Optional[str] = None,
+	hospital_id: Optional[str] = None,
+	city: Optional[str] = None,
+) -> int:
+	"""list_requests ile aynı filtrelere uyan toplam talep sayısını döndürür."""
+	conditions = _list_request_conditions(status, blood_type, request_type, hospital_id, city)
+
+	stmt = select(func.count(BloodRequest.id))
+	if city:
+		stmt = stmt.join(Hospital, Hospital.id == BloodRequest.hospital_id)
+
+	result = await db.execute(stmt.where(and_(*conditions)))
+	return result.scalar() or 0
+
+
+async def find_nearby_donors(
+	db: AsyncSession,
+	request_id: str,
+	radius_meters: Optional[float] = None,
+	exclude_notified: bool = False,
+) -> list[User]:
+	"""
+	Verilen talep için bildirim gönderilecek bağışçıları döndürür.
+
+	radius_meters verilmezse hastanenin arama yarıçapı kullanılır.
+	exclude_notified True ise bu talep için daha önce NEW_REQUEST bildirimi
+	almış bağışçılar (önceki halkalar) dışlanır.
+
+	Yarıçap içindeki en yakın DONOR_CANDIDATE_POOL_SIZE uygun aday; mesafe,
+	trust_score, no_show_count ve son bildirim yüküyle puanlanır. Dönen liste
+	skor sırasındadır ve boyutu (fan-out) kalan ünite sayısı ile adayların
+	tahmini gelme olasılığından belirlenir (DONOR_FANOUT_MIN..MAX).
+	"""
 	request_row = await db.execute(
 		select(BloodRequest, Hospital)
 		.join(Hospital, Hospital.id == BloodRequest.hospital_id)
@@ -183,56 +404,210 @@ async def find_nearby_donors(db: AsyncSession, request_id: str) -> list[User]:
 		raise NotFoundException("Kan talebi bulunamadı")
 
 	blood_request, hospital = row
-	compatible_donors = get_compatible_donors(blood_request.blood_type)
-	if not compatible_donors:
+	donor_mask = compatible_donor_mask(blood_request.blood_type)
+	if not donor_mask:
 		return []
 
 	now = datetime.now(timezone.utc)
-	radius_meters = (
-		hospital.geofence_radius_meters
-		if hospital.geofence_radius_meters
-		else settings.DEFAULT_SEARCH_RADIUS_KM * 1000
-	)
-
-	active_commitment_exists = exists(
-		select(DonationCommitment.id).where(
-			DonationCommitment.donor_id == User.id,
-			DonationCommitment.status.in_(
-				[CommitmentStatus.ON_THE_WAY.value, CommitmentStatus.ARRIVED.value]
-			),
+	if radius_meters is None:
+		radius_meters = _search_radius(hospital)
+	load_since = now - timedelta(hours=settings.DONOR_NOTIFICATION_LOAD_HOURS)
+
+	request_coordinates = extract_coordinates(blood_request.location)
+	if donor_index.is_ready and request_coordinates is not None:
+		candidates = await _nearby_candidates_from_index(
+			db, blood_request, get_compatible_donors(blood_request.blood_type), request_coordinates, radius_meters, now, load_since,
+			exclude_notified,
 		)
-	)
+		return _rank_candidates(blood_request, candidates, radius_meters)
 
 	distance_expr = func.ST_Distance(User.location, blood_request.location).label("distance_meters")
 
+	conditions = []
+	if exclude_notified:
+		conditions.append(~_already_notified(blood_request))
+
+	# İlk altı koşul idx_users_eligible_donor_location predicate'ini kapsar
 	stmt = (
-		select(User, distance_expr)
+		select(User, distance_expr, _recent_notification_load(load_since))
 		.where(
 			User.deleted_at.is_(None),
 			User.is_active == True,
-			User.id != blood_request.requester_id,
 			User.location.is_not(None),
 			User.fcm_token.is_not(None),
-			User.blood_type.in_(compatible_donors),
+			User.blood_type.is_not(None),
+			User.has_active_commitment == False,
+			User.blood_type_mask.bitwise_and(donor_mask) != 0,
+			User.id != blood_request.requester_id,
 			or_(User.next_available_date.is_(None), User.next_available_date <= now),
-			~active_commitment_exists,
 			func.ST_DWithin(User.location, blood_request.location, radius_meters),
+			*conditions,
 		)
 		.order_by(distance_expr)
-		.limit(50)
+		.limit(settings.DONOR_CANDIDATE_POOL_SIZE)
 	)
 
 	result = await db.execute(stmt)
-	rows = result.all()
+	candidates = [
+		(donor, distance_meters or 0, load or 0)
+		for donor, distance_meters, load in result.all()
+	]
+	return _rank_candidates(blood_request, candidates, radius_meters)
+
+
+def _request_notification_conditions(blood_request: BloodRequest) -> list:
+	"""Talebin NEW_REQUEST bildirimlerini seçen koşullar."""
+	window = timedelta(minutes=settings.NOTIFICATION_THROTTLE_WINDOW_MINUTES)
+	return [
+		Notification.notification_type == NotificationType.NEW_REQUEST.value,
+		# Başka talebe taşınmış (collapse) bildirim bu talebi kapsamaya devam eder
+		or_(
+			Notification.blood_request_id == blood_request.id,
+			Notification.covered_request_ids.contains([str(blood_request.id)]),
+		),
+		# Taşınan bildirim talepten en fazla bir throttle penceresi önce
+		# oluşturulmuştur; önceki aydan eski partition'lar (InitPlan ile
+		# çalışma anında) taranmaz
+		Notification.created_at >= func.least(
+			select(BloodRequest.created_at - window)
+			.where(BloodRequest.id == blood_request.id)
+			.scalar_subquery(),
+			recent_notification_cutoff(),
+		),
+	]
+
+
+def _already_notified(blood_request: BloodRequest):
+	"""
+	Bağışçının bu talep için NEW_REQUEST bildirimi almış olması (correlated EXISTS).
+
+	Aynı hastane + kan grubu için yakın zamanda bildirim almış bağışçılar
+	burada elenmez; onların bildirimi throttle tarafından bu talebe taşınır.
+	Taşınan bildirim önceki talebi covered_request_ids'te tutar, böylece
+	önceki talep bağışçıyı tekrar seçip bildirimi geri almaz.
+	"""
+	return exists(
+		select(Notification.id)
+		.where(Notification.user_id == User.id, *_request_notification_conditions(blood_request))
+	)
+
+
+async def _notified_user_ids(db: AsyncSession, blood_request: BloodRequest) -> set[str]:
+	"""Bu talep için NEW_REQUEST bildirimi almış bağışçıların ID'leri."""
+	result = await db.execute(
+		select(Notification.user_id).where(*_request_notification_conditions(blood_request))
+	)
+	return {str(user_id) for user_id in result.scalars().all()}
+
+
+def _recent_notification_load(since: datetime):
+	"""Bağışçının since'ten beri aldığı NEW_REQUEST bildirim sayısı (correlated subquery)."""
+	return (
+		select(func.count(Notification.id))
+		.where(
+			Notification.user_id == User.id,
+			Notification.notification_type == NotificationType.NEW_REQUEST.value,
+			Notification.created_at >= since,
+		)
+		.correlate(User)
+		.scalar_subquery()
+		.label("recent_notifications")
+	)
+
+
+def _rank_candidates(
+	blood_request: BloodRequest,
+	candidates: list[tuple[User, float, int]],
+	radius_meters: float,
+) -> list[User]:
+	"""
+	(bağışçı, mesafe, bildirim yükü) adaylarını puanlar ve fan-out kadarını döndürür.
+
+	Dönen bağışçıların distance_km alanı doldurulur.
+	"""
+	if not candidates:
+		return []
+
+	units_remaining = blood_request.units_needed - (blood_request.units_collected or 0)
+	ranked = rank_donors(
+		distances_meters=[distance for _, distance, _ in candidates],
+		radius_meters=radius_meters,
+		trust_scores=[donor.trust_score for donor, _, _ in candidates],
+		no_show_counts=[donor.no_show_count or 0 for donor, _, _ in candidates],
+		recent_notifications=[load for _, _, load in candidates],
+		units_needed=units_remaining,
+		safety_factor=settings.DONOR_FANOUT_SAFETY_FACTOR,
+		minimum=settings.DONOR_FANOUT_MIN,
+		maximum=settings.DONOR_FANOUT_MAX,
+	)
 
 	donors: list[User] = []
-	for donor, distance_meters in rows:
-		donor.distance_km = round((distance_meters or 0) / 1000, 3)
+	for position in ranked.order[:ranked.fanout]:
+		donor, distance_meters, _ = candidates[position]
+		donor.distance_km = round(distance_meters / 1000, 3)
 		donors.append(donor)
 
 	return donors
 
 
+async def _nearby_candidates_from_index(
+	db: AsyncSession,
+	blood_request: BloodRequest,
+	compatible_donors: list[str],
+	request_coordinates: tuple[float, float],
+	radius_meters: float,
+	now: datetime,
+	load_since: datetime,
+	exclude_notified: bool = False,
+) -> list[tuple[User, float, int]]:
+	"""
+	find_nearby_donors'un donor index üzerinden çalışan aday seçimi.
+
+	Aday seçimi ve mesafe sıralaması bellekte yapılır; DB'ye yalnızca
+	seçilen bağışçılar primary key ile yüklenir. Index commit sonrası
+	güncellendiği için ucuz uygunluk koşulları yüklemede tekrar kontrol edilir.
+	"""
+	# Bildirilmiş bağışçılar limit'ten önce elenmeli; aksi halde dolu bir iç
+	# halka her dalgada aynı adaylarla limit'i doldurur ve dış halka hiç seçilmez
+	exclude_ids = {str(blood_request.requester_id)}
+	if exclude_notified:
+		exclude_ids |= await _notified_user_ids(db, blood_request)
+
+	latitude, longitude = request_coordinates
+	hits = donor_index.query(
+		compatible_donors,
+		latitude,
+		longitude,
+		radius_meters,
+		exclude_ids=exclude_ids,
+		limit=settings.DONOR_CANDIDATE_POOL_SIZE,
+		now=now,
+	)
+	if not hits:
+		return []
+
+	result = await db.execute(
+		select(User, _recent_notification_load(load_since)).where(
+			User.id.in_([entry.user_id for entry, _ in hits]),
+			User.deleted_at.is_(None),
+			User.is_active == True,
+			User.fcm_token.is_not(None),
+			or_(User.next_available_date.is_(None), User.next_available_date <= now),
+		)
+	)
+	users_by_id = {str(user.id): (user, load or 0) for user, load in result.all()}
+
+	candidates: list[tuple[User, float, int]] = []
+	for entry, distance_meters in hits:
+		loaded = users_by_id.get(entry.user_id)
+		if loaded is None:
+			continue
+		donor, load = loaded
+		candidates.append((donor, distance_meters, load))
+
+	return candidates
+
+
 async def update_request(
 	db: AsyncSession,
 	request_id: str,
@@ -284,8 +659,10 @@ async def cancel_request(db: AsyncSession, request_id: str, requester_id: str) -
 		raise BadRequestException("Bu durumdaki talep iptal edilemez")
 
 	blood_request.status = RequestStatus.CANCELLED.value
+	# Aktif taahhütlerin hepsi iptal edildiğinden slot sayacı sıfırlanır
+	blood_request.active_commitment_count = 0
 
-	await db.execute(
+	cancelled_result = await db.execute(
 		update(DonationCommitment)
 		.where(
 			DonationCommitment.blood_request_id == request_id,
@@ -294,7 +671,9 @@ async def cancel_request(db: AsyncSession, request_id: str, requester_id: str) -
 			),
 		)
 		.values(status=CommitmentStatus.CANCELLED.value)
+		.returning(DonationCommitment.donor_id)
 	)
+	await track_commitments_ended(db, cancelled_result.scalars().all())
 
 	await db.flush()
 	await db.refresh(blood_request)
@@ -0,0 +1,265 @@
+"""
+Commitment Scheduler Service for KanVer API.
+
+Bu dosya, ON_THE_WAY taahhütlerin deadline'larını tutan process-içi
+zamanlayıcıyı içerir. Periyodik tablo taraması yerine:
+- Her taahhüt için created_at + timeout_minutes (timeout) ve bundan
+  COMMITMENT_TIMEOUT_WARNING_MINUTES önce (TIMEOUT_WARNING) min-heap'e eklenir
+- Commitment scheduler (background task) en yakın deadline'a kadar uyur ve
+  zamanı gelen taahhütleri tam zamanında işler
+- Yeni taahhütler create_commitment'ta, biten taahhütler
+  update_commitment_status'ta commit sonrası eklenir/çıkarılır
+
+Deadline'ları yalnızca job leader'ı işler (diğer worker'lar zamanlayıcıyı
+boşaltır). Leader olan worker zamanlayıcıyı DB'den tamamen doldurur, sonra
+başka worker'larda oluşturulan taahhütleri created_at'e göre artımlı yükler.
+İşlem SQL tarafında durum koşuluyla yapıldığından bayat kayıtlar zararsızdır;
+kaçırılan deadline'lar timeout checker'ın uzlaştırma taramasıyla yakalanır.
+"""
+import asyncio
+import heapq
+import itertools
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.constants import CommitmentStatus
+from app.database import run_after_commit
+from app.models import DonationCommitment
+
+
+WARNING = "WARNING"
+TIMEOUT = "TIMEOUT"
+
+
+def commitment_deadline(created_at: datetime, timeout_minutes: int) -> datetime:
+    """Taahhüdün timeout anı (created_at + timeout_minutes)."""
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at + timedelta(minutes=timeout_minutes)
+
+
+@dataclass
+class _Deadline:
+    """Bir taahhüdün zamanlanmış deadline'ı."""
+
+    timeout_at: datetime
+    warning_pending: bool
+
+
+class CommitmentScheduler:
+    """
+    Taahhüt deadline'larının min-heap'i.
+
+    Heap'ten silme yapılmaz; iptal edilen ya da yeniden zamanlanan
+    taahhütlerin eski kayıtları zamanı geldiğinde atlanır.
+    """
+
+    def __init__(self, warning_lead: timedelta):
+        self.warning_lead = warning_lead
+        self._deadlines: Dict[str, _Deadline] = {}
+        # (zaman, sıra, tür, commitment_id)
+        self._heap: List[Tuple[datetime, int, str, str]] = []
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._running = False
+
+    @property
+    def is_running(self) -> bool:
+        """Zamanlayıcı startup'ta başlatıldıysa True."""
+        return self._running
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def start(self) -> None:
+        # Event, çalışan event loop içinde oluşturulur
+        self._wakeup = asyncio.Event()
+        self._running = True
+
+    def stop(self) -> None:
+        """Yeni kayıt kabulünü durdurur ve bekleyen scheduler'ı uyandırır."""
+        self._running = False
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def clear(self) -> None:
+        """Tüm deadline'ları atar (zamanlayıcı çalışmaya devam eder)."""
+        self._deadlines.clear()
+        self._heap = []
+
+    def reset(self) -> None:
+        """Tüm deadline'ları atar ve zamanlayıcıyı durdurur."""
+        self.stop()
+        self.clear()
+
+    def schedule(self, commitment_id: str, timeout_at: datetime, warn: bool = True) -> None:
+        """
+        Taahhüdün timeout'unu (ve warn ise uyarısını) zamanlar.
+
+        Aynı deadline ile tekrar çağrılırsa (DB'den yeniden yükleme) yeni kayıt
+        eklenmez; warn False ise bekleyen uyarı iptal edilir.
+
+        Args:
+            commitment_id: Taahhüt ID'si
+            timeout_at: Timeout anı
+            warn: TIMEOUT_WARNING gönderilecek mi
+        """
+        existing = self._deadlines.get(commitment_id)
+        if existing is not None and existing.timeout_at == timeout_at:
+            existing.warning_pending = existing.warning_pending and warn
+            return
+
+        self._deadlines[commitment_id] = _Deadline(timeout_at=timeout_at, warning_pending=warn)
+        if warn:
+            heapq.heappush(
+                self._heap, (timeout_at - self.warning_lead, next(self._sequence), WARNING, commitment_id)
+            )
+        heapq.heappush(self._heap, (timeout_at, next(self._sequence), TIMEOUT, commitment_id))
+        # En yakın deadline değişmiş olabilir
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def warns(self, timeout_minutes: int) -> bool:
+        """Uyarı süresi timeout süresinden kısaysa True (aksi halde uyarı atlanır)."""
+        return timedelta(minutes=timeout_minutes) > self.warning_lead
+
+    def cancel(self, commitment_id: str) -> None:
+        """Taahhüdün deadline'larını iptal eder (heap kaydı zamanında atlanır)."""
+        self._deadlines.pop(commitment_id, None)
+
+    def schedule_after_commit(self, db: AsyncSession, commitment: DonationCommitment) -> None:
+        """Taahhüdü session commit edildikten sonra zamanlar (rollback'te atılır)."""
+        if not self._running:
+            return
+        run_after_commit(
+            db,
+            partial(
+                self.schedule,
+                str(commitment.id),
+                commitment_deadline(commitment.created_at, commitment.timeout_minutes),
+                self.warns(commitment.timeout_minutes),
+            ),
+        )
+
+    def cancel_after_commit(self, db: AsyncSession, commitment_id: str) -> None:
+        """Taahhüdün deadline'larını session commit edildikten sonra iptal eder."""
+        if not self._running:
+            return
+        run_after_commit(db, partial(self.cancel, str(commitment_id)))
+
+    def _is_current(self, due_at: datetime, kind: str, commitment_id: str) -> bool:
+        deadline = self._deadlines.get(commitment_id)
+        if deadline is None:
+            return False
+        if kind == TIMEOUT:
+            return due_at == deadline.timeout_at
+        return deadline.warning_pending and due_at == deadline.timeout_at - self.warning_lead
+
+    def next_due(self) -> Optional[datetime]:
+        """En yakın geçerli deadline; yoksa None."""
+        while self._heap and not self._is_current(self._heap[0][0], self._heap[0][2], self._heap[0][3]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> Tuple[List[str], List[str]]:
+        """
+        Zamanı gelen uyarı ve timeout'ları heap'ten alır.
+
+        Timeout'u alınan taahhüt zamanlayıcıdan çıkar.
+
+        Args:
+            now: Referans zaman
+
+        Returns:
+            (uyarılacak commitment_id'ler, timeout olacak commitment_id'ler)
+        """
+        warnings: List[str] = []
+        timeouts: List[str] = []
+        while self._heap and self._heap[0][0] <= now:
+            due_at, _, kind, commitment_id = heapq.heappop(self._heap)
+            if not self._is_current(due_at, kind, commitment_id):
+                continue
+            if kind == TIMEOUT:
+                del self._deadlines[commitment_id]
+                timeouts.append(commitment_id)
+            else:
+                self._deadlines[commitment_id].warning_pending = False
+                warnings.append(commitment_id)
+        return warnings, timeouts
+
+    async def wait(self, max_wait: float) -> None:
+        """
+        En yakın deadline'a kadar (en fazla max_wait saniye) bekler.
+
+        Yeni bir taahhüt zamanlanınca erken uyanır.
+
+        Args:
+            max_wait: Maksimum bekleme süresi (saniye)
+        """
+        if self._wakeup is None:
+            return
+        timeout = max_wait
+        next_due = self.next_due()
+        if next_due is not None:
+            timeout = min(timeout, (next_due - datetime.now(timezone.utc)).total_seconds())
+        if timeout <= 0:
+            return
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+# Process-genel zamanlayıcı instance'ı
+commitment_scheduler = CommitmentScheduler(
+    warning_lead=timedelta(minutes=settings.COMMITMENT_TIMEOUT_WARNING_MINUTES),
+)
+
+
+async def load_commitment_deadlines(
+    db: AsyncSession,
+    scheduler: CommitmentScheduler,
+    created_after: Optional[datetime] = None,
+) -> int:
+    """
+    ON_THE_WAY taahhütlerin deadline'larını DB'den zamanlayıcıya yükler.
+
+    Mevcut kayıtlarla birleştirilir; uyarısı gönderilmiş taahhütler için
+    uyarı zamanlanmaz.
+
+    Args:
+        db: AsyncSession
+        scheduler: Doldurulacak zamanlayıcı
+        created_after: Yalnızca bu andan sonra oluşturulanlar (artımlı yükleme)
+
+    Returns:
+        Yüklenen taahhüt sayısı
+    """
+    conditions = [DonationCommitment.status == CommitmentStatus.ON_THE_WAY.value]
+    if created_after is not None:
+        conditions.append(DonationCommitment.created_at >= created_after)
+
+    result = await db.execute(
+        select(
+            DonationCommitment.id,
+            DonationCommitment.created_at,
+            DonationCommitment.timeout_minutes,
+            DonationCommitment.timeout_warning_sent_at,
+        )
+        .where(*conditions)
+    )
+    rows = result.all()
+    for commitment_id, created_at, timeout_minutes, warning_sent_at in rows:
+        scheduler.schedule(
+            str(commitment_id),
+            commitment_deadline(created_at, timeout_minutes),
+            warn=warning_sent_at is None and scheduler.warns(timeout_minutes),
+        )
+    return len(rows)
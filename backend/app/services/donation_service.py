@@ -4,12 +4,17 @@ Donation Service for KanVer API.
 Bu dosya, bağış taahhüdü (commitment) ile ilgili business logic fonksiyonlarını içerir.
 Router'lar bu servis katmanını kullanarak veritabanı işlemlerini gerçekleştirir.
 """
+import math
+from collections import Counter, defaultdict
 from datetime import datetime, timezone, timedelta
-from typing import Optional, List
+from typing import Iterable, Optional, List, Sequence
 
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, or_, case, func, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.config import settings
 from app.constants import CommitmentStatus, RequestStatus, RequestType, DonationStatus, NotificationType
@@ -22,11 +27,14 @@ from app.core.exceptions import (
     SlotFullException,
 )
 from app.models import DonationCommitment, BloodRequest, User, QRCode, Donation, HospitalStaff
-from app.utils.cooldown import is_in_cooldown, set_cooldown
+from app.utils.cooldown import calculate_next_available, is_in_cooldown
 from app.utils.validators import can_donate_to
-from app.utils.qr_code import create_qr_data, validate_qr
-from app.services.gamification_service import award_hero_points, penalize_no_show
-from app.services.notification_service import create_notification
+from app.utils.qr_code import create_qr_data, ensure_qr_usable
+from app.utils.pagination import decode_cursor, keyset_condition
+from app.services.gamification_service import penalize_no_shows
+from app.services.notification_service import create_notification, create_notifications_bulk
+from app.services.donor_index_service import track_commitment_started, track_commitments_ended, track_donor
+from app.services.commitment_scheduler_service import commitment_scheduler
 
 
 # =============================================================================
@@ -137,6 +145,97 @@ async def count_active_commitments(db: AsyncSession, request_id: str) -> int:
 # COMMITMENT OPERATIONS
 # =============================================================================
 
+def _ensure_request_open(blood_request: BloodRequest, now: datetime) -> None:
+    """
+    Talep taahhüt kabul ediyor mu (ACTIVE ve süresi dolmamış) kontrol eder.
+
+    Raises:
+        BadRequestException: Talep aktif değil veya expire olmuş
+    """
+    if blood_request.status != RequestStatus.ACTIVE.value:
+        raise BadRequestException(
+            "Bu talep artık aktif değil",
+            detail=f"Talep durumu: {blood_request.status}"
+        )
+
+    if blood_request.expires_at:
+        expires_at = blood_request.expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        if expires_at < now:
+            raise BadRequestException(
+                "Bu talebin süresi dolmuş",
+                detail=f"Son kullanma tarihi: {expires_at.isoformat()}"
+            )
+
+
+async def _claim_commitment_slot(db: AsyncSession, request_id: str):
+    """
+    N+1 slotlarından birini tek koşullu UPDATE ile atomik olarak alır.
+
+    Talep ACTIVE, süresi dolmamış ve active_commitment_count < units_needed + 1
+    ise sayaç artırılır. Satır kilidi sayesinde eşzamanlı "Geliyorum"
+    istekleri sırayla değerlendirilir ve slot sayısı aşılamaz. Talep sahibinin
+    FCM token'ı DONOR_FOUND bildirimi için aynı sorguda döner.
+
+    Args:
+        db: AsyncSession
+        request_id: Kan talebi UUID'si
+
+    Returns:
+        (yeni active_commitment_count, talep sahibinin fcm_token'ı);
+        slot alınamadıysa None
+    """
+    result = await db.execute(
+        update(BloodRequest)
+        .where(
+            BloodRequest.id == request_id,
+            BloodRequest.status == RequestStatus.ACTIVE.value,
+            or_(BloodRequest.expires_at.is_(None), BloodRequest.expires_at >= func.now()),
+            BloodRequest.active_commitment_count < BloodRequest.units_needed + 1,  # N+1 kuralı
+            User.id == BloodRequest.requester_id,
+        )
+        .values(active_commitment_count=BloodRequest.active_commitment_count + 1)
+        .returning(BloodRequest.active_commitment_count, User.fcm_token)
+        .execution_options(synchronize_session=False)
+    )
+    return result.first()
+
+
+async def release_commitment_slots(db: AsyncSession, request_ids: Iterable[str]) -> None:
+    """
+    Aktif durumdan çıkan taahhütlerin slotlarını taleplere geri verir.
+
+    Tek UPDATE ile her talebin active_commitment_count'u biten taahhüt
+    sayısı kadar azaltılır (minimum 0). Session'daki talep nesnelerine yeni
+    değer RETURNING ile yazılır.
+
+    Args:
+        db: AsyncSession
+        request_ids: Biten her taahhüt için talep ID'si (tekrarlar sayılır)
+    """
+    counts = Counter(str(request_id) for request_id in request_ids)
+    if not counts:
+        return
+
+    result = await db.execute(
+        update(BloodRequest)
+        .where(BloodRequest.id.in_(list(counts)))
+        .values(
+            active_commitment_count=func.greatest(
+                BloodRequest.active_commitment_count - case(counts, value=BloodRequest.id),
+                0,
+            )
+        )
+        .returning(BloodRequest.id, BloodRequest.active_commitment_count)
+        .execution_options(synchronize_session=False)
+    )
+    for request_id, active_count in result.all():
+        blood_request = db.identity_map.get(identity_key(BloodRequest, request_id))
+        if blood_request is not None:
+            set_committed_value(blood_request, "active_commitment_count", active_count)
+
+
 async def create_commitment(
     db: AsyncSession,
     donor_id: str,
@@ -146,13 +245,14 @@ async def create_commitment(
     Yeni bir bağış taahhüdü oluşturur.
 
     İş Akışı:
-    1. Kan talebini kontrol et
-    2. Bağışçıyı kontrol et
-    3. Cooldown kontrolü
-    4. Aktif taahhüt kontrolü
-    5. Kan grubu uyumluluğu
-    6. N+1 kuralı kontrolü
-    7. Taahhüt oluştur
+    1. Talep, bağışçı ve bağışçının aktif taahhüdü tek sorguda okunur
+    2. Talep durumu ve süresi kontrolü
+    3. Bağışçı, cooldown, aktif taahhüt ve kan grubu uyumluluğu kontrolü
+    4. N+1 slotu koşullu UPDATE ile atomik olarak alınır
+    5. Taahhüt oluşturulur
+
+    Eşzamanlı isteklerde slot sayısı sayaç üzerinden, bağışçı başına tek
+    aktif taahhüt ise idx_single_active_commitment ile korunur.
 
     Args:
         db: AsyncSession
@@ -169,43 +269,39 @@ async def create_commitment(
         ActiveCommitmentExistsException: Bağışçının zaten aktif taahhüdü var
         SlotFullException: N+1 kuralı nedeniyle slot dolu
     """
-    # 1. Kan talebini getir
-    request_result = await db.execute(
-        select(BloodRequest).where(BloodRequest.id == request_id)
-    )
-    blood_request = request_result.scalar_one_or_none()
-
-    if not blood_request:
-        raise NotFoundException("Kan talebi bulunamadı")
+    now = datetime.now(timezone.utc)
 
-    # 2. Talep ACTIVE mi kontrol et
-    if blood_request.status != RequestStatus.ACTIVE.value:
-        raise BadRequestException(
-            "Bu talep artık aktif değil",
-            detail=f"Talep durumu: {blood_request.status}"
+    # 1. Talep + bağışçı + aktif taahhüt (tek sorgu)
+    has_active_commitment = (
+        select(DonationCommitment.id)
+        .where(
+            DonationCommitment.donor_id == donor_id,
+            DonationCommitment.status.in_([
+                CommitmentStatus.ON_THE_WAY.value,
+                CommitmentStatus.ARRIVED.value
+            ])
         )
+        .exists()
+    )
+    result = await db.execute(
+        select(BloodRequest, User, has_active_commitment)
+        .select_from(BloodRequest)
+        .outerjoin(User, User.id == donor_id)
+        .where(BloodRequest.id == request_id)
+    )
+    row = result.first()
 
-    # 3. Talep expire olmuş mu kontrol et
-    if blood_request.expires_at:
-        expires_at = blood_request.expires_at
-        if expires_at.tzinfo is None:
-            expires_at = expires_at.replace(tzinfo=timezone.utc)
-        if expires_at < datetime.now(timezone.utc):
-            raise BadRequestException(
-                "Bu talebin süresi dolmuş",
-                detail=f"Son kullanma tarihi: {expires_at.isoformat()}"
-            )
+    if row is None:
+        raise NotFoundException("Kan talebi bulunamadı")
+    blood_request, donor, has_active = row
 
-    # 4. Bağışçıyı getir
-    donor_result = await db.execute(
-        select(User).where(User.id == donor_id)
-    )
-    donor = donor_result.scalar_one_or_none()
+    # 2. Talep ACTIVE mi ve süresi dolmamış mı
+    _ensure_request_open(blood_request, now)
 
+    # 3. Bağışçı uygunluğu
     if not donor:
         raise NotFoundException("Bağışçı bulunamadı")
 
-    # 5. Cooldown kontrolü
     if is_in_cooldown(donor):
         next_available = donor.next_available_date
         if next_available:
@@ -214,12 +310,9 @@ async def create_commitment(
             next_available_str = "bilinmiyor"
         raise CooldownActiveException(next_available_str)
 
-    # 6. Aktif taahhüt kontrolü
-    existing_commitment = await get_active_commitment(db, donor_id)
-    if existing_commitment:
+    if has_active:
         raise ActiveCommitmentExistsException()
 
-    # 7. Kan grubu uyumluluğu kontrolü
     # Bağışçının kan grubu, talep edilen kan grubuna uygun mu?
     if donor.blood_type:
         if not can_donate_to(donor.blood_type, blood_request.blood_type):
@@ -233,39 +326,43 @@ async def create_commitment(
             detail="Profilinizi güncelleyin"
         )
 
-    # 8. N+1 kuralı kontrolü
-    active_count = await count_active_commitments(db, request_id)
-    max_allowed = blood_request.units_needed + 1  # N+1 kuralı
-
-    if active_count >= max_allowed:
+    # 4. N+1 slotunu atomik olarak al
+    claimed = await _claim_commitment_slot(db, request_id)
+    if claimed is None:
+        # Talep bu arada kapanmış olabilir; değilse slot doludur
+        await db.refresh(blood_request, ["status", "expires_at"])
+        _ensure_request_open(blood_request, now)
         raise SlotFullException()
+    active_count, requester_fcm_token = claimed
+    set_committed_value(blood_request, "active_commitment_count", active_count)
 
-    # 9. Taahhüt oluştur
+    # 5. Taahhüt oluştur (server default'ları INSERT ... RETURNING ile gelir)
     commitment = DonationCommitment(
         donor_id=donor_id,
         blood_request_id=request_id,
         status=CommitmentStatus.ON_THE_WAY.value,
         timeout_minutes=settings.COMMITMENT_TIMEOUT_MINUTES,
     )
-
     db.add(commitment)
-    await db.flush()
-    await db.refresh(commitment)
+    try:
+        await db.flush()
+    except IntegrityError:
+        # Aynı bağışçının eşzamanlı başka bir taahhüdü önce yazıldı
+        raise ActiveCommitmentExistsException()
+
+    await track_commitment_started(db, donor_id)
+    # Timeout ve TIMEOUT_WARNING deadline'ları commit sonrası zamanlanır
+    commitment_scheduler.schedule_after_commit(db, commitment)
 
     # Talep sahibine DONOR_FOUND bildirimi
-    requester_result = await db.execute(
-        select(User).where(User.id == blood_request.requester_id)
+    await create_notification(
+        db=db,
+        user_id=str(blood_request.requester_id),
+        notification_type=NotificationType.DONOR_FOUND.value,
+        context={"request_code": blood_request.request_code},
+        request_id=str(blood_request.id),
+        fcm_token=requester_fcm_token,
     )
-    requester_user = requester_result.scalar_one_or_none()
-    if requester_user:
-        await create_notification(
-            db=db,
-            user_id=str(requester_user.id),
-            notification_type=NotificationType.DONOR_FOUND.value,
-            context={"request_code": blood_request.request_code},
-            request_id=str(blood_request.id),
-            fcm_token=requester_user.fcm_token,
-        )
 
     # Bağışçıya DONOR_ON_WAY bildirimi
     await create_notification(
@@ -344,6 +441,7 @@ async def update_commitment_status(
     if status == CommitmentStatus.ARRIVED.value:
         commitment.status = CommitmentStatus.ARRIVED.value
         commitment.arrived_at = datetime.now(timezone.utc)
+        commitment_scheduler.cancel_after_commit(db, commitment.id)
 
         # QR kod oluştur (duplicate korumalı)
         existing_qr = await db.execute(
@@ -384,6 +482,9 @@ async def update_commitment_status(
         commitment.status = CommitmentStatus.CANCELLED.value
         # Not: cancel_reason'ı şimdilik kaydetmiyoruz çünkü model'de bu alan yok
         # İleride model'e cancel_reason alanı eklenebilir
+        await release_commitment_slots(db, [commitment.blood_request_id])
+        await track_commitments_ended(db, [commitment.donor_id])
+        commitment_scheduler.cancel_after_commit(db, commitment.id)
 
     await db.flush()
     await db.refresh(commitment)
@@ -391,71 +492,162 @@ async def update_commitment_status(
     return commitment
 
 
-async def check_timeouts(db: AsyncSession) -> int:
+def _commitment_deadline_expr():
+    """created_at + timeout_minutes (SQL ifadesi)."""
+    return DonationCommitment.created_at + timedelta(minutes=1) * DonationCommitment.timeout_minutes
+
+
+async def check_timeouts(
+    db: AsyncSession,
+    limit: Optional[int] = None,
+    commitment_ids: Optional[Sequence[str]] = None,
+) -> int:
     """
-    Timeout olmuş taahhütleri kontrol eder ve günceller.
+    Timeout olmuş taahhütlerden bir batch'i işler.
 
     İş Akışı:
-    1. ON_THE_WAY durumunda ve süresi geçmiş taahhütleri bul
-    2. Her biri için:
-       - Status → TIMEOUT
-       - Bağışçının no_show_count +1
-       - Bağışçının trust_score -10 (minimum 0)
+    1. ON_THE_WAY durumunda ve süresi geçmiş en eski `limit` taahhüt
+       FOR UPDATE SKIP LOCKED ile seçilip tek UPDATE ile TIMEOUT yapılır
+       (başka worker'ın kilitlediği satırlar atlanır)
+    2. Bağışçılar tek UPDATE ile cezalandırılır: no_show_count +1,
+       trust_score -10 (minimum 0)
+    3. NO_SHOW bildirimleri tek INSERT ile oluşturulur
 
-    Bu fonksiyon background task olarak çağrılacak (Task 8.4).
+    Commitment scheduler deadline'ı gelen taahhütleri commitment_ids ile
+    verir; timeout checker batch dolu döndükçe her batch'i ayrı
+    transaction'da tekrar çağırır (uzlaştırma).
 
     Args:
         db: AsyncSession
+        limit: Batch boyutu (varsayılan: TIMEOUT_BATCH_SIZE)
+        commitment_ids: Yalnızca bu taahhütler (opsiyonel)
 
     Returns:
         Timeout edilen taahhüt sayısı
     """
     now = datetime.now(timezone.utc)
+    limit = limit or settings.TIMEOUT_BATCH_SIZE
 
     # Timeout koşulu: created_at + timeout_minutes < now
-    # SQLAlchemy'de interval hesabı için text expression kullanıyoruz
+    conditions = [
+        DonationCommitment.status == CommitmentStatus.ON_THE_WAY.value,
+        _commitment_deadline_expr() < now,
+    ]
+    if commitment_ids is not None:
+        if not commitment_ids:
+            return 0
+        conditions.append(DonationCommitment.id.in_(list(commitment_ids)))
+        limit = len(commitment_ids)
+
+    due = (
+        select(DonationCommitment.id)
+        .where(*conditions)
+        .order_by(DonationCommitment.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
     result = await db.execute(
-        select(DonationCommitment).where(
-            and_(
-                DonationCommitment.status == CommitmentStatus.ON_THE_WAY.value,
-                DonationCommitment.created_at + timedelta(minutes=1) *
-                DonationCommitment.timeout_minutes < now
-            )
-        )
+        update(DonationCommitment)
+        .where(DonationCommitment.id.in_(due))
+        .values(status=CommitmentStatus.TIMEOUT.value)
+        .returning(DonationCommitment.donor_id, DonationCommitment.blood_request_id)
+        .execution_options(synchronize_session=False)
     )
-    timeout_commitments = list(result.scalars().all())
+    rows = result.all()
+    if not rows:
+        return 0
+    donor_ids = [str(donor_id) for donor_id, _ in rows]
+    await release_commitment_slots(db, [request_id for _, request_id in rows])
+
+    # No-show cezası (gamification service) ve NO_SHOW bildirimi
+    no_show_recipients = await penalize_no_shows(db, donor_ids)
+    await create_notifications_bulk(
+        db,
+        no_show_recipients,
+        notification_type=NotificationType.NO_SHOW.value,
+        context={},
+    )
+    await track_commitments_ended(db, donor_ids)
 
-    timeout_count = 0
+    return len(donor_ids)
 
-    for commitment in timeout_commitments:
-        # Status güncelle
-        commitment.status = CommitmentStatus.TIMEOUT.value
 
-        # Bağışçıyı getir ve cezalandır
-        donor_result = await db.execute(
-            select(User).where(User.id == commitment.donor_id)
-        )
-        donor = donor_result.scalar_one_or_none()
-
-        if donor:
-            # No-show cezası uygula (gamification service)
-            await penalize_no_show(db, str(donor.id))
-
-            # Bağışçıya NO_SHOW bildirimi
-            await create_notification(
-                db=db,
-                user_id=str(donor.id),
-                notification_type=NotificationType.NO_SHOW.value,
-                context={},
-                fcm_token=donor.fcm_token,
-            )
+async def send_timeout_warnings(
+    db: AsyncSession,
+    commitment_ids: Optional[Sequence[str]] = None,
+    limit: Optional[int] = None,
+) -> int:
+    """
+    Süresinin dolmasına COMMITMENT_TIMEOUT_WARNING_MINUTES kalan taahhütlerin
+    bağışçılarına TIMEOUT_WARNING bildirimi gönderir.
 
-        timeout_count += 1
+    timeout_warning_sent_at tek UPDATE ile (SKIP LOCKED) işaretlenir; her
+    taahhüt için en fazla bir uyarı gider, birden fazla worker güvenle
+    çağırabilir.
 
-    if timeout_count > 0:
-        await db.flush()
+    Args:
+        db: AsyncSession
+        commitment_ids: Yalnızca bu taahhütler (opsiyonel; scheduler'dan)
+        limit: Batch boyutu (varsayılan: TIMEOUT_BATCH_SIZE)
+
+    Returns:
+        Uyarı gönderilen taahhüt sayısı
+    """
+    now = datetime.now(timezone.utc)
+    limit = limit or settings.TIMEOUT_BATCH_SIZE
+    deadline = _commitment_deadline_expr()
+    warning_lead = timedelta(minutes=settings.COMMITMENT_TIMEOUT_WARNING_MINUTES)
+
+    conditions = [
+        DonationCommitment.status == CommitmentStatus.ON_THE_WAY.value,
+        DonationCommitment.timeout_warning_sent_at.is_(None),
+        deadline - warning_lead <= now,
+        deadline > now,
+    ]
+    if commitment_ids is not None:
+        if not commitment_ids:
+            return 0
+        conditions.append(DonationCommitment.id.in_(list(commitment_ids)))
+        limit = len(commitment_ids)
+
+    due = (
+        select(DonationCommitment.id)
+        .where(*conditions)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.execute(
+        update(DonationCommitment)
+        .where(DonationCommitment.id.in_(due), User.id == DonationCommitment.donor_id)
+        .values(timeout_warning_sent_at=now)
+        .returning(
+            DonationCommitment.donor_id,
+            DonationCommitment.blood_request_id,
+            DonationCommitment.created_at,
+            DonationCommitment.timeout_minutes,
+            User.fcm_token,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    rows = result.all()
+
+    # Kalan süre ve talep aynı olan uyarılar tek INSERT ile yazılır
+    groups = defaultdict(list)
+    for donor_id, request_id, created_at, timeout_minutes, fcm_token in rows:
+        remaining = created_at + timedelta(minutes=timeout_minutes) - now
+        remaining_minutes = max(1, math.ceil(remaining.total_seconds() / 60))
+        groups[(str(request_id), remaining_minutes)].append((str(donor_id), fcm_token))
+
+    for (request_id, remaining_minutes), recipients in groups.items():
+        await create_notifications_bulk(
+            db,
+            recipients,
+            notification_type=NotificationType.TIMEOUT_WARNING.value,
+            context={"remaining": remaining_minutes},
+            request_id=request_id,
+        )
 
-    return timeout_count
+    return len(rows)
 
 
 async def redirect_excess_donors(
@@ -517,23 +709,28 @@ async def redirect_excess_donors(
 
         redirected.append(commitment)
 
-        # Bağışçıya REDIRECT_TO_BANK bildirimi
-        donor_result = await db.execute(
-            select(User).where(User.id == commitment.donor_id)
-        )
-        redirect_donor = donor_result.scalar_one_or_none()
-        if redirect_donor:
-            await create_notification(
-                db=db,
-                user_id=str(redirect_donor.id),
-                notification_type=NotificationType.REDIRECT_TO_BANK.value,
-                context={},
-                request_id=str(blood_request.id),
-                fcm_token=redirect_donor.fcm_token,
-            )
-
     if redirected:
+        # Bağışçılara REDIRECT_TO_BANK bildirimi (tek SELECT + tek INSERT)
+        donors_result = await db.execute(
+            select(User.id, User.fcm_token).where(
+                User.id.in_([c.donor_id for c in redirected])
+            )
+        )
+        fcm_tokens = {str(user_id): fcm_token for user_id, fcm_token in donors_result.all()}
+        await create_notifications_bulk(
+            db,
+            [
+                (str(c.donor_id), fcm_tokens[str(c.donor_id)])
+                for c in redirected
+                if str(c.donor_id) in fcm_tokens
+            ],
+            notification_type=NotificationType.REDIRECT_TO_BANK.value,
+            context={},
+            request_id=str(blood_request.id),
+        )
         await db.flush()
+        await release_commitment_slots(db, [c.blood_request_id for c in redirected])
+        await track_commitments_ended(db, [c.donor_id for c in redirected])
 
     return redirected
 
@@ -550,16 +747,20 @@ async def verify_and_complete_donation(
     """
     QR kod ile bağış doğrular ve tamamlar.
 
+    Sabit ve küçük sayıda DB round-trip'i ile çalışır: okuma tek bir join
+    sorgusudur, sayaçlar SQL tarafında atomik olarak artırılır.
+
     İş Akışı:
-    1. QR token'ı doğrula (validate_qr)
-    2. Hemşire rolü kontrolü (NURSE)
-    3. Hemşire bu hastanede çalışıyor mu?
-    4. QR'ı used olarak işaretle
-    5. Commitment status → COMPLETED
-    6. Donation kaydı oluştur
-    7. Blood request güncelle (units_collected +1, FULFILLED kontrolü)
-    8. Bağışçı bilgilerini güncelle
-    9. Cooldown başlat
+    1. QR kod, taahhüt, talep, bağışçı, talep sahibinin FCM token'ı ve
+       hemşirenin bu hastanede çalışıp çalışmadığı tek sorguda yüklenir
+       (QR satırı FOR UPDATE ile kilitlenir; aynı QR iki kez kullanılamaz)
+    2. QR kontrolleri (ensure_qr_usable) ve hemşire-hastane kontrolü
+    3. QR used, commitment COMPLETED, Donation kaydı (tek flush)
+    4. Blood request: units_collected +1, FULFILLED kontrolü ve aktif
+       taahhüt sayacı tek UPDATE ... RETURNING ile
+    5. Bağışçı: hero points, total_donations, cooldown tarihleri ve
+       has_active_commitment tek UPDATE ... RETURNING ile
+    6. Bildirimler (DONATION_COMPLETE, FULFILLED ise REQUEST_FULFILLED)
 
     Args:
         db: AsyncSession
@@ -570,124 +771,133 @@ async def verify_and_complete_donation(
         Oluşturulan Donation objesi
 
     Raises:
-        NotFoundException: QR kod veya hemşire bulunamadı
+        NotFoundException: QR kod bulunamadı
         ForbiddenException: Hemşire bu hastanede çalışmıyor
         BadRequestException: QR geçersiz/expired/used
     """
-    # 1. QR token'ı doğrula (NotFoundException, BadRequestException fırlatabilir)
-    qr_code = await validate_qr(db, qr_token)
-
-    # 2. İlişkili kayıtları getir (eager loading)
-    result = await db.execute(
-        select(QRCode)
-        .where(QRCode.id == qr_code.id)
-        .options(
-            selectinload(QRCode.commitment).selectinload(DonationCommitment.donor),
-            selectinload(QRCode.commitment).selectinload(DonationCommitment.blood_request)
-                .selectinload(BloodRequest.hospital),
+    # 1. Tüm ilişkili kayıtları tek sorguda getir
+    requester = aliased(User)
+    staff_exists = (
+        select(HospitalStaff.id)
+        .where(
+            HospitalStaff.user_id == nurse_id,
+            HospitalStaff.hospital_id == BloodRequest.hospital_id,
+            HospitalStaff.is_active == True,
         )
+        .exists()
     )
-    qr_code = result.scalar_one()
-
-    commitment = qr_code.commitment
-    donor = commitment.donor
-    blood_request = commitment.blood_request
-    hospital = blood_request.hospital
-
-    # 3. Hemşire-hastane kontrolü
-    staff_result = await db.execute(
-        select(HospitalStaff).where(
-            and_(
-                HospitalStaff.user_id == nurse_id,
-                HospitalStaff.hospital_id == hospital.id,
-                HospitalStaff.is_active == True
-            )
-        )
+    result = await db.execute(
+        select(QRCode, DonationCommitment, BloodRequest, User, requester.fcm_token, staff_exists)
+        .join(DonationCommitment, DonationCommitment.id == QRCode.commitment_id)
+        .join(BloodRequest, BloodRequest.id == DonationCommitment.blood_request_id)
+        .join(User, User.id == DonationCommitment.donor_id)
+        .outerjoin(requester, requester.id == BloodRequest.requester_id)
+        .where(QRCode.token == qr_token)
+        .with_for_update(of=QRCode)
     )
-    staff = staff_result.scalar_one_or_none()
+    row = result.first()
+
+    # 2. QR ve hemşire-hastane kontrolleri (NotFoundException, BadRequestException fırlatabilir)
+    qr_code = ensure_qr_usable(row[0] if row else None)
+    _, commitment, blood_request, donor, requester_fcm_token, is_staff = row
 
-    if not staff:
+    if not is_staff:
         raise ForbiddenException(
             "Bu hastanede çalışma yetkiniz yok",
             detail="Sadece atandığınız hastanede bağış doğrulayabilirsiniz"
         )
 
-    # 4. QR'ı kullanıldı olarak işaretle
-    qr_code.is_used = True
-    qr_code.used_at = datetime.now(timezone.utc)
-
-    # 5. Commitment status → COMPLETED
-    commitment.status = CommitmentStatus.COMPLETED.value
-    commitment.completed_at = datetime.now(timezone.utc)
-
-    # 6. Hero points hesapla
+    now = datetime.now(timezone.utc)
     donation_type = blood_request.request_type
     if donation_type == RequestType.WHOLE_BLOOD.value:
         hero_points_earned = settings.HERO_POINTS_WHOLE_BLOOD
     else:
         hero_points_earned = settings.HERO_POINTS_APHERESIS
 
-    # 7. Donation kaydı oluştur
+    # 3. QR used, commitment COMPLETED, Donation kaydı
+    qr_code.is_used = True
+    qr_code.used_at = now
+    commitment.status = CommitmentStatus.COMPLETED.value
+    commitment.completed_at = now
+
+    # Hastane satırına ihtiyaç yok; yanıt için hastane bilgisi hospital registry'den alınır
     donation = Donation(
         donor_id=donor.id,
-        hospital_id=hospital.id,
+        hospital_id=blood_request.hospital_id,
         blood_request_id=blood_request.id,
         commitment_id=commitment.id,
         qr_code_id=qr_code.id,
         donation_type=donation_type,
         blood_type=donor.blood_type,
         verified_by=nurse_id,
-        verified_at=datetime.now(timezone.utc),
+        verified_at=now,
         hero_points_earned=hero_points_earned,
         status=DonationStatus.COMPLETED.value,
     )
     db.add(donation)
-
-    # 8. Blood request güncelle (units_collected +1)
-    blood_request.units_collected += 1
-
-    # FULFILLED kontrolü
-    if blood_request.units_collected >= blood_request.units_needed:
-        blood_request.status = RequestStatus.FULFILLED.value
-
-    # 9. Bağışçı bilgilerini güncelle
-    donor.total_donations += 1
-    # Hero points ver (gamification service)
-    await award_hero_points(db, str(donor.id), donation_type)
-    donor.last_donation_date = datetime.now(timezone.utc)
-
-    # 10. Cooldown başlat
-    await set_cooldown(db, str(donor.id), donation_type)
-
     await db.flush()
-    await db.refresh(donation)
 
-    # 11. Bildirimler gönder
+    # 4. Blood request: units_collected +1, FULFILLED kontrolü, slot bırakma
+    request_result = await db.execute(
+        update(BloodRequest)
+        .where(BloodRequest.id == blood_request.id)
+        .values(
+            units_collected=BloodRequest.units_collected + 1,
+            status=case(
+                (BloodRequest.units_collected + 1 >= BloodRequest.units_needed, RequestStatus.FULFILLED.value),
+                else_=BloodRequest.status,
+            ),
+            active_commitment_count=func.greatest(BloodRequest.active_commitment_count - 1, 0),
+        )
+        .returning(BloodRequest.units_collected, BloodRequest.status, BloodRequest.active_commitment_count)
+        .execution_options(synchronize_session=False)
+    )
+    units_collected, request_status, active_count = request_result.one()
+    set_committed_value(blood_request, "units_collected", units_collected)
+    set_committed_value(blood_request, "status", request_status)
+    set_committed_value(blood_request, "active_commitment_count", active_count)
+
+    # 5. Bağışçı: hero points, toplam bağış, cooldown, aktif taahhüt bayrağı
+    donor_fields = (
+        "hero_points", "total_donations", "last_donation_date", "next_available_date", "has_active_commitment",
+    )
+    donor_result = await db.execute(
+        update(User)
+        .where(User.id == donor.id)
+        .values(
+            hero_points=User.hero_points + hero_points_earned,
+            total_donations=User.total_donations + 1,
+            last_donation_date=now,
+            next_available_date=calculate_next_available(donation_type, now),
+            has_active_commitment=False,
+        )
+        .returning(*(getattr(User, key) for key in donor_fields))
+        .execution_options(synchronize_session=False)
+    )
+    for key, value in zip(donor_fields, donor_result.one()):
+        set_committed_value(donor, key, value)
+    track_donor(db, donor)
+    await track_commitments_ended(db, [donor.id], refresh_flags=False)
+
+    # 6. Bildirimler
     # Bağışçıya DONATION_COMPLETE bildirimi
-    await create_notification(
-        db=db,
-        user_id=str(donor.id),
-        notification_type=NotificationType.DONATION_COMPLETE.value,
-        context={"points": str(hero_points_earned)},
+    await create_notifications_bulk(
+        db,
+        [(str(donor.id), donor.fcm_token)],
+        NotificationType.DONATION_COMPLETE.value,
+        {"points": str(hero_points_earned)},
         donation_id=str(donation.id),
-        fcm_token=donor.fcm_token,
     )
 
     # Talep FULFILLED ise talep sahibine bildir
     if blood_request.status == RequestStatus.FULFILLED.value:
-        requester_result = await db.execute(
-            select(User).where(User.id == blood_request.requester_id)
+        await create_notifications_bulk(
+            db,
+            [(str(blood_request.requester_id), requester_fcm_token)],
+            NotificationType.REQUEST_FULFILLED.value,
+            {"request_code": blood_request.request_code},
+            request_id=str(blood_request.id),
         )
-        requester = requester_result.scalar_one_or_none()
-        if requester:
-            await create_notification(
-                db=db,
-                user_id=str(requester.id),
-                notification_type=NotificationType.REQUEST_FULFILLED.value,
-                context={"request_code": blood_request.request_code},
-                request_id=str(blood_request.id),
-                fcm_token=requester.fcm_token,
-            )
 
     return donation
 
@@ -696,35 +906,44 @@ async def get_donor_donations(
     db: AsyncSession,
     donor_id: str,
     page: int = 1,
-    size: int = 20
-) -> tuple[List[Donation], int]:
+    size: int = 20,
+    cursor: Optional[str] = None,
+    with_total: bool = True,
+) -> tuple[List[Donation], Optional[int]]:
     """
     Bağışçının bağış geçmişini getirir (pagination).
 
     Args:
         db: AsyncSession
         donor_id: Bağışçı ID'si
-        page: Sayfa numarası (1'den başlar)
+        page: Sayfa numarası (1'den başlar, cursor verilirse yok sayılır)
         size: Sayfa başına kayıt sayısı
+        cursor: Keyset pagination cursor'u (created_at, id)
+        with_total: False ise COUNT sorgusu atlanır ve total None döner
 
     Returns:
         (donation listesi, toplam kayıt sayısı)
     """
     # Toplam sayı
-    count_result = await db.execute(
-        select(func.count()).select_from(Donation).where(
-            Donation.donor_id == donor_id
+    total = None
+    if with_total:
+        count_result = await db.execute(
+            select(func.count()).select_from(Donation).where(
+                Donation.donor_id == donor_id
+            )
         )
-    )
-    total = count_result.scalar() or 0
+        total = count_result.scalar() or 0
 
-    # Pagination ile getir
-    offset = (page - 1) * size
+    # Pagination ile getir (cursor varsa keyset, yoksa offset)
+    stmt = select(Donation).where(Donation.donor_id == donor_id)
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(keyset_condition(Donation.created_at, Donation.id, created_at, row_id))
+    else:
+        stmt = stmt.offset((page - 1) * size)
     result = await db.execute(
-        select(Donation)
-        .where(Donation.donor_id == donor_id)
-        .order_by(Donation.created_at.desc())
-        .offset(offset)
+        stmt
+        .order_by(Donation.created_at.desc(), Donation.id.desc())
         .limit(size)
         .options(
             selectinload(Donation.hospital),
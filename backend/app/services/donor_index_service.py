@@ -0,0 +1,396 @@
+"""
+Donor Index Service for KanVer API.
+
+Bu dosya, find_nearby_donors için process-içi bağışçı spatial index'ini içerir.
+
+Index, kan grubuna göre ayrılmış grid'lerde aday bağışçıları tutar:
+- Aktif ve silinmemiş
+- FCM token'ı ve konumu olan
+- Kan grubu kayıtlı
+
+Cooldown sorgu anında next_available_date ile, aktif taahhüt (ON_THE_WAY/ARRIVED)
+ise ayrı bir küme ile kontrol edilir. Index startup'ta DB'den doldurulur ve
+servis fonksiyonlarından gelen hook'larla commit sonrasında güncel tutulur.
+Hook'lar yalnızca değişikliği yapan worker'ın index'ine uygulandığından her
+worker index'ini DONOR_INDEX_REFRESH_INTERVAL_MINUTES'ta bir yeniden kurar
+(app/background/donor_index_refresher.py).
+Index soğukken (henüz doldurulmamışken) hook'lar index'e dokunmaz ve
+find_nearby_donors SQL sorgusuna geri düşer.
+
+Taahhüt hook'ları ayrıca users.has_active_commitment alanını günceller;
+SQL yolu bu alan üzerinden idx_users_eligible_donor_location partial
+index'ini kullanır.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from geoalchemy2 import Geometry
+from sqlalchemy import cast, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.constants import BloodType, CommitmentStatus
+from app.core.logging import get_logger
+from app.database import run_after_commit
+from app.models import DonationCommitment, User
+from app.utils.location import extract_coordinates
+from app.utils.spatial_index import GridIndex
+
+logger = get_logger(__name__)
+
+# Bağışçıyı yeni taahhütten alıkoyan durumlar
+ACTIVE_COMMITMENT_STATUSES = [CommitmentStatus.ON_THE_WAY.value, CommitmentStatus.ARRIVED.value]
+
+
+@dataclass(frozen=True)
+class DonorEntry:
+    """Index'te tutulan bağışçı özeti."""
+
+    user_id: str
+    blood_type: str
+    latitude: float
+    longitude: float
+    fcm_token: str
+    next_available_date: Optional[datetime] = None
+
+    def is_in_cooldown(self, now: datetime) -> bool:
+        if self.next_available_date is None:
+            return False
+        next_available = self.next_available_date
+        if next_available.tzinfo is None:
+            next_available = next_available.replace(tzinfo=timezone.utc)
+        return next_available > now
+
+
+class DonorIndex:
+    """
+    Kan grubuna göre ayrılmış bağışçı grid index'i.
+
+    Tüm metodlar senkron ve O(1)/O(hücre) maliyetlidir; event loop'u
+    bloklamadan request path'inde çağrılabilir.
+    """
+
+    def __init__(self, cell_size_meters: float = 2000.0):
+        self._cell_size_meters = cell_size_meters
+        self._grids: Dict[str, GridIndex] = {}
+        self._entries: Dict[str, DonorEntry] = {}
+        self._committed: Set[str] = set()
+        self._ready = False
+        self._reset_grids()
+
+    def _reset_grids(self) -> None:
+        self._grids = {
+            blood_type: GridIndex(self._cell_size_meters)
+            for blood_type in BloodType.all_values()
+        }
+
+    @property
+    def is_ready(self) -> bool:
+        """Index DB'den doldurulduysa True."""
+        return self._ready
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self, entries: Iterable[DonorEntry], committed_ids: Iterable[str]) -> None:
+        """Index'i verilen kayıtlarla baştan kurar ve hazır işaretler."""
+        self._reset_grids()
+        self._entries = {}
+        for entry in entries:
+            self.upsert(entry)
+        self._committed = set(committed_ids)
+        self._ready = True
+
+    def reset(self) -> None:
+        """Index'i boşaltır ve soğuk duruma getirir."""
+        self._reset_grids()
+        self._entries = {}
+        self._committed = set()
+        self._ready = False
+
+    def upsert(self, entry: DonorEntry) -> None:
+        """Bağışçıyı ekler veya konumunu/özelliklerini günceller."""
+        previous = self._entries.get(entry.user_id)
+        if previous is not None and previous.blood_type != entry.blood_type:
+            self._grids[previous.blood_type].remove(entry.user_id)
+
+        grid = self._grids.get(entry.blood_type)
+        if grid is None:
+            return
+        grid.insert(entry.user_id, entry.latitude, entry.longitude, entry)
+        self._entries[entry.user_id] = entry
+
+    def discard(self, user_id: str) -> None:
+        """Bağışçıyı index'ten çıkarır (uygunluğunu kaybetti)."""
+        entry = self._entries.pop(user_id, None)
+        if entry is not None:
+            self._grids[entry.blood_type].remove(user_id)
+
+    def get(self, user_id: str) -> Optional[DonorEntry]:
+        return self._entries.get(user_id)
+
+    def mark_committed(self, user_id: str) -> None:
+        """Bağışçının aktif taahhüdü başladı."""
+        self._committed.add(user_id)
+
+    def release(self, user_id: str) -> None:
+        """Bağışçının aktif taahhüdü sona erdi."""
+        self._committed.discard(user_id)
+
+    def is_committed(self, user_id: str) -> bool:
+        return user_id in self._committed
+
+    def query(
+        self,
+        blood_types: Iterable[str],
+        latitude: float,
+        longitude: float,
+        radius_meters: float,
+        exclude_ids: Optional[Set[str]] = None,
+        limit: Optional[int] = None,
+        now: Optional[datetime] = None,
+    ) -> List[Tuple[DonorEntry, float]]:
+        """
+        Yarıçap içindeki uygun bağışçıları mesafeye göre sıralı döndürür.
+
+        Args:
+            blood_types: Uyumlu bağışçı kan grupları
+            latitude: Talep konumu enlemi
+            longitude: Talep konumu boylamı
+            radius_meters: Arama yarıçapı (metre)
+            exclude_ids: Hariç tutulacak kullanıcı ID'leri (örn. talep sahibi)
+            limit: Maksimum sonuç sayısı
+            now: Cooldown kontrolü için referans zaman
+
+        Returns:
+            (DonorEntry, distance_meters) listesi
+        """
+        now = now or datetime.now(timezone.utc)
+        exclude_ids = exclude_ids or set()
+
+        hits: List[Tuple[DonorEntry, float]] = []
+        for blood_type in blood_types:
+            grid = self._grids.get(blood_type)
+            if grid is None:
+                continue
+            for user_id, entry, distance in grid.query_radius(latitude, longitude, radius_meters):
+                if user_id in exclude_ids or user_id in self._committed:
+                    continue
+                if entry.is_in_cooldown(now):
+                    continue
+                hits.append((entry, distance))
+
+        hits.sort(key=lambda hit: hit[1])
+        if limit is not None:
+            return hits[:limit]
+        return hits
+
+
+# Process-genel index instance'ı
+donor_index = DonorIndex(cell_size_meters=settings.DONOR_INDEX_CELL_SIZE_METERS)
+
+
+# =============================================================================
+# REBUILD
+# =============================================================================
+
+async def rebuild_donor_index(db: AsyncSession) -> int:
+    """
+    Donor index'i veritabanından baştan kurar.
+
+    Startup'ta (lifespan) ve her worker'da periyodik olarak
+    (refresh_donor_index job'ı) çağrılır.
+
+    Args:
+        db: AsyncSession
+
+    Returns:
+        Index'e alınan bağışçı sayısı
+    """
+    location_geometry = cast(User.location, Geometry)
+    result = await db.execute(
+        select(
+            User.id,
+            User.blood_type,
+            User.fcm_token,
+            User.next_available_date,
+            func.ST_Y(location_geometry),
+            func.ST_X(location_geometry),
+        ).where(
+            User.deleted_at.is_(None),
+            User.is_active == True,
+            User.location.is_not(None),
+            User.fcm_token.is_not(None),
+            User.blood_type.is_not(None),
+        )
+    )
+    entries = [
+        DonorEntry(
+            user_id=str(user_id),
+            blood_type=blood_type,
+            latitude=float(latitude),
+            longitude=float(longitude),
+            fcm_token=fcm_token,
+            next_available_date=next_available_date,
+        )
+        for user_id, blood_type, fcm_token, next_available_date, latitude, longitude in result.all()
+    ]
+
+    committed_result = await db.execute(
+        select(DonationCommitment.donor_id).where(
+            DonationCommitment.status.in_(ACTIVE_COMMITMENT_STATUSES)
+        )
+    )
+    committed_ids = [str(donor_id) for donor_id in committed_result.scalars().all()]
+
+    donor_index.load(entries, committed_ids)
+    logger.info(f"Donor index rebuilt with {len(entries)} donor(s)")
+    return len(entries)
+
+
+# =============================================================================
+# HOOKS (index güncellemeleri commit sonrası uygulanır)
+# =============================================================================
+
+def build_donor_entry(
+    user: User,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+) -> Optional[DonorEntry]:
+    """
+    User nesnesinden index kaydı üretir.
+
+    Kullanıcı index'e alınmaya uygun değilse None döner.
+    Koordinat verilmezse user.location'dan çözülür.
+    """
+    if user.deleted_at is not None or not user.is_active:
+        return None
+    if not user.fcm_token or not user.blood_type:
+        return None
+
+    if latitude is None or longitude is None:
+        coordinates = extract_coordinates(user.location)
+        if coordinates is None:
+            existing = donor_index.get(str(user.id))
+            if existing is None:
+                return None
+            coordinates = (existing.latitude, existing.longitude)
+        latitude, longitude = coordinates
+
+    return DonorEntry(
+        user_id=str(user.id),
+        blood_type=user.blood_type,
+        latitude=latitude,
+        longitude=longitude,
+        fcm_token=user.fcm_token,
+        next_available_date=user.next_available_date,
+    )
+
+
+def _apply_donor_entry(user_id: str, entry: Optional[DonorEntry]) -> None:
+    if entry is None:
+        donor_index.discard(user_id)
+    else:
+        donor_index.upsert(entry)
+
+
+def _release_donors(donor_ids: List[str]) -> None:
+    for donor_id in donor_ids:
+        donor_index.release(donor_id)
+
+
+def _discard_donors(user_ids: List[str]) -> None:
+    for user_id in user_ids:
+        donor_index.discard(user_id)
+
+
+def track_donor(
+    db: AsyncSession,
+    user: User,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+) -> None:
+    """
+    Kullanıcının index kaydını commit sonrasında günceller.
+
+    Konum, FCM token, cooldown veya hesap durumu değiştiğinde çağrılır.
+    """
+    if not donor_index.is_ready:
+        return
+    entry = build_donor_entry(user, latitude, longitude)
+    run_after_commit(db, partial(_apply_donor_entry, str(user.id), entry))
+
+
+def untrack_donors(db: AsyncSession, user_ids: Iterable[str]) -> None:
+    """
+    Toplu UPDATE ile uygunluğunu kaybeden kullanıcıları (örn. FCM token'ı
+    silinen) commit sonrasında index'ten çıkarır.
+    """
+    ids = [str(user_id) for user_id in user_ids]
+    if not ids or not donor_index.is_ready:
+        return
+    run_after_commit(db, partial(_discard_donors, ids))
+
+
+async def refresh_active_commitment_flags(db: AsyncSession, donor_ids: Iterable[str]) -> None:
+    """
+    users.has_active_commitment alanını taahhüt tablosundan yeniden hesaplar.
+
+    Bağışçının ON_THE_WAY veya ARRIVED durumunda taahhüdü varsa True olur.
+    Bekleyen ORM değişiklikleri sorgudan önce autoflush ile yazılır.
+
+    Args:
+        db: AsyncSession
+        donor_ids: Bağışçı ID'leri
+    """
+    ids = [str(donor_id) for donor_id in donor_ids]
+    if not ids:
+        return
+
+    active_exists = (
+        select(DonationCommitment.id)
+        .where(
+            DonationCommitment.donor_id == User.id,
+            DonationCommitment.status.in_(ACTIVE_COMMITMENT_STATUSES),
+        )
+        .exists()
+    )
+    await db.execute(
+        update(User)
+        .where(User.id.in_(ids))
+        .values(has_active_commitment=active_exists)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def track_commitment_started(db: AsyncSession, donor_id: str) -> None:
+    """
+    Bağışçının aktif taahhüdü başladığında has_active_commitment'ı işaretler
+    ve commit sonrasında bağışçıyı index'ten düşürür.
+    """
+    await refresh_active_commitment_flags(db, [donor_id])
+    if donor_index.is_ready:
+        run_after_commit(db, partial(donor_index.mark_committed, str(donor_id)))
+
+
+async def track_commitments_ended(
+    db: AsyncSession,
+    donor_ids: Iterable[str],
+    refresh_flags: bool = True,
+) -> None:
+    """
+    Aktif taahhüdü biten bağışçıların has_active_commitment'ını günceller
+    ve commit sonrasında onları index'te yeniden uygun yapar.
+
+    refresh_flags False ise bayrağın çağıran tarafından zaten yazıldığı
+    kabul edilir ve yeniden hesaplama sorgusu atlanır.
+    """
+    ids = [str(donor_id) for donor_id in donor_ids]
+    if not ids:
+        return
+    if refresh_flags:
+        await refresh_active_commitment_flags(db, ids)
+    if donor_index.is_ready:
+        run_after_commit(db, partial(_release_donors, ids))
@@ -4,8 +4,8 @@ Gamification Service for KanVer API.
 Bu dosya, oyunlaştırma (gamification) ile ilgili business logic fonksiyonlarını içerir.
 Hero points, trust score, rank badge ve leaderboard işlemleri.
 """
-from typing import List, Dict, Optional
-from sqlalchemy import select, func, desc
+from typing import List, Dict, Optional, Sequence, Tuple
+from sqlalchemy import select, func, desc, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import User
@@ -107,6 +107,39 @@ async def penalize_no_show(
     return user.trust_score
 
 
+async def penalize_no_shows(
+    db: AsyncSession,
+    user_ids: Sequence[str]
+) -> List[Tuple[str, Optional[str]]]:
+    """
+    Birden fazla kullanıcıya tek UPDATE ile no-show cezası uygular.
+
+    Her kullanıcı bir kez cezalandırılır (aynı anda tek aktif taahhüt);
+    trust_score penalize_no_show'daki gibi 0'ın altına düşmez.
+
+    Args:
+        db: AsyncSession
+        user_ids: Cezalandırılacak kullanıcı ID'leri
+
+    Returns:
+        Cezalandırılan kullanıcıların (user_id, fcm_token) listesi
+    """
+    if not user_ids:
+        return []
+
+    result = await db.execute(
+        update(User)
+        .where(User.id.in_(list(user_ids)))
+        .values(
+            no_show_count=User.no_show_count + 1,
+            trust_score=func.greatest(0, User.trust_score + settings.NO_SHOW_PENALTY),
+        )
+        .returning(User.id, User.fcm_token)
+        .execution_options(synchronize_session=False)
+    )
+    return [(str(user_id), fcm_token) for user_id, fcm_token in result.all()]
+
+
 async def get_user_rank(
     db: AsyncSession,
     user_id: str
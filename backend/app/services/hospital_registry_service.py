@@ -0,0 +1,245 @@
+"""
+Hospital Registry Service for KanVer API.
+
+Bu dosya, hastanelerin process-içi kaydını (registry) içerir.
+
+Hastaneler neredeyse statiktir; bu nedenle startup'ta tüm hastaneler
+koordinatlarıyla birlikte belleğe alınır ve şu yollar DB'ye gitmeden
+yanıtlanır:
+- GET /api/hospitals/{id} ve /api/hospitals/nearby
+- Talep ve taahhüt yanıtlarındaki hastane bilgisi
+
+Yakınlık sorguları (yarıçap ve k-nearest) GridIndex ile yapılır.
+create_hospital/update_hospital commit sonrasında kaydı günceller; bu
+yalnızca isteği işleyen worker'a uygulandığından her worker registry'yi
+HOSPITAL_REGISTRY_REFRESH_INTERVAL_MINUTES'ta bir yeniden yükler
+(app/background/hospital_registry_refresher.py). Registry soğukken (henüz doldurulmamışken) tüm çağıranlar DB'ye düşer.
+"""
+import dataclasses
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from typing import Dict, List, Optional
+
+from geoalchemy2 import Geometry
+from sqlalchemy import cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.database import run_after_commit
+from app.models import Hospital
+from app.utils.location import extract_coordinates
+from app.utils.spatial_index import GridIndex
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class HospitalRecord:
+    """
+    Registry'de tutulan hastane kaydı.
+
+    Alan adları Hospital modeliyle aynıdır; HospitalResponse ve
+    BloodRequestHospitalInfo şemaları bu nesneden doğrudan üretilebilir.
+    """
+
+    id: str
+    hospital_code: str
+    name: str
+    address: str
+    district: str
+    city: str
+    phone_number: str
+    email: Optional[str]
+    geofence_radius_meters: int
+    is_active: bool
+    created_at: datetime
+    latitude: float
+    longitude: float
+    distance_km: Optional[float] = None
+
+
+class HospitalRegistry:
+    """
+    Hastane kayıtları (id → kayıt) ve aktif hastaneler için spatial index.
+    """
+
+    def __init__(self, cell_size_meters: float = 5000.0):
+        self._records: Dict[str, HospitalRecord] = {}
+        self._index = GridIndex(cell_size_meters)
+        self._ready = False
+
+    @property
+    def is_ready(self) -> bool:
+        """Registry DB'den doldurulduysa True."""
+        return self._ready
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def load(self, records: List[HospitalRecord]) -> None:
+        """Registry'yi verilen kayıtlarla baştan kurar ve hazır işaretler."""
+        self._records = {}
+        self._index.clear()
+        for record in records:
+            self.upsert(record)
+        self._ready = True
+
+    def reset(self) -> None:
+        """Registry'yi boşaltır ve soğuk duruma getirir."""
+        self._records = {}
+        self._index.clear()
+        self._ready = False
+
+    def upsert(self, record: HospitalRecord) -> None:
+        """Kaydı ekler veya günceller; pasif hastaneler index'ten çıkarılır."""
+        self._records[record.id] = record
+        if record.is_active:
+            self._index.insert(record.id, record.latitude, record.longitude, record)
+        else:
+            self._index.remove(record.id)
+
+    def invalidate(self, hospital_id: str) -> None:
+        """Kaydı siler; sonraki okuma DB'den yapılır."""
+        self._records.pop(hospital_id, None)
+        self._index.remove(hospital_id)
+
+    def get(self, hospital_id: str) -> Optional[HospitalRecord]:
+        return self._records.get(str(hospital_id))
+
+    def nearby(self, latitude: float, longitude: float, radius_meters: float) -> List[HospitalRecord]:
+        """
+        Yarıçap içindeki aktif hastaneleri mesafeye göre sıralı döndürür.
+
+        Args:
+            latitude: Merkez enlemi
+            longitude: Merkez boylamı
+            radius_meters: Arama yarıçapı (metre)
+
+        Returns:
+            distance_km alanı doldurulmuş HospitalRecord listesi
+        """
+        return [
+            dataclasses.replace(record, distance_km=round(distance / 1000, 3))
+            for _, record, distance in self._index.query_radius(latitude, longitude, radius_meters)
+        ]
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int,
+        max_radius_meters: Optional[float] = None,
+    ) -> List[HospitalRecord]:
+        """En yakın k aktif hastaneyi distance_km ile döndürür."""
+        return [
+            dataclasses.replace(record, distance_km=round(distance / 1000, 3))
+            for _, record, distance in self._index.nearest(latitude, longitude, k, max_radius_meters)
+        ]
+
+
+# Process-genel registry instance'ı
+hospital_registry = HospitalRegistry()
+
+
+def build_hospital_record(
+    hospital: Hospital,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+) -> Optional[HospitalRecord]:
+    """
+    Hospital nesnesinden registry kaydı üretir.
+
+    Koordinat verilmezse hospital.location'dan çözülür; çözülemezse None döner.
+    """
+    if latitude is None or longitude is None:
+        coordinates = extract_coordinates(hospital.location)
+        if coordinates is None:
+            return None
+        latitude, longitude = coordinates
+
+    return HospitalRecord(
+        id=str(hospital.id),
+        hospital_code=hospital.hospital_code,
+        name=hospital.name,
+        address=hospital.address,
+        district=hospital.district,
+        city=hospital.city,
+        phone_number=hospital.phone_number,
+        email=hospital.email,
+        geofence_radius_meters=hospital.geofence_radius_meters,
+        is_active=hospital.is_active,
+        created_at=hospital.created_at,
+        latitude=latitude,
+        longitude=longitude,
+    )
+
+
+async def rebuild_hospital_registry(db: AsyncSession) -> int:
+    """
+    Hospital registry'yi veritabanından baştan kurar.
+
+    Startup'ta (lifespan) ve her worker'da periyodik olarak
+    (refresh_hospital_registry job'ı) çağrılır.
+
+    Args:
+        db: AsyncSession
+
+    Returns:
+        Registry'ye alınan hastane sayısı
+    """
+    location_geometry = cast(Hospital.location, Geometry)
+    result = await db.execute(
+        select(Hospital, func.ST_Y(location_geometry), func.ST_X(location_geometry))
+    )
+    records = [
+        build_hospital_record(hospital, float(latitude), float(longitude))
+        for hospital, latitude, longitude in result.all()
+    ]
+
+    hospital_registry.load(records)
+    logger.info(f"Hospital registry loaded with {len(records)} hospital(s)")
+    return len(records)
+
+
+def track_hospital(
+    db: AsyncSession,
+    hospital: Hospital,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+) -> None:
+    """
+    Hastanenin registry kaydını commit sonrasında günceller.
+
+    Koordinatlar çözülemezse kayıt geçersiz kılınır ve ilk okumada DB'den alınır.
+    """
+    if not hospital_registry.is_ready:
+        return
+
+    record = build_hospital_record(hospital, latitude, longitude)
+    if record is None:
+        run_after_commit(db, partial(hospital_registry.invalidate, str(hospital.id)))
+    else:
+        run_after_commit(db, partial(hospital_registry.upsert, record))
+
+
+async def get_hospital_info(db: AsyncSession, hospital_id: str):
+    """
+    Yanıt zenginleştirme için hastane bilgisini döndürür.
+
+    Registry hazırsa DB'ye gidilmez; kayıt yoksa (veya registry soğuksa)
+    hastane DB'den okunur.
+
+    Args:
+        db: AsyncSession
+        hospital_id: Hastane ID'si
+
+    Returns:
+        HospitalRecord, Hospital veya bulunamazsa None
+    """
+    record = hospital_registry.get(hospital_id)
+    if record is not None:
+        return record
+
+    result = await db.execute(select(Hospital).where(Hospital.id == hospital_id))
+    return result.scalar_one_or_none()
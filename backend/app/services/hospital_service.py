@@ -13,7 +13,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import Hospital, HospitalStaff, User
 from app.constants.roles import UserRole
 from app.core.exceptions import ConflictException, NotFoundException
-from app.utils.location import create_point
+from app.utils.location import create_point, resolve_geofence
+from app.services.hospital_registry_service import (
+    hospital_registry,
+    get_hospital_info,
+    track_hospital,
+)
 
 
 # =============================================================================
@@ -61,6 +66,8 @@ async def create_hospital(db: AsyncSession, data: dict) -> Hospital:
     db.add(hospital)
     await db.flush()
     await db.refresh(hospital)
+
+    track_hospital(db, hospital, data["latitude"], data["longitude"])
     return hospital
 
 
@@ -87,6 +94,29 @@ async def get_hospital(db: AsyncSession, hospital_id: str) -> Hospital:
     return hospital
 
 
+async def get_hospital_cached(db: AsyncSession, hospital_id: str):
+    """
+    ID'ye göre hastaneyi hospital registry üzerinden getirir.
+
+    Registry hazırsa DB'ye gidilmez; aksi halde get_hospital gibi davranır.
+    Dönen nesne salt okunur kullanım içindir (yanıt üretimi).
+
+    Args:
+        db: AsyncSession
+        hospital_id: Hastane UUID'si
+
+    Returns:
+        HospitalRecord veya Hospital nesnesi
+
+    Raises:
+        NotFoundException: Hastane bulunamazsa
+    """
+    hospital = await get_hospital_info(db, hospital_id)
+    if not hospital:
+        raise NotFoundException(f"Hastane bulunamadı: {hospital_id}")
+    return hospital
+
+
 async def list_hospitals(
     db: AsyncSession,
     city: Optional[str] = None,
@@ -191,6 +221,8 @@ async def update_hospital(
 
     await db.flush()
     await db.refresh(hospital)
+
+    track_hospital(db, hospital, lat, lng)
     return hospital
 
 
@@ -209,6 +241,8 @@ async def get_nearby_hospitals(
 
     PostGIS ST_DWithin ile yarıçap filtresi, ST_Distance ile sıralama yapar.
     Her Hospital nesnesine distance_km attribute'u dinamik olarak eklenir.
+    Hospital registry hazırsa sorgu DB'ye gitmeden bellekte yanıtlanır
+    (mesafeler Haversine ile hesaplanır).
 
     Args:
         db: AsyncSession
@@ -220,6 +254,10 @@ async def get_nearby_hospitals(
         Hospital listesi — her birinde .distance_km (float, km cinsinden)
     """
     radius_meters = radius_km * 1000
+
+    if hospital_registry.is_ready:
+        return hospital_registry.nearby(lat, lng, radius_meters)
+
     user_point = create_point(lat, lng)
 
     distance_expr = func.ST_Distance(
@@ -255,8 +293,9 @@ async def is_user_in_geofence(
     """
     Kullanıcının hastane geofence'ı içinde olup olmadığını kontrol eder.
 
-    PostGIS ST_DWithin kullanır. Mesafe eşiği olarak hastanedeki
-    geofence_radius_meters değerini alır.
+    Mesafe eşiği olarak hastanedeki geofence_radius_meters değerini alır.
+    Karar resolve_geofence ile verilir (Haversine ön kontrolü, sınıra
+    çok yakın noktalarda ST_DWithin).
 
     Args:
         db: AsyncSession
@@ -271,19 +310,10 @@ async def is_user_in_geofence(
     Raises:
         NotFoundException: Hastane bulunamazsa
     """
-    hospital = await get_hospital(db, hospital_id)
-    user_point = create_point(user_lat, user_lng)
-
-    stmt = select(
-        func.ST_DWithin(
-            Hospital.location,
-            user_point,
-            hospital.geofence_radius_meters,
-        )
-    ).where(Hospital.id == hospital_id)
-
-    result = await db.execute(stmt)
-    return bool(result.scalar())
+    check = await resolve_geofence(db, user_lat, user_lng, hospital_id)
+    if check.hospital is None:
+        raise NotFoundException(f"Hastane bulunamadı: {hospital_id}")
+    return check.inside
 
 
 # =============================================================================
@@ -0,0 +1,187 @@
+"""
+Location Buffer Service for KanVer API.
+
+Bu dosya, bağışçı konum güncellemeleri için process-içi toplama (ingestion)
+buffer'ını içerir.
+
+Mobil istemciler sık GPS ping'i gönderir; her ping için ayrı UPDATE yerine:
+- Son yazılan/bekleyen konuma göre LOCATION_MIN_MOVEMENT_METERS'dan az
+  hareket eden ping'ler atılır
+- Kullanıcı başına yalnızca en son konum bellekte tutulur
+- Bekleyen konumlar location flusher tarafından periyodik olarak tek bir
+  UPDATE ... FROM (VALUES ...) ifadesiyle yazılır
+
+Buffer başlatılmadıkça (startup'ta) update_location doğrudan yazma yoluna düşer.
+"""
+import dataclasses
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from geoalchemy2 import Geography
+from sqlalchemy import DateTime, Float, String, cast, column, func, or_, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import run_after_commit
+from app.models import User
+from app.services.donor_index_service import donor_index
+from app.utils.location import distance_between
+
+# Tek UPDATE ifadesindeki en fazla satır (satır başına 4 bind parametresi)
+WRITE_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class PendingLocation:
+    """Yazılmayı bekleyen konum."""
+
+    user_id: str
+    latitude: float
+    longitude: float
+    recorded_at: datetime
+
+
+class LocationBuffer:
+    """
+    Kullanıcı başına son konumu tutan birleştirici (coalescing) buffer.
+    """
+
+    def __init__(self, min_movement_meters: float = 50.0):
+        self._pending: Dict[str, PendingLocation] = {}
+        self._min_movement_meters = min_movement_meters
+        self._running = False
+
+    @property
+    def is_running(self) -> bool:
+        """Buffer flusher ile birlikte başlatıldıysa True."""
+        return self._running
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def start(self) -> None:
+        self._running = True
+
+    def stop(self) -> None:
+        """Yeni konum kabulünü durdurur; bekleyenler drain ile alınabilir."""
+        self._running = False
+
+    def submit(
+        self,
+        user_id: str,
+        latitude: float,
+        longitude: float,
+        previous: Optional[Tuple[float, float]] = None,
+        recorded_at: Optional[datetime] = None,
+    ) -> bool:
+        """
+        Konumu buffer'a ekler.
+
+        Args:
+            user_id: Kullanıcı ID'si
+            latitude: Enlem
+            longitude: Boylam
+            previous: DB'deki son (lat, lng); bekleyen konum yoksa referans alınır
+            recorded_at: Konum zamanı (varsayılan şimdi)
+
+        Returns:
+            Konum kabul edildiyse True, hareket eşiğin altındaysa False
+        """
+        user_id = str(user_id)
+        pending = self._pending.get(user_id)
+        reference = (pending.latitude, pending.longitude) if pending else previous
+
+        if reference is not None:
+            moved = distance_between(reference[0], reference[1], latitude, longitude)
+            if moved < self._min_movement_meters:
+                return False
+
+        self._pending[user_id] = PendingLocation(
+            user_id=user_id,
+            latitude=latitude,
+            longitude=longitude,
+            recorded_at=recorded_at or datetime.now(timezone.utc),
+        )
+        return True
+
+    def drain(self) -> List[PendingLocation]:
+        """Bekleyen tüm konumları alır ve buffer'ı boşaltır."""
+        pending = list(self._pending.values())
+        self._pending = {}
+        return pending
+
+    def requeue(self, entries: Iterable[PendingLocation]) -> None:
+        """Yazılamayan konumları geri koyar; bu arada gelen daha yeni konumlar korunur."""
+        for entry in entries:
+            self._pending.setdefault(entry.user_id, entry)
+
+
+# Process-genel buffer instance'ı
+location_buffer = LocationBuffer(min_movement_meters=settings.LOCATION_MIN_MOVEMENT_METERS)
+
+
+def _apply_locations(entries: List[PendingLocation]) -> None:
+    for entry in entries:
+        existing = donor_index.get(entry.user_id)
+        if existing is not None:
+            donor_index.upsert(
+                dataclasses.replace(existing, latitude=entry.latitude, longitude=entry.longitude)
+            )
+
+
+async def write_locations(db: AsyncSession, entries: List[PendingLocation]) -> int:
+    """
+    Bekleyen konumları tek bir UPDATE ... FROM (VALUES ...) ile yazar.
+
+    Her worker kendi buffer'ını yazdığından, DB'deki konumdan eski ping'ler
+    (location_updated_at >= recorded_at) atlanır. Donor index commit
+    sonrasında yalnızca yazılan konumlarla güncellenir.
+
+    Args:
+        db: AsyncSession
+        entries: Yazılacak konumlar (kullanıcı başına en fazla bir tane)
+
+    Returns:
+        Yazılan konum sayısı
+    """
+    if not entries:
+        return 0
+
+    written: Set[str] = set()
+
+    # Bind parametre sınırı için büyük batch'ler parçalara bölünür
+    for start in range(0, len(entries), WRITE_BATCH_SIZE):
+        pending = values(
+            column("user_id", String),
+            column("latitude", Float),
+            column("longitude", Float),
+            column("recorded_at", DateTime(timezone=True)),
+            name="pending",
+        ).data([
+            (entry.user_id, entry.latitude, entry.longitude, entry.recorded_at)
+            for entry in entries[start:start + WRITE_BATCH_SIZE]
+        ])
+
+        point = func.ST_SetSRID(func.ST_MakePoint(pending.c.longitude, pending.c.latitude), 4326)
+        result = await db.execute(
+            update(User)
+            .where(
+                User.id == pending.c.user_id,
+                User.deleted_at.is_(None),
+                or_(User.location_updated_at.is_(None), User.location_updated_at < pending.c.recorded_at),
+            )
+            .values(
+                location=cast(point, Geography(geometry_type="POINT", srid=4326)),
+                location_updated_at=pending.c.recorded_at,
+            )
+            .returning(User.id)
+            .execution_options(synchronize_session=False)
+        )
+        written.update(str(user_id) for user_id in result.scalars().all())
+
+    if donor_index.is_ready and written:
+        run_after_commit(db, partial(_apply_locations, [entry for entry in entries if entry.user_id in written]))
+
+    return len(written)
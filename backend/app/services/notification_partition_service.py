@@ -0,0 +1,200 @@
+"""
+Notification Partition Service for KanVer API.
+
+notifications tablosu created_at üzerinde aylık RANGE partition'lıdır
+(notifications_yYYYYmMM, sınırlar UTC ay başları). Bu dosya:
+- Gelecek aylar için partition'ları önceden oluşturur
+- Saklama süresi (NOTIFICATION_RETENTION_MONTHS) dolan partition'ları
+  detach edip siler
+- notifications sorgularının partition pruning için kullandığı zaman
+  sınırlarını üretir
+
+Default partition yoktur (DETACH PARTITION ... CONCURRENTLY buna izin
+vermez); partition'ı olmayan aya bildirim yazılamayacağından gelecek aylar
+bakım job'ı tarafından önceden oluşturulur. Job kapalı, leader'sız ya da
+hata alıyor olsa bile bu ay ve sonraki ayın partition'ları her worker'ın
+startup'ında ve her ayın ilk bildirim yazımından önce garanti edilir.
+"""
+import re
+from datetime import datetime, timezone
+from functools import partial
+from typing import List, Optional, Set, Union
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.config import settings
+from app.core.logging import get_logger
+from app.database import run_after_commit
+
+logger = get_logger(__name__)
+
+
+NOTIFICATION_PARTITION_PREFIX = "notifications_y"
+
+_PARTITION_NAME_RE = re.compile(r"^notifications_y(\d{4})m(\d{2})$")
+
+# Bu worker'da partition'ları doğrulanmış aylar (commit sonrası eklenir)
+_ensured_months: Set[datetime] = set()
+
+
+def month_start(value: Optional[datetime] = None) -> datetime:
+    """Verilen anın (varsayılan: şimdi) UTC ay başını döner."""
+    value = (value or datetime.now(timezone.utc)).astimezone(timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """Ay başına months ay ekler (negatif olabilir)."""
+    index = month.year * 12 + (month.month - 1) + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    """Ayın partition tablo adı (ör. notifications_y2026m03)."""
+    return f"{NOTIFICATION_PARTITION_PREFIX}{month.year:04d}m{month.month:02d}"
+
+
+def notification_retention_cutoff(now: Optional[datetime] = None) -> datetime:
+    """
+    Saklanan en eski bildirimin alt sınırı.
+
+    Bu sınırdan eski partition'lar silinir; notifications sorguları bu
+    sınırı taşıdığından planner silinmiş/silinecek partition'lara bakmaz.
+    """
+    return add_months(month_start(now), -settings.NOTIFICATION_RETENTION_MONTHS)
+
+
+def recent_notification_cutoff(now: Optional[datetime] = None) -> datetime:
+    """
+    Az önce oluşturulmuş bildirimleri hedefleyen sorguların alt sınırı.
+
+    Push işaretleme gibi dakikalar içinde yapılan işlemler için önceki ayın
+    başı; en fazla iki partition taranır.
+    """
+    return add_months(month_start(now), -1)
+
+
+async def list_notification_partitions(db: Union[AsyncSession, AsyncConnection]) -> List[str]:
+    """notifications'ın aylık partition adlarını (default hariç) sıralı döner."""
+    result = await db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'notifications'::regclass"
+        )
+    )
+    return sorted(name for name in result.scalars().all() if _PARTITION_NAME_RE.match(name))
+
+
+async def ensure_notification_partitions(
+    db: Union[AsyncSession, AsyncConnection],
+    months_ahead: int,
+    now: Optional[datetime] = None,
+) -> List[str]:
+    """
+    Bu ay ve sonraki months_ahead ay için eksik partition'ları oluşturur.
+
+    Args:
+        db: AsyncSession ya da AsyncConnection
+        months_ahead: Önceden oluşturulacak ay sayısı
+        now: Referans zaman (varsayılan: şimdi)
+
+    Returns:
+        Oluşturulan partition adları
+    """
+    existing = set(await list_notification_partitions(db))
+    current = month_start(now)
+
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        await db.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF notifications "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            )
+        )
+        created.append(name)
+    return created
+
+
+async def ensure_current_notification_partitions(
+    db: AsyncSession,
+    now: Optional[datetime] = None,
+) -> List[str]:
+    """
+    Bildirim yazmadan önce bu ay ve sonraki ayın partition'larını garanti eder.
+
+    Worker başına ayda bir kez DB'ye bakılır; ay, transaction commit
+    edildikten sonra doğrulanmış sayılır. Burada partition oluşturulması
+    bakım job'ının geride kaldığını gösterir ve hata olarak loglanır.
+
+    Args:
+        db: AsyncSession (bildirimi yazacak transaction)
+        now: Referans zaman (varsayılan: şimdi)
+
+    Returns:
+        Oluşturulan partition adları
+    """
+    current = month_start(now)
+    if current in _ensured_months:
+        return []
+
+    created = await ensure_notification_partitions(db, months_ahead=1, now=now)
+    if created:
+        logger.error(
+            f"Notification partitions were missing and created on insert: {', '.join(created)}. "
+            "Check the notification_partitions job (NOTIFICATION_PARTITION_MAINTENANCE_ENABLED, leader)."
+        )
+    run_after_commit(db, partial(_ensured_months.add, current))
+    return created
+
+
+async def drop_expired_notification_partitions(
+    connection: AsyncConnection,
+    retention_months: int,
+    now: Optional[datetime] = None,
+) -> List[str]:
+    """
+    Tamamı saklama süresinin dışında kalan partition'ları detach edip siler.
+
+    Tek tek DELETE yerine partition düşürmek tabloyu şişirmez ve VACUUM
+    gerektirmez. DETACH PARTITION ... CONCURRENTLY parent'ı kilitlemez ama
+    transaction bloğunda çalışamaz; connection AUTOCOMMIT olmalıdır. Yarıda
+    kalmış bir concurrent detach FINALIZE ile tamamlanır. Silinen okunmamış
+    bildirimler için sayaçlar ayrıca uzlaştırılmalıdır (reconcile_unread_counts).
+
+    Args:
+        connection: AUTOCOMMIT isolation level'lı AsyncConnection
+        retention_months: Saklanacak ay sayısı (bu ay hariç)
+        now: Referans zaman (varsayılan: şimdi)
+
+    Returns:
+        Silinen partition adları
+    """
+    cutoff = add_months(month_start(now), -retention_months)
+
+    result = await connection.execute(
+        text(
+            "SELECT c.relname, i.inhdetachpending FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'notifications'::regclass"
+        )
+    )
+    detach_pending = {name: pending for name, pending in result.all() if _PARTITION_NAME_RE.match(name)}
+
+    dropped = []
+    for name in sorted(detach_pending):
+        year, month = map(int, _PARTITION_NAME_RE.match(name).groups())
+        partition_end = add_months(datetime(year, month, 1, tzinfo=timezone.utc), 1)
+        if partition_end > cutoff:
+            continue
+        mode = "FINALIZE" if detach_pending[name] else "CONCURRENTLY"
+        await connection.execute(text(f"ALTER TABLE notifications DETACH PARTITION {name} {mode}"))
+        await connection.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+    return dropped
@@ -3,23 +3,91 @@ Notification Service for KanVer API.
 
 Bu dosya, bildirimlerle ilgili business logic fonksiyonlarını içerir.
 Router'lar bu servis katmanını kullanarak veritabanı işlemlerini gerçekleştirir.
+
+notifications aylık partition'lı olduğundan sorgular created_at alt sınırı
+taşır; planner saklama süresi dolmuş partition'lara bakmaz. ID ile
+hedeflenen bildirimler önce son iki partition'da (recent_notification_cutoff)
+aranır, bulunamayanlar için saklama süresinin kalanına bakılır. Kullanıcının
+tüm geçmişini kapsayan listeleme/sayma sorguları notification_retention_cutoff
+ile sınırlıdır.
 """
+from collections import Counter
 from datetime import datetime, timezone
-from typing import Optional, List
+from functools import lru_cache
+from string import Formatter
+from typing import Dict, Iterable, Optional, List, Sequence, Tuple
 import math
 
-from sqlalchemy import select, and_, func, update
+from sqlalchemy import Row, select, and_, or_, case, func, update, insert, exists
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from app.constants import NotificationType, NOTIFICATION_TEMPLATES
 from app.core.exceptions import NotFoundException, BadRequestException
-from app.models import Notification
+from app.models import Notification, NotificationCounter
+from app.services.notification_partition_service import (
+    ensure_current_notification_partitions,
+    notification_retention_cutoff,
+    recent_notification_cutoff,
+)
+from app.services.notification_stream_service import notification_broker, publish_notifications
+from app.services.push_dispatch_service import PendingPush, dispatch_pushes
+from app.utils.fcm import PushMessage
 
 
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
 
+# Render sonuçları için cache boyutu; fan-out'ta aynı (tür, context) tekrar eder
+RENDER_CACHE_SIZE = 1024
+
+
+class CompiledTemplate:
+    """
+    Önceden parçalanmış bildirim şablonu.
+
+    Şablon import anında sabit metin ve placeholder parçalarına ayrılır;
+    render sadece parçaları birleştirir. Context'te olmayan placeholder'lar
+    metinde olduğu gibi ({name}) kalır.
+    """
+
+    __slots__ = ("parts", "fields")
+
+    def __init__(self, template: str):
+        parts: List[Tuple[str, Optional[str]]] = []
+        for literal, field_name, _, _ in Formatter().parse(template):
+            parts.append((literal, field_name))
+        self.parts = tuple(parts)
+        self.fields = frozenset(name for _, name in parts if name is not None)
+
+    def render(self, values: dict) -> str:
+        chunks = []
+        for literal, field_name in self.parts:
+            chunks.append(literal)
+            if field_name is not None:
+                chunks.append(values.get(field_name, "{" + field_name + "}"))
+        return "".join(chunks)
+
+
+# Bildirim türü → (title, message) derlenmiş şablonları
+COMPILED_TEMPLATES: dict[str, tuple[CompiledTemplate, CompiledTemplate]] = {
+    notification_type: (CompiledTemplate(template["title"]), CompiledTemplate(template["message"]))
+    for notification_type, template in NOTIFICATION_TEMPLATES.items()
+}
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render_compiled(
+    notification_type: str,
+    frozen_context: Tuple[Tuple[str, str], ...],
+) -> tuple[str, str]:
+    title_template, message_template = COMPILED_TEMPLATES[notification_type]
+    values = dict(frozen_context)
+    return title_template.render(values), message_template.render(values)
+
+
 def render_notification_template(
     notification_type: str,
     context: dict
@@ -27,6 +95,9 @@ def render_notification_template(
     """
     Bildirim şablonunu context verisiyle render eder.
 
+    Sonuç (tür, şablonda kullanılan context değerleri) anahtarıyla
+    memoize edilir.
+
     Args:
         notification_type: Bildirim türü (NotificationType value)
         context: Template placeholder'ları için değerler
@@ -38,23 +109,155 @@ def render_notification_template(
     Raises:
         BadRequestException: Geçersiz notification_type
     """
-    if notification_type not in NOTIFICATION_TEMPLATES:
+    compiled = COMPILED_TEMPLATES.get(notification_type)
+    if compiled is None:
         raise BadRequestException(
             f"Geçersiz bildirim türü: {notification_type}",
             detail=f"Geçerli türler: {', '.join(NOTIFICATION_TEMPLATES.keys())}"
         )
 
-    template = NOTIFICATION_TEMPLATES[notification_type]
-    title = template["title"]
-    message = template["message"]
+    # Sadece şablonda geçen alanlar anahtara girer
+    fields = compiled[0].fields | compiled[1].fields
+    frozen_context = tuple(sorted(
+        (key, str(value)) for key, value in context.items() if key in fields
+    ))
+    return _render_compiled(notification_type, frozen_context)
 
-    # Placeholder'ları değiştir
-    for key, value in context.items():
-        placeholder = "{" + key + "}"
-        title = title.replace(placeholder, str(value))
-        message = message.replace(placeholder, str(value))
 
-    return title, message
+def _push_message(
+    notification_id: str,
+    notification_type: str,
+    title: str,
+    message: str,
+    fcm_token: str,
+    request_id: Optional[str] = None,
+    donation_id: Optional[str] = None,
+) -> PushMessage:
+    """Bildirim için FCM push mesajını oluşturur."""
+    return PushMessage(
+        fcm_token=fcm_token,
+        title=title,
+        body=message,
+        data={
+            "notification_id": str(notification_id),
+            "notification_type": notification_type,
+            "request_id": request_id or "",
+            "donation_id": donation_id or "",
+        },
+    )
+
+
+# =============================================================================
+# UNREAD COUNTERS
+# =============================================================================
+
+async def _increment_unread_counts(db: AsyncSession, counts: Dict[str, int]) -> None:
+    """
+    Kullanıcıların okunmamış sayaçlarını tek bir upsert ile artırır.
+
+    Kilit sırası sabit olsun diye satırlar user_id sırasıyla yazılır.
+    """
+    if not counts:
+        return
+
+    stmt = pg_insert(NotificationCounter).values([
+        {"user_id": user_id, "unread_count": counts[user_id]}
+        for user_id in sorted(counts)
+    ])
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[NotificationCounter.user_id],
+            set_={
+                "unread_count": NotificationCounter.unread_count + stmt.excluded.unread_count,
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+async def _decrement_unread_count(db: AsyncSession, user_id: str, amount: int) -> None:
+    if amount <= 0:
+        return
+
+    await db.execute(
+        update(NotificationCounter)
+        .where(NotificationCounter.user_id == user_id)
+        .values(unread_count=func.greatest(NotificationCounter.unread_count - amount, 0))
+    )
+
+
+async def reconcile_unread_counts(
+    db: AsyncSession,
+    user_ids: Optional[Iterable[str]] = None,
+) -> int:
+    """
+    Okunmamış sayaçlarını notifications tablosundan yeniden hesaplar.
+
+    Sayaçlar normalde transaction içinde güncel tutulur; bu fonksiyon
+    elle yapılan DB değişiklikleri gibi durumlardan kalan sapmaları düzeltir.
+    Okunmamış satırlar idx_notifications_user_unread partial index'i ile okunur.
+
+    Args:
+        db: AsyncSession
+        user_ids: Sadece bu kullanıcılar (None ise tümü)
+
+    Returns:
+        Düzeltilen sayaç sayısı
+    """
+    ids = [str(user_id) for user_id in user_ids] if user_ids is not None else None
+    if ids is not None and not ids:
+        return 0
+
+    cutoff = notification_retention_cutoff()
+    actual = (
+        select(Notification.user_id, func.count().label("unread_count"))
+        .where(Notification.is_read == False, Notification.created_at >= cutoff)
+        .group_by(Notification.user_id)
+    )
+    if ids is not None:
+        actual = actual.where(Notification.user_id.in_(ids))
+
+    upsert = pg_insert(NotificationCounter).from_select(["user_id", "unread_count"], actual)
+    upserted = await db.execute(
+        upsert.on_conflict_do_update(
+            index_elements=[NotificationCounter.user_id],
+            set_={"unread_count": upsert.excluded.unread_count, "updated_at": func.now()},
+            where=NotificationCounter.unread_count != upsert.excluded.unread_count,
+        )
+    )
+
+    # Okunmamış bildirimi kalmayan ama sayacı sıfır olmayan kullanıcılar
+    has_unread = exists().where(
+        Notification.user_id == NotificationCounter.user_id,
+        Notification.is_read == False,
+        Notification.created_at >= cutoff,
+    )
+    stale = (
+        update(NotificationCounter)
+        .where(NotificationCounter.unread_count != 0, ~has_unread)
+        .values(unread_count=0)
+        .execution_options(synchronize_session=False)
+    )
+    if ids is not None:
+        stale = stale.where(NotificationCounter.user_id.in_(ids))
+    zeroed = await db.execute(stale)
+
+    return (upserted.rowcount or 0) + (zeroed.rowcount or 0)
+
+
+def _created_at_ranges() -> List[list]:
+    """
+    ID ile hedeflenen bildirimler için created_at koşulları, yeniden eskiye.
+
+    Bildirimler çoğunlukla oluşturulduktan kısa süre sonra okunur/açılır;
+    ilk aralık son iki partition'ı, ikincisi saklama süresinin kalanını kapsar.
+    """
+    retention = notification_retention_cutoff()
+    recent = max(recent_notification_cutoff(), retention)
+    ranges = [[Notification.created_at >= recent]]
+    if retention < recent:
+        ranges.append([Notification.created_at >= retention, Notification.created_at < recent])
+    return ranges
 
 
 # =============================================================================
@@ -75,8 +278,10 @@ async def create_notification(
 
     İş Akışı:
     1. Template'den title ve message render et
-    2. Notification kaydı oluştur
-    3. (TODO: Task 10.3) FCM push gönder
+    2. Notification kaydı oluştur (stream açıksa commit'te SSE olayı yayınlanır)
+    3. FCM token varsa push gönder (dispatch_pushes): push kuyruğu
+       çalışıyorsa commit sonrası kuyruğa alınır (toplu gönderim), değilse
+       istek içinde worker thread'de gönderilir
 
     Args:
         db: AsyncSession
@@ -96,7 +301,8 @@ async def create_notification(
     # Template'den title ve message render et
     title, message = render_notification_template(notification_type, context)
 
-    # Notification oluştur
+    # Notification oluştur (default partition yok; ayın partition'ı garanti edilir)
+    await ensure_current_notification_partitions(db)
     notification = Notification(
         user_id=user_id,
         notification_type=notification_type,
@@ -112,29 +318,182 @@ async def create_notification(
     db.add(notification)
     await db.flush()
     await db.refresh(notification)
+    await _increment_unread_counts(db, {str(user_id): 1})
+    if notification_broker.is_running:
+        await publish_notifications(db, [notification.id])
 
     # FCM push notification gönder
     if fcm_token:
-        from app.utils.fcm import send_push_notification
+        push = _push_message(
+            notification.id, notification_type, title, message, fcm_token, request_id, donation_id
+        )
 
-        push_sent = send_push_notification(
-            fcm_token=fcm_token,
-            title=title,
-            body=message,
-            data={
-                "notification_id": str(notification.id),
+        pending = [PendingPush(notification_id=str(notification.id), user_id=str(user_id), message=push)]
+        if await dispatch_pushes(db, pending):
+            await db.refresh(notification, attribute_names=["is_push_sent", "push_sent_at"])
+
+    return notification
+
+
+async def create_notifications_bulk(
+    db: AsyncSession,
+    recipients: Sequence[Tuple[str, Optional[str]]],
+    notification_type: str,
+    context: dict,
+    request_id: Optional[str] = None,
+    donation_id: Optional[str] = None,
+) -> List[str]:
+    """
+    Aynı içerikteki bildirimi birden fazla kullanıcıya tek seferde oluşturur.
+
+    Şablon bir kez render edilir ve tüm satırlar tek bir çok satırlı
+    INSERT ... RETURNING id ile yazılır. FCM token'ı olan alıcıların push'ları
+    kuyruk çalışıyorsa commit sonrası kuyruğa alınır, değilse tek bir
+    send_each çağrısıyla gönderilir ve geçici hatalar tekrar denenir
+    (dispatch_pushes).
+
+    Args:
+        db: AsyncSession
+        recipients: (user_id, fcm_token) listesi
+        notification_type: Bildirim türü
+        context: Template placeholder'ları için değerler
+        request_id: İlgili kan talebi ID'si (opsiyonel)
+        donation_id: İlgili bağış ID'si (opsiyonel)
+
+    Returns:
+        Oluşturulan bildirim ID'leri (recipients sırasıyla)
+
+    Raises:
+        BadRequestException: Geçersiz notification_type
+    """
+    title, message = render_notification_template(notification_type, context)
+
+    if not recipients:
+        return []
+
+    await ensure_current_notification_partitions(db)
+    result = await db.execute(
+        insert(Notification).returning(Notification.id, sort_by_parameter_order=True),
+        [
+            {
+                "user_id": user_id,
                 "notification_type": notification_type,
-                "request_id": request_id or "",
-                "donation_id": donation_id or "",
+                "title": title,
+                "message": message,
+                "blood_request_id": request_id,
+                "donation_id": donation_id,
+                "fcm_token": fcm_token,
+                "is_read": False,
+                "is_push_sent": False,
             }
+            for user_id, fcm_token in recipients
+        ],
+    )
+    notification_ids = list(result.scalars().all())
+    await _increment_unread_counts(db, Counter(str(user_id) for user_id, _ in recipients))
+    if notification_broker.is_running:
+        await publish_notifications(db, notification_ids)
+
+    pushes = [
+        PendingPush(
+            notification_id=notification_id,
+            user_id=str(user_id),
+            message=_push_message(
+                notification_id, notification_type, title, message, fcm_token, request_id, donation_id
+            ),
         )
+        for notification_id, (user_id, fcm_token) in zip(notification_ids, recipients)
+        if fcm_token
+    ]
+    await dispatch_pushes(db, pushes)
 
-        if push_sent:
-            notification.is_push_sent = True
-            notification.push_sent_at = datetime.now(timezone.utc)
-            await db.flush()
+    return notification_ids
 
-    return notification
+
+async def reopen_notifications(
+    db: AsyncSession,
+    notification_ids: Sequence[str],
+    notification_type: str,
+    context: dict,
+    request_id: str,
+    since: datetime,
+) -> List[str]:
+    """
+    Mevcut bildirimleri yeni talebe taşır ve yeniden okunmamış yapar.
+
+    Başlık/mesaj yeniden render edilir, is_read/read_at sıfırlanır ve daha
+    önce okunmuş satırların sahiplerinin okunmamış sayacı artırılır. Eski
+    is_read değeri aynı UPDATE'te tablonun kendisiyle join'den okunur.
+    Önceki talep covered_request_ids'e eklenir; bildirim o talep için de
+    gönderilmiş sayılmaya devam eder.
+
+    Args:
+        db: AsyncSession
+        notification_ids: Taşınacak bildirim ID'leri
+        notification_type: Bildirim türü
+        context: Template placeholder'ları için değerler
+        request_id: Yeni kan talebi ID'si
+        since: created_at alt sınırı (partition pruning)
+
+    Returns:
+        Güncellenen bildirim ID'leri
+
+    Raises:
+        BadRequestException: Geçersiz notification_type
+    """
+    title, message = render_notification_template(notification_type, context)
+
+    ids = [str(notification_id) for notification_id in notification_ids]
+    if not ids:
+        return []
+
+    previous = aliased(Notification)
+    result = await db.execute(
+        update(Notification)
+        .where(
+            Notification.id == previous.id,
+            Notification.created_at == previous.created_at,
+            Notification.created_at >= since,
+            previous.id.in_(ids),
+            previous.created_at >= since,
+        )
+        .values(
+            title=title,
+            message=message,
+            blood_request_id=request_id,
+            covered_request_ids=case(
+                (
+                    or_(previous.blood_request_id.is_(None), previous.blood_request_id == request_id),
+                    previous.covered_request_ids,
+                ),
+                else_=func.array_append(previous.covered_request_ids, previous.blood_request_id),
+            ),
+            is_read=False,
+            read_at=None,
+        )
+        .returning(Notification.id, Notification.user_id, previous.is_read)
+        .execution_options(synchronize_session=False)
+    )
+    rows = result.all()
+    await _increment_unread_counts(db, Counter(str(user_id) for _, user_id, was_read in rows if was_read))
+    reopened = [str(notification_id) for notification_id, _, _ in rows]
+    if notification_broker.is_running:
+        await publish_notifications(db, reopened)
+    return reopened
+
+
+# Bildirim listesi satırlarının kolonları (NotificationResponse alanları)
+NOTIFICATION_LIST_COLUMNS = (
+    Notification.id,
+    Notification.notification_type,
+    Notification.title,
+    Notification.message,
+    Notification.blood_request_id,
+    Notification.donation_id,
+    Notification.is_read,
+    Notification.read_at,
+    Notification.created_at,
+)
 
 
 async def get_user_notifications(
@@ -143,10 +502,15 @@ async def get_user_notifications(
     page: int = 1,
     size: int = 20,
     unread_only: bool = False
-) -> tuple[List[Notification], int, int]:
+) -> tuple[List[Row], int, int]:
     """
     Kullanıcının bildirimlerini listeler (pagination).
 
+    Sayfa, toplam ve okunmamış sayısı tek sorguda döner: toplamlar
+    LIMIT'ten önce hesaplanan window aggregate'lerdir (count(*) over ()),
+    sayfa idx_notifications_user_created_at sırasıyla okunur. ORM nesnesi
+    oluşturulmaz; satırlar NotificationResponse alanlarını doğrudan taşır.
+
     Args:
         db: AsyncSession
         user_id: Kullanıcı ID'si
@@ -155,53 +519,49 @@ async def get_user_notifications(
         unread_only: Sadece okunmamış bildirimleri getir
 
     Returns:
-        (notification listesi, toplam kayıt sayısı, okunmamış sayısı)
+        (bildirim satırları, toplam kayıt sayısı, okunmamış sayısı)
     """
-    # Base query
-    base_query = select(Notification).where(Notification.user_id == user_id)
-
-    # Unread filter
+    unread_filter = Notification.is_read.is_(False)
+    conditions = [
+        Notification.user_id == user_id,
+        Notification.created_at >= notification_retention_cutoff(),
+    ]
     if unread_only:
-        base_query = base_query.where(Notification.is_read == False)
-
-    # Toplam sayı
-    count_query = select(func.count()).select_from(Notification).where(
-        Notification.user_id == user_id
-    )
-    if unread_only:
-        count_query = count_query.where(Notification.is_read == False)
-
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Okunmamış sayısı (her zaman hesapla)
-    unread_count_result = await db.execute(
-        select(func.count()).select_from(Notification).where(
-            and_(
-                Notification.user_id == user_id,
-                Notification.is_read == False
-            )
-        )
-    )
-    unread_count = unread_count_result.scalar() or 0
+        conditions.append(unread_filter)
 
-    # Pagination ile getir
-    offset = (page - 1) * size
     result = await db.execute(
-        base_query
+        select(
+            *NOTIFICATION_LIST_COLUMNS,
+            func.count().over().label("total_count"),
+            func.count().filter(unread_filter).over().label("unread_count"),
+        )
+        .where(*conditions)
         .order_by(Notification.created_at.desc())
-        .offset(offset)
+        .offset((page - 1) * size)
         .limit(size)
     )
-    notifications = list(result.scalars().all())
+    rows = list(result.all())
+
+    if rows:
+        return rows, rows[0].total_count, rows[0].unread_count
 
-    return notifications, total, unread_count
+    # Son sayfanın ötesi: window aggregate satırsız kalır, toplamlar ayrıca sayılır
+    if page == 1:
+        return rows, 0, 0
+    totals = await db.execute(
+        select(func.count(), func.count().filter(unread_filter)).where(*conditions)
+    )
+    total, unread_count = totals.one()
+    return rows, total, unread_count
 
 
 async def get_unread_count(db: AsyncSession, user_id: str) -> int:
     """
     Kullanıcının okunmamış bildirim sayısını döner.
 
+    notifications tablosu taranmaz; notification_counters satırı okunur
+    (satır yoksa kullanıcının hiç okunmamış bildirimi yoktur).
+
     Args:
         db: AsyncSession
         user_id: Kullanıcı ID'si
@@ -210,14 +570,9 @@ async def get_unread_count(db: AsyncSession, user_id: str) -> int:
         Okunmamış bildirim sayısı
     """
     result = await db.execute(
-        select(func.count()).select_from(Notification).where(
-            and_(
-                Notification.user_id == user_id,
-                Notification.is_read == False
-            )
-        )
+        select(NotificationCounter.unread_count).where(NotificationCounter.user_id == user_id)
     )
-    return result.scalar() or 0
+    return result.scalar_one_or_none() or 0
 
 
 async def mark_as_read(
@@ -241,21 +596,33 @@ async def mark_as_read(
 
     now = datetime.now(timezone.utc)
 
-    # Kullanıcının kendi bildirimlerini güncelle
-    result = await db.execute(
-        update(Notification)
-        .where(
-            and_(
-                Notification.id.in_(notification_ids),
-                Notification.user_id == user_id,
-                Notification.is_read == False
+    # Kullanıcının kendi bildirimlerini güncelle; eski partition'lara sadece
+    # son aylarda bulunamayan ID'ler için bakılır
+    remaining = {str(notification_id) for notification_id in notification_ids}
+    marked = 0
+    for created_at_range in _created_at_ranges():
+        result = await db.execute(
+            update(Notification)
+            .where(
+                and_(
+                    Notification.id.in_(list(remaining)),
+                    Notification.user_id == user_id,
+                    Notification.is_read == False,
+                    *created_at_range,
+                )
             )
+            .values(is_read=True, read_at=now)
+            .returning(Notification.id)
         )
-        .values(is_read=True, read_at=now)
-    )
+        updated_ids = {str(notification_id) for notification_id in result.scalars().all()}
+        marked += len(updated_ids)
+        remaining -= updated_ids
+        if not remaining:
+            break
 
+    await _decrement_unread_count(db, user_id, marked)
     await db.flush()
-    return result.rowcount
+    return marked
 
 
 async def mark_all_as_read(db: AsyncSession, user_id: str) -> int:
@@ -276,12 +643,15 @@ async def mark_all_as_read(db: AsyncSession, user_id: str) -> int:
         .where(
             and_(
                 Notification.user_id == user_id,
-                Notification.is_read == False
+                Notification.is_read == False,
+                Notification.created_at >= notification_retention_cutoff(),
             )
         )
         .values(is_read=True, read_at=now)
     )
 
+    # Sıfırlamak yerine düşülür; eşzamanlı eklenen bildirim sayaçta kalır
+    await _decrement_unread_count(db, user_id, result.rowcount)
     await db.flush()
     return result.rowcount
 
@@ -300,7 +670,11 @@ async def get_notification_by_id(
     Returns:
         Notification objesi veya None
     """
-    result = await db.execute(
-        select(Notification).where(Notification.id == notification_id)
-    )
-    return result.scalar_one_or_none()
\ No newline at end of file
+    for created_at_range in _created_at_ranges():
+        result = await db.execute(
+            select(Notification).where(Notification.id == notification_id, *created_at_range)
+        )
+        notification = result.scalar_one_or_none()
+        if notification is not None:
+            return notification
+    return None
\ No newline at end of file
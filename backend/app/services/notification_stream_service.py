@@ -0,0 +1,294 @@
+"""
+Notification Stream Service for KanVer API.
+
+Bu dosya, uygulama içi bildirimlerin Server-Sent Events (SSE) ile
+bağlı kullanıcılara iletilmesini sağlar.
+
+Akış:
+- create_notification / create_notifications_bulk, bildirimi yazan
+  transaction içinde pg_notify çağırır; NOTIFY transactional olduğundan
+  olay yalnızca commit'te yayınlanır, rollback'te atılır
+- Her worker tek bir LISTEN bağlantısıyla (notification_listener) kanalı
+  dinler ve olayı process-içi broker üzerinden o kullanıcının açık
+  bağlantılarına dağıtır
+- Yeniden bağlanan istemci Last-Event-ID ile kaçırdığı bildirimleri alır
+- Yavaş tüketicinin kuyruğu dolarsa bağlantı kapatılır; istemci
+  Last-Event-ID ile yeniden bağlanıp eksikleri tamamlar
+
+Broker başlatılmadıkça (startup'ta) NOTIFY gönderilmez ve stream endpoint'i
+503 döner.
+"""
+import asyncio
+import json
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import Row, Text, cast, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Notification
+from app.services.notification_partition_service import (
+    notification_retention_cutoff,
+    recent_notification_cutoff,
+)
+from app.schemas import NotificationResponse
+
+
+# Postgres NOTIFY kanalı
+NOTIFICATION_CHANNEL = "kanver_notifications"
+
+# SSE istemcisine önerilen yeniden bağlanma süresi (ms)
+STREAM_RETRY_MS = 3000
+
+
+class NotificationSubscription:
+    """Bir SSE bağlantısının olay kuyruğu."""
+
+    def __init__(self, user_id: str, max_size: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self.closed = False
+
+    def close(self) -> None:
+        """Bağlantıyı kapanmak üzere işaretler ve bekleyen okuyucuyu uyandırır."""
+        self.closed = True
+        try:
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            # Okuyucu kuyruğu boşaltınca closed bayrağını görür
+            pass
+
+
+class NotificationBroker:
+    """
+    Worker içindeki SSE bağlantılarına kullanıcı bazlı olay dağıtan pub/sub.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[NotificationSubscription]] = {}
+        self._running = False
+
+    @property
+    def is_running(self) -> bool:
+        """Broker LISTEN task'ı ile birlikte başlatıldıysa True."""
+        return self._running
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(subscriptions) for subscriptions in self._subscribers.values())
+
+    def start(self) -> None:
+        self._running = True
+
+    def stop(self) -> None:
+        """Tüm bağlantıları kapatır; yeni abonelik kabul edilmez."""
+        self._running = False
+        for subscriptions in list(self._subscribers.values()):
+            for subscription in list(subscriptions):
+                subscription.close()
+        self._subscribers.clear()
+
+    def subscribe(self, user_id: str, max_size: int) -> NotificationSubscription:
+        subscription = NotificationSubscription(str(user_id), max_size)
+        self._subscribers.setdefault(subscription.user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: NotificationSubscription) -> None:
+        subscriptions = self._subscribers.get(subscription.user_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id: str, event: dict) -> int:
+        """
+        Olayı kullanıcının bu worker'daki tüm bağlantılarına iletir.
+
+        Kuyruğu dolu bağlantı kapatılır (istemci Last-Event-ID ile devam eder).
+
+        Args:
+            user_id: Hedef kullanıcı ID'si
+            event: NotificationResponse alanlarını taşıyan dict
+
+        Returns:
+            Olayın iletildiği bağlantı sayısı
+        """
+        delivered = 0
+        for subscription in list(self._subscribers.get(str(user_id), ())):
+            try:
+                subscription.queue.put_nowait(event)
+                delivered += 1
+            except asyncio.QueueFull:
+                subscription.close()
+                self.unsubscribe(subscription)
+        return delivered
+
+
+# Process-genel broker instance'ı
+notification_broker = NotificationBroker()
+
+
+def dispatch_notify_payload(payload: str) -> int:
+    """
+    LISTEN bağlantısından gelen NOTIFY payload'ını broker'a iletir.
+
+    Args:
+        payload: publish_notifications'ın ürettiği JSON
+
+    Returns:
+        Olayın iletildiği bağlantı sayısı
+    """
+    event = json.loads(payload)
+    user_id = event.pop("user_id")
+    return notification_broker.publish(user_id, event)
+
+
+async def publish_notifications(db: AsyncSession, notification_ids: Iterable[str]) -> None:
+    """
+    Bildirimler için transaction içinde pg_notify çağırır.
+
+    Payload, satırlardan Postgres tarafında tek sorguda oluşturulur
+    (server-side created_at dahil). Olaylar commit'te tüm worker'lara
+    ulaşır; transaction rollback olursa hiç yayınlanmaz.
+
+    Args:
+        db: AsyncSession
+        notification_ids: Yayınlanacak bildirim ID'leri
+    """
+    ids = [str(notification_id) for notification_id in notification_ids]
+    if not ids:
+        return
+
+    payload = func.json_build_object(
+        "user_id", Notification.user_id,
+        "id", Notification.id,
+        "notification_type", Notification.notification_type,
+        "title", Notification.title,
+        "message", Notification.message,
+        "request_id", Notification.blood_request_id,
+        "donation_id", Notification.donation_id,
+        "is_read", Notification.is_read,
+        "read_at", Notification.read_at,
+        "created_at", Notification.created_at,
+    )
+    await db.execute(
+        select(func.pg_notify(NOTIFICATION_CHANNEL, cast(payload, Text)))
+        .where(Notification.id.in_(ids), Notification.created_at >= recent_notification_cutoff())
+    )
+
+
+async def get_notifications_since(
+    db: AsyncSession,
+    user_id: str,
+    last_event_id: Optional[str],
+    limit: int,
+) -> List[Row]:
+    """
+    Last-Event-ID'den sonra oluşturulan bildirimleri eskiden yeniye döner.
+
+    Sıralama (created_at, id) üzerindendir; ID kullanıcıya ait değilse
+    veya bulunamazsa tekrar gönderim yapılmaz.
+
+    Args:
+        db: AsyncSession
+        user_id: Kullanıcı ID'si
+        last_event_id: İstemcinin aldığı son bildirim ID'si
+        limit: En fazla döndürülecek bildirim
+
+    Returns:
+        NotificationResponse alanlarını taşıyan satırlar
+    """
+    if not last_event_id:
+        return []
+
+    last_result = await db.execute(
+        select(Notification.created_at, Notification.id)
+        .where(
+            Notification.id == last_event_id,
+            Notification.user_id == user_id,
+            Notification.created_at >= notification_retention_cutoff(),
+        )
+    )
+    last = last_result.first()
+    if last is None:
+        return []
+
+    result = await db.execute(
+        select(
+            Notification.id,
+            Notification.notification_type,
+            Notification.title,
+            Notification.message,
+            Notification.blood_request_id.label("request_id"),
+            Notification.donation_id,
+            Notification.is_read,
+            Notification.read_at,
+            Notification.created_at,
+        )
+        .where(
+            Notification.user_id == user_id,
+            # Ayrı alt sınır planner'ın eski partition'ları elemesini sağlar
+            Notification.created_at >= last.created_at,
+            tuple_(Notification.created_at, Notification.id) > tuple_(last.created_at, last.id),
+        )
+        .order_by(Notification.created_at, Notification.id)
+        .limit(limit)
+    )
+    return list(result.all())
+
+
+def format_sse(data: str, event: Optional[str] = None, event_id: Optional[str] = None) -> str:
+    """Tek bir SSE mesajını wire formatına çevirir."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.extend(f"data: {line}" for line in data.splitlines() or [""])
+    return "\n".join(lines) + "\n\n"
+
+
+async def stream_notification_events(
+    subscription: NotificationSubscription,
+    replay: Iterable[Row],
+    heartbeat_seconds: float,
+) -> AsyncIterator[str]:
+    """
+    Bir SSE bağlantısının mesajlarını üretir.
+
+    Önce tekrar gönderilecek bildirimler, ardından canlı olaylar gönderilir;
+    olay gelmeyen her heartbeat_seconds'ta yorum satırı (ping) yazılır.
+    Abonelik tekrar sorgusundan önce açıldığından aradaki olaylar
+    kaçırılmaz; hem tekrar listesinde hem canlı gelenler bir kez gönderilir.
+
+    Args:
+        subscription: Broker aboneliği (bitince kaldırılır)
+        replay: get_notifications_since satırları
+        heartbeat_seconds: Ping aralığı
+    """
+    replayed_ids: Set[str] = set()
+    try:
+        yield f"retry: {STREAM_RETRY_MS}\n\n"
+
+        for row in replay:
+            item = NotificationResponse.model_validate(row._mapping)
+            replayed_ids.add(item.id)
+            yield format_sse(item.model_dump_json(), event="notification", event_id=item.id)
+
+        while True:
+            if subscription.closed and subscription.queue.empty():
+                return
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if event is None:
+                return
+
+            item = NotificationResponse.model_validate(event)
+            if item.id in replayed_ids:
+                continue
+            yield format_sse(item.model_dump_json(), event="notification", event_id=item.id)
+    finally:
+        notification_broker.unsubscribe(subscription)
@@ -0,0 +1,317 @@
+"""
+Notification Throttle Service for KanVer API.
+
+Bu dosya, NEW_REQUEST bildirimleri için bağışçı bazlı throttle ve
+tekilleştirme katmanını içerir. Aynı hastanede art arda açılan (veya
+yeniden oluşturulan) taleplerde:
+- Pencere içinde aynı hastane + kan grubu için bildirim almış bağışçıya
+  yeni satır yazılmaz; mevcut bildirimi yeni talebe taşınır ve yeniden
+  okunmamış yapılır (collapse)
+- Pencere içinde NOTIFICATION_THROTTLE_MAX_PUSHES push almış bağışçının
+  bildirimi push'suz (sadece uygulama içi) oluşturulur
+
+Son gönderim durumu process-içi tutulur (startup'ta başlatılır). Bellekte
+olmayan ya da durumu bir pencereden eski bağışçılar tek sorguyla DB'den
+yüklenir; throttle başlatılmamışsa her karar DB'den verilir. Worker'lar
+arası paylaşılmadığından sınır en fazla bir pencere gecikmeyle tutarlıdır.
+
+Pencere bildirimin created_at'inden ölçülür; collapse pencereyi uzatmaz.
+updated_at okundu işaretleme, push gönderimi ve token temizliğiyle de
+değiştiği için saat olarak kullanılmaz.
+"""
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.constants import NotificationType
+from app.database import run_after_commit
+from app.models import BloodRequest, Notification
+from app.services.notification_partition_service import recent_notification_cutoff
+from app.services.notification_service import create_notifications_bulk, reopen_notifications
+
+
+DedupKey = Tuple[str, str]  # (hospital_id, blood_type)
+
+
+@dataclass
+class _DonorState:
+    """Bir bağışçının pencere içindeki NEW_REQUEST geçmişi."""
+
+    loaded_at: datetime
+    pushes: Deque[datetime] = field(default_factory=deque)
+    recent: Dict[DedupKey, Tuple[str, datetime]] = field(default_factory=dict)  # → (notification_id, zaman)
+
+
+@dataclass(frozen=True)
+class ThrottleDecision:
+    """Bir bildirim dalgası için throttle kararı."""
+
+    deliver: List[Tuple[str, Optional[str]]] = field(default_factory=list)  # (user_id, fcm_token); token None ise push yok
+    collapse: List[Tuple[str, str, Optional[str]]] = field(default_factory=list)  # (user_id, notification_id, fcm_token)
+    capped: int = 0  # Push'u kesilen bağışçı sayısı
+
+
+class NotificationThrottle:
+    """
+    Bağışçı bazlı son push zamanları ve (hastane, kan grubu) bildirimleri.
+    """
+
+    def __init__(self, window: timedelta, max_pushes: int):
+        self.window = window
+        self.max_pushes = max_pushes
+        self._users: Dict[str, _DonorState] = {}
+        self._running = False
+        self._last_sweep: Optional[datetime] = None
+
+    @property
+    def is_running(self) -> bool:
+        """Throttle durumu startup'ta başlatıldıysa True."""
+        return self._running
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def start(self) -> None:
+        self._running = True
+
+    def reset(self) -> None:
+        """Tüm durumu atar ve throttle'ı durdurur."""
+        self._users.clear()
+        self._running = False
+        self._last_sweep = None
+
+    def knows(self, user_id: str, now: datetime) -> bool:
+        """Bağışçının durumu bellekte ve bir pencereden yeni mi."""
+        state = self._users.get(user_id)
+        return state is not None and now - state.loaded_at < self.window
+
+    def load(
+        self,
+        user_id: str,
+        pushes: Sequence[datetime],
+        recent: Dict[DedupKey, Tuple[str, datetime]],
+        now: datetime,
+    ) -> None:
+        """DB'den okunan durumu bağışçı için yazar (öncekinin yerine)."""
+        self._users[user_id] = _DonorState(loaded_at=now, pushes=deque(sorted(pushes)), recent=dict(recent))
+
+    def decide(
+        self,
+        recipients: Sequence[Tuple[str, Optional[str]]],
+        key: DedupKey,
+        now: datetime,
+    ) -> ThrottleDecision:
+        """
+        Alıcıları yeni bildirim, push'suz bildirim ve collapse olarak ayırır.
+
+        Args:
+            recipients: (user_id, fcm_token) listesi
+            key: Talebin (hastane, kan grubu) anahtarı
+            now: Referans zaman
+
+        Returns:
+            ThrottleDecision
+        """
+        self._sweep(now)
+        window_start = now - self.window
+
+        deliver = []
+        collapse = []
+        capped = 0
+        for user_id, fcm_token in recipients:
+            state = self._users.get(user_id)
+            if state is not None:
+                recent = state.recent.get(key)
+                if recent is not None and recent[1] >= window_start:
+                    collapse.append((user_id, recent[0], fcm_token))
+                    continue
+                while state.pushes and state.pushes[0] < window_start:
+                    state.pushes.popleft()
+                if fcm_token and len(state.pushes) >= self.max_pushes:
+                    fcm_token = None
+                    capped += 1
+            deliver.append((user_id, fcm_token))
+
+        return ThrottleDecision(deliver=deliver, collapse=collapse, capped=capped)
+
+    def record(
+        self,
+        deliveries: Sequence[Tuple[str, str, bool]],
+        key: DedupKey,
+        at: datetime,
+    ) -> None:
+        """
+        Commit edilmiş bildirimleri bağışçı durumlarına işler.
+
+        Bellekte olmayan bağışçılar atlanır; bir sonraki kararda DB'den yüklenir.
+
+        Args:
+            deliveries: (user_id, notification_id, push_gönderildi_mi) listesi
+            key: Talebin (hastane, kan grubu) anahtarı
+            at: Bildirim zamanı
+        """
+        for user_id, notification_id, pushed in deliveries:
+            state = self._users.get(user_id)
+            if state is None:
+                continue
+            state.recent[key] = (notification_id, at)
+            if pushed:
+                state.pushes.append(at)
+
+    def _sweep(self, now: datetime) -> None:
+        """Pencere başına bir kez, süresi dolmuş bağışçı durumlarını atar."""
+        if self._last_sweep is not None and now - self._last_sweep < self.window:
+            return
+        self._last_sweep = now
+        expired = [user_id for user_id, state in self._users.items() if now - state.loaded_at >= self.window]
+        for user_id in expired:
+            del self._users[user_id]
+
+
+# Process-genel throttle instance'ı
+notification_throttle = NotificationThrottle(
+    window=timedelta(minutes=settings.NOTIFICATION_THROTTLE_WINDOW_MINUTES),
+    max_pushes=settings.NOTIFICATION_THROTTLE_MAX_PUSHES,
+)
+
+
+async def load_throttle_state(
+    db: AsyncSession,
+    throttle: NotificationThrottle,
+    user_ids: Sequence[str],
+    now: datetime,
+) -> None:
+    """
+    Bağışçıların pencere içindeki NEW_REQUEST geçmişini tek sorguda yükler.
+
+    Push sayısı ve tekilleştirme, pencere içinde oluşturulan bildirimlerden
+    (created_at) hesaplanır.
+
+    Args:
+        db: AsyncSession
+        throttle: Durumun yazılacağı throttle
+        user_ids: Yüklenecek bağışçılar
+        now: Referans zaman
+    """
+    if not user_ids:
+        return
+    window_start = now - throttle.window
+
+    result = await db.execute(
+        select(
+            Notification.user_id,
+            Notification.id,
+            Notification.created_at,
+            Notification.fcm_token.is_not(None).label("pushed"),
+            BloodRequest.hospital_id,
+            BloodRequest.blood_type,
+        )
+        .join(BloodRequest, BloodRequest.id == Notification.blood_request_id)
+        .where(
+            Notification.user_id.in_(user_ids),
+            Notification.notification_type == NotificationType.NEW_REQUEST.value,
+            Notification.created_at >= window_start,
+        )
+    )
+
+    pushes: Dict[str, List[datetime]] = {user_id: [] for user_id in user_ids}
+    recent: Dict[str, Dict[DedupKey, Tuple[str, datetime]]] = {user_id: {} for user_id in user_ids}
+    for row in result.all():
+        user_id = str(row.user_id)
+        if row.pushed:
+            pushes[user_id].append(row.created_at)
+        key = (str(row.hospital_id), row.blood_type)
+        latest = recent[user_id].get(key)
+        if latest is None or row.created_at > latest[1]:
+            recent[user_id][key] = (str(row.id), row.created_at)
+
+    for user_id in user_ids:
+        throttle.load(user_id, pushes[user_id], recent[user_id], now)
+
+
+async def create_request_notifications(
+    db: AsyncSession,
+    blood_request: BloodRequest,
+    recipients: Sequence[Tuple[str, Optional[str]]],
+    context: dict,
+    now: Optional[datetime] = None,
+) -> ThrottleDecision:
+    """
+    NEW_REQUEST bildirimlerini throttle ve tekilleştirmeden geçirerek oluşturur.
+
+    İş Akışı:
+    1. Bellekte olmayan bağışçıların durumu DB'den yüklenir
+    2. Aynı (hastane, kan grubu) bildirimi pencere içinde olanlar için mevcut
+       bildirim reopen_notifications ile bu talebe taşınır ve okunmamış
+       yapılır (yeni satır ve push yok)
+    3. Kalanlar create_notifications_bulk ile yazılır; push sınırını
+       aşanların token'ı düşürülür
+    4. Commit sonrası bellek durumu güncellenir
+
+    Args:
+        db: AsyncSession
+        blood_request: Bildirimin ait olduğu kan talebi
+        recipients: (user_id, fcm_token) listesi
+        context: Template placeholder'ları için değerler
+        now: Referans zaman (test için)
+
+    Returns:
+        Uygulanan ThrottleDecision
+    """
+    now = now or datetime.now(timezone.utc)
+    key: DedupKey = (str(blood_request.hospital_id), blood_request.blood_type)
+
+    throttle = notification_throttle
+    if not throttle.is_running:
+        # Kalıcı durum yok: karar yalnızca DB'den verilir
+        throttle = NotificationThrottle(notification_throttle.window, notification_throttle.max_pushes)
+
+    unknown = [str(user_id) for user_id, _ in recipients if not throttle.knows(str(user_id), now)]
+    await load_throttle_state(db, throttle, unknown, now)
+    decision = throttle.decide([(str(user_id), token) for user_id, token in recipients], key, now)
+
+    deliver = list(decision.deliver)
+    collapsed: List[Tuple[str, str]] = []
+    if decision.collapse:
+        updated = set(await reopen_notifications(
+            db,
+            [notification_id for _, notification_id, _ in decision.collapse],
+            notification_type=NotificationType.NEW_REQUEST.value,
+            context=context,
+            request_id=str(blood_request.id),
+            since=recent_notification_cutoff(now),
+        ))
+        for user_id, notification_id, fcm_token in decision.collapse:
+            if notification_id in updated:
+                collapsed.append((user_id, notification_id))
+            else:
+                # Bildirim artık yok (silinmiş partition vb.); normal yoldan gönder
+                deliver.append((user_id, fcm_token))
+
+    notification_ids = await create_notifications_bulk(
+        db,
+        deliver,
+        notification_type=NotificationType.NEW_REQUEST.value,
+        context=context,
+        request_id=str(blood_request.id),
+    )
+
+    if notification_throttle.is_running:
+        deliveries = [
+            (user_id, str(notification_id), bool(fcm_token))
+            for notification_id, (user_id, fcm_token) in zip(notification_ids, deliver)
+        ]
+        run_after_commit(db, partial(notification_throttle.record, deliveries, key, now))
+
+    collapsed_ids = {notification_id for _, notification_id in collapsed}
+    return ThrottleDecision(
+        deliver=deliver,
+        collapse=[entry for entry in decision.collapse if entry[1] in collapsed_ids],
+        capped=decision.capped,
+    )
@@ -0,0 +1,287 @@
+"""
+Push Dispatch Service for KanVer API.
+
+Bu dosya, FCM push bildirimleri için process-içi gönderim kuyruğunu içerir.
+
+Bildirim oluşturan istek, FCM'e tek tek HTTPS çağrısı yapmak yerine:
+- Push mesajını transaction commit edildikten sonra kuyruğa ekler
+- Push sender (background task) kuyruğu PUSH_BATCH_SIZE'lık parçalar halinde
+  boşaltır, messaging.send_each ile worker thread'de gönderir
+- Başarılı gönderimlerin is_push_sent/push_sent_at alanları tek UPDATE ile yazılır
+- Kalıcı olarak geçersiz (UNREGISTERED) token'lar users ve notifications
+  tablolarından toplu olarak silinir; kullanıcı donor index'ten düşer
+- Geçici (TRANSIENT) hatalar üstel bekleme ile PUSH_MAX_ATTEMPTS'e kadar
+  tekrar denenir
+
+Kuyruk başlatılmadıkça (startup'ta) push'lar bildirimi oluşturan istek içinde
+aynı send_pushes yoluyla (worker thread'de) gönderilir; geçici hatalar istek
+içinde üstel bekleme ile tekrar denenir.
+"""
+import asyncio
+import dataclasses
+import heapq
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import partial
+from typing import Deque, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import run_after_commit
+from app.models import Notification, User
+from app.services.donor_index_service import untrack_donors
+from app.services.notification_partition_service import (
+    notification_retention_cutoff,
+    recent_notification_cutoff,
+)
+from app.utils.fcm import PushMessage, PushOutcome
+
+
+@dataclass(frozen=True)
+class PendingPush:
+    """Gönderilmeyi bekleyen push mesajı."""
+
+    notification_id: str
+    user_id: str
+    message: PushMessage
+    attempts: int = 0  # Geçici hatayla sonuçlanan önceki deneme sayısı
+
+
+@dataclass(frozen=True)
+class PushReport:
+    """send_pushes sonucu."""
+
+    sent: int = 0
+    pruned: int = 0  # fcm_token'ı silinen kullanıcı sayısı
+    retry: List[PendingPush] = field(default_factory=list)
+
+
+class PushQueue:
+    """
+    Commit edilmiş bildirimlerin push mesajlarını tutan FIFO kuyruk.
+    """
+
+    def __init__(self):
+        self._pending: Deque[PendingPush] = deque()
+        # Tekrar denenecek push'lar: (zaman, sıra, push) min-heap'i
+        self._delayed: List[Tuple[float, int, PendingPush]] = []
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._running = False
+
+    @property
+    def is_running(self) -> bool:
+        """Kuyruk push sender ile birlikte başlatıldıysa True."""
+        return self._running
+
+    def __len__(self) -> int:
+        return len(self._pending) + len(self._delayed)
+
+    def start(self) -> None:
+        # Event, çalışan event loop içinde oluşturulur
+        self._wakeup = asyncio.Event()
+        self._running = True
+
+    def stop(self) -> None:
+        """
+        Yeni push kabulünü durdurur; bekleyenler drain ile alınabilir.
+
+        Ertelenmiş tekrarlar beklemeden bekleyenlere alınır; shutdown'daki
+        son boşaltmada bir kez daha denenirler.
+        """
+        self._running = False
+        while self._delayed:
+            self._pending.append(heapq.heappop(self._delayed)[2])
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def enqueue(self, push: PendingPush) -> None:
+        self._pending.append(push)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def extend(self, pushes: Iterable[PendingPush]) -> None:
+        for push in pushes:
+            self.enqueue(push)
+
+    def enqueue_after_commit(self, db: AsyncSession, pushes: List[PendingPush]) -> None:
+        """Push'ları session commit edildikten sonra kuyruğa ekler (rollback'te atılır)."""
+        run_after_commit(db, partial(self.extend, list(pushes)))
+
+    def retry_later(self, pushes: Iterable[PendingPush], base_delay: float) -> None:
+        """
+        Geçici hatayla sonuçlanan push'ları üstel bekleme ile tekrar kuyruğa alır.
+
+        Bekleme süresi base_delay * 2^(attempts - 1) saniyedir.
+        """
+        now = time.monotonic()
+        for push in pushes:
+            delay = base_delay * 2 ** max(push.attempts - 1, 0)
+            heapq.heappush(self._delayed, (now + delay, next(self._sequence), push))
+
+    def clear(self) -> None:
+        """Bekleyen ve ertelenmiş tüm push'ları atar."""
+        self._pending.clear()
+        self._delayed = []
+
+    def _promote_due(self) -> None:
+        now = time.monotonic()
+        while self._delayed and self._delayed[0][0] <= now:
+            self._pending.append(heapq.heappop(self._delayed)[2])
+
+    def drain(self, limit: int) -> List[PendingPush]:
+        """Kuyruğun başından (zamanı gelen tekrarlar dahil) en fazla limit kadar push alır."""
+        self._promote_due()
+        count = min(limit, len(self._pending))
+        return [self._pending.popleft() for _ in range(count)]
+
+    def requeue(self, entries: Iterable[PendingPush]) -> None:
+        """Gönderilemeyen push'ları sıralarını koruyarak kuyruğun başına geri koyar."""
+        self._pending.extendleft(reversed(list(entries)))
+
+    async def wait(self, timeout: float) -> None:
+        """
+        Kuyrukta push olana kadar (en fazla timeout saniye) bekler.
+
+        Args:
+            timeout: Maksimum bekleme süresi (saniye)
+        """
+        self._promote_due()
+        if self._pending or self._wakeup is None:
+            return
+        if self._delayed:
+            timeout = min(timeout, max(self._delayed[0][0] - time.monotonic(), 0))
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+# Process-genel kuyruk instance'ı
+push_queue = PushQueue()
+
+
+async def prune_fcm_tokens(db: AsyncSession, user_tokens: Sequence[Tuple[str, str]]) -> int:
+    """
+    FCM'in kalıcı olarak reddettiği token'ları siler.
+
+    users.fcm_token yalnızca hâlâ aynı token'ı taşıyorsa silinir (bu arada
+    yeni token kaydeden kullanıcı etkilenmez). Token'ı silinen kullanıcılar
+    artık bağışçı eşleşmesine girmez; commit sonrasında donor index'ten düşer.
+
+    Args:
+        db: AsyncSession
+        user_tokens: (user_id, fcm_token) çiftleri
+
+    Returns:
+        fcm_token'ı silinen kullanıcı sayısı
+    """
+    pairs = sorted(set(user_tokens))
+    if not pairs:
+        return 0
+
+    result = await db.execute(
+        update(User)
+        .where(tuple_(User.id, User.fcm_token).in_(pairs))
+        .values(fcm_token=None)
+        .returning(User.id)
+        .execution_options(synchronize_session=False)
+    )
+    pruned_ids = list(result.scalars().all())
+
+    # Bekleyen/geçmiş bildirimlerdeki aynı token (idx_notifications_user_created_at ile)
+    await db.execute(
+        update(Notification)
+        .where(
+            tuple_(Notification.user_id, Notification.fcm_token).in_(pairs),
+            Notification.created_at >= notification_retention_cutoff(),
+        )
+        .values(fcm_token=None)
+        .execution_options(synchronize_session=False)
+    )
+
+    untrack_donors(db, pruned_ids)
+    return len(pruned_ids)
+
+
+async def send_pushes(db: AsyncSession, entries: List[PendingPush]) -> PushReport:
+    """
+    Push'ları send_each ile toplu gönderir ve sonuçlarını toplu olarak işler.
+
+    FCM çağrısı event loop'u bloklamaması için worker thread'de yapılır.
+    Başarılı olanlar tek UPDATE ile işaretlenir, UNREGISTERED token'lar
+    silinir; TRANSIENT hatalar deneme hakkı kaldıysa retry listesinde döner.
+
+    Args:
+        db: AsyncSession
+        entries: Gönderilecek push'lar
+
+    Returns:
+        PushReport (gönderilen, silinen token ve tekrar denenecek push'lar)
+    """
+    if not entries:
+        return PushReport()
+
+    from app.utils.fcm import send_push_batch
+
+    outcomes = await asyncio.to_thread(send_push_batch, [entry.message for entry in entries])
+
+    sent_ids: List[str] = []
+    dead_tokens: List[Tuple[str, str]] = []
+    retry: List[PendingPush] = []
+    for entry, outcome in zip(entries, outcomes):
+        if outcome == PushOutcome.SENT:
+            sent_ids.append(entry.notification_id)
+        elif outcome == PushOutcome.UNREGISTERED:
+            dead_tokens.append((entry.user_id, entry.message.fcm_token))
+        elif outcome == PushOutcome.TRANSIENT and entry.attempts + 1 < settings.PUSH_MAX_ATTEMPTS:
+            retry.append(dataclasses.replace(entry, attempts=entry.attempts + 1))
+
+    if sent_ids:
+        await db.execute(
+            update(Notification)
+            .where(Notification.id.in_(sent_ids), Notification.created_at >= recent_notification_cutoff())
+            .values(is_push_sent=True, push_sent_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+
+    pruned = await prune_fcm_tokens(db, dead_tokens)
+    return PushReport(sent=len(sent_ids), pruned=pruned, retry=retry)
+
+
+async def dispatch_pushes(db: AsyncSession, pushes: List[PendingPush]) -> int:
+    """
+    Push'ları kuyruk çalışıyorsa commit sonrası kuyruğa alır, değilse hemen gönderir.
+
+    Kuyruksuz gönderim send_pushes ile (FCM çağrısı worker thread'de) yapılır;
+    geçici hatalar PUSH_RETRY_BASE_SECONDS'tan başlayan üstel bekleme ile
+    PUSH_MAX_ATTEMPTS'e kadar istek içinde tekrar denenir.
+
+    Args:
+        db: AsyncSession
+        pushes: Gönderilecek push'lar
+
+    Returns:
+        Hemen gönderilen push sayısı (kuyruğa alındıysa 0)
+    """
+    if not pushes:
+        return 0
+    if push_queue.is_running:
+        push_queue.enqueue_after_commit(db, pushes)
+        return 0
+
+    sent = 0
+    pending = list(pushes)
+    while pending:
+        report = await send_pushes(db, pending)
+        sent += report.sent
+        pending = report.retry
+        if pending:
+            await asyncio.sleep(settings.PUSH_RETRY_BASE_SECONDS * 2 ** (pending[0].attempts - 1))
+    return sent
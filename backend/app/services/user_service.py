@@ -5,15 +5,18 @@ Bu dosya, kullanıcı yönetimi ile ilgili business logic fonksiyonlarını içe
 Router'lar bu servis katmanını kullanarak veritabanı işlemlerini gerçekleştirir.
 """
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Optional, Tuple
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.constants import LocationUpdateStatus
 from app.models import User
 from app.utils.helpers import normalize_phone
-from app.utils.location import create_point_wkt
+from app.utils.location import create_point_wkt, extract_coordinates
 from app.core.exceptions import ConflictException
+from app.services.donor_index_service import track_donor
+from app.services.location_buffer_service import location_buffer
 
 
 # =============================================================================
@@ -143,6 +146,10 @@ async def update_user_profile(
     # İlişkili verileri yeniden yükle
     await db.refresh(user)
 
+    # FCM token değişimi bağışçı index'indeki uygunluğu etkiler
+    if "fcm_token" in update_data:
+        track_donor(db, user)
+
     return user
 
 
@@ -185,9 +192,50 @@ async def update_user_location(
     await db.flush()
     await db.refresh(user)
 
+    track_donor(db, user, latitude, longitude)
+
     return user
 
 
+async def ingest_user_location(
+    db: AsyncSession,
+    user: User,
+    latitude: float,
+    longitude: float
+) -> Tuple[User, LocationUpdateStatus]:
+    """
+    Konum ping'ini işler.
+
+    Location buffer çalışıyorsa konum buffer'a alınır (hareket eşiğinin
+    altındaysa atılır) ve DB'ye location flusher tarafından toplu yazılır.
+    Buffer kapalıysa veya kullanıcının henüz kayıtlı konumu yoksa
+    update_user_location ile doğrudan yazılır.
+
+    Args:
+        db: AsyncSession
+        user: Konumu güncellenecek User objesi
+        latitude: Enlem (-90 ile +90 arası)
+        longitude: Boylam (-180 ile +180 arası)
+
+    Returns:
+        (User objesi, konum durumu); PENDING ve IGNORED durumlarında
+        User'ın konum alanı gönderilen konumu yansıtmaz
+
+    Raises:
+        ValueError: Latitude veya longitude geçersiz aralıktaysa
+    """
+    previous = extract_coordinates(user.location)
+    if not location_buffer.is_running or previous is None:
+        user = await update_user_location(db, user, latitude, longitude)
+        return user, LocationUpdateStatus.ACCEPTED
+
+    # Aralık doğrulaması doğrudan yolla aynı olsun
+    create_point_wkt(latitude, longitude)
+    if location_buffer.submit(str(user.id), latitude, longitude, previous=previous):
+        return user, LocationUpdateStatus.PENDING
+    return user, LocationUpdateStatus.IGNORED
+
+
 async def soft_delete_user(db: AsyncSession, user: User) -> None:
     """
     Kullanıcıyı soft delete ile siler.
@@ -207,6 +255,8 @@ async def soft_delete_user(db: AsyncSession, user: User) -> None:
 
     await db.flush()
 
+    track_donor(db, user)
+
 
 # =============================================================================
 # USER STATS
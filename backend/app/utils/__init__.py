@@ -12,7 +12,12 @@ from app.utils.cooldown import (
     calculate_next_available,
     set_cooldown,
 )
-from app.utils.validators import get_compatible_donors, can_donate_to
+from app.utils.validators import (
+    get_compatible_donors,
+    can_donate_to,
+    compatible_donor_mask,
+    compatible_recipient_mask,
+)
 
 __all__ = [
     "normalize_phone",
@@ -23,4 +28,6 @@ __all__ = [
     "set_cooldown",
     "get_compatible_donors",
     "can_donate_to",
+    "compatible_donor_mask",
+    "compatible_recipient_mask",
 ]
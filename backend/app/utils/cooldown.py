@@ -13,6 +13,7 @@ from app.config import settings
 from app.constants import RequestType
 from app.core.exceptions import BadRequestException, NotFoundException
 from app.models import User
+from app.services.donor_index_service import track_donor
 
 
 def _ensure_utc(value: datetime) -> datetime:
@@ -60,4 +61,6 @@ async def set_cooldown(db: AsyncSession, user_id: str, donation_type: str) -> Us
 
 	await db.flush()
 	await db.refresh(user)
+
+	track_donor(db, user)
 	return user
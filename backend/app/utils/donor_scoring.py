@@ -0,0 +1,168 @@
+"""
+Donor scoring utility functions for KanVer API.
+
+Bu modül, yeni talep bildirimi gönderilecek bağışçıların sıralanması ve
+bildirim sayısının (fan-out) belirlenmesi için yardımcıları içerir.
+
+Her aday için skor üç bileşenin çarpımıdır:
+- Gelme olasılığı: trust_score ve no_show_count'tan tahmin edilir
+- Yakınlık: Mesafe arttıkça doğrusal olarak azalır
+- Bildirim yükü: Son saatlerde çok bildirim alan bağışçılar geri düşer
+
+Fan-out, skor sırasındaki adayların gelme olasılıkları toplanarak
+beklenen gelen bağışçı sayısı ihtiyaca (units_needed × güvenlik katsayısı)
+ulaşana kadar büyütülür. Tüm hesaplar NumPy ile vektörizedir.
+"""
+from typing import NamedTuple, Sequence
+
+import numpy as np
+
+
+# Gelme olasılığı sınırları: en güvenilir bağışçı da her zaman gelmez,
+# en kötü bağışçı da tamamen dışlanmaz
+SHOW_UP_FLOOR = 0.05
+SHOW_UP_CEILING = 0.9
+
+# Her no-show gelme olasılığını bu katsayıyla çarpar
+NO_SHOW_DECAY = 0.85
+
+# Yarıçap sınırındaki bağışçının yakınlık çarpanı (merkezde 1.0)
+MIN_PROXIMITY = 0.5
+
+# Son bildirim penceresindeki her bildirim için yük cezası
+NOTIFICATION_LOAD_PENALTY = 0.25
+
+
+class RankedDonors(NamedTuple):
+    """rank_donors sonucu: skor sırasındaki aday indeksleri ve fan-out boyutu."""
+
+    order: np.ndarray
+    fanout: int
+
+
+def show_up_probability(
+    trust_scores: Sequence[float],
+    no_show_counts: Sequence[int],
+) -> np.ndarray:
+    """
+    Bağışçıların taahhüt verip gelme olasılığını tahmin eder.
+
+    Args:
+        trust_scores: Güven skorları (0-100)
+        no_show_counts: Gelmeme sayıları
+
+    Returns:
+        [SHOW_UP_FLOOR, SHOW_UP_CEILING] aralığında olasılık dizisi
+
+    Examples:
+        >>> show_up_probability([100, 50], [0, 2])
+        array([0.9    , 0.36125])
+    """
+    trust = np.asarray(trust_scores, dtype=np.float64) / 100.0
+    no_shows = np.asarray(no_show_counts, dtype=np.float64)
+    probability = trust * np.power(NO_SHOW_DECAY, no_shows)
+    return np.clip(probability, SHOW_UP_FLOOR, SHOW_UP_CEILING)
+
+
+def score_donors(
+    distances_meters: Sequence[float],
+    radius_meters: float,
+    trust_scores: Sequence[float],
+    no_show_counts: Sequence[int],
+    recent_notifications: Sequence[int],
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Aday bağışçıları tek bir skorla puanlar.
+
+    Args:
+        distances_meters: Talep konumuna mesafeler (metre)
+        radius_meters: Arama yarıçapı (metre)
+        trust_scores: Güven skorları (0-100)
+        no_show_counts: Gelmeme sayıları
+        recent_notifications: Son penceredeki NEW_REQUEST bildirim sayıları
+
+    Returns:
+        (skorlar, gelme olasılıkları) dizileri; yüksek skor önce bildirilir
+    """
+    probability = show_up_probability(trust_scores, no_show_counts)
+
+    distances = np.asarray(distances_meters, dtype=np.float64)
+    ratio = np.clip(distances / max(radius_meters, 1.0), 0.0, 1.0)
+    proximity = 1.0 - (1.0 - MIN_PROXIMITY) * ratio
+
+    load = np.asarray(recent_notifications, dtype=np.float64)
+    freshness = 1.0 / (1.0 + NOTIFICATION_LOAD_PENALTY * load)
+
+    return probability * proximity * freshness, probability
+
+
+def fanout_size(
+    ranked_probabilities: Sequence[float],
+    units_needed: int,
+    safety_factor: float,
+    minimum: int,
+    maximum: int,
+) -> int:
+    """
+    Kaç bağışçıya bildirim gönderileceğini hesaplar.
+
+    Skor sırasındaki olasılıklar toplanır; beklenen gelen bağışçı sayısı
+    units_needed × safety_factor değerine ulaştığı ilk noktada durulur.
+
+    Args:
+        ranked_probabilities: Skor sırasındaki gelme olasılıkları
+        units_needed: İhtiyaç duyulan ünite sayısı
+        safety_factor: Hedef beklenen bağışçı / ünite oranı
+        minimum: Alt sınır (aday sayısını aşamaz)
+        maximum: Üst sınır
+
+    Returns:
+        0 ile min(maximum, aday sayısı) arasında fan-out boyutu
+
+    Examples:
+        >>> fanout_size([0.9] * 60, units_needed=5, safety_factor=2.0, minimum=10, maximum=50)
+        12
+    """
+    probabilities = np.asarray(ranked_probabilities, dtype=np.float64)
+    available = len(probabilities)
+    if available == 0:
+        return 0
+
+    target = max(units_needed, 1) * safety_factor
+    expected = np.cumsum(probabilities)
+    reached = np.flatnonzero(expected >= target - 1e-9)
+    needed = int(reached[0]) + 1 if reached.size else available
+
+    return min(max(needed, minimum), maximum, available)
+
+
+def rank_donors(
+    distances_meters: Sequence[float],
+    radius_meters: float,
+    trust_scores: Sequence[float],
+    no_show_counts: Sequence[int],
+    recent_notifications: Sequence[int],
+    units_needed: int,
+    safety_factor: float,
+    minimum: int,
+    maximum: int,
+) -> RankedDonors:
+    """
+    Adayları puanlar, sıralar ve fan-out boyutunu belirler.
+
+    Eşit skorlarda yakın olan önce gelir.
+
+    Returns:
+        RankedDonors(order, fanout); bildirilecekler order[:fanout]
+    """
+    scores, probability = score_donors(
+        distances_meters, radius_meters, trust_scores, no_show_counts, recent_notifications
+    )
+    if scores.size == 0:
+        return RankedDonors(order=np.empty(0, dtype=np.intp), fanout=0)
+
+    distances = np.asarray(distances_meters, dtype=np.float64)
+    order = np.lexsort((distances, -scores))
+    fanout = fanout_size(probability[order], units_needed, safety_factor, minimum, maximum)
+    return RankedDonors(order=order, fanout=fanout)
+
@@ -3,13 +3,34 @@ FCM (Firebase Cloud Messaging) utility module.
 
 Bu modül, Firebase Cloud Messaging üzerinden push notification göndermek için
 gerekli fonksiyonları içerir.
+
+Gönderim yolu PUSH_TRANSPORT ayarıyla seçilir:
+- firebase: firebase_admin ile gerçek FCM (varsayılan)
+- http: FCM yerine geçen yerel HTTP sunucusu (bkz. scripts/fake_fcm_server.py);
+  POST {PUSH_HTTP_URL}/v1/send_each gövdesi {"messages": [{"token", "title",
+  "body", "data"}]}, yanıtı mesaj sırasıyla {"responses": [{"success": bool,
+  "error": FCM hata kodu}]}
+- memory: mesajlar memory_push_sink'te toplanır, hepsi gönderilmiş sayılır
 """
 import os
-from typing import Optional, List, Dict, Any
+import threading
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import partial
+from typing import Callable, Optional, List, Dict, Any
 import logging
 
+import httpx
+
 from firebase_admin import initialize_app, messaging, App, credentials
-from firebase_admin.exceptions import FirebaseError
+from firebase_admin.exceptions import (
+    FirebaseError,
+    InternalError,
+    UnavailableError,
+    DeadlineExceededError,
+    ResourceExhaustedError,
+    UnknownError,
+)
 
 from app.config import settings
 
@@ -18,6 +39,134 @@ logger = logging.getLogger(__name__)
 # Firebase App instance (singleton)
 _firebase_app: Optional[App] = None
 
+# Yerel HTTP stand-in client'ı (thread-safe, worker thread'ler arasında paylaşılır)
+_http_client: Optional[httpx.Client] = None
+
+# messaging.send_each çağrısı başına izin verilen en fazla mesaj
+FCM_BATCH_LIMIT = 500
+
+
+class PushTransport(str, Enum):
+    """Push mesajlarının gönderileceği yol (PUSH_TRANSPORT)."""
+
+    FIREBASE = "firebase"
+    HTTP = "http"
+    MEMORY = "memory"
+
+
+class PushOutcome(str, Enum):
+    """Tek bir push gönderiminin sonucu."""
+
+    SENT = "SENT"
+    UNREGISTERED = "UNREGISTERED"  # Token kalıcı olarak geçersiz, silinmeli
+    TRANSIENT = "TRANSIENT"        # Geçici hata, tekrar denenebilir
+    FAILED = "FAILED"              # Kalıcı hata, token kaynaklı değil
+
+
+# Token'ın artık teslim edilemez olduğunu gösteren hatalar. INVALID_ARGUMENT
+# bunlara dahil değildir: FCM onu payload hataları (boyut, data alanları)
+# için de döner ve tek bir bozuk mesaj tüm batch'in token'larını sildirirdi.
+_UNREGISTERED_ERRORS = (
+    messaging.UnregisteredError,
+    messaging.SenderIdMismatchError,
+)
+
+_TRANSIENT_ERRORS = (
+    messaging.QuotaExceededError,
+    ResourceExhaustedError,
+    UnavailableError,
+    InternalError,
+    DeadlineExceededError,
+    UnknownError,
+)
+
+
+# HTTP stand-in'in döndüğü FCM v1 hata kodları
+_HTTP_ERROR_OUTCOMES = {
+    "UNREGISTERED": PushOutcome.UNREGISTERED,
+    "SENDER_ID_MISMATCH": PushOutcome.UNREGISTERED,
+    "INVALID_ARGUMENT": PushOutcome.FAILED,
+    "QUOTA_EXCEEDED": PushOutcome.TRANSIENT,
+    "UNAVAILABLE": PushOutcome.TRANSIENT,
+    "INTERNAL": PushOutcome.TRANSIENT,
+    "DEADLINE_EXCEEDED": PushOutcome.TRANSIENT,
+}
+
+
+def classify_push_error(error: Optional[Exception]) -> PushOutcome:
+    """
+    FCM hatasını sınıflandırır.
+
+    Args:
+        error: send/send_each'ten gelen exception
+
+    Returns:
+        UNREGISTERED, TRANSIENT veya FAILED
+    """
+    if isinstance(error, _UNREGISTERED_ERRORS):
+        return PushOutcome.UNREGISTERED
+    if isinstance(error, _TRANSIENT_ERRORS):
+        return PushOutcome.TRANSIENT
+    if isinstance(error, FirebaseError):
+        return PushOutcome.FAILED
+    # Firebase dışı hatalar (bağlantı, timeout vb.) geçici kabul edilir
+    return PushOutcome.TRANSIENT
+
+
+@dataclass(frozen=True)
+class PushMessage:
+    """Tek bir cihaza gidecek push mesajı."""
+
+    fcm_token: str
+    title: str
+    body: str
+    data: Dict[str, str] = field(default_factory=dict)
+
+
+class MemoryPushSink:
+    """
+    MEMORY transport'unun "gönderdiği" mesajlar.
+
+    send_push_batch worker thread'de çalıştığından erişim kilitlidir.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._messages: List[PushMessage] = []
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    @property
+    def messages(self) -> List[PushMessage]:
+        with self._lock:
+            return list(self._messages)
+
+    def record(self, pushes: List[PushMessage]) -> None:
+        with self._lock:
+            self._messages.extend(pushes)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._messages.clear()
+
+
+memory_push_sink = MemoryPushSink()
+
+
+def get_push_transport() -> PushTransport:
+    """
+    PUSH_TRANSPORT ayarını döner; bilinmeyen değerde Firebase'e düşer.
+
+    Returns:
+        Seçili PushTransport
+    """
+    try:
+        return PushTransport(settings.PUSH_TRANSPORT)
+    except ValueError:
+        logger.warning(f"Unknown PUSH_TRANSPORT '{settings.PUSH_TRANSPORT}', using firebase")
+        return PushTransport.FIREBASE
+
 
 def get_firebase_app() -> Optional[App]:
     """
@@ -65,6 +214,10 @@ def send_push_notification(
     Returns:
         Başarılı ise True, değilse False
     """
+    if get_push_transport() != PushTransport.FIREBASE:
+        outcomes = send_push_batch([PushMessage(fcm_token=fcm_token, title=title, body=body, data=data or {})])
+        return outcomes[0] == PushOutcome.SENT
+
     app = get_firebase_app()
     if app is None:
         logger.debug("Firebase not initialized, skipping push notification")
@@ -86,7 +239,7 @@ def send_push_notification(
 
     except FirebaseError as e:
         # Invalid token, expired token, etc.
-        logger.warning(f"Failed to send push notification: {e}")
+        logger.warning(f"Failed to send push notification ({classify_push_error(e).value}): {e}")
         return False
     except Exception as e:
         logger.error(f"Unexpected error sending push notification: {e}")
@@ -111,6 +264,14 @@ def send_push_to_multiple(
     Returns:
         {"success_count": int, "failure_count": int}
     """
+    if get_push_transport() != PushTransport.FIREBASE:
+        outcomes = send_push_batch([
+            PushMessage(fcm_token=token, title=title, body=body, data=data or {})
+            for token in fcm_tokens
+        ])
+        success_count = outcomes.count(PushOutcome.SENT)
+        return {"success_count": success_count, "failure_count": len(outcomes) - success_count}
+
     app = get_firebase_app()
     if app is None:
         logger.debug("Firebase not initialized, skipping push notification")
@@ -143,6 +304,117 @@ def send_push_to_multiple(
         return {"success_count": 0, "failure_count": len(fcm_tokens)}
 
 
+def _send_chunk_firebase(
+    chunk: List[PushMessage],
+    app: App,
+    shared_notifications: Dict[tuple, messaging.Notification],
+) -> List[PushOutcome]:
+    """Bir parçayı messaging.send_each ile gönderir."""
+    messages = []
+    for push in chunk:
+        notification = shared_notifications.get((push.title, push.body))
+        if notification is None:
+            notification = messaging.Notification(title=push.title, body=push.body)
+            shared_notifications[(push.title, push.body)] = notification
+        messages.append(
+            messaging.Message(notification=notification, data=push.data, token=push.fcm_token)
+        )
+
+    response = messaging.send_each(messages, app=app)
+    return [
+        PushOutcome.SENT if item.success else classify_push_error(item.exception)
+        for item in response.responses
+    ]
+
+
+def _get_http_client() -> httpx.Client:
+    """HTTP stand-in client'ını döner veya oluşturur."""
+    global _http_client
+
+    if _http_client is None:
+        _http_client = httpx.Client(
+            base_url=settings.PUSH_HTTP_URL,
+            timeout=settings.PUSH_HTTP_TIMEOUT_SECONDS,
+        )
+    return _http_client
+
+
+def _send_chunk_http(chunk: List[PushMessage]) -> List[PushOutcome]:
+    """Bir parçayı yerel HTTP stand-in'e gönderir."""
+    response = _get_http_client().post(
+        "/v1/send_each",
+        json={
+            "messages": [
+                {"token": push.fcm_token, "title": push.title, "body": push.body, "data": push.data}
+                for push in chunk
+            ]
+        },
+    )
+    if response.status_code == 429 or response.status_code >= 500:
+        return [PushOutcome.TRANSIENT] * len(chunk)
+    if response.status_code >= 400:
+        return [PushOutcome.FAILED] * len(chunk)
+
+    return [
+        PushOutcome.SENT if item.get("success") else _HTTP_ERROR_OUTCOMES.get(item.get("error"), PushOutcome.FAILED)
+        for item in response.json()["responses"]
+    ]
+
+
+def send_push_batch(pushes: List[PushMessage]) -> List[PushOutcome]:
+    """
+    Farklı içerikteki mesajları seçili transport ile toplu gönderir.
+
+    Bloklayan HTTP çağrısı yaptığı için async koddan worker thread'de
+    (asyncio.to_thread) çağrılmalıdır. FCM_BATCH_LIMIT'ten büyük listeler
+    parçalara bölünür.
+
+    Args:
+        pushes: Gönderilecek mesajlar
+
+    Returns:
+        Mesaj sırasıyla gönderim sonuçları (bkz. classify_push_error)
+    """
+    if not pushes:
+        return []
+
+    transport = get_push_transport()
+    if transport == PushTransport.MEMORY:
+        memory_push_sink.record(pushes)
+        return [PushOutcome.SENT] * len(pushes)
+
+    send_chunk: Callable[[List[PushMessage]], List[PushOutcome]]
+    if transport == PushTransport.HTTP:
+        send_chunk = _send_chunk_http
+    else:
+        app = get_firebase_app()
+        if app is None:
+            logger.debug("Firebase not initialized, skipping push notifications")
+            return [PushOutcome.FAILED] * len(pushes)
+        # Fan-out'ta başlık/metin aynı; Notification objesi alıcılar arasında paylaşılır
+        send_chunk = partial(_send_chunk_firebase, app=app, shared_notifications={})
+
+    results: List[PushOutcome] = []
+    for start in range(0, len(pushes), FCM_BATCH_LIMIT):
+        chunk = pushes[start:start + FCM_BATCH_LIMIT]
+        try:
+            results.extend(send_chunk(chunk))
+        except Exception as e:
+            logger.error(f"Error sending push batch: {e}")
+            results.extend([classify_push_error(e)] * len(chunk))
+
+    return results
+
+
+def close_push_transport() -> None:
+    """HTTP stand-in client'ını kapatır (shutdown için)."""
+    global _http_client
+
+    if _http_client is not None:
+        _http_client.close()
+        _http_client = None
+
+
 def reset_firebase_app() -> None:
     """
     Firebase app instance'ı sıfırlar.
@@ -5,10 +5,12 @@ Bu dosya, PostGIS Geography işlemleri için helper fonksiyonlar içerir.
 Fonksiyonlar users, hospitals ve blood_requests modelleri için yeniden kullanılabilir.
 """
 import math
-from typing import Any, Type
+import struct
+from typing import Any, NamedTuple, Optional, Sequence, Type
 
-from geoalchemy2 import WKTElement
-from sqlalchemy import select, func
+import numpy as np
+from geoalchemy2 import Geometry, WKBElement, WKTElement
+from sqlalchemy import cast, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -66,6 +68,62 @@ def create_point(latitude: float, longitude: float) -> WKTElement:
     return create_point_wkt(latitude, longitude)
 
 
+def extract_coordinates(point: Any) -> Optional[tuple[float, float]]:
+    """
+    PostGIS POINT değerinden (latitude, longitude) çiftini çıkarır.
+
+    Yeni oluşturulmuş WKTElement'leri ve veritabanından okunan (E)WKB
+    değerlerini destekler. Veritabanına ek sorgu atmadan konumu Python
+    tarafında kullanabilmek için vardır.
+
+    Args:
+        point: WKTElement, WKBElement veya None
+
+    Returns:
+        (latitude, longitude) tuple'ı veya çözümlenemezse None
+
+    Examples:
+        >>> extract_coordinates(create_point(36.8969, 30.7133))
+        (36.8969, 30.7133)
+    """
+    if point is None:
+        return None
+
+    if isinstance(point, WKTElement):
+        wkt = str(point.data).strip().upper()
+        if wkt.startswith("SRID="):
+            wkt = wkt.split(";", 1)[-1]
+        if not (wkt.startswith("POINT(") and wkt.endswith(")")):
+            return None
+        lng_str, lat_str = wkt[6:-1].split()
+        return float(lat_str), float(lng_str)
+
+    if isinstance(point, WKBElement):
+        data = point.data
+        if isinstance(data, str):
+            data = bytes.fromhex(data)
+        data = bytes(data)
+        if len(data) < 21:
+            return None
+
+        # (E)WKB: [byte order][uint32 type][uint32 srid?][double x][double y]
+        endian = "<" if data[0] == 1 else ">"
+        geometry_type = struct.unpack(f"{endian}I", data[1:5])[0]
+        offset = 5
+        if geometry_type & 0x20000000:  # EWKB SRID flag
+            offset += 4
+        if geometry_type & 0xFF != 1:  # POINT değil
+            return None
+        lng, lat = struct.unpack(f"{endian}dd", data[offset:offset + 16])
+        return lat, lng
+
+    return None
+
+
+# Haversine için Dünya yarıçapı (metre)
+EARTH_RADIUS_METERS = 6_371_000.0
+
+
 def distance_between(
     lat1: float, lng1: float,
     lat2: float, lng2: float,
@@ -91,7 +149,7 @@ def distance_between(
         >>> distance_between(36.8969, 30.7133, 41.0082, 28.9784)  # Antalya→İstanbul ≈ 481 km
         481000.0  # yaklaşık
     """
-    R = 6_371_000.0  # Dünya yarıçapı (metre)
+    R = EARTH_RADIUS_METERS
 
     phi1 = math.radians(lat1)
     phi2 = math.radians(lat2)
@@ -107,6 +165,88 @@ def distance_between(
     return R * c
 
 
+def _haversine(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """Derece cinsinden broadcast edilebilir diziler için Haversine çekirdeği."""
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = np.radians(lng2) - np.radians(lng1)
+
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return EARTH_RADIUS_METERS * c
+
+
+def distance_between_many(
+    lat: float,
+    lng: float,
+    latitudes: Sequence[float],
+    longitudes: Sequence[float],
+) -> np.ndarray:
+    """
+    Bir noktadan N noktaya olan mesafeleri tek seferde hesaplar.
+
+    distance_between ile aynı Haversine formülünü NumPy ile vektörize eder;
+    Python döngüsü olmadan binlerce noktayı sıralamak için kullanılır.
+
+    Args:
+        lat: Merkez enlemi
+        lng: Merkez boylamı
+        latitudes: N noktanın enlemleri
+        longitudes: N noktanın boylamları
+
+    Returns:
+        (N,) boyutlu, metre cinsinden mesafe dizisi
+
+    Raises:
+        ValueError: latitudes ve longitudes uzunlukları farklıysa
+
+    Examples:
+        >>> distance_between_many(36.8969, 30.7133, [36.8969, 41.0082], [30.7133, 28.9784])
+        array([0.0, 481111.7])  # yaklaşık
+    """
+    lats = np.asarray(latitudes, dtype=np.float64)
+    lngs = np.asarray(longitudes, dtype=np.float64)
+    if lats.shape != lngs.shape:
+        raise ValueError("latitudes ve longitudes aynı uzunlukta olmalı")
+
+    return _haversine(lat, lng, lats, lngs)
+
+
+def pairwise_distances(
+    latitudes_a: Sequence[float],
+    longitudes_a: Sequence[float],
+    latitudes_b: Sequence[float],
+    longitudes_b: Sequence[float],
+) -> np.ndarray:
+    """
+    M nokta ile N nokta arasındaki tüm mesafeleri hesaplar.
+
+    Args:
+        latitudes_a: M noktanın enlemleri
+        longitudes_a: M noktanın boylamları
+        latitudes_b: N noktanın enlemleri
+        longitudes_b: N noktanın boylamları
+
+    Returns:
+        (M, N) boyutlu, metre cinsinden mesafe matrisi; [i, j] = a[i] → b[j]
+
+    Raises:
+        ValueError: Enlem/boylam dizilerinin uzunlukları uyuşmuyorsa
+    """
+    lats_a = np.asarray(latitudes_a, dtype=np.float64)
+    lngs_a = np.asarray(longitudes_a, dtype=np.float64)
+    lats_b = np.asarray(latitudes_b, dtype=np.float64)
+    lngs_b = np.asarray(longitudes_b, dtype=np.float64)
+    if lats_a.shape != lngs_a.shape or lats_b.shape != lngs_b.shape:
+        raise ValueError("Enlem ve boylam dizileri aynı uzunlukta olmalı")
+
+    return _haversine(
+        lats_a[:, np.newaxis], lngs_a[:, np.newaxis],
+        lats_b[np.newaxis, :], lngs_b[np.newaxis, :],
+    )
+
+
 async def find_within_radius(
     db: AsyncSession,
     model: Type[Any],
@@ -145,17 +285,69 @@ async def find_within_radius(
     return list(result.scalars().all())
 
 
-async def validate_geofence(
+# Haversine (küre) ile ST_DWithin (geography, sferoid) arasındaki fark
+# %0.5'i geçmez. Yarıçapın bu oranı kadar sınıra yakın noktalarda karar
+# PostGIS'e bırakılır.
+GEOFENCE_AMBIGUITY_RATIO = 0.01
+
+
+class GeofenceCheck(NamedTuple):
+    """resolve_geofence sonucu: hastane, hastane koordinatları ve geofence kararı."""
+
+    hospital: Any
+    latitude: Optional[float]
+    longitude: Optional[float]
+    inside: bool
+
+
+def precheck_geofence(
+    user_lat: float,
+    user_lng: float,
+    center_lat: float,
+    center_lng: float,
+    radius_meters: float,
+) -> Optional[bool]:
+    """
+    Geofence kararını Haversine mesafesiyle verir.
+
+    Nokta sınıra GEOFENCE_AMBIGUITY_RATIO oranından daha yakınsa karar
+    verilemez ve None döner; bu durumda ST_DWithin ile doğrulanmalıdır.
+
+    Args:
+        user_lat: Kullanıcı enlemi
+        user_lng: Kullanıcı boylamı
+        center_lat: Geofence merkezi enlemi
+        center_lng: Geofence merkezi boylamı
+        radius_meters: Geofence yarıçapı (metre)
+
+    Returns:
+        True (kesin içeride), False (kesin dışarıda) veya None (belirsiz)
+
+    Examples:
+        >>> precheck_geofence(36.8969, 30.7133, 36.8969, 30.7133, 5000)
+        True
+    """
+    distance = distance_between(user_lat, user_lng, center_lat, center_lng)
+    margin = radius_meters * GEOFENCE_AMBIGUITY_RATIO
+    if distance <= radius_meters - margin:
+        return True
+    if distance >= radius_meters + margin:
+        return False
+    return None
+
+
+async def resolve_geofence(
     db: AsyncSession,
     user_lat: float,
     user_lng: float,
     hospital_id: str,
-) -> bool:
+) -> GeofenceCheck:
     """
-    Kullanıcının hastane geofence'ı içinde olup olmadığını kontrol eder.
+    Hastaneyi, koordinatlarını ve geofence kararını birlikte döndürür.
 
-    Hastanenin geofence_radius_meters değerini kullanarak PostGIS
-    ST_DWithin sorgusu çalıştırır.
+    Hastane satırı ve ST_Y/ST_X koordinatları tek sorguda alınır; karar
+    Python'da Haversine ile verilir. Sadece sınıra çok yakın (belirsiz)
+    noktalarda ek bir ST_DWithin sorgusu çalıştırılır.
 
     Args:
         db: AsyncSession
@@ -164,30 +356,77 @@ async def validate_geofence(
         hospital_id: Geofence'ı kontrol edilecek hastane ID'si
 
     Returns:
-        True — kullanıcı geofence içinde
-        False — kullanıcı geofence dışında veya hastane bulunamadı
+        GeofenceCheck; hastane bulunamazsa hospital=None ve inside=False
 
     Examples:
-        inside = await validate_geofence(db, 36.8969, 30.7133, hospital_id)
+        check = await resolve_geofence(db, 36.8969, 30.7133, hospital_id)
+        if check.inside:
+            ...
     """
     from app.models import Hospital  # circular import önlemek için local import
 
+    location_geometry = cast(Hospital.location, Geometry)
     result = await db.execute(
-        select(Hospital).where(Hospital.id == hospital_id)
+        select(
+            Hospital,
+            func.ST_Y(location_geometry),
+            func.ST_X(location_geometry),
+        ).where(Hospital.id == hospital_id)
     )
-    hospital = result.scalar_one_or_none()
-    if not hospital:
-        return False
+    row = result.first()
+    if row is None:
+        return GeofenceCheck(hospital=None, latitude=None, longitude=None, inside=False)
 
-    user_point = create_point(user_lat, user_lng)
+    hospital, hospital_lat, hospital_lng = row
+    inside = precheck_geofence(
+        user_lat, user_lng, hospital_lat, hospital_lng, hospital.geofence_radius_meters
+    )
 
-    check = await db.execute(
-        select(
-            func.ST_DWithin(
-                Hospital.location,
-                user_point,
-                hospital.geofence_radius_meters,
-            )
-        ).where(Hospital.id == hospital_id)
+    if inside is None:
+        check = await db.execute(
+            select(
+                func.ST_DWithin(
+                    Hospital.location,
+                    create_point(user_lat, user_lng),
+                    hospital.geofence_radius_meters,
+                )
+            ).where(Hospital.id == hospital_id)
+        )
+        inside = bool(check.scalar())
+
+    return GeofenceCheck(
+        hospital=hospital,
+        latitude=hospital_lat,
+        longitude=hospital_lng,
+        inside=inside,
     )
-    return bool(check.scalar())
+
+
+async def validate_geofence(
+    db: AsyncSession,
+    user_lat: float,
+    user_lng: float,
+    hospital_id: str,
+) -> bool:
+    """
+    Kullanıcının hastane geofence'ı içinde olup olmadığını kontrol eder.
+
+    Hastanenin geofence_radius_meters değerini kullanır. Karar Haversine
+    ön kontrolüyle verilir, sınıra çok yakın noktalarda PostGIS
+    ST_DWithin sorgusuna düşülür (bkz. resolve_geofence).
+
+    Args:
+        db: AsyncSession
+        user_lat: Kullanıcı enlemi
+        user_lng: Kullanıcı boylamı
+        hospital_id: Geofence'ı kontrol edilecek hastane ID'si
+
+    Returns:
+        True — kullanıcı geofence içinde
+        False — kullanıcı geofence dışında veya hastane bulunamadı
+
+    Examples:
+        inside = await validate_geofence(db, 36.8969, 30.7133, hospital_id)
+    """
+    check = await resolve_geofence(db, user_lat, user_lng, hospital_id)
+    return check.inside
@@ -0,0 +1,152 @@
+"""
+Pagination utility functions for KanVer API.
+
+Bu modül, liste endpoint'leri için keyset (cursor) pagination yardımcılarını içerir.
+
+OFFSET tabanlı sayfalamada N. sayfa için veritabanı önceki tüm satırları
+okuyup atlamak zorundadır. Keyset pagination'da ise son görülen kaydın
+sıralama anahtarı (örn. created_at, id) cursor olarak istemciye verilir ve
+sonraki sayfa "bu anahtardan sonra gelenler" koşuluyla çekilir; böylece
+her sayfa ilk sayfa kadar ucuzdur.
+
+Cursor, istemci için opak bir stringdir (URL-safe base64 JSON).
+"""
+import base64
+import binascii
+import json
+import math
+from datetime import datetime
+from typing import Any, Callable, Optional, Sequence, Tuple, Type
+
+from sqlalchemy import and_, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.exceptions import BadRequestException
+
+
+def encode_cursor(sort_value: Any, row_id: Any) -> str:
+    """
+    Sıralama anahtarını opak cursor string'ine çevirir.
+
+    Args:
+        sort_value: Sıralama kolonunun değeri (datetime veya sayı)
+        row_id: Kaydın ID'si (eşit sıralama değerlerinde tie-breaker)
+
+    Returns:
+        URL-safe base64 cursor
+
+    Examples:
+        >>> encode_cursor(12.5, "abc")
+        'WzEyLjUsICJhYmMiXQ'
+    """
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_value, str(row_id)])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_type: Type = datetime) -> Tuple[Any, str]:
+    """
+    Cursor string'ini (sort_value, row_id) tuple'ına çözer.
+
+    Args:
+        cursor: encode_cursor ile üretilmiş cursor
+        sort_type: Sıralama değerinin tipi (datetime veya float)
+
+    Returns:
+        (sort_value, row_id) tuple'ı
+
+    Raises:
+        BadRequestException: Cursor bozuksa veya beklenen formatta değilse
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if sort_type is datetime:
+            sort_value = datetime.fromisoformat(sort_value)
+        else:
+            sort_value = sort_type(sort_value)
+        return sort_value, str(row_id)
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise BadRequestException(
+            "Geçersiz cursor",
+            detail="Cursor değeri bir önceki yanıttaki next_cursor olmalıdır"
+        )
+
+
+def keyset_condition(
+    sort_column: ColumnElement,
+    id_column: ColumnElement,
+    sort_value: Any,
+    row_id: str,
+    descending: bool = True,
+) -> ColumnElement:
+    """
+    Cursor'dan sonraki kayıtları seçen WHERE koşulunu üretir.
+
+    Sorgunun ORDER BY ifadesi (sort_column, id_column) ile aynı yönde olmalıdır.
+
+    Args:
+        sort_column: Sıralama kolonu veya ifadesi
+        id_column: Tie-breaker ID kolonu
+        sort_value: Cursor'daki sıralama değeri
+        row_id: Cursor'daki ID
+        descending: Sıralama azalan ise True
+
+    Returns:
+        SQLAlchemy koşul ifadesi
+    """
+    if descending:
+        return or_(
+            sort_column < sort_value,
+            and_(sort_column == sort_value, id_column < row_id),
+        )
+    return or_(
+        sort_column > sort_value,
+        and_(sort_column == sort_value, id_column > row_id),
+    )
+
+
+def _created_at_key(item: Any) -> Tuple[Any, Any]:
+    return item.created_at, item.id
+
+
+def next_cursor_for(
+    items: Sequence[Any],
+    size: int,
+    key: Callable[[Any], Tuple[Any, Any]] = _created_at_key,
+) -> Optional[str]:
+    """
+    Sayfa dolduysa son kaydın anahtarından next_cursor üretir.
+
+    Args:
+        items: Dönen sayfa
+        size: İstenen sayfa boyutu
+        key: Kayıttan (sort_value, id) döndüren fonksiyon (varsayılan created_at, id)
+
+    Returns:
+        Sonraki sayfanın cursor'u veya son sayfadaysa None
+    """
+    if not items or len(items) < size:
+        return None
+    sort_value, row_id = key(items[-1])
+    return encode_cursor(sort_value, row_id)
+
+
+def should_count(cursor: Optional[str], include_total: Optional[bool]) -> bool:
+    """
+    Toplam kayıt sayısının hesaplanıp hesaplanmayacağına karar verir.
+
+    İstemci açıkça belirtmezse OFFSET modunda sayılır, cursor modunda
+    (ikinci ve sonraki sayfalar) COUNT sorgusu atlanır.
+    """
+    if include_total is not None:
+        return include_total
+    return cursor is None
+
+
+def page_count(total: Optional[int], size: int) -> Optional[int]:
+    """Toplam kayıt sayısından sayfa sayısını hesaplar (total yoksa None)."""
+    if total is None:
+        return None
+    return math.ceil(total / size) if total > 0 else 0
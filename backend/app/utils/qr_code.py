@@ -129,8 +129,27 @@ async def validate_qr(db: AsyncSession, token: str) -> QRCode:
     result = await db.execute(
         select(QRCode).where(QRCode.token == token)
     )
-    qr_code = result.scalar_one_or_none()
+    return ensure_qr_usable(result.scalar_one_or_none())
 
+
+def ensure_qr_usable(qr_code: Optional[QRCode]) -> QRCode:
+    """
+    Yüklenmiş QR kodunun kullanılabilir olduğunu doğrular.
+
+    validate_qr'daki kontrolleri (varlık, süre, kullanım, imza) DB'ye
+    gitmeden yapar; QR kodu başka bir sorguyla birlikte yükleyen
+    çağıranlar içindir.
+
+    Args:
+        qr_code: QRCode objesi veya None
+
+    Returns:
+        QRCode objesi
+
+    Raises:
+        NotFoundException: QR kod bulunamadı
+        BadRequestException: QR kod geçersiz (expired, used, invalid signature)
+    """
     if not qr_code:
         raise NotFoundException("QR kod bulunamadı")
 
@@ -0,0 +1,191 @@
+"""
+In-memory spatial grid index for KanVer API.
+
+Bu modül, noktaları sabit boyutlu enlem/boylam hücrelerine dağıtan
+process-içi bir grid index içerir. PostGIS'e gitmeden yarıçap ve
+en yakın komşu (k-nearest) sorgularını yanıtlamak için kullanılır.
+
+Mesafeler distance_between_many (vektörize Haversine) ile hesaplanır; bu nedenle
+sonuçlar ST_Distance(geography) ile aynı doğruluk seviyesindedir.
+"""
+import math
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Set, Tuple
+
+from app.utils.location import distance_between_many
+
+
+# Bir enlem derecesinin yaklaşık metre karşılığı
+METERS_PER_DEGREE = 111_320.0
+
+# Dünya çevresinin yarısı (metre) - k-nearest aramasında üst sınır
+MAX_SEARCH_RADIUS_METERS = 20_037_500.0
+
+# (key, payload, distance_meters)
+IndexHit = Tuple[Hashable, Any, float]
+
+
+class GridIndex:
+    """
+    Enlem/boylam grid'i üzerinde nokta index'i.
+
+    Her nokta bir key ile saklanır; aynı key ile tekrar insert edilen
+    nokta eski konumundan taşınır. Hücre boyutu derece cinsinden
+    sabittir, sorgu sırasında boylam aralığı enleme göre genişletilir.
+
+    Examples:
+        >>> index = GridIndex(cell_size_meters=1000)
+        >>> index.insert("h1", 36.8969, 30.7133, payload="Akdeniz")
+        >>> [key for key, _, _ in index.query_radius(36.8970, 30.7134, 500)]
+        ['h1']
+    """
+
+    def __init__(self, cell_size_meters: float = 2000.0):
+        if cell_size_meters <= 0:
+            raise ValueError("cell_size_meters pozitif olmalı")
+
+        self.cell_size_meters = cell_size_meters
+        self._cell_degrees = cell_size_meters / METERS_PER_DEGREE
+        self._cells: Dict[Tuple[int, int], Set[Hashable]] = {}
+        self._points: Dict[Hashable, Tuple[float, float, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._points
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._points)
+
+    def _cell_of(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return (
+            math.floor(latitude / self._cell_degrees),
+            math.floor(longitude / self._cell_degrees),
+        )
+
+    def insert(self, key: Hashable, latitude: float, longitude: float, payload: Any = None) -> None:
+        """Noktayı ekler; key zaten varsa konumunu ve payload'ını günceller."""
+        if key in self._points:
+            self.remove(key)
+
+        cell = self._cell_of(latitude, longitude)
+        self._cells.setdefault(cell, set()).add(key)
+        self._points[key] = (latitude, longitude, payload)
+
+    def remove(self, key: Hashable) -> bool:
+        """Noktayı siler. Silindiyse True, yoksa False döner."""
+        point = self._points.pop(key, None)
+        if point is None:
+            return False
+
+        cell = self._cell_of(point[0], point[1])
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(key)
+            if not members:
+                del self._cells[cell]
+        return True
+
+    def get(self, key: Hashable) -> Optional[Tuple[float, float, Any]]:
+        """Key için (latitude, longitude, payload) döner."""
+        return self._points.get(key)
+
+    def clear(self) -> None:
+        """Tüm noktaları siler."""
+        self._cells.clear()
+        self._points.clear()
+
+    def _candidate_keys(self, latitude: float, longitude: float, radius_meters: float) -> Iterator[Hashable]:
+        lat_span = radius_meters / METERS_PER_DEGREE
+        max_abs_lat = min(abs(latitude) + lat_span, 89.9)
+        lng_span = radius_meters / (METERS_PER_DEGREE * math.cos(math.radians(max_abs_lat)))
+
+        min_row, min_col = self._cell_of(latitude - lat_span, longitude - lng_span)
+        max_row, max_col = self._cell_of(latitude + lat_span, longitude + lng_span)
+
+        # Taranacak hücre sayısı nokta sayısını aşıyorsa düz tarama daha ucuz
+        cell_count = (max_row - min_row + 1) * (max_col - min_col + 1)
+        if cell_count >= len(self._cells) or lng_span >= 180:
+            yield from self._points
+            return
+
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                members = self._cells.get((row, col))
+                if members:
+                    yield from members
+
+    def query_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_meters: float,
+        limit: Optional[int] = None,
+    ) -> List[IndexHit]:
+        """
+        Yarıçap içindeki noktaları mesafeye göre sıralı döndürür.
+
+        Args:
+            latitude: Merkez enlemi
+            longitude: Merkez boylamı
+            radius_meters: Arama yarıçapı (metre)
+            limit: Maksimum sonuç sayısı (opsiyonel)
+
+        Returns:
+            (key, payload, distance_meters) listesi, en yakından uzağa
+        """
+        keys = list(self._candidate_keys(latitude, longitude, radius_meters))
+        if not keys:
+            return []
+
+        points = [self._points[key] for key in keys]
+        distances = distance_between_many(
+            latitude,
+            longitude,
+            [point[0] for point in points],
+            [point[1] for point in points],
+        )
+
+        hits: List[IndexHit] = [
+            (key, point[2], float(distance))
+            for key, point, distance in zip(keys, points, distances)
+            if distance <= radius_meters
+        ]
+        hits.sort(key=lambda hit: hit[2])
+        if limit is not None:
+            return hits[:limit]
+        return hits
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int,
+        max_radius_meters: Optional[float] = None,
+    ) -> List[IndexHit]:
+        """
+        En yakın k noktayı döndürür.
+
+        Arama yarıçapı hücre boyutundan başlayarak k sonuç bulunana
+        veya max_radius_meters aşılana kadar ikiye katlanır.
+
+        Args:
+            latitude: Merkez enlemi
+            longitude: Merkez boylamı
+            k: İstenen nokta sayısı
+            max_radius_meters: Opsiyonel üst yarıçap sınırı
+
+        Returns:
+            (key, payload, distance_meters) listesi, en yakından uzağa
+        """
+        if k <= 0 or not self._points:
+            return []
+
+        upper = min(max_radius_meters or MAX_SEARCH_RADIUS_METERS, MAX_SEARCH_RADIUS_METERS)
+        radius = min(self.cell_size_meters, upper)
+
+        while True:
+            hits = self.query_radius(latitude, longitude, radius)
+            if len(hits) >= k or radius >= upper or len(hits) == len(self._points):
+                return hits[:k]
+            radius = min(radius * 2, upper)
@@ -3,7 +3,12 @@
 from typing import List
 
 from app.constants import BloodType
-from app.constants.blood_types import can_donate, get_compatible_donors as get_compatible_donors_from_constants
+from app.constants.blood_types import (
+	BLOOD_TYPE_BITS,
+	COMPATIBLE_DONOR_MASKS,
+	COMPATIBLE_RECIPIENT_MASKS,
+	get_compatible_donors as get_compatible_donors_from_constants,
+)
 
 
 def _normalize_blood_type(value: str) -> str:
@@ -11,6 +16,13 @@ def _normalize_blood_type(value: str) -> str:
 	return value.strip().upper()
 
 
+def _canonical_blood_type(value: str) -> str:
+	"""DB'den gelen kanonik değerlerde normalizasyonu atlar."""
+	if value in BLOOD_TYPE_BITS:
+		return value
+	return _normalize_blood_type(value)
+
+
 def get_compatible_donors(blood_type: str) -> List[str]:
 	"""Verilen alıcı kan grubu için uyumlu bağışçı gruplarını döndürür."""
 	normalized_type = _normalize_blood_type(blood_type)
@@ -23,10 +35,15 @@ def get_compatible_donors(blood_type: str) -> List[str]:
 
 def can_donate_to(donor_type: str, recipient_type: str) -> bool:
 	"""Donörün alıcıya bağış yapıp yapamayacağını kontrol eder."""
-	normalized_donor = _normalize_blood_type(donor_type)
-	normalized_recipient = _normalize_blood_type(recipient_type)
+	donor_bit = BLOOD_TYPE_BITS.get(_canonical_blood_type(donor_type), 0)
+	return bool(donor_bit & compatible_donor_mask(recipient_type))
+
+
+def compatible_donor_mask(recipient_type: str) -> int:
+	"""Alıcıya bağış yapabilecek bağışçı gruplarının bitmask'i (geçersizse 0)."""
+	return COMPATIBLE_DONOR_MASKS.get(_canonical_blood_type(recipient_type), 0)
 
-	if not BloodType.is_valid(normalized_donor) or not BloodType.is_valid(normalized_recipient):
-		return False
 
-	return can_donate(normalized_donor, normalized_recipient)
+def compatible_recipient_mask(donor_type: str) -> int:
+	"""Donörün bağış yapabileceği alıcı gruplarının bitmask'i (geçersizse 0)."""
+	return COMPATIBLE_RECIPIENT_MASKS.get(_canonical_blood_type(donor_type), 0)
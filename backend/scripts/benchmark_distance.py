@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+KanVer Distance Benchmark Script
+
+distance_between (skaler döngü), distance_between_many / pairwise_distances
+(NumPy) ve PostGIS ST_Distance sürelerini karşılaştırır.
+
+Merkez noktalar seed_data.py'deki Antalya hastaneleridir; hedef noktalar
+bu hastanelerin çevresine rastgele (sabit seed ile) dağıtılır.
+PostGIS ölçümü için çalışan bir veritabanı gerekir (--skip-db ile atlanır).
+
+Kullanım:
+    python -m scripts.benchmark_distance
+    python -m scripts.benchmark_distance --points 100000 --repeat 5 --skip-db
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from app.utils.location import distance_between, distance_between_many, pairwise_distances
+from scripts.seed_data import HOSPITALS_DATA
+
+
+def _hospital_origins():
+    """Seed hastanelerinin (lat, lng) listesini döndürür."""
+    origins = []
+    for data in HOSPITALS_DATA:
+        lng, lat = data["location"].removeprefix("POINT(").rstrip(")").split()
+        origins.append((float(lat), float(lng)))
+    return origins
+
+
+def _random_points(origins, count, spread_degrees=0.3, seed=42):
+    """Hastanelerin çevresine dağılmış rastgele noktalar üretir."""
+    rng = random.Random(seed)
+    lats, lngs = [], []
+    for _ in range(count):
+        lat, lng = rng.choice(origins)
+        lats.append(lat + rng.uniform(-spread_degrees, spread_degrees))
+        lngs.append(lng + rng.uniform(-spread_degrees, spread_degrees))
+    return lats, lngs
+
+
+def _best_of(repeat, fn):
+    """fn'i repeat kez çalıştırır; en iyi süreyi (saniye) ve son sonucu döndürür."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+async def _postgis_distances(origin, lats, lngs, repeat):
+    """ST_Distance(geography) ile tek merkezden tüm noktalara mesafeleri ölçer."""
+    from sqlalchemy import text
+    from app.database import AsyncSessionLocal
+
+    query = text(
+        """
+        SELECT ST_Distance(
+            ST_SetSRID(ST_MakePoint(p.lng, p.lat), 4326)::geography,
+            ST_SetSRID(ST_MakePoint(:origin_lng, :origin_lat), 4326)::geography,
+            false
+        )
+        FROM unnest(CAST(:lats AS float8[]), CAST(:lngs AS float8[])) AS p(lat, lng)
+        """
+    )
+    params = {"origin_lat": origin[0], "origin_lng": origin[1], "lats": lats, "lngs": lngs}
+
+    best, result = float("inf"), None
+    async with AsyncSessionLocal() as session:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = await session.execute(query, params)
+            result = [row[0] for row in rows]
+            best = min(best, time.perf_counter() - started)
+    return best, np.asarray(result)
+
+
+def _report(label, seconds, count):
+    rate = count / seconds if seconds > 0 else float("inf")
+    print(f"  {label:<28} {seconds * 1000:10.2f} ms  ({rate:,.0f} mesafe/sn)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="KanVer mesafe hesaplama benchmark'ı")
+    parser.add_argument("--points", type=int, default=50_000, help="Hedef nokta sayısı")
+    parser.add_argument("--repeat", type=int, default=3, help="Her ölçüm için tekrar sayısı")
+    parser.add_argument("--skip-db", action="store_true", help="PostGIS ölçümünü atla")
+    args = parser.parse_args()
+
+    origins = _hospital_origins()
+    lats, lngs = _random_points(origins, args.points)
+    origin = origins[0]
+
+    print("📏 KanVer Distance Benchmark")
+    print("=" * 40)
+    print(f"Merkez: {len(origins)} hastane, hedef: {args.points:,} nokta, tekrar: {args.repeat}")
+
+    print("\n1 merkez × N nokta:")
+    scalar_time, scalar = _best_of(
+        args.repeat,
+        lambda: [distance_between(origin[0], origin[1], lat, lng) for lat, lng in zip(lats, lngs)],
+    )
+    _report("distance_between (döngü)", scalar_time, args.points)
+
+    lats_arr, lngs_arr = np.asarray(lats), np.asarray(lngs)
+    vector_time, vector = _best_of(
+        args.repeat,
+        lambda: distance_between_many(origin[0], origin[1], lats_arr, lngs_arr),
+    )
+    _report("distance_between_many", vector_time, args.points)
+    print(f"  Maks. fark (skaler/vektör): {np.max(np.abs(vector - np.asarray(scalar))):.6f} m")
+
+    if not args.skip_db:
+        try:
+            db_time, db_result = await _postgis_distances(origin, lats, lngs, args.repeat)
+            _report("PostGIS ST_Distance", db_time, args.points)
+            print(f"  Maks. fark (PostGIS/vektör): {np.max(np.abs(vector - db_result)):.3f} m")
+        except Exception as e:
+            print(f"  PostGIS ölçümü atlandı: {e}")
+
+    print(f"\n{len(origins)} merkez × N nokta:")
+    origin_lats = [lat for lat, _ in origins]
+    origin_lngs = [lng for _, lng in origins]
+    total = len(origins) * args.points
+
+    scalar_time, _ = _best_of(
+        args.repeat,
+        lambda: [
+            [distance_between(o_lat, o_lng, lat, lng) for lat, lng in zip(lats, lngs)]
+            for o_lat, o_lng in origins
+        ],
+    )
+    _report("distance_between (döngü)", scalar_time, total)
+
+    matrix_time, _ = _best_of(
+        args.repeat,
+        lambda: pairwise_distances(origin_lats, origin_lngs, lats_arr, lngs_arr),
+    )
+    _report("pairwise_distances", matrix_time, total)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
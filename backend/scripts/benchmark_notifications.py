@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+KanVer Notification Throughput Benchmark
+
+create_request fan-out'unu (bağışçı arama, NEW_REQUEST bildirimleri, commit
+sonrası push kuyruğu ve push sender) uçtan uca ölçer ve şunları raporlar:
+- create_request gecikmesi (p50/p99) ve saniyede oluşturulan bildirim
+- Bildirimin oluşturulmasından push'un gönderilmesine kadar geçen süre
+  (p50/p99) ve saniyede gönderilen push
+- Event loop'un bloklandığı toplam ve en uzun süre
+
+Push'lar PUSH_TRANSPORT ile gönderilir: memory (varsayılan) ya da http
+(önce scripts/fake_fcm_server.py başlatılmalı). Çalışan bir veritabanı ve
+seed_data.py ile oluşturulmuş hastaneler gerekir. Sentetik bağışçılar
+seçilen hastanenin çevresine eklenir ve benchmark sonunda silinir.
+
+Aynı hastane + kan grubu için art arda açılan talepler varsayılan olarak
+throttle'dan geçmez (--throttle ile açılır); aksi halde ilk talepten sonraki
+bildirimler tekilleştirilir.
+
+Kullanım:
+    python -m scripts.benchmark_notifications
+    python -m scripts.benchmark_notifications --requests 200 --concurrency 10 --fanout 50
+    python -m scripts.fake_fcm_server &
+    python -m scripts.benchmark_notifications --transport http
+"""
+import argparse
+import asyncio
+import math
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+
+
+BENCHMARK_PHONE_PREFIX = "+90597"
+
+SEED_DONORS_SQL = text(
+    """
+    INSERT INTO users (
+        id, phone_number, full_name, password_hash, date_of_birth, role,
+        blood_type, location, fcm_token, is_active
+    )
+    SELECT
+        gen_random_uuid()::text,
+        :phone_prefix || lpad(i::text, 7, '0'),
+        'Benchmark Donor ' || i,
+        'x',
+        '1990-01-01'::timestamptz,
+        'USER',
+        'O-',
+        ST_SetSRID(ST_MakePoint(
+            :center_lng + (random() - 0.5) * :spread,
+            :center_lat + (random() - 0.5) * :spread
+        ), 4326)::geography,
+        'bench-token-' || i,
+        true
+    FROM generate_series(1, :count) AS i
+    """
+)
+
+
+class LoopMonitor:
+    """
+    Event loop'un planlanan uyanmadan ne kadar geç kaldığını ölçer.
+
+    threshold'u aşan gecikmeler bloklama sayılır (senkron DB/CPU işi).
+    """
+
+    def __init__(self, interval: float = 0.005, threshold: float = 0.010):
+        self.interval = interval
+        self.threshold = threshold
+        self.blocked = 0.0
+        self.max_lag = 0.0
+        self._running = False
+
+    async def run(self) -> None:
+        self._running = True
+        while self._running:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - expected
+            if lag > self.threshold:
+                self.blocked += lag
+            self.max_lag = max(self.max_lag, lag)
+
+    def stop(self) -> None:
+        self._running = False
+
+
+def _percentile(values, percent):
+    """Nearest-rank yüzdelik; boş listede 0."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _configure(args):
+    """Benchmark için ayarları process içinde değiştirir."""
+    from app.services.notification_throttle_service import notification_throttle
+
+    settings.PUSH_TRANSPORT = args.transport
+    settings.PUSH_HTTP_URL = args.http_url
+    settings.DONOR_FANOUT_MIN = args.fanout
+    settings.DONOR_FANOUT_MAX = args.fanout
+    settings.DONOR_CANDIDATE_POOL_SIZE = max(settings.DONOR_CANDIDATE_POOL_SIZE, args.fanout)
+    if not args.throttle:
+        settings.NOTIFICATION_THROTTLE_WINDOW_MINUTES = 0
+        notification_throttle.window = timedelta(0)
+
+
+async def _setup(args):
+    """Hastaneyi seçer, talep sahibi ve sentetik bağışçıları ekler."""
+    async with AsyncSessionLocal() as session:
+        hospital = (await session.execute(
+            text(
+                "SELECT id, ST_Y(location::geometry) AS lat, ST_X(location::geometry) AS lng "
+                "FROM hospitals WHERE is_active = true ORDER BY hospital_code LIMIT 1"
+            )
+        )).first()
+        if hospital is None:
+            raise RuntimeError("Aktif hastane yok; önce python -m scripts.seed_data çalıştırın")
+
+        requester_id = (await session.execute(
+            text(
+                "INSERT INTO users (id, phone_number, full_name, password_hash, date_of_birth, role, is_active) "
+                "VALUES (gen_random_uuid()::text, :phone, 'Benchmark Requester', 'x', "
+                "'1990-01-01'::timestamptz, 'USER', true) RETURNING id"
+            ),
+            {"phone": f"{BENCHMARK_PHONE_PREFIX}0000000"},
+        )).scalar_one()
+
+        # İlk bildirim halkasının içine (≈ ±0.005° ≈ 550 m)
+        await session.execute(
+            SEED_DONORS_SQL,
+            {
+                "phone_prefix": BENCHMARK_PHONE_PREFIX,
+                "count": args.donors,
+                "center_lat": hospital.lat,
+                "center_lng": hospital.lng,
+                "spread": 0.01,
+            },
+        )
+        await session.execute(text("ANALYZE users"))
+        await session.commit()
+    return hospital, requester_id
+
+
+async def _cleanup(requester_id):
+    """Benchmark'ın eklediği talepleri ve kullanıcıları (bildirimleriyle) siler."""
+    async with AsyncSessionLocal() as session:
+        if requester_id is not None:
+            await session.execute(
+                text("DELETE FROM blood_requests WHERE requester_id = :requester_id"),
+                {"requester_id": requester_id},
+            )
+        await session.execute(
+            text("DELETE FROM users WHERE phone_number LIKE :prefix"),
+            {"prefix": f"{BENCHMARK_PHONE_PREFIX}%"},
+        )
+        await session.commit()
+
+
+async def _create_requests(args, hospital, requester_id):
+    """create_request'i concurrency kadar paralel çağırır; gecikmeleri (s) döner."""
+    from app.services.blood_request_service import create_request
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            async with AsyncSessionLocal() as session:
+                await create_request(session, requester_id, {
+                    "hospital_id": hospital.id,
+                    "latitude": hospital.lat,
+                    "longitude": hospital.lng,
+                    "blood_type": args.blood_type,
+                    "request_type": "WHOLE_BLOOD",
+                    "units_needed": 1,
+                })
+                await session.commit()
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one() for _ in range(args.requests)))
+    return latencies
+
+
+async def _wait_for_push_queue(timeout: float) -> None:
+    """Push kuyruğu boşalana (veya timeout dolana) kadar bekler."""
+    from app.services.push_dispatch_service import push_queue
+
+    deadline = time.perf_counter() + timeout
+    while len(push_queue) and time.perf_counter() < deadline:
+        await asyncio.sleep(0.01)
+
+
+async def _notification_stats(requester_id):
+    """Benchmark bildirimlerinin sayısı ve oluşturma → push süreleri (s)."""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            text(
+                "SELECT n.is_push_sent, EXTRACT(EPOCH FROM n.push_sent_at - n.created_at) "
+                "FROM notifications n JOIN blood_requests r ON r.id = n.blood_request_id "
+                "WHERE r.requester_id = :requester_id"
+            ),
+            {"requester_id": requester_id},
+        )
+        rows = result.all()
+    push_latencies = [float(seconds) for sent, seconds in rows if sent and seconds is not None]
+    return len(rows), push_latencies
+
+
+def _report_latency(label, seconds):
+    print(f"  {label:<28} p50 {_percentile(seconds, 50) * 1000:9.2f} ms   p99 {_percentile(seconds, 99) * 1000:9.2f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="KanVer bildirim fan-out benchmark'ı")
+    parser.add_argument("--donors", type=int, default=5_000, help="Eklenecek sentetik bağışçı sayısı")
+    parser.add_argument("--requests", type=int, default=50, help="Oluşturulacak talep sayısı")
+    parser.add_argument("--concurrency", type=int, default=5, help="Paralel create_request sayısı")
+    parser.add_argument("--fanout", type=int, default=50, help="Talep başına bildirilecek bağışçı")
+    parser.add_argument("--blood-type", default="A+", help="Talep kan grubu (bağışçılar O-)")
+    parser.add_argument("--transport", choices=["memory", "http"], default="memory", help="Push transport")
+    parser.add_argument("--http-url", default=settings.PUSH_HTTP_URL, help="Fake FCM adresi (--transport http)")
+    parser.add_argument("--throttle", action="store_true", help="NEW_REQUEST throttle'ını açık bırak")
+    parser.add_argument("--push-timeout", type=float, default=60.0, help="Push kuyruğunu bekleme süresi (s)")
+    args = parser.parse_args()
+
+    _configure(args)
+
+    from app.background.push_sender import flush_push_queue, run_push_sender, stop_push_sender
+    from app.services.push_dispatch_service import push_queue
+    from app.utils.fcm import close_push_transport
+
+    print("📣 KanVer Notification Benchmark")
+    print("=" * 40)
+    print(
+        f"Bağışçı: {args.donors:,}, talep: {args.requests}, paralel: {args.concurrency}, "
+        f"fan-out: {args.fanout}, transport: {args.transport}"
+    )
+
+    requester_id = None
+    monitor = LoopMonitor()
+    try:
+        hospital, requester_id = await _setup(args)
+
+        push_queue.start()
+        sender = asyncio.create_task(run_push_sender())
+        monitor_task = asyncio.create_task(monitor.run())
+
+        started = time.perf_counter()
+        request_latencies = await _create_requests(args, hospital, requester_id)
+        create_seconds = time.perf_counter() - started
+
+        await _wait_for_push_queue(args.push_timeout)
+        push_seconds = time.perf_counter() - started
+
+        # Sender iptal edilmez; elindeki batch'i işaretleyip döngüden çıkar
+        stop_push_sender()
+        push_queue.stop()
+        await asyncio.wait_for(sender, timeout=args.push_timeout)
+        await flush_push_queue()
+        monitor.stop()
+        await monitor_task
+
+        notifications, push_latencies = await _notification_stats(requester_id)
+
+        print("\nTalepler:")
+        _report_latency("create_request + commit", request_latencies)
+        print(f"  {'Bildirim':<28} {notifications:,} ({notifications / create_seconds:,.0f} bildirim/sn)")
+
+        print("\nPush:")
+        _report_latency("oluşturma → gönderim", push_latencies)
+        print(f"  {'Gönderilen':<28} {len(push_latencies):,} ({len(push_latencies) / push_seconds:,.0f} push/sn)")
+
+        print("\nEvent loop:")
+        print(f"  {'Bloklanan toplam':<28} {monitor.blocked * 1000:10.2f} ms ({monitor.blocked / push_seconds:.1%})")
+        print(f"  {'En uzun gecikme':<28} {monitor.max_lag * 1000:10.2f} ms")
+    finally:
+        monitor.stop()
+        close_push_transport()
+        await _cleanup(requester_id)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+KanVer Nearby Donors EXPLAIN Script
+
+find_nearby_donors SQL yolunun idx_users_eligible_donor_location partial
+GIST index'ini kullandığını büyük bir veri setinde doğrular.
+
+Antalya çevresine sentetik kullanıcılar (bir kısmı silinmiş, token'sız veya
+aktif taahhütlü) eklenir, EXPLAIN ANALYZE çıktısı yazdırılır ve transaction
+geri alınır; veritabanında kalıcı değişiklik yapılmaz.
+
+Kullanım:
+    python -m scripts.explain_nearby_donors
+    python -m scripts.explain_nearby_donors --users 500000 --radius 5000
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.database import AsyncSessionLocal
+
+
+INDEX_NAME = "idx_users_eligible_donor_location"
+
+# Antalya merkez
+CENTER_LAT = 36.8969
+CENTER_LNG = 30.7133
+
+SEED_USERS_SQL = text(
+    """
+    INSERT INTO users (
+        id, phone_number, full_name, password_hash, date_of_birth, role,
+        blood_type, location, fcm_token, is_active, deleted_at, has_active_commitment
+    )
+    SELECT
+        gen_random_uuid()::text,
+        '+90599' || lpad(i::text, 7, '0'),
+        'Explain Donor ' || i,
+        'x',
+        '1990-01-01'::timestamptz,
+        'USER',
+        (ARRAY['A+', 'A-', 'B+', 'B-', 'AB+', 'AB-', 'O+', 'O-'])[1 + i % 8],
+        ST_SetSRID(ST_MakePoint(
+            :center_lng + (random() - 0.5) * :spread,
+            :center_lat + (random() - 0.5) * :spread
+        ), 4326)::geography,
+        CASE WHEN i % 10 = 0 THEN NULL ELSE 'explain-token-' || i END,
+        i % 17 <> 0,
+        CASE WHEN i % 23 = 0 THEN now() END,
+        i % 7 = 0
+    FROM generate_series(1, :count) AS i
+    """
+)
+
+NEARBY_DONORS_SQL = """
+    EXPLAIN (ANALYZE, BUFFERS)
+    SELECT id, ST_Distance(location, ST_GeogFromText(:center)) AS distance_meters
+    FROM users
+    WHERE deleted_at IS NULL
+      AND is_active = true
+      AND location IS NOT NULL
+      AND fcm_token IS NOT NULL
+      AND blood_type IS NOT NULL
+      AND has_active_commitment = false
+      AND blood_type_mask & 195 <> 0  -- A+ alıcısına uyumlu bağışçılar
+      AND (next_available_date IS NULL OR next_available_date <= now())
+      AND ST_DWithin(location, ST_GeogFromText(:center), :radius)
+    ORDER BY distance_meters
+    LIMIT 200
+"""
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="find_nearby_donors sorgu planı")
+    parser.add_argument("--users", type=int, default=200_000, help="Eklenecek sentetik kullanıcı sayısı")
+    parser.add_argument("--radius", type=int, default=5000, help="Arama yarıçapı (metre)")
+    parser.add_argument("--spread", type=float, default=2.0, help="Koordinat yayılımı (derece)")
+    args = parser.parse_args()
+
+    print("🔎 KanVer Nearby Donors EXPLAIN")
+    print("=" * 40)
+
+    async with AsyncSessionLocal() as session:
+        try:
+            await session.execute(
+                SEED_USERS_SQL,
+                {
+                    "count": args.users,
+                    "center_lat": CENTER_LAT,
+                    "center_lng": CENTER_LNG,
+                    "spread": args.spread,
+                },
+            )
+            await session.execute(text("ANALYZE users"))
+            print(f"{args.users:,} sentetik kullanıcı eklendi (transaction geri alınacak)\n")
+
+            result = await session.execute(
+                text(NEARBY_DONORS_SQL),
+                {"center": f"SRID=4326;POINT({CENTER_LNG} {CENTER_LAT})", "radius": args.radius},
+            )
+            plan = [row[0] for row in result.all()]
+            print("\n".join(plan))
+
+            print()
+            if any(INDEX_NAME in line for line in plan):
+                print(f"✅ Plan {INDEX_NAME} kullanıyor")
+            else:
+                print(f"❌ Plan {INDEX_NAME} kullanmıyor")
+                sys.exit(1)
+        finally:
+            await session.rollback()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
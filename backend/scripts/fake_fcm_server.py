@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+KanVer Fake FCM Server
+
+Yük testleri için Firebase Cloud Messaging yerine geçen yerel HTTP sunucusu.
+API PUSH_TRANSPORT=http ve PUSH_HTTP_URL=http://localhost:8089 ile bu
+sunucuya gönderir (protokol: app/utils/fcm.py).
+
+Her send_each isteği ayarlanabilir gecikmeyle yanıtlanır; mesajların bir
+kısmı UNREGISTERED veya geçici hata (UNAVAILABLE), isteklerin bir kısmı
+503 (kesinti) ile döner. "unregistered-" ile başlayan token'lar her zaman
+UNREGISTERED döner. Sayaçlar GET /stats ile okunur, DELETE /stats ile sıfırlanır.
+
+Kullanım:
+    python -m scripts.fake_fcm_server
+    python -m scripts.fake_fcm_server --latency-ms 80 --jitter-ms 40 --unregistered-rate 0.02 --transient-rate 0.01
+"""
+import argparse
+import asyncio
+import random
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI, Response
+from pydantic import BaseModel, Field
+
+
+UNREGISTERED_TOKEN_PREFIX = "unregistered-"
+
+
+@dataclass
+class FakeFcmConfig:
+    """Sunucu davranışı."""
+
+    latency_ms: float = 50.0  # send_each isteği başına
+    jitter_ms: float = 20.0  # ± rastgele sapma
+    unregistered_rate: float = 0.0  # Mesaj başına UNREGISTERED olasılığı
+    transient_rate: float = 0.0  # Mesaj başına UNAVAILABLE olasılığı
+    outage_rate: float = 0.0  # İstek başına 503 olasılığı
+    seed: Optional[int] = None
+
+
+@dataclass
+class FakeFcmStats:
+    """Sunucu sayaçları."""
+
+    requests: int = 0
+    messages: int = 0
+    sent: int = 0
+    unregistered: int = 0
+    transient: int = 0
+    outages: int = 0
+
+
+class FakeMessage(BaseModel):
+    token: str
+    title: str = ""
+    body: str = ""
+    data: Dict[str, str] = Field(default_factory=dict)
+
+
+class SendEachRequest(BaseModel):
+    messages: List[FakeMessage]
+
+
+def create_app(config: Optional[FakeFcmConfig] = None) -> FastAPI:
+    """
+    Fake FCM uygulamasını oluşturur.
+
+    Args:
+        config: Sunucu davranışı (varsayılan: FakeFcmConfig())
+
+    Returns:
+        FastAPI uygulaması (app.state.stats sayaçları tutar)
+    """
+    config = config or FakeFcmConfig()
+    rng = random.Random(config.seed)
+    app = FastAPI(title="Fake FCM")
+    app.state.stats = FakeFcmStats()
+
+    @app.post("/v1/send_each")
+    async def send_each(payload: SendEachRequest, response: Response):
+        stats: FakeFcmStats = app.state.stats
+        stats.requests += 1
+
+        delay = config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if rng.random() < config.outage_rate:
+            stats.outages += 1
+            response.status_code = 503
+            return {"error": "UNAVAILABLE"}
+
+        responses = []
+        for message in payload.messages:
+            stats.messages += 1
+            if message.token.startswith(UNREGISTERED_TOKEN_PREFIX) or rng.random() < config.unregistered_rate:
+                stats.unregistered += 1
+                responses.append({"success": False, "error": "UNREGISTERED"})
+            elif rng.random() < config.transient_rate:
+                stats.transient += 1
+                responses.append({"success": False, "error": "UNAVAILABLE"})
+            else:
+                stats.sent += 1
+                responses.append({"success": True})
+        return {"responses": responses}
+
+    @app.get("/stats")
+    async def get_stats():
+        return asdict(app.state.stats)
+
+    @app.delete("/stats")
+    async def reset_stats():
+        app.state.stats = FakeFcmStats()
+        return asdict(app.state.stats)
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yerel FCM stand-in sunucusu")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="send_each başına gecikme")
+    parser.add_argument("--jitter-ms", type=float, default=20.0, help="Gecikme sapması (±)")
+    parser.add_argument("--unregistered-rate", type=float, default=0.0, help="Mesaj başına UNREGISTERED olasılığı")
+    parser.add_argument("--transient-rate", type=float, default=0.0, help="Mesaj başına UNAVAILABLE olasılığı")
+    parser.add_argument("--outage-rate", type=float, default=0.0, help="İstek başına 503 olasılığı")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = FakeFcmConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        unregistered_rate=args.unregistered_rate,
+        transient_rate=args.transient_rate,
+        outage_rate=args.outage_rate,
+        seed=args.seed,
+    )
+    print(f"📨 Fake FCM listening on http://{args.host}:{args.port} ({config})")
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,9 +9,10 @@ import asyncio
 from datetime import datetime, timezone, timedelta
 from uuid import uuid4
 
-from sqlalchemy import delete
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.config import settings
 from app.constants import RequestStatus, RequestType, CommitmentStatus, UserRole
 from app.core.exceptions import (
     GeofenceException,
@@ -20,7 +21,8 @@ from app.core.exceptions import (
     BadRequestException,
 )
 from app.core.security import hash_password
-from app.models import User, Hospital, BloodRequest, DonationCommitment
+from app.models import User, Hospital, BloodRequest, DonationCommitment, Notification
+from app.services.notification_throttle_service import ThrottleDecision
 from app.services.blood_request_service import (
     create_request,
     get_request,
@@ -29,8 +31,13 @@ from app.services.blood_request_service import (
     update_request,
     cancel_request,
     expire_stale_requests,
+    advance_dispatch_waves,
+    notify_donor_ring,
 )
+from app.services.donor_index_service import donor_index, rebuild_donor_index, track_commitment_started
+from app.services.notification_service import get_unread_count, mark_as_read
 from app.utils.location import create_point
+from app.utils.pagination import next_cursor_for
 
 
 # =============================================================================
@@ -303,6 +310,29 @@ async def test_list_requests_pagination(db_session, requester, hospital):
     assert len(p2) >= 1
 
 
+@pytest.mark.asyncio
+async def test_list_requests_cursor_pagination(db_session, requester, hospital):
+    created_ids = set()
+    for _ in range(3):
+        created = await create_request(
+            db_session,
+            requester.id,
+            _request_payload(hospital_id=hospital.id),
+        )
+        created_ids.add(created.id)
+
+    p1 = await list_requests(db_session, hospital_id=hospital.id, size=2)
+    cursor = next_cursor_for(p1, 2)
+    assert cursor is not None
+
+    p2 = await list_requests(db_session, hospital_id=hospital.id, size=2, cursor=cursor)
+
+    assert len(p1) == 2
+    assert len(p2) == 1
+    assert {item.id for item in p1 + p2} == created_ids
+    assert next_cursor_for(p2, 2) is None
+
+
 @pytest.mark.asyncio
 async def test_list_requests_excludes_expired(db_session, requester, hospital):
     expired = await create_request(db_session, requester.id, _request_payload(hospital_id=hospital.id))
@@ -685,6 +715,7 @@ async def test_find_nearby_donors_filters_and_orders(db_session, requester, hosp
     )
     db_session.add(active_commitment)
     await db_session.flush()
+    await track_commitment_started(db_session, compatible_farther.id)
 
     donors = await find_nearby_donors(db_session, active_request.id)
     donor_ids = [donor.id for donor in donors]
@@ -705,10 +736,10 @@ async def test_find_nearby_donors_not_found_raises(db_session):
         await find_nearby_donors(db_session, "00000000-0000-0000-0000-000000000000")
 
 
-@pytest.mark.asyncio
-async def test_find_nearby_donors_returns_max_50(db_session, requester, hospital, active_request):
-    for idx in range(60):
-        donor = User(
+def _bulk_donors(count: int, **overrides) -> list[User]:
+    donors = []
+    for idx in range(count):
+        data = dict(
             phone_number=f"+90556123{idx:04d}",
             password_hash=hash_password("Test1234!"),
             full_name=f"Bulk Donor {idx}",
@@ -719,10 +750,262 @@ async def test_find_nearby_donors_returns_max_50(db_session, requester, hospital
             fcm_token=f"bulk-token-{idx}",
             location=create_point(36.8969 + (idx * 0.00001), 30.7133 + (idx * 0.00001)),
         )
-        db_session.add(donor)
+        data.update(overrides)
+        donors.append(User(**data))
+    return donors
+
+
+@pytest.mark.asyncio
+async def test_find_nearby_donors_fanout_sized_by_units(db_session, requester, hospital, active_request):
+    db_session.add_all(_bulk_donors(60))
+    await db_session.flush()
+
+    donors = await find_nearby_donors(db_session, active_request.id)
+
+    # 2 ünite × 2.0 güvenlik katsayısı / 0.9 gelme olasılığı → 5, alt sınır 10
+    assert len(donors) == settings.DONOR_FANOUT_MIN
+
+
+@pytest.mark.asyncio
+async def test_find_nearby_donors_returns_max_50(db_session, requester, hospital, active_request):
+    db_session.add_all(_bulk_donors(60))
+    active_request.units_needed = 40
+    await db_session.flush()
+
+    donors = await find_nearby_donors(db_session, active_request.id)
+
+    assert len(donors) == settings.DONOR_FANOUT_MAX == 50
+
 
+@pytest.mark.asyncio
+async def test_find_nearby_donors_prefers_reliable_donors(db_session, requester, hospital, active_request):
+    unreliable = _bulk_donors(12, trust_score=20, no_show_count=4)
+    reliable = User(
+        phone_number="+905551239101",
+        password_hash=hash_password("Test1234!"),
+        full_name="Reliable Donor",
+        date_of_birth=datetime(1991, 1, 1, tzinfo=timezone.utc),
+        blood_type="O+",
+        role=UserRole.USER.value,
+        is_active=True,
+        fcm_token="token-reliable",
+        location=create_point(36.9000, 30.7170),
+    )
+    db_session.add_all([*unreliable, reliable])
     await db_session.flush()
 
     donors = await find_nearby_donors(db_session, active_request.id)
 
-    assert len(donors) == 50
+    assert donors[0].id == reliable.id
+
+
+# =============================================================================
+# WAVE DISPATCH
+# =============================================================================
+
+
+async def _ring_donors(db_session) -> tuple[User, User]:
+    """Hastane yanında bir ve ~3 km uzakta (ilk halkanın dışında) bir bağışçı."""
+    near, far = _bulk_donors(2)
+    far.location = create_point(36.9239, 30.7133)
+    db_session.add_all([near, far])
+    await db_session.flush()
+    return near, far
+
+
+async def _notified_user_ids(db_session, request_id: str) -> set[str]:
+    result = await db_session.execute(
+        select(Notification.user_id).where(Notification.blood_request_id == request_id)
+    )
+    return set(result.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_create_request_notifies_initial_ring_only(db_session, requester, hospital):
+    near, far = await _ring_donors(db_session)
+
+    req = await create_request(db_session, requester.id, _request_payload(hospital_id=hospital.id))
+    notified = await _notified_user_ids(db_session, req.id)
+
+    assert near.id in notified
+    assert far.id not in notified
+    assert req.dispatch_radius_meters == settings.DISPATCH_INITIAL_RADIUS_METERS
+    assert req.next_dispatch_at is not None
+
+
+@pytest.mark.asyncio
+async def test_advance_dispatch_waves_expands_ring(db_session, requester, hospital):
+    near, far = await _ring_donors(db_session)
+    req = await create_request(db_session, requester.id, _request_payload(hospital_id=hospital.id))
+
+    expanded = await advance_dispatch_waves(db_session, now=req.next_dispatch_at + timedelta(seconds=1))
+    notified = await _notified_user_ids(db_session, req.id)
+
+    assert expanded == 1
+    assert far.id in notified
+    assert req.dispatch_radius_meters == settings.DISPATCH_INITIAL_RADIUS_METERS * 2
+
+
+@pytest.mark.asyncio
+async def test_advance_dispatch_waves_waits_after_new_commitment(db_session, requester, hospital):
+    near, far = await _ring_donors(db_session)
+    req = await create_request(db_session, requester.id, _request_payload(hospital_id=hospital.id))
+    db_session.add(
+        DonationCommitment(
+            donor_id=near.id,
+            blood_request_id=req.id,
+            status=CommitmentStatus.ON_THE_WAY.value,
+        )
+    )
+    await db_session.flush()
+    due_at = req.next_dispatch_at
+
+    expanded = await advance_dispatch_waves(db_session, now=due_at + timedelta(seconds=1))
+
+    assert expanded == 0
+    assert far.id not in await _notified_user_ids(db_session, req.id)
+    assert req.dispatch_radius_meters == settings.DISPATCH_INITIAL_RADIUS_METERS
+    assert req.next_dispatch_at > due_at
+
+
+@pytest.mark.asyncio
+async def test_advance_dispatch_waves_stops_when_slots_filled(db_session, requester, hospital):
+    donors = _bulk_donors(3)
+    db_session.add_all(donors)
+    await db_session.flush()
+    req = await create_request(
+        db_session, requester.id, _request_payload(hospital_id=hospital.id, units_needed=2)
+    )
+    for donor in donors:
+        db_session.add(
+            DonationCommitment(
+                donor_id=donor.id,
+                blood_request_id=req.id,
+                status=CommitmentStatus.ON_THE_WAY.value,
+            )
+        )
+    await db_session.flush()
+
+    await advance_dispatch_waves(db_session, now=req.next_dispatch_at + timedelta(seconds=1))
+
+    assert req.next_dispatch_at is None
+
+
+@pytest.mark.asyncio
+async def test_same_hospital_requests_collapse_through_dispatch(db_session, requester, hospital):
+    """İkinci talep, ilk talebin bildirimlerini (okunmuş olsa da) kendine taşır."""
+    near, far = await _ring_donors(db_session)
+    first = await create_request(db_session, requester.id, _request_payload(hospital_id=hospital.id))
+    await advance_dispatch_waves(db_session, now=first.next_dispatch_at + timedelta(seconds=1))
+    assert {near.id, far.id} <= await _notified_user_ids(db_session, first.id)
+
+    # Okuma updated_at'i ilerletir; tekilleştirme penceresini etkilememeli
+    read_result = await db_session.execute(
+        select(Notification.id).where(Notification.user_id == near.id)
+    )
+    await mark_as_read(db_session, near.id, list(read_result.scalars().all()))
+    assert await get_unread_count(db_session, near.id) == 0
+
+    second = await create_request(db_session, requester.id, _request_payload(hospital_id=hospital.id))
+    await advance_dispatch_waves(db_session, now=second.next_dispatch_at + timedelta(seconds=1))
+
+    result = await db_session.execute(
+        select(Notification.user_id, Notification.blood_request_id, Notification.is_read)
+        .where(Notification.user_id.in_([near.id, far.id]))
+    )
+    rows = {user_id: (request_id, is_read) for user_id, request_id, is_read in result.all()}
+    assert rows == {near.id: (second.id, False), far.id: (second.id, False)}
+    assert await get_unread_count(db_session, near.id) == 1
+
+
+@pytest.mark.asyncio
+async def test_collapsed_notification_is_not_taken_back_by_the_first_request(db_session, requester, hospital):
+    """İlk talebin sonraki dalgası, ikinci talebe taşınan bildirimi geri almaz."""
+    near, far = await _ring_donors(db_session)
+    first = await create_request(db_session, requester.id, _request_payload(hospital_id=hospital.id))
+    await advance_dispatch_waves(db_session, now=first.next_dispatch_at + timedelta(seconds=1))
+    second = await create_request(db_session, requester.id, _request_payload(hospital_id=hospital.id))
+    await advance_dispatch_waves(db_session, now=second.next_dispatch_at + timedelta(seconds=1))
+
+    read_result = await db_session.execute(
+        select(Notification.id).where(Notification.user_id == near.id)
+    )
+    await mark_as_read(db_session, near.id, list(read_result.scalars().all()))
+
+    # İlk talep baştan bir dalga daha açar; iki bağışçı da onun için bildirilmiş sayılır
+    first.dispatch_radius_meters = settings.DISPATCH_INITIAL_RADIUS_METERS
+    first.next_dispatch_at = datetime.now(timezone.utc)
+    second.next_dispatch_at = None
+    await db_session.flush()
+    expanded = await advance_dispatch_waves(db_session, now=first.next_dispatch_at + timedelta(seconds=1))
+
+    assert expanded == 0
+    result = await db_session.execute(
+        select(
+            Notification.user_id, Notification.blood_request_id,
+            Notification.covered_request_ids, Notification.is_read,
+        )
+        .where(Notification.user_id.in_([near.id, far.id]))
+    )
+    rows = {user_id: (request_id, covered, is_read) for user_id, request_id, covered, is_read in result.all()}
+    assert rows == {
+        near.id: (second.id, [first.id], True),
+        far.id: (second.id, [first.id], False),
+    }
+    assert await get_unread_count(db_session, near.id) == 0
+
+
+@pytest.mark.asyncio
+async def test_notify_donor_ring_refills_slots_taken_by_collapsed_donors(monkeypatch):
+    """Collapse edilen bağışçı yeni kişi sayılmaz; yeri sıradaki adayla doldurulur."""
+    from types import SimpleNamespace
+    from app.services import blood_request_service
+
+    donors = {name: SimpleNamespace(id=name, fcm_token=f"token-{name}") for name in "abcd"}
+    searches = [[donors["a"], donors["b"]], [donors["c"], donors["d"]]]
+    batches = []
+
+    async def fake_find_nearby_donors(db, request_id, radius_meters=None, exclude_notified=False):
+        assert exclude_notified
+        return searches.pop(0)
+
+    async def fake_create_request_notifications(db, blood_request, recipients, context, now=None):
+        batches.append([user_id for user_id, _ in recipients])
+        if "b" in batches[-1]:
+            return ThrottleDecision(deliver=[("a", "token-a")], collapse=[("b", "n-b", "token-b")])
+        return ThrottleDecision(deliver=list(recipients))
+
+    monkeypatch.setattr(blood_request_service, "find_nearby_donors", fake_find_nearby_donors)
+    monkeypatch.setattr(blood_request_service, "create_request_notifications", fake_create_request_notifications)
+    blood_request = SimpleNamespace(id="request-1", blood_type="A+")
+
+    notified = await notify_donor_ring(None, blood_request, "Hastane", 5000)
+
+    assert notified == 2
+    assert batches == [["a", "b"], ["c"]]
+
+
+@pytest.mark.asyncio
+async def test_advance_dispatch_waves_reaches_outer_ring_with_donor_index(
+    db_session, requester, hospital, monkeypatch
+):
+    """Aday havuzu iç halkayla dolsa da index yolu sonraki dalgada dış halkaya ulaşır."""
+    near_donors = _bulk_donors(3)
+    far = near_donors.pop()
+    far.location = create_point(36.9239, 30.7133)
+    db_session.add_all([*near_donors, far])
+    await db_session.flush()
+    monkeypatch.setattr(settings, "DONOR_CANDIDATE_POOL_SIZE", 2)
+
+    await rebuild_donor_index(db_session)
+    try:
+        req = await create_request(db_session, requester.id, _request_payload(hospital_id=hospital.id))
+        assert await _notified_user_ids(db_session, req.id) == {donor.id for donor in near_donors}
+
+        expanded = await advance_dispatch_waves(db_session, now=req.next_dispatch_at + timedelta(seconds=1))
+    finally:
+        donor_index.reset()
+
+    assert expanded == 1
+    assert far.id in await _notified_user_ids(db_session, req.id)
+    assert req.dispatch_radius_meters == settings.DISPATCH_INITIAL_RADIUS_METERS * 2
@@ -0,0 +1,225 @@
+"""
+Commitment Scheduler Testleri.
+
+Bu dosya, app/services/commitment_scheduler_service.py (CommitmentScheduler)
+ve app/background/commitment_scheduler.py (fire_due_commitments)
+fonksiyonlarını test eder. Testler DB gerektirmez.
+"""
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.commitment_scheduler_service import CommitmentScheduler, commitment_deadline
+
+
+NOW = datetime(2026, 3, 16, 12, 0, tzinfo=timezone.utc)
+
+
+def _scheduler() -> CommitmentScheduler:
+    return CommitmentScheduler(warning_lead=timedelta(minutes=10))
+
+
+# =============================================================================
+# TEST_COMMITMENT_SCHEDULER
+# =============================================================================
+
+class TestCommitmentScheduler:
+    """Deadline sıralaması, iptal ve yeniden yükleme."""
+
+    def test_warning_fires_before_timeout(self):
+        scheduler = _scheduler()
+        scheduler.schedule("c1", NOW + timedelta(minutes=60))
+
+        assert scheduler.next_due() == NOW + timedelta(minutes=50)
+        assert scheduler.pop_due(NOW + timedelta(minutes=49)) == ([], [])
+        assert scheduler.pop_due(NOW + timedelta(minutes=50)) == (["c1"], [])
+        assert scheduler.pop_due(NOW + timedelta(minutes=60)) == ([], ["c1"])
+        assert len(scheduler) == 0
+        assert scheduler.next_due() is None
+
+    def test_due_commitments_are_popped_in_deadline_order(self):
+        scheduler = _scheduler()
+        scheduler.schedule("late", NOW + timedelta(minutes=30), warn=False)
+        scheduler.schedule("early", NOW + timedelta(minutes=20), warn=False)
+
+        assert scheduler.pop_due(NOW + timedelta(hours=1)) == ([], ["early", "late"])
+
+    def test_cancelled_commitment_is_skipped(self):
+        scheduler = _scheduler()
+        scheduler.schedule("c1", NOW + timedelta(minutes=60))
+        scheduler.cancel("c1")
+
+        assert scheduler.next_due() is None
+        assert scheduler.pop_due(NOW + timedelta(hours=2)) == ([], [])
+
+    def test_reload_does_not_duplicate_or_rewarn(self):
+        scheduler = _scheduler()
+        timeout_at = NOW + timedelta(minutes=60)
+        scheduler.schedule("c1", timeout_at)
+        # DB'den yeniden yükleme: uyarı başka yerde gönderilmiş
+        scheduler.schedule("c1", timeout_at, warn=False)
+
+        assert scheduler.pop_due(timeout_at) == ([], ["c1"])
+
+    def test_warning_skipped_when_timeout_shorter_than_lead(self):
+        scheduler = _scheduler()
+
+        assert scheduler.warns(60)
+        assert not scheduler.warns(10)
+
+    def test_after_commit_hooks_require_running_scheduler(self):
+        scheduler = _scheduler()
+        commitment = SimpleNamespace(id="c1", created_at=NOW, timeout_minutes=60)
+        callbacks = []
+
+        with patch(
+            "app.services.commitment_scheduler_service.run_after_commit",
+            side_effect=lambda session, callback: callbacks.append(callback),
+        ):
+            scheduler.schedule_after_commit(None, commitment)
+            assert callbacks == []
+
+            scheduler._running = True
+            scheduler.schedule_after_commit(None, commitment)
+            scheduler.cancel_after_commit(None, "c1")
+
+        callbacks[0]()
+        assert len(scheduler) == 1
+        callbacks[1]()
+        assert len(scheduler) == 0
+
+    def test_clear_keeps_scheduler_running(self):
+        scheduler = _scheduler()
+        scheduler.start()
+        scheduler.schedule("c1", NOW)
+
+        scheduler.clear()
+
+        assert len(scheduler) == 0
+        assert scheduler.next_due() is None
+        assert scheduler.is_running
+
+    def test_commitment_deadline_assumes_utc_for_naive_times(self):
+        naive = datetime(2026, 3, 16, 12, 0)
+
+        assert commitment_deadline(naive, 60) == NOW + timedelta(minutes=60)
+
+
+# =============================================================================
+# TEST_FIRE_DUE_COMMITMENTS
+# =============================================================================
+
+class TestFireDueCommitments:
+    """Zamanı gelen taahhütlerin tek transaction'da işlenmesi."""
+
+    @pytest.mark.asyncio
+    async def test_fires_warnings_and_timeouts(self):
+        from app.background import commitment_scheduler as task
+
+        scheduler = _scheduler()
+        past = datetime.now(timezone.utc) - timedelta(minutes=1)
+        scheduler.schedule("expired", past, warn=False)
+        scheduler.schedule("warned", past + timedelta(minutes=5))
+
+        session = AsyncMock()
+        with patch.object(task, "commitment_scheduler", scheduler), patch(
+            "app.background.commitment_scheduler.AsyncSessionLocal"
+        ) as session_local, patch(
+            "app.background.commitment_scheduler.send_timeout_warnings", AsyncMock(return_value=1)
+        ) as warnings, patch(
+            "app.background.commitment_scheduler.check_timeouts", AsyncMock(return_value=1)
+        ) as timeouts:
+            session_local.return_value.__aenter__ = AsyncMock(return_value=session)
+            session_local.return_value.__aexit__ = AsyncMock(return_value=None)
+
+            assert await task.fire_due_commitments() == (1, 1)
+
+        assert warnings.await_args.kwargs["commitment_ids"] == ["warned"]
+        assert timeouts.await_args.kwargs["commitment_ids"] == ["expired"]
+        session.commit.assert_awaited_once()
+        assert len(scheduler) == 1
+
+    @pytest.mark.asyncio
+    async def test_nothing_due_skips_database(self):
+        from app.background import commitment_scheduler as task
+
+        scheduler = _scheduler()
+        scheduler.schedule("c1", datetime.now(timezone.utc) + timedelta(hours=1))
+
+        with patch.object(task, "commitment_scheduler", scheduler), patch(
+            "app.background.commitment_scheduler.AsyncSessionLocal"
+        ) as session_local:
+            assert await task.fire_due_commitments() == (0, 0)
+
+        session_local.assert_not_called()
+
+
+class TestRunCommitmentScheduler:
+    """Deadline'ların yalnızca job leader'ında işlenmesi."""
+
+    @pytest.mark.asyncio
+    async def test_non_leader_releases_deadlines_without_firing(self):
+        from app.background import commitment_scheduler as task
+
+        scheduler = _scheduler()
+        scheduler.start()
+        scheduler.schedule("c1", datetime.now(timezone.utc) - timedelta(minutes=1), warn=False)
+
+        with patch.object(task, "commitment_scheduler", scheduler), patch.object(
+            task.job_runner, "is_leader", AsyncMock(return_value=False)
+        ), patch.object(
+            task, "fire_due_commitments", AsyncMock(return_value=(0, 0))
+        ) as fire, patch.object(
+            task, "refresh_commitment_deadlines", AsyncMock()
+        ) as refresh, patch.object(
+            task.asyncio, "sleep", AsyncMock(side_effect=lambda _: task.stop_commitment_scheduler())
+        ):
+            await task.run_commitment_scheduler()
+
+        fire.assert_not_awaited()
+        refresh.assert_not_awaited()
+        assert len(scheduler) == 0
+
+    @pytest.mark.asyncio
+    async def test_leader_loads_all_deadlines_once_then_fires(self):
+        from app.background import commitment_scheduler as task
+
+        scheduler = _scheduler()
+        scheduler.start()
+        loaded_at = datetime.now(timezone.utc)
+
+        with patch.object(task, "commitment_scheduler", scheduler), patch.object(
+            task.job_runner, "is_leader", AsyncMock(return_value=True)
+        ), patch.object(
+            task, "fire_due_commitments", AsyncMock(side_effect=lambda: task.stop_commitment_scheduler() or (0, 0))
+        ) as fire, patch.object(
+            task, "refresh_commitment_deadlines", AsyncMock(return_value=loaded_at)
+        ) as refresh, patch.object(scheduler, "wait", AsyncMock()):
+            await task.run_commitment_scheduler()
+
+        refresh.assert_awaited_once_with(None)
+        fire.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_refresh_loads_only_recent_commitments_after_first_load(self):
+        from app.background import commitment_scheduler as task
+
+        scheduler = _scheduler()
+        loaded_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+
+        with patch.object(task, "commitment_scheduler", scheduler), patch(
+            "app.background.commitment_scheduler.AsyncSessionLocal"
+        ) as session_local, patch(
+            "app.background.commitment_scheduler.load_commitment_deadlines", AsyncMock(return_value=0)
+        ) as load:
+            session_local.return_value.__aenter__ = AsyncMock(return_value=AsyncMock())
+            session_local.return_value.__aexit__ = AsyncMock(return_value=None)
+
+            first = await task.refresh_commitment_deadlines(None)
+            await task.refresh_commitment_deadlines(loaded_at)
+
+        assert first >= loaded_at
+        assert load.await_args_list[0].kwargs["created_after"] is None
+        assert load.await_args_list[1].kwargs["created_after"] == loaded_at - timedelta(seconds=task.MAX_IDLE_SECONDS)
@@ -3,10 +3,13 @@ Donation Service Testleri.
 
 Bu test dosyası, bağış taahhüdü service fonksiyonlarının doğru çalıştığını doğrular.
 """
+import asyncio
 import pytest
 from datetime import datetime, timedelta, timezone
+from uuid import uuid4
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.services.donation_service import (
     get_commitment_by_id,
@@ -16,9 +19,10 @@ from app.services.donation_service import (
     create_commitment,
     update_commitment_status,
     check_timeouts,
+    send_timeout_warnings,
     redirect_excess_donors,
 )
-from app.models import User, Hospital, BloodRequest, DonationCommitment
+from app.models import User, Hospital, BloodRequest, DonationCommitment, Notification
 from app.core.security import hash_password
 from app.constants import UserRole, RequestStatus, CommitmentStatus, RequestType
 from app.core.exceptions import (
@@ -119,6 +123,9 @@ async def create_test_commitment(
         timeout_minutes=60,
     )
     db_session.add(commitment)
+    if status in (CommitmentStatus.ON_THE_WAY.value, CommitmentStatus.ARRIVED.value):
+        # create_commitment'ın aldığı slotu taklit et
+        request.active_commitment_count += 1
     await db_session.flush()
     return commitment
 
@@ -399,6 +406,90 @@ async def test_n_plus_1_rule_rejects_over_limit(db_session: AsyncSession):
         await create_commitment(db_session, donor3.id, request.id)
 
 
+async def test_concurrent_commitments_cannot_exceed_slots(test_engine):
+    """Ayrı session'lardaki eşzamanlı taahhütler N+1 sınırını aşamamalı."""
+    session_factory = async_sessionmaker(
+        test_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+    unique_suffix = uuid4().hex[:6]
+    user_ids = []
+    hospital_id = None
+    request_id = None
+
+    try:
+        async with session_factory() as setup_session:
+            hospital = Hospital(
+                hospital_code=f"SLT-{unique_suffix.upper()}",
+                name="Slot Race Hastanesi",
+                address="Test Adres",
+                district="Test İlçe",
+                city="Test Şehir",
+                phone_number=f"0242{unique_suffix}",
+                location=create_point_wkt(36.8969, 30.7133),
+                geofence_radius_meters=5000,
+            )
+            users = [
+                User(
+                    phone_number=f"+90556{unique_suffix}{i}",
+                    password_hash="x",
+                    full_name=f"Slot Race User {i}",
+                    date_of_birth=datetime(1990, 1, 1, tzinfo=timezone.utc),
+                    blood_type="A+",
+                    role=UserRole.USER.value,
+                    is_active=True,
+                )
+                for i in range(5)
+            ]
+            setup_session.add(hospital)
+            setup_session.add_all(users)
+            await setup_session.flush()
+            request = BloodRequest(
+                request_code=f"#KAN-{unique_suffix}",
+                requester_id=users[0].id,
+                hospital_id=hospital.id,
+                blood_type="A+",
+                request_type=RequestType.WHOLE_BLOOD.value,
+                units_needed=1,
+                status=RequestStatus.ACTIVE.value,
+                location=create_point_wkt(36.8969, 30.7133),
+            )
+            setup_session.add(request)
+            await setup_session.commit()
+            hospital_id = hospital.id
+            user_ids = [user.id for user in users]
+            request_id = request.id
+
+        async def _accept(donor_id: str):
+            async with session_factory() as session:
+                try:
+                    await create_commitment(session, donor_id, request_id)
+                    await session.commit()
+                    return True
+                except SlotFullException:
+                    await session.rollback()
+                    return False
+
+        results = await asyncio.gather(*(_accept(donor_id) for donor_id in user_ids[1:]))
+
+        # units_needed=1 → N+1 = 2 slot
+        assert sorted(results) == [False, False, True, True]
+        async with session_factory() as check_session:
+            request = await check_session.get(BloodRequest, request_id)
+            assert request.active_commitment_count == 2
+
+    finally:
+        async with session_factory() as cleanup_session:
+            if request_id:
+                await cleanup_session.execute(delete(BloodRequest).where(BloodRequest.id == request_id))
+            if user_ids:
+                await cleanup_session.execute(delete(User).where(User.id.in_(user_ids)))
+            if hospital_id:
+                await cleanup_session.execute(delete(Hospital).where(Hospital.id == hospital_id))
+            await cleanup_session.commit()
+
+
 # =============================================================================
 # UPDATE_COMMITMENT_STATUS TESTS
 # =============================================================================
@@ -434,6 +525,49 @@ async def test_update_commitment_to_cancelled(db_session: AsyncSession):
     assert updated.status == CommitmentStatus.CANCELLED.value
 
 
+async def test_commitment_lifecycle_maintains_active_flag(db_session: AsyncSession):
+    """has_active_commitment taahhüt başlayınca True, bitince False olmalı."""
+    hospital = await create_test_hospital(db_session)
+    donor = await create_test_donor(db_session)
+    requester = await create_test_donor(db_session, phone="+90555222222")
+    request = await create_test_request(db_session, requester, hospital)
+
+    commitment = await create_commitment(db_session, donor.id, request.id)
+    await db_session.refresh(donor)
+    assert donor.has_active_commitment is True
+
+    await update_commitment_status(
+        db_session, commitment.id, donor.id, CommitmentStatus.CANCELLED.value
+    )
+    await db_session.refresh(donor)
+    assert donor.has_active_commitment is False
+
+
+async def test_commitment_lifecycle_maintains_slot_counter(db_session: AsyncSession):
+    """active_commitment_count taahhüt alınınca artmalı, iptal/timeout ile azalmalı."""
+    hospital = await create_test_hospital(db_session)
+    donor1 = await create_test_donor(db_session, phone="+90555111111")
+    donor2 = await create_test_donor(db_session, phone="+90555333333")
+    requester = await create_test_donor(db_session, phone="+90555222222")
+    request = await create_test_request(db_session, requester, hospital, units_needed=2)
+
+    first = await create_commitment(db_session, donor1.id, request.id)
+    second = await create_commitment(db_session, donor2.id, request.id)
+    assert request.active_commitment_count == 2
+
+    await update_commitment_status(
+        db_session, first.id, donor1.id, CommitmentStatus.CANCELLED.value
+    )
+    assert request.active_commitment_count == 1
+
+    second.created_at = datetime.now(timezone.utc) - timedelta(hours=2)
+    await db_session.flush()
+    assert await check_timeouts(db_session) == 1
+
+    await db_session.refresh(request)
+    assert request.active_commitment_count == 0
+
+
 async def test_update_commitment_not_found(db_session: AsyncSession):
     """Olmayan taahhüt için NotFoundException."""
     donor = await create_test_donor(db_session)
@@ -629,6 +763,97 @@ async def test_check_timeouts_returns_count(db_session: AsyncSession):
     assert timeout_count == 2
 
 
+async def test_check_timeouts_processes_bounded_batches(db_session: AsyncSession):
+    """limit kadar taahhüt işlenmeli, kalanlar sonraki çağrıya kalmalı."""
+    hospital = await create_test_hospital(db_session)
+    donor1 = await create_test_donor(db_session, phone="+90555111111")
+    donor2 = await create_test_donor(db_session, phone="+90555222222")
+    requester = await create_test_donor(db_session, phone="+90555444444")
+    request = await create_test_request(db_session, requester, hospital, units_needed=5)
+
+    commitments = []
+    for hours, donor in [(3, donor1), (2, donor2)]:
+        c = DonationCommitment(
+            donor_id=donor.id,
+            blood_request_id=request.id,
+            status=CommitmentStatus.ON_THE_WAY.value,
+            timeout_minutes=60,
+        )
+        db_session.add(c)
+        await db_session.flush()
+        c.created_at = datetime.now(timezone.utc) - timedelta(hours=hours)
+        await db_session.flush()
+        commitments.append(c)
+
+    assert await check_timeouts(db_session, limit=1) == 1
+    # En eski taahhüt önce işlenir
+    await db_session.refresh(commitments[0])
+    await db_session.refresh(commitments[1])
+    assert commitments[0].status == CommitmentStatus.TIMEOUT.value
+    assert commitments[1].status == CommitmentStatus.ON_THE_WAY.value
+
+    assert await check_timeouts(db_session, limit=1) == 1
+    assert await check_timeouts(db_session, limit=1) == 0
+
+
+async def test_check_timeouts_only_given_commitments(db_session: AsyncSession):
+    """commitment_ids verilirse yalnızca o taahhütler timeout edilmeli."""
+    hospital = await create_test_hospital(db_session)
+    requester = await create_test_donor(db_session, phone="+90555222222")
+    request = await create_test_request(db_session, requester, hospital)
+
+    commitments = []
+    for phone in ("+90555111111", "+90555333333"):
+        donor = await create_test_donor(db_session, phone=phone)
+        commitment = await create_test_commitment(db_session, donor, request)
+        commitment.created_at = datetime.now(timezone.utc) - timedelta(hours=2)
+        commitments.append(commitment)
+    await db_session.flush()
+
+    assert await check_timeouts(db_session, commitment_ids=[commitments[1].id]) == 1
+
+    for commitment in commitments:
+        await db_session.refresh(commitment)
+    assert commitments[0].status == CommitmentStatus.ON_THE_WAY.value
+    assert commitments[1].status == CommitmentStatus.TIMEOUT.value
+
+
+# =============================================================================
+# SEND_TIMEOUT_WARNINGS TESTS
+# =============================================================================
+
+async def test_send_timeout_warnings_once_within_warning_window(db_session: AsyncSession):
+    """Uyarı penceresindeki taahhüde bir kez TIMEOUT_WARNING gönderilmeli."""
+    hospital = await create_test_hospital(db_session)
+    requester = await create_test_donor(db_session, phone="+90555222222")
+    request = await create_test_request(db_session, requester, hospital)
+    due_donor = await create_test_donor(db_session, phone="+90555111111")
+    early_donor = await create_test_donor(db_session, phone="+90555333333")
+
+    # 60 dk timeout: 55 dk önce oluşturulan uyarı penceresinde, 5 dk önce oluşturulan değil
+    due = await create_test_commitment(db_session, due_donor, request)
+    early = await create_test_commitment(db_session, early_donor, request)
+    due.created_at = datetime.now(timezone.utc) - timedelta(minutes=55)
+    early.created_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+    await db_session.flush()
+
+    assert await send_timeout_warnings(db_session) == 1
+    assert await send_timeout_warnings(db_session) == 0
+
+    await db_session.refresh(due)
+    await db_session.refresh(early)
+    assert due.timeout_warning_sent_at is not None
+    assert early.timeout_warning_sent_at is None
+
+    result = await db_session.execute(
+        select(Notification).where(Notification.notification_type == "TIMEOUT_WARNING")
+    )
+    notifications = result.scalars().all()
+    assert [n.user_id for n in notifications] == [due_donor.id]
+    assert notifications[0].blood_request_id == request.id
+    assert "5 dk" in notifications[0].message
+
+
 # =============================================================================
 # REDIRECT_EXCESS_DONORS TESTS
 # =============================================================================
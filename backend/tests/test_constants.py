@@ -18,8 +18,12 @@ import pytest
 from app.constants.blood_types import (
     BloodType,
     DONATION_COMPATIBILITY,
+    BLOOD_TYPE_BITS,
+    COMPATIBLE_DONOR_MASKS,
+    COMPATIBLE_RECIPIENT_MASKS,
     can_donate,
     get_compatible_donors,
+    mask_to_blood_types,
     BLOOD_TYPE_DESCRIPTIONS,
 )
 from app.constants.roles import (
@@ -270,6 +274,34 @@ class TestGetCompatibleDonorsFunction:
         assert "X+" not in donors2
 
 
+class TestBloodTypeMasks:
+    """
+    Önceden hesaplanmış bitmask tablolarının matrisle tutarlılığı.
+    """
+
+    def test_each_blood_type_has_distinct_bit(self):
+        bits = list(BLOOD_TYPE_BITS.values())
+        assert len(set(bits)) == 8
+        assert all(bit & (bit - 1) == 0 for bit in bits)
+        assert sum(bits) == 0xFF
+
+    def test_donor_masks_match_matrix(self):
+        for recipient, donors in DONATION_COMPATIBILITY.items():
+            assert set(mask_to_blood_types(COMPATIBLE_DONOR_MASKS[recipient])) == set(donors)
+
+    def test_recipient_masks_are_transpose_of_donor_masks(self):
+        for donor in BloodType.all_values():
+            for recipient in BloodType.all_values():
+                forward = bool(COMPATIBLE_DONOR_MASKS[recipient] & BLOOD_TYPE_BITS[donor])
+                backward = bool(COMPATIBLE_RECIPIENT_MASKS[donor] & BLOOD_TYPE_BITS[recipient])
+                assert forward is backward
+
+    def test_universal_donor_and_recipient_masks(self):
+        assert COMPATIBLE_RECIPIENT_MASKS["O-"] == 0xFF
+        assert COMPATIBLE_DONOR_MASKS["AB+"] == 0xFF
+        assert mask_to_blood_types(COMPATIBLE_RECIPIENT_MASKS["AB+"]) == ["AB+"]
+
+
 # =============================================================================
 # USER ROLE TESTS
 # =============================================================================
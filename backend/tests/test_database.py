@@ -133,3 +133,26 @@ class TestDatabaseQueries:
             result = await session.execute(text("SHOW timezone"))
             timezone = result.scalar()
             assert timezone is not None
+
+
+class TestRunAfterCommit:
+    """Commit sonrası callback'ler."""
+
+    def test_failing_callback_is_logged_and_others_still_run(self):
+        """Hata veren callback stack trace ile loglanır, sıradaki çalışır."""
+        from unittest.mock import patch
+        from app.database import AsyncSessionLocal, run_after_commit
+
+        session = AsyncSessionLocal()
+        ran = []
+
+        def failing():
+            raise RuntimeError("index update failed")
+
+        run_after_commit(session, failing)
+        run_after_commit(session, lambda: ran.append(True))
+        with patch("app.database.logger") as logger:
+            session.sync_session.dispatch.after_commit(session.sync_session)
+
+        logger.exception.assert_called_once_with("After-commit callback failed")
+        assert ran == [True]
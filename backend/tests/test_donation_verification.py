@@ -7,13 +7,14 @@ Bu dosya, Task 9.3 kapsamındaki tüm testleri içerir:
 - Bağış tamamlama
 - Hero points kazandırma
 - Cooldown başlatma
+- Doğrulamanın sorgu bütçesi
 """
 import pytest
 import pytest_asyncio
 from datetime import datetime, timedelta, timezone
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import event, select
 
 from app.models import User, Hospital, HospitalStaff, BloodRequest, DonationCommitment, QRCode, Donation
 from app.core.security import hash_password
@@ -809,4 +810,64 @@ async def test_donation_record_created(
     assert donation.donation_type == RequestType.WHOLE_BLOOD.value
     assert donation.blood_type == "A+"
     assert donation.hero_points_earned == 50
-    assert donation.status == DonationStatus.COMPLETED.value
\ No newline at end of file
+    assert donation.status == DonationStatus.COMPLETED.value
+
+
+# =============================================================================
+# TEST: QUERY BUDGET
+# =============================================================================
+
+# Tek join sorgusu + flush (QR, commitment, donation) + talep ve bağışçı
+# UPDATE'leri + iki bildirim (her biri INSERT ve okunmamış sayacı)
+VERIFY_QUERY_BUDGET = 10
+
+
+@pytest.mark.asyncio
+async def test_verify_runs_within_query_budget(
+    db_session: AsyncSession,
+    test_engine,
+    test_staff_assignment,
+    test_commitment_arrived: DonationCommitment,
+    test_blood_request: BloodRequest,
+    test_donor: User,
+    test_nurse: User,
+):
+    """Doğrulama sabit sayıda sorguyla tamamlanır ve sayaçları doğru günceller."""
+    from app.services.donation_service import verify_and_complete_donation
+
+    test_blood_request.active_commitment_count = 1
+    await db_session.flush()
+    qr_token = await get_qr_token(db_session, str(test_commitment_arrived.id))
+    initial_points = test_donor.hero_points
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        donation = await verify_and_complete_donation(db_session, str(test_nurse.id), qr_token)
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", count_statement)
+
+    # Talep FULFILLED olduğu için iki bildirim de gönderilir (en kötü durum)
+    assert len(statements) <= VERIFY_QUERY_BUDGET, statements
+    assert donation.created_at is not None
+
+    # ORM objeleri RETURNING değerleriyle senkron
+    assert test_blood_request.units_collected == 1
+    assert test_blood_request.status == RequestStatus.FULFILLED.value
+    assert test_blood_request.active_commitment_count == 0
+    assert test_donor.hero_points == initial_points + 50
+    assert test_donor.total_donations == 1
+    assert test_donor.next_available_date > datetime.now(timezone.utc)
+    assert test_donor.has_active_commitment is False
+
+    # DB ile aynı
+    await db_session.refresh(test_blood_request)
+    await db_session.refresh(test_donor)
+    assert test_blood_request.units_collected == 1
+    assert test_blood_request.active_commitment_count == 0
+    assert test_donor.hero_points == initial_points + 50
+    assert test_donor.total_donations == 1
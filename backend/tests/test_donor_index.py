@@ -0,0 +1,246 @@
+"""
+Donor Index Testleri.
+
+Bu dosya, app/utils/spatial_index.py (GridIndex), app/services/donor_index_service.py
+(DonorIndex), app/utils/location.py extract_coordinates ve
+app/background/donor_index_refresher.py fonksiyonlarını test eder.
+Tüm testler pure-Python'dır, DB gerektirmez.
+"""
+import struct
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from geoalchemy2 import WKBElement, WKTElement
+
+from app.services.donor_index_service import DonorEntry, DonorIndex
+from app.utils.location import distance_between, extract_coordinates
+from app.utils.spatial_index import GridIndex
+
+
+# Antalya merkez koordinatları
+ANTALYA_LAT = 36.8969
+ANTALYA_LNG = 30.7133
+
+
+def _entry(user_id: str, blood_type: str = "A+", lat: float = ANTALYA_LAT,
+           lng: float = ANTALYA_LNG, next_available_date=None) -> DonorEntry:
+    return DonorEntry(
+        user_id=user_id,
+        blood_type=blood_type,
+        latitude=lat,
+        longitude=lng,
+        fcm_token=f"token-{user_id}",
+        next_available_date=next_available_date,
+    )
+
+
+# =============================================================================
+# TEST_GRID_INDEX
+# =============================================================================
+
+class TestGridIndex:
+    """GridIndex yarıçap ve en yakın komşu sorguları."""
+
+    def test_invalid_cell_size_raises(self):
+        with pytest.raises(ValueError):
+            GridIndex(cell_size_meters=0)
+
+    def test_query_radius_returns_sorted_hits(self):
+        index = GridIndex(cell_size_meters=1000)
+        index.insert("far", ANTALYA_LAT + 0.03, ANTALYA_LNG)
+        index.insert("near", ANTALYA_LAT + 0.001, ANTALYA_LNG)
+        index.insert("mid", ANTALYA_LAT + 0.01, ANTALYA_LNG)
+
+        hits = index.query_radius(ANTALYA_LAT, ANTALYA_LNG, 5000)
+        assert [key for key, _, _ in hits] == ["near", "mid", "far"]
+
+    def test_query_radius_excludes_points_outside(self):
+        index = GridIndex(cell_size_meters=1000)
+        index.insert("inside", ANTALYA_LAT + 0.005, ANTALYA_LNG)
+        index.insert("outside", ANTALYA_LAT + 0.1, ANTALYA_LNG)
+
+        hits = index.query_radius(ANTALYA_LAT, ANTALYA_LNG, 2000)
+        assert [key for key, _, _ in hits] == ["inside"]
+
+    def test_query_radius_matches_full_scan(self):
+        """Grid sonucu düz Haversine taramasıyla aynı olmalı."""
+        index = GridIndex(cell_size_meters=500)
+        points = {}
+        for i in range(20):
+            for j in range(20):
+                lat = ANTALYA_LAT + (i - 10) * 0.004
+                lng = ANTALYA_LNG + (j - 10) * 0.004
+                points[(i, j)] = (lat, lng)
+                index.insert((i, j), lat, lng)
+
+        radius = 3000
+        expected = {
+            key for key, (lat, lng) in points.items()
+            if distance_between(ANTALYA_LAT, ANTALYA_LNG, lat, lng) <= radius
+        }
+        hits = index.query_radius(ANTALYA_LAT, ANTALYA_LNG, radius)
+        assert {key for key, _, _ in hits} == expected
+
+    def test_reinsert_moves_point(self):
+        index = GridIndex(cell_size_meters=1000)
+        index.insert("u1", ANTALYA_LAT, ANTALYA_LNG)
+        index.insert("u1", ANTALYA_LAT + 1.0, ANTALYA_LNG)
+
+        assert len(index) == 1
+        assert index.query_radius(ANTALYA_LAT, ANTALYA_LNG, 5000) == []
+
+    def test_remove(self):
+        index = GridIndex()
+        index.insert("u1", ANTALYA_LAT, ANTALYA_LNG)
+        assert index.remove("u1") is True
+        assert index.remove("u1") is False
+        assert "u1" not in index
+
+    def test_limit(self):
+        index = GridIndex(cell_size_meters=1000)
+        for i in range(10):
+            index.insert(i, ANTALYA_LAT + i * 0.001, ANTALYA_LNG)
+        hits = index.query_radius(ANTALYA_LAT, ANTALYA_LNG, 10000, limit=3)
+        assert [key for key, _, _ in hits] == [0, 1, 2]
+
+    def test_nearest_expands_radius(self):
+        index = GridIndex(cell_size_meters=500)
+        index.insert("a", ANTALYA_LAT + 0.2, ANTALYA_LNG)
+        index.insert("b", ANTALYA_LAT + 0.5, ANTALYA_LNG)
+        index.insert("c", ANTALYA_LAT + 1.0, ANTALYA_LNG)
+
+        hits = index.nearest(ANTALYA_LAT, ANTALYA_LNG, k=2)
+        assert [key for key, _, _ in hits] == ["a", "b"]
+
+    def test_nearest_respects_max_radius(self):
+        index = GridIndex(cell_size_meters=500)
+        index.insert("a", ANTALYA_LAT + 1.0, ANTALYA_LNG)
+        assert index.nearest(ANTALYA_LAT, ANTALYA_LNG, k=1, max_radius_meters=10000) == []
+
+
+# =============================================================================
+# TEST_DONOR_INDEX
+# =============================================================================
+
+class TestDonorIndex:
+    """DonorIndex uygunluk filtreleri."""
+
+    def test_not_ready_until_loaded(self):
+        index = DonorIndex()
+        assert index.is_ready is False
+        index.load([], [])
+        assert index.is_ready is True
+        index.reset()
+        assert index.is_ready is False
+
+    def test_filters_by_blood_type(self):
+        index = DonorIndex()
+        index.load([_entry("a", "A+"), _entry("b", "B+"), _entry("o", "O-")], [])
+
+        hits = index.query(["A+", "O-"], ANTALYA_LAT, ANTALYA_LNG, 1000)
+        assert {entry.user_id for entry, _ in hits} == {"a", "o"}
+
+    def test_excludes_committed_donors(self):
+        index = DonorIndex()
+        index.load([_entry("a"), _entry("b")], committed_ids=["a"])
+
+        hits = index.query(["A+"], ANTALYA_LAT, ANTALYA_LNG, 1000)
+        assert [entry.user_id for entry, _ in hits] == ["b"]
+
+        index.release("a")
+        hits = index.query(["A+"], ANTALYA_LAT, ANTALYA_LNG, 1000)
+        assert {entry.user_id for entry, _ in hits} == {"a", "b"}
+
+    def test_excludes_donors_in_cooldown(self):
+        now = datetime.now(timezone.utc)
+        index = DonorIndex()
+        index.load(
+            [
+                _entry("cooldown", next_available_date=now + timedelta(days=10)),
+                _entry("ready", next_available_date=now - timedelta(days=1)),
+            ],
+            [],
+        )
+
+        hits = index.query(["A+"], ANTALYA_LAT, ANTALYA_LNG, 1000, now=now)
+        assert [entry.user_id for entry, _ in hits] == ["ready"]
+
+    def test_excludes_ids_and_limits(self):
+        index = DonorIndex()
+        index.load(
+            [_entry(f"u{i}", lat=ANTALYA_LAT + i * 0.001) for i in range(5)],
+            [],
+        )
+
+        hits = index.query(
+            ["A+"], ANTALYA_LAT, ANTALYA_LNG, 10000, exclude_ids={"u0"}, limit=2
+        )
+        assert [entry.user_id for entry, _ in hits] == ["u1", "u2"]
+
+    def test_upsert_changes_blood_type_grid(self):
+        index = DonorIndex()
+        index.load([_entry("a", "A+")], [])
+        index.upsert(_entry("a", "B+"))
+
+        assert index.query(["A+"], ANTALYA_LAT, ANTALYA_LNG, 1000) == []
+        assert len(index.query(["B+"], ANTALYA_LAT, ANTALYA_LNG, 1000)) == 1
+
+    def test_discard(self):
+        index = DonorIndex()
+        index.load([_entry("a")], [])
+        index.discard("a")
+        assert len(index) == 0
+        assert index.query(["A+"], ANTALYA_LAT, ANTALYA_LNG, 1000) == []
+
+
+# =============================================================================
+# TEST_EXTRACT_COORDINATES
+# =============================================================================
+
+class TestExtractCoordinates:
+    """extract_coordinates WKT/WKB çözümleme testleri."""
+
+    def test_none(self):
+        assert extract_coordinates(None) is None
+
+    def test_wkt_element(self):
+        point = WKTElement(f"POINT({ANTALYA_LNG} {ANTALYA_LAT})", srid=4326)
+        assert extract_coordinates(point) == (ANTALYA_LAT, ANTALYA_LNG)
+
+    def test_ewkb_with_srid(self):
+        data = struct.pack("<BII", 1, 0x20000001, 4326) + struct.pack("<dd", ANTALYA_LNG, ANTALYA_LAT)
+        point = WKBElement(data.hex(), srid=4326, extended=True)
+        assert extract_coordinates(point) == (ANTALYA_LAT, ANTALYA_LNG)
+
+    def test_wkb_big_endian(self):
+        data = struct.pack(">BI", 0, 1) + struct.pack(">dd", ANTALYA_LNG, ANTALYA_LAT)
+        point = WKBElement(data, srid=4326)
+        assert extract_coordinates(point) == (ANTALYA_LAT, ANTALYA_LNG)
+
+
+# =============================================================================
+# TEST_REFRESH_DONOR_INDEX
+# =============================================================================
+
+class TestRefreshDonorIndex:
+    """Periyodik index yeniden kurulum job'ı."""
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_resets_index(self):
+        from app.background import donor_index_refresher
+
+        donor_index = DonorIndex()
+        donor_index.load([_entry("a")], [])
+
+        with patch.object(donor_index_refresher, "donor_index", donor_index), \
+             patch.object(donor_index_refresher, "AsyncSessionLocal") as session_local, \
+             patch.object(donor_index_refresher, "rebuild_donor_index", AsyncMock(side_effect=OSError("db down"))):
+            session_local.return_value.__aenter__ = AsyncMock(return_value=AsyncMock())
+            session_local.return_value.__aexit__ = AsyncMock(return_value=None)
+
+            with pytest.raises(OSError):
+                await donor_index_refresher.refresh_donor_index()
+
+        # Bayat index yerine SQL yoluna düşülür
+        assert donor_index.is_ready is False
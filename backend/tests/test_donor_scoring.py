@@ -0,0 +1,102 @@
+"""
+Donor Scoring Testleri.
+
+Bu dosya, app/utils/donor_scoring.py fonksiyonlarını test eder.
+Tüm testler pure-Python'dır, DB gerektirmez.
+"""
+import pytest
+
+from app.utils.donor_scoring import (
+    SHOW_UP_CEILING,
+    SHOW_UP_FLOOR,
+    fanout_size,
+    rank_donors,
+    score_donors,
+    show_up_probability,
+)
+
+
+# =============================================================================
+# TEST_SHOW_UP_PROBABILITY
+# =============================================================================
+
+class TestShowUpProbability:
+    """Gelme olasılığı tahmini."""
+
+    def test_perfect_donor_capped_at_ceiling(self):
+        assert show_up_probability([100], [0])[0] == pytest.approx(SHOW_UP_CEILING)
+
+    def test_no_shows_reduce_probability(self):
+        probabilities = show_up_probability([80, 80, 80], [0, 1, 3])
+        assert probabilities[0] > probabilities[1] > probabilities[2]
+
+    def test_floor(self):
+        assert show_up_probability([0], [10])[0] == pytest.approx(SHOW_UP_FLOOR)
+
+
+# =============================================================================
+# TEST_SCORE_DONORS
+# =============================================================================
+
+class TestScoreDonors:
+    """Mesafe, güven ve bildirim yükü bileşenleri."""
+
+    def test_closer_donor_scores_higher(self):
+        scores, _ = score_donors([100, 4000], 5000, [100, 100], [0, 0], [0, 0])
+        assert scores[0] > scores[1]
+
+    def test_notification_load_lowers_score(self):
+        scores, _ = score_donors([100, 100], 5000, [100, 100], [0, 0], [0, 5])
+        assert scores[0] > scores[1]
+
+    def test_reliable_far_donor_beats_unreliable_near_donor(self):
+        scores, _ = score_donors([4500, 50], 5000, [100, 20], [0, 4], [0, 0])
+        assert scores[0] > scores[1]
+
+
+# =============================================================================
+# TEST_FANOUT
+# =============================================================================
+
+class TestFanoutSize:
+    """Fan-out boyutlandırma."""
+
+    def test_stops_when_expected_donors_reached(self):
+        # 3 ünite × 2.0 = 6 beklenen bağışçı; 0.5 olasılıkla 12 aday gerekir
+        assert fanout_size([0.5] * 40, units_needed=3, safety_factor=2.0, minimum=1, maximum=50) == 12
+
+    def test_minimum(self):
+        assert fanout_size([0.9] * 40, units_needed=1, safety_factor=1.0, minimum=10, maximum=50) == 10
+
+    def test_maximum(self):
+        assert fanout_size([0.1] * 100, units_needed=5, safety_factor=2.0, minimum=10, maximum=50) == 50
+
+    def test_never_exceeds_candidates(self):
+        assert fanout_size([0.9] * 3, units_needed=1, safety_factor=2.0, minimum=10, maximum=50) == 3
+
+    def test_empty(self):
+        assert fanout_size([], units_needed=1, safety_factor=2.0, minimum=10, maximum=50) == 0
+
+
+class TestRankDonors:
+    """Sıralama ve fan-out birlikte."""
+
+    def test_orders_by_score_then_distance(self):
+        ranked = rank_donors(
+            distances_meters=[300, 100, 100],
+            radius_meters=5000,
+            trust_scores=[100, 100, 30],
+            no_show_counts=[0, 0, 2],
+            recent_notifications=[0, 0, 0],
+            units_needed=1,
+            safety_factor=2.0,
+            minimum=1,
+            maximum=50,
+        )
+        assert list(ranked.order) == [1, 0, 2]
+        assert ranked.fanout == 3
+
+    def test_empty(self):
+        ranked = rank_donors([], 5000, [], [], [], 1, 2.0, 10, 50)
+        assert ranked.fanout == 0
+        assert len(ranked.order) == 0
@@ -668,6 +668,7 @@ async def test_accept_commitment_slot_full(client: AsyncClient, db_session):
             status=CommitmentStatus.ON_THE_WAY.value,
         )
         db_session.add(commitment)
+    blood_request.active_commitment_count = len(donors)
     await db_session.flush()
 
     # 3. bağışçı (slot dolu olmalı)
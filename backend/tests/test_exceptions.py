@@ -12,6 +12,7 @@ from app.core.exceptions import (
     BadRequestException,
     ConflictException,
     UnauthorizedException,
+    ServiceUnavailableException,
     CooldownActiveException,
     GeofenceException,
     ActiveCommitmentExistsException,
@@ -118,6 +119,20 @@ class TestUnauthorizedException:
         assert exc.message == "Unauthorized"
 
 
+class TestServiceUnavailableException:
+    """Test ServiceUnavailableException class."""
+
+    def test_service_unavailable_exception_status_code(self):
+        """ServiceUnavailableException 503 status koduna sahip olmalı."""
+        exc = ServiceUnavailableException()
+        assert exc.status_code == 503
+
+    def test_service_unavailable_exception_default_message(self):
+        """ServiceUnavailableException varsayılan mesaja sahip olmalı."""
+        exc = ServiceUnavailableException()
+        assert exc.message == "Service unavailable"
+
+
 class TestCooldownActiveException:
     """Test CooldownActiveException class."""
 
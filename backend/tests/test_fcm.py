@@ -12,9 +12,19 @@ from app.utils.fcm import (
     get_firebase_app,
     send_push_notification,
     send_push_to_multiple,
+    send_push_batch,
+    classify_push_error,
+    get_push_transport,
     reset_firebase_app,
+    memory_push_sink,
+    PushMessage,
+    PushOutcome,
+    PushTransport,
+    FCM_BATCH_LIMIT,
 )
 from app.services.notification_service import create_notification
+from firebase_admin import messaging
+from firebase_admin.exceptions import InvalidArgumentError, InternalError, UnavailableError
 
 
 # =============================================================================
@@ -197,6 +207,201 @@ class TestSendPushToMultiple:
         assert result["failure_count"] == 0
 
 
+class TestSendPushBatch:
+    """send_push_batch fonksiyonu testleri."""
+
+    @staticmethod
+    def _send_each_response(*successes, exception=None):
+        response = MagicMock()
+        response.responses = [
+            MagicMock(success=success, exception=None if success else exception)
+            for success in successes
+        ]
+        return response
+
+    @patch("app.utils.fcm.os.path.exists")
+    @patch("app.utils.fcm.credentials.Certificate")
+    @patch("app.utils.fcm.initialize_app")
+    @patch("app.utils.fcm.messaging.send_each")
+    def test_returns_per_message_results(
+        self,
+        mock_send_each,
+        mock_init_app,
+        mock_cert,
+        mock_exists
+    ):
+        """Her mesaj için ayrı sonuç, mesaj sırasıyla."""
+        mock_exists.return_value = True
+        mock_init_app.return_value = MagicMock()
+        mock_send_each.return_value = self._send_each_response(
+            True, False, exception=messaging.UnregisteredError("Requested entity was not found.")
+        )
+
+        result = send_push_batch([
+            PushMessage(fcm_token="token1", title="T1", body="B1", data={"k": "1"}),
+            PushMessage(fcm_token="token2", title="T2", body="B2"),
+        ])
+
+        assert result == [PushOutcome.SENT, PushOutcome.UNREGISTERED]
+        messages = mock_send_each.call_args[0][0]
+        assert [message.token for message in messages] == ["token1", "token2"]
+        assert messages[0].data == {"k": "1"}
+
+    @patch("app.utils.fcm.os.path.exists")
+    @patch("app.utils.fcm.credentials.Certificate")
+    @patch("app.utils.fcm.initialize_app")
+    @patch("app.utils.fcm.messaging.send_each")
+    def test_splits_batches_at_fcm_limit(
+        self,
+        mock_send_each,
+        mock_init_app,
+        mock_cert,
+        mock_exists
+    ):
+        """FCM_BATCH_LIMIT'ten büyük liste parçalara bölünür."""
+        mock_exists.return_value = True
+        mock_init_app.return_value = MagicMock()
+        mock_send_each.side_effect = lambda messages, app: self._send_each_response(
+            *([True] * len(messages))
+        )
+
+        pushes = [
+            PushMessage(fcm_token=f"token{i}", title="T", body="B")
+            for i in range(FCM_BATCH_LIMIT + 1)
+        ]
+        result = send_push_batch(pushes)
+
+        assert result == [PushOutcome.SENT] * (FCM_BATCH_LIMIT + 1)
+        assert mock_send_each.call_count == 2
+
+    @patch("app.utils.fcm.os.path.exists")
+    @patch("app.utils.fcm.credentials.Certificate")
+    @patch("app.utils.fcm.initialize_app")
+    @patch("app.utils.fcm.messaging.send_each")
+    def test_shares_notification_object_for_identical_content(
+        self,
+        mock_send_each,
+        mock_init_app,
+        mock_cert,
+        mock_exists
+    ):
+        """Aynı başlık/metin için tek Notification objesi kullanılır."""
+        mock_exists.return_value = True
+        mock_init_app.return_value = MagicMock()
+        mock_send_each.return_value = self._send_each_response(True, True, True)
+
+        send_push_batch([
+            PushMessage(fcm_token="token1", title="T", body="B"),
+            PushMessage(fcm_token="token2", title="T", body="B"),
+            PushMessage(fcm_token="token3", title="T", body="Other"),
+        ])
+
+        messages = mock_send_each.call_args[0][0]
+        assert messages[0].notification is messages[1].notification
+        assert messages[2].notification is not messages[0].notification
+
+    def test_firebase_not_initialized_returns_failures(self):
+        """Firebase yoksa tüm mesajlar başarısız sayılır."""
+        with patch("app.utils.fcm.os.path.exists", return_value=False):
+            result = send_push_batch([PushMessage(fcm_token="token1", title="T", body="B")])
+
+        assert result == [PushOutcome.FAILED]
+
+    def test_empty_batch(self):
+        assert send_push_batch([]) == []
+
+
+class TestPushTransports:
+    """PUSH_TRANSPORT ile seçilen memory ve http transport testleri."""
+
+    @pytest.fixture
+    def transport_settings(self):
+        with patch("app.utils.fcm.settings") as mock_settings:
+            yield mock_settings
+
+    @pytest.fixture
+    def fake_fcm(self):
+        """http transport'u scripts/fake_fcm_server uygulamasına bağlar."""
+        from fastapi.testclient import TestClient
+        from scripts.fake_fcm_server import FakeFcmConfig, create_app
+
+        def connect(**config):
+            fake_app = create_app(FakeFcmConfig(latency_ms=0, jitter_ms=0, seed=1, **config))
+            client = TestClient(fake_app)
+            patcher = patch("app.utils.fcm._http_client", client)
+            patcher.start()
+            clients.append((client, patcher))
+            return fake_app
+
+        clients = []
+        yield connect
+        for client, patcher in clients:
+            patcher.stop()
+            client.close()
+
+    def test_memory_transport_records_messages(self, transport_settings):
+        transport_settings.PUSH_TRANSPORT = "memory"
+        memory_push_sink.clear()
+        pushes = [PushMessage(fcm_token=f"token{i}", title="T", body="B") for i in range(3)]
+
+        assert send_push_batch(pushes) == [PushOutcome.SENT] * 3
+        assert send_push_notification("token9", "T", "B") is True
+        assert [push.fcm_token for push in memory_push_sink.messages] == ["token0", "token1", "token2", "token9"]
+        memory_push_sink.clear()
+
+    def test_http_transport_maps_fake_server_results(self, transport_settings, fake_fcm):
+        transport_settings.PUSH_TRANSPORT = "http"
+        fake_app = fake_fcm()
+
+        result = send_push_batch([
+            PushMessage(fcm_token="token1", title="T", body="B", data={"k": "1"}),
+            PushMessage(fcm_token="unregistered-token2", title="T", body="B"),
+        ])
+
+        assert result == [PushOutcome.SENT, PushOutcome.UNREGISTERED]
+        assert fake_app.state.stats.requests == 1
+        assert fake_app.state.stats.sent == 1
+
+    def test_http_transport_transient_errors(self, transport_settings, fake_fcm):
+        transport_settings.PUSH_TRANSPORT = "http"
+        fake_fcm(transient_rate=1.0)
+
+        assert send_push_batch([PushMessage(fcm_token="token1", title="T", body="B")]) == [PushOutcome.TRANSIENT]
+
+    def test_http_transport_outage_is_transient(self, transport_settings, fake_fcm):
+        transport_settings.PUSH_TRANSPORT = "http"
+        fake_fcm(outage_rate=1.0)
+
+        result = send_push_to_multiple(["token1", "token2"], "T", "B")
+
+        assert result == {"success_count": 0, "failure_count": 2}
+        assert send_push_batch([PushMessage(fcm_token="token1", title="T", body="B")]) == [PushOutcome.TRANSIENT]
+
+    def test_unknown_transport_falls_back_to_firebase(self, transport_settings):
+        transport_settings.PUSH_TRANSPORT = "carrier-pigeon"
+        transport_settings.FIREBASE_CREDENTIALS = "/nonexistent/firebase.json"
+
+        assert get_push_transport() == PushTransport.FIREBASE
+        assert send_push_batch([PushMessage(fcm_token="token1", title="T", body="B")]) == [PushOutcome.FAILED]
+
+
+class TestClassifyPushError:
+    """FCM hata sınıflandırması."""
+
+    @pytest.mark.parametrize("error, expected", [
+        (messaging.UnregisteredError("not registered"), PushOutcome.UNREGISTERED),
+        (messaging.SenderIdMismatchError("mismatch"), PushOutcome.UNREGISTERED),
+        (InvalidArgumentError("payload too large"), PushOutcome.FAILED),
+        (messaging.QuotaExceededError("quota"), PushOutcome.TRANSIENT),
+        (UnavailableError("unavailable"), PushOutcome.TRANSIENT),
+        (InternalError("internal"), PushOutcome.TRANSIENT),
+        (ConnectionError("reset"), PushOutcome.TRANSIENT),
+        (messaging.ThirdPartyAuthError("apns auth"), PushOutcome.FAILED),
+    ])
+    def test_classification(self, error, expected):
+        assert classify_push_error(error) is expected
+
+
 class TestFirebaseAppSingleton:
     """Firebase app singleton pattern testleri."""
 
@@ -230,7 +435,7 @@ class TestNotificationWithPush:
     """Notification service FCM entegrasyon testleri."""
 
     @pytest.mark.asyncio
-    @patch("app.utils.fcm.send_push_notification")
+    @patch("app.utils.fcm.send_push_batch")
     async def test_notification_with_push_updates_flags(
         self,
         mock_send_push,
@@ -239,7 +444,7 @@ class TestNotificationWithPush:
     ):
         """is_push_sent güncellenmeli."""
         # Arrange
-        mock_send_push.return_value = True
+        mock_send_push.return_value = [PushOutcome.SENT]
 
         # Act
         notification = await create_notification(
@@ -260,7 +465,7 @@ class TestNotificationWithPush:
         mock_send_push.assert_called_once()
 
     @pytest.mark.asyncio
-    @patch("app.utils.fcm.send_push_notification")
+    @patch("app.utils.fcm.send_push_batch")
     async def test_notification_without_token_no_push(
         self,
         mock_send_push,
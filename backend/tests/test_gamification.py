@@ -5,6 +5,7 @@ Test coverage:
 - get_rank_badge (5 tests: tüm rozet seviyeleri)
 - award_hero_points (2 tests: whole blood ve apheresis)
 - penalize_no_show (3 tests: trust score düşüşü, minimum 0, count artışı)
+- penalize_no_shows (1 test: toplu ceza)
 - get_user_rank (1 test)
 - get_leaderboard (2 tests: sıralama ve limit)
 """
@@ -16,6 +17,7 @@ from app.services.gamification_service import (
     get_rank_badge,
     award_hero_points,
     penalize_no_show,
+    penalize_no_shows,
     get_user_rank,
     get_leaderboard,
     RANK_BADGES,
@@ -198,6 +200,37 @@ class TestPenalizeNoShow:
 
         assert user.no_show_count == 3
 
+    @pytest.mark.asyncio
+    async def test_penalize_no_shows_bulk(self, db_session):
+        """Toplu ceza her kullanıcıya bir kez uygulanmalı, minimum 0 korunmalı."""
+        users = [
+            User(
+                phone_number=phone,
+                full_name="Bulk No Show",
+                date_of_birth=datetime(1990, 1, 1, tzinfo=timezone.utc),
+                password_hash="hash",
+                blood_type="O+",
+                role=UserRole.USER.value,
+                trust_score=trust_score,
+                no_show_count=0,
+                fcm_token=fcm_token,
+            )
+            for phone, trust_score, fcm_token in [
+                ("+905556666661", 100, "token-1"),
+                ("+905556666662", 5, None),
+            ]
+        ]
+        db_session.add_all(users)
+        await db_session.flush()
+
+        penalized = await penalize_no_shows(db_session, [str(user.id) for user in users])
+
+        assert sorted(penalized) == sorted([(str(users[0].id), "token-1"), (str(users[1].id), None)])
+        for user in users:
+            await db_session.refresh(user)
+        assert [user.trust_score for user in users] == [90, 0]
+        assert [user.no_show_count for user in users] == [1, 1]
+
 
 # =============================================================================
 # get_user_rank Tests
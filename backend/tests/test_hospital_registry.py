@@ -0,0 +1,156 @@
+"""
+Hospital Registry Testleri.
+
+Bu dosya, app/services/hospital_registry_service.py ve
+app/background/hospital_registry_refresher.py fonksiyonlarını test eder.
+Registry process-geneldir; her test sonunda soğuk duruma döndürülür.
+Tüm testler pure-Python'dır, DB gerektirmez.
+"""
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.exceptions import NotFoundException
+from app.services.hospital_registry_service import (
+    HospitalRecord,
+    HospitalRegistry,
+    hospital_registry,
+)
+from app.services.hospital_service import get_hospital_cached, get_nearby_hospitals
+
+
+def _record(hospital_id: str, lat: float, lng: float, is_active: bool = True) -> HospitalRecord:
+    return HospitalRecord(
+        id=hospital_id,
+        hospital_code=f"CODE-{hospital_id}",
+        name=f"Hastane {hospital_id}",
+        address="Test",
+        district="Muratpaşa",
+        city="Antalya",
+        phone_number="02420000000",
+        email=None,
+        geofence_radius_meters=5000,
+        is_active=is_active,
+        created_at=datetime.now(timezone.utc),
+        latitude=lat,
+        longitude=lng,
+    )
+
+
+@pytest.fixture
+def loaded_registry():
+    hospital_registry.load([
+        _record("akdeniz", 36.8969, 30.7133),
+        _record("ataturk", 36.9081, 30.6556),
+        _record("istanbul", 41.0082, 28.9784),
+        _record("kapali", 36.8970, 30.7134, is_active=False),
+    ])
+    yield hospital_registry
+    hospital_registry.reset()
+
+
+class TestHospitalRegistry:
+    """HospitalRegistry bellek içi sorguları."""
+
+    def test_cold_until_loaded(self):
+        registry = HospitalRegistry()
+        assert registry.is_ready is False
+        registry.load([])
+        assert registry.is_ready is True
+
+    def test_nearby_sorted_with_distance(self, loaded_registry):
+        results = loaded_registry.nearby(36.8969, 30.7133, 10_000)
+        assert [r.id for r in results] == ["akdeniz", "ataturk"]
+        assert results[0].distance_km == 0.0
+        assert results[1].distance_km > 0
+
+    def test_nearby_does_not_mutate_records(self, loaded_registry):
+        loaded_registry.nearby(36.8969, 30.7133, 10_000)
+        assert loaded_registry.get("akdeniz").distance_km is None
+
+    def test_inactive_hospitals_not_in_spatial_queries(self, loaded_registry):
+        assert "kapali" not in [r.id for r in loaded_registry.nearby(36.8969, 30.7133, 1000)]
+        assert loaded_registry.get("kapali") is not None
+
+    def test_nearest(self, loaded_registry):
+        results = loaded_registry.nearest(40.9, 29.0, k=1)
+        assert [r.id for r in results] == ["istanbul"]
+
+    def test_upsert_moves_hospital(self, loaded_registry):
+        loaded_registry.upsert(_record("istanbul", 36.90, 30.72))
+        ids = [r.id for r in loaded_registry.nearby(36.8969, 30.7133, 5000)]
+        assert "istanbul" in ids
+
+    def test_upsert_deactivate(self, loaded_registry):
+        loaded_registry.upsert(_record("akdeniz", 36.8969, 30.7133, is_active=False))
+        assert "akdeniz" not in [r.id for r in loaded_registry.nearby(36.8969, 30.7133, 1000)]
+
+    def test_invalidate(self, loaded_registry):
+        loaded_registry.invalidate("akdeniz")
+        assert loaded_registry.get("akdeniz") is None
+        assert "akdeniz" not in [r.id for r in loaded_registry.nearby(36.8969, 30.7133, 1000)]
+
+
+class TestHospitalServiceWithRegistry:
+    """Registry hazırken servis fonksiyonları DB'ye gitmemeli (db=None)."""
+
+    @pytest.mark.asyncio
+    async def test_get_nearby_hospitals_served_from_registry(self, loaded_registry):
+        results = await get_nearby_hospitals(None, lat=36.8969, lng=30.7133, radius_km=10)
+        assert [r.id for r in results] == ["akdeniz", "ataturk"]
+
+    @pytest.mark.asyncio
+    async def test_get_hospital_cached_served_from_registry(self, loaded_registry):
+        hospital = await get_hospital_cached(None, "ataturk")
+        assert hospital.name == "Hastane ataturk"
+
+    @pytest.mark.asyncio
+    async def test_get_hospital_cached_miss_falls_back_to_db(self, loaded_registry):
+        class _Result:
+            def scalar_one_or_none(self):
+                return None
+
+        class _Session:
+            async def execute(self, stmt):
+                return _Result()
+
+        with pytest.raises(NotFoundException):
+            await get_hospital_cached(_Session(), "yok")
+
+
+class TestRefreshHospitalRegistry:
+    """Periyodik registry yeniden yükleme job'ı."""
+
+    @pytest.mark.asyncio
+    async def test_refresh_replaces_records(self, loaded_registry):
+        from app.background import hospital_registry_refresher
+
+        async def rebuild(db):
+            hospital_registry.load([_record("yeni", 36.8969, 30.7133)])
+            return 1
+
+        with patch.object(hospital_registry_refresher, "AsyncSessionLocal") as session_local, \
+             patch.object(hospital_registry_refresher, "rebuild_hospital_registry", side_effect=rebuild):
+            session_local.return_value.__aenter__ = AsyncMock(return_value=AsyncMock())
+            session_local.return_value.__aexit__ = AsyncMock(return_value=None)
+
+            assert await hospital_registry_refresher.refresh_hospital_registry() == 1
+
+        assert hospital_registry.get("yeni") is not None
+        assert hospital_registry.get("akdeniz") is None
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_resets_registry(self, loaded_registry):
+        from app.background import hospital_registry_refresher
+
+        with patch.object(hospital_registry_refresher, "AsyncSessionLocal") as session_local, \
+             patch.object(hospital_registry_refresher, "rebuild_hospital_registry", AsyncMock(side_effect=OSError("db down"))):
+            session_local.return_value.__aenter__ = AsyncMock(return_value=AsyncMock())
+            session_local.return_value.__aexit__ = AsyncMock(return_value=None)
+
+            with pytest.raises(OSError):
+                await hospital_registry_refresher.refresh_hospital_registry()
+
+        # Bayat kayıtlar yerine DB'ye düşülür
+        assert hospital_registry.is_ready is False
@@ -0,0 +1,177 @@
+"""
+Background Job Framework Testleri.
+
+Bu dosya, app/background/jobs.py (PeriodicJob, JobRunner, LeaderElector)
+fonksiyonlarını test eder.
+TestLeaderElectorDb dışındaki testler DB gerektirmez.
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.background.jobs import JobRunner, LeaderElector, PeriodicJob
+
+
+def _elector(leader: bool) -> MagicMock:
+    elector = MagicMock()
+    elector.acquire = AsyncMock(return_value=leader)
+    elector.release = AsyncMock()
+    return elector
+
+
+# =============================================================================
+# TEST_JOB_RUNNER
+# =============================================================================
+
+class TestJobRunner:
+    """Çalıştırma, metrikler, leader kontrolü ve bekleme süreleri."""
+
+    @pytest.mark.asyncio
+    async def test_run_once_records_metrics(self):
+        func = AsyncMock(return_value=3)
+        runner = JobRunner(elector=_elector(True))
+        job = PeriodicJob(name="expiry", func=func, interval_seconds=60)
+        runner.register(job)
+
+        assert await runner.run_once(job) is True
+
+        func.assert_awaited_once()
+        stats = runner.stats()["expiry"]
+        assert stats["runs"] == 1
+        assert stats["failures"] == 0
+        assert stats["last_started_at"] is not None
+        assert stats["max_duration_seconds"] >= stats["last_duration_seconds"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_sync_jobs_are_supported(self):
+        func = MagicMock(return_value=1)
+        runner = JobRunner()
+        job = PeriodicJob(name="cleanup", func=func, interval_seconds=60, leader_only=False)
+        runner.register(job)
+
+        assert await runner.run_once(job) is True
+        func.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_non_leader_skips_leader_only_jobs(self):
+        leader_job = AsyncMock()
+        local_job = AsyncMock()
+        runner = JobRunner(elector=_elector(False))
+        runner.register(PeriodicJob(name="timeouts", func=leader_job, interval_seconds=60))
+        runner.register(PeriodicJob(name="cleanup", func=local_job, interval_seconds=60, leader_only=False))
+
+        assert await runner.run_once(runner._jobs["timeouts"]) is False
+        assert await runner.run_once(runner._jobs["cleanup"]) is True
+
+        leader_job.assert_not_awaited()
+        local_job.assert_awaited_once()
+        assert runner.stats()["timeouts"]["skipped"] == 1
+        runner.elector.acquire.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_is_leader_follows_elector_and_defaults_to_true(self):
+        assert await JobRunner().is_leader() is True
+        assert await JobRunner(elector=_elector(True)).is_leader() is True
+        assert await JobRunner(elector=_elector(False)).is_leader() is False
+
+    @pytest.mark.asyncio
+    async def test_failures_back_off_exponentially_and_reset_on_success(self):
+        func = AsyncMock(side_effect=[Exception("db down"), Exception("db down"), None])
+        runner = JobRunner()
+        job = PeriodicJob(name="timeouts", func=func, interval_seconds=600, jitter=0)
+        runner.register(job)
+
+        with patch("app.background.jobs.settings") as mock_settings:
+            mock_settings.JOB_ERROR_BACKOFF_SECONDS = 5
+            mock_settings.JOB_ERROR_BACKOFF_MAX_SECONDS = 8
+
+            await runner.run_once(job)
+            assert runner.next_delay(job) == 5
+            await runner.run_once(job)
+            assert runner.next_delay(job) == 8
+            await runner.run_once(job)
+            assert runner.next_delay(job) == 600
+
+        stats = runner.stats()["timeouts"]
+        assert stats["runs"] == 3
+        assert stats["failures"] == 2
+        assert stats["consecutive_failures"] == 0
+        assert stats["last_error"] == "db down"
+
+    def test_interval_jitter_stays_within_bounds(self):
+        runner = JobRunner()
+        job = PeriodicJob(name="expiry", func=AsyncMock(), interval_seconds=100, jitter=0.2)
+        runner.register(job)
+
+        delays = [runner.next_delay(job) for _ in range(200)]
+
+        assert all(80 <= delay <= 120 for delay in delays)
+        assert len(set(delays)) > 1
+
+    def test_duplicate_job_names_are_rejected(self):
+        runner = JobRunner()
+        runner.register(PeriodicJob(name="expiry", func=AsyncMock(), interval_seconds=60))
+
+        with pytest.raises(ValueError):
+            runner.register(PeriodicJob(name="expiry", func=AsyncMock(), interval_seconds=60))
+
+    @pytest.mark.asyncio
+    async def test_run_at_start_false_waits_one_interval(self):
+        func = AsyncMock()
+        runner = JobRunner()
+        runner.register(PeriodicJob(
+            name="refresh", func=func, interval_seconds=60, jitter=0, leader_only=False, run_at_start=False,
+        ))
+
+        runner.start()
+        await asyncio.sleep(0.01)
+        await runner.stop()
+
+        func.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_start_runs_jobs_periodically_until_stopped(self):
+        ran = asyncio.Event()
+        calls = 0
+
+        async def job_func():
+            nonlocal calls
+            calls += 1
+            if calls >= 3:
+                ran.set()
+
+        elector = _elector(True)
+        runner = JobRunner(elector=elector)
+        runner.register(PeriodicJob(name="fast", func=job_func, interval_seconds=0.001, jitter=0))
+
+        runner.start()
+        await asyncio.wait_for(ran.wait(), timeout=1)
+        await runner.stop()
+
+        assert calls >= 3
+        elector.release.assert_awaited_once()
+
+
+# =============================================================================
+# TEST_LEADER_ELECTOR (DB)
+# =============================================================================
+
+class TestLeaderElectorDb:
+    """Aynı lock anahtarıyla yalnızca bir worker leader olur."""
+
+    @pytest.mark.asyncio
+    async def test_only_one_elector_holds_the_lock(self, test_engine):
+        first = LeaderElector(lock_key=918_273, engine=test_engine)
+        second = LeaderElector(lock_key=918_273, engine=test_engine)
+        try:
+            assert await first.acquire() is True
+            assert await first.acquire() is True
+            assert await second.acquire() is False
+
+            await first.release()
+            assert first.is_leader is False
+            assert await second.acquire() is True
+        finally:
+            await first.release()
+            await second.release()
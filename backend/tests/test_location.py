@@ -14,7 +14,11 @@ from app.utils.location import (
     create_point,
     create_point_wkt,
     distance_between,
+    distance_between_many,
     find_within_radius,
+    pairwise_distances,
+    precheck_geofence,
+    resolve_geofence,
     validate_geofence,
 )
 
@@ -167,6 +171,50 @@ class TestDistanceBetween:
         assert 110_000 < d < 113_000
 
 
+# =============================================================================
+# TEST_BATCH_DISTANCE
+# =============================================================================
+
+BATCH_LATS = [36.8969, 36.8832, 36.9200, 41.0082, 0.0]
+BATCH_LNGS = [30.7133, 30.7056, 30.6500, 28.9784, 0.0]
+
+
+class TestDistanceBetweenMany:
+    """distance_between_many ve pairwise_distances (vektörize Haversine) testleri."""
+
+    def test_matches_scalar(self):
+        """Her eleman distance_between ile aynı olmalı."""
+        result = distance_between_many(36.8969, 30.7133, BATCH_LATS, BATCH_LNGS)
+        expected = [distance_between(36.8969, 30.7133, lat, lng) for lat, lng in zip(BATCH_LATS, BATCH_LNGS)]
+        assert result.shape == (len(BATCH_LATS),)
+        assert list(result) == pytest.approx(expected, rel=1e-12, abs=1e-6)
+
+    def test_empty_input(self):
+        result = distance_between_many(36.8969, 30.7133, [], [])
+        assert result.shape == (0,)
+
+    def test_length_mismatch_raises(self):
+        with pytest.raises(ValueError):
+            distance_between_many(36.8969, 30.7133, [36.9, 36.8], [30.7])
+
+    def test_pairwise_shape_and_values(self):
+        """[i, j] elemanı a[i] → b[j] mesafesi olmalı."""
+        origins_lat, origins_lng = BATCH_LATS[:2], BATCH_LNGS[:2]
+        matrix = pairwise_distances(origins_lat, origins_lng, BATCH_LATS, BATCH_LNGS)
+
+        assert matrix.shape == (2, len(BATCH_LATS))
+        for i in range(2):
+            for j in range(len(BATCH_LATS)):
+                assert matrix[i, j] == pytest.approx(
+                    distance_between(origins_lat[i], origins_lng[i], BATCH_LATS[j], BATCH_LNGS[j]),
+                    rel=1e-12, abs=1e-6,
+                )
+
+    def test_pairwise_length_mismatch_raises(self):
+        with pytest.raises(ValueError):
+            pairwise_distances([36.9], [30.7, 30.8], BATCH_LATS, BATCH_LNGS)
+
+
 # =============================================================================
 # TEST_WITHIN_RADIUS
 # =============================================================================
@@ -278,6 +326,24 @@ async def test_within_radius_multiple_models(db_session, hospital_for_radius):
 # TEST_GEOFENCE_VALIDATION
 # =============================================================================
 
+class TestPrecheckGeofence:
+    """precheck_geofence — Haversine ön kontrolü (DB gerektirmez)."""
+
+    def test_clearly_inside(self):
+        assert precheck_geofence(36.8969, 30.7133, 36.8969, 30.7133, 5000) is True
+
+    def test_clearly_outside(self):
+        # Antalya → İstanbul
+        assert precheck_geofence(41.0082, 28.9784, 36.8969, 30.7133, 5000) is False
+
+    def test_near_boundary_is_ambiguous(self):
+        # Merkezden tam yarıçap kadar kuzeyde bir nokta
+        center_lat, center_lng = 36.8969, 30.7133
+        radius = 1000.0
+        boundary_lat = center_lat + math.degrees(radius / 6_371_000.0)
+        assert precheck_geofence(boundary_lat, center_lng, center_lat, center_lng, radius) is None
+
+
 @pytest_asyncio.fixture
 async def hospital_for_geofence(db_session):
     """Geofence testleri için 5 km geofence'lı bir hastane."""
@@ -368,3 +434,16 @@ async def test_geofence_validation_near_boundary(db_session):
         hospital_id=hospital.id,
     )
     assert outside is False
+
+
+@pytest.mark.asyncio
+async def test_resolve_geofence_returns_hospital_and_coordinates(db_session, hospital_for_geofence):
+    """resolve_geofence — Hastane, koordinatları ve karar birlikte döner."""
+    check = await resolve_geofence(
+        db_session, user_lat=36.8969, user_lng=30.7133,
+        hospital_id=hospital_for_geofence.id,
+    )
+    assert check.hospital.id == hospital_for_geofence.id
+    assert check.latitude == pytest.approx(36.8969)
+    assert check.longitude == pytest.approx(30.7133)
+    assert check.inside is True
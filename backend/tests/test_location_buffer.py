@@ -0,0 +1,231 @@
+"""
+Location Buffer Testleri.
+
+Bu dosya, app/services/location_buffer_service.py (LocationBuffer),
+user_service.ingest_user_location buffer yolu ve
+app/background/location_flusher.py fonksiyonlarını ve write_locations'ın
+donor index güncellemesini test eder.
+Tüm testler DB gerektirmez.
+"""
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from geoalchemy2 import WKTElement
+
+from app.constants import LocationUpdateStatus
+from app.models import User
+from app.services import location_buffer_service
+from app.services.donor_index_service import DonorEntry, DonorIndex
+from app.services.location_buffer_service import LocationBuffer, PendingLocation, location_buffer, write_locations
+from app.services.user_service import ingest_user_location
+
+
+# Antalya merkez koordinatları
+ANTALYA_LAT = 36.8969
+ANTALYA_LNG = 30.7133
+
+
+# =============================================================================
+# TEST_LOCATION_BUFFER
+# =============================================================================
+
+class TestLocationBuffer:
+    """Hareket eşiği ve birleştirme davranışı."""
+
+    def test_drops_small_movement_from_stored_location(self):
+        buffer = LocationBuffer(min_movement_meters=50)
+        accepted = buffer.submit("u1", ANTALYA_LAT + 0.0001, ANTALYA_LNG, previous=(ANTALYA_LAT, ANTALYA_LNG))
+        assert accepted is False
+        assert len(buffer) == 0
+
+    def test_accepts_large_movement(self):
+        buffer = LocationBuffer(min_movement_meters=50)
+        accepted = buffer.submit("u1", ANTALYA_LAT + 0.01, ANTALYA_LNG, previous=(ANTALYA_LAT, ANTALYA_LNG))
+        assert accepted is True
+        assert len(buffer) == 1
+
+    def test_coalesces_latest_position_per_user(self):
+        buffer = LocationBuffer(min_movement_meters=50)
+        buffer.submit("u1", ANTALYA_LAT + 0.01, ANTALYA_LNG)
+        buffer.submit("u1", ANTALYA_LAT + 0.02, ANTALYA_LNG)
+        buffer.submit("u2", ANTALYA_LAT, ANTALYA_LNG)
+
+        pending = {entry.user_id: entry for entry in buffer.drain()}
+        assert set(pending) == {"u1", "u2"}
+        assert pending["u1"].latitude == pytest.approx(ANTALYA_LAT + 0.02)
+        assert len(buffer) == 0
+
+    def test_threshold_uses_pending_position(self):
+        buffer = LocationBuffer(min_movement_meters=50)
+        buffer.submit("u1", ANTALYA_LAT + 0.01, ANTALYA_LNG, previous=(ANTALYA_LAT, ANTALYA_LNG))
+        accepted = buffer.submit(
+            "u1", ANTALYA_LAT + 0.0101, ANTALYA_LNG, previous=(ANTALYA_LAT, ANTALYA_LNG)
+        )
+        assert accepted is False
+
+    def test_requeue_keeps_newer_positions(self):
+        buffer = LocationBuffer(min_movement_meters=50)
+        buffer.submit("u1", ANTALYA_LAT + 0.01, ANTALYA_LNG)
+        buffer.submit("u2", ANTALYA_LAT + 0.01, ANTALYA_LNG)
+        failed = buffer.drain()
+
+        buffer.submit("u1", ANTALYA_LAT + 0.05, ANTALYA_LNG)
+        buffer.requeue(failed)
+
+        pending = {entry.user_id: entry for entry in buffer.drain()}
+        assert pending["u1"].latitude == pytest.approx(ANTALYA_LAT + 0.05)
+        assert pending["u2"].latitude == pytest.approx(ANTALYA_LAT + 0.01)
+
+
+# =============================================================================
+# TEST_INGEST_USER_LOCATION
+# =============================================================================
+
+class TestIngestUserLocation:
+    """ingest_user_location buffer yolu."""
+
+    @pytest.fixture(autouse=True)
+    def running_buffer(self):
+        location_buffer.drain()
+        location_buffer.start()
+        yield location_buffer
+        location_buffer.stop()
+        location_buffer.drain()
+
+    @pytest.mark.asyncio
+    async def test_buffers_without_touching_db(self):
+        user = User(id="u1", location=WKTElement(f"POINT({ANTALYA_LNG} {ANTALYA_LAT})", srid=4326))
+        db = AsyncMock()
+
+        result, location_status = await ingest_user_location(db, user, ANTALYA_LAT + 0.01, ANTALYA_LNG)
+
+        assert result is user
+        assert location_status == LocationUpdateStatus.PENDING
+        assert len(location_buffer) == 1
+        db.flush.assert_not_called()
+        db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_first_location_written_directly(self):
+        user = User(id="u1", location=None)
+        with patch("app.services.user_service.update_user_location", AsyncMock(return_value=user)) as direct:
+            _, location_status = await ingest_user_location(AsyncMock(), user, ANTALYA_LAT, ANTALYA_LNG)
+
+        direct.assert_awaited_once()
+        assert location_status == LocationUpdateStatus.ACCEPTED
+        assert len(location_buffer) == 0
+
+    @pytest.mark.asyncio
+    async def test_ping_below_movement_threshold_is_ignored(self):
+        user = User(id="u1", location=WKTElement(f"POINT({ANTALYA_LNG} {ANTALYA_LAT})", srid=4326))
+
+        _, location_status = await ingest_user_location(AsyncMock(), user, ANTALYA_LAT, ANTALYA_LNG)
+
+        assert location_status == LocationUpdateStatus.IGNORED
+        assert len(location_buffer) == 0
+
+    @pytest.mark.asyncio
+    async def test_invalid_coordinates_raise(self):
+        user = User(id="u1", location=WKTElement(f"POINT({ANTALYA_LNG} {ANTALYA_LAT})", srid=4326))
+        with pytest.raises(ValueError):
+            await ingest_user_location(AsyncMock(), user, 95.0, ANTALYA_LNG)
+
+
+# =============================================================================
+# TEST_LOCATION_FLUSHER
+# =============================================================================
+
+class TestFlushLocations:
+    """flush_locations yazma ve hata davranışı."""
+
+    @pytest.fixture(autouse=True)
+    def empty_buffer(self):
+        location_buffer.drain()
+        yield
+        location_buffer.drain()
+
+    @staticmethod
+    def _patch_session():
+        session_patch = patch("app.background.location_flusher.AsyncSessionLocal")
+        mock_session_local = session_patch.start()
+        mock_session = AsyncMock()
+        mock_session_local.return_value.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session_local.return_value.__aexit__ = AsyncMock(return_value=None)
+        return session_patch, mock_session
+
+    @pytest.mark.asyncio
+    async def test_empty_buffer_skips_db(self):
+        from app.background.location_flusher import flush_locations
+
+        with patch("app.background.location_flusher.AsyncSessionLocal") as session_local:
+            assert await flush_locations() == 0
+        session_local.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_writes_and_commits(self):
+        from app.background.location_flusher import flush_locations
+
+        location_buffer.submit("u1", ANTALYA_LAT, ANTALYA_LNG)
+        session_patch, session = self._patch_session()
+        try:
+            with patch("app.background.location_flusher.write_locations", AsyncMock(return_value=1)) as write:
+                assert await flush_locations() == 1
+        finally:
+            session_patch.stop()
+
+        write.assert_awaited_once()
+        session.commit.assert_awaited_once()
+        assert len(location_buffer) == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_write_requeues(self):
+        from app.background.location_flusher import flush_locations
+
+        location_buffer.submit("u1", ANTALYA_LAT, ANTALYA_LNG)
+        session_patch, _ = self._patch_session()
+        try:
+            with patch(
+                "app.background.location_flusher.write_locations",
+                AsyncMock(side_effect=Exception("Database connection error")),
+            ):
+                with pytest.raises(Exception):
+                    await flush_locations()
+        finally:
+            session_patch.stop()
+
+        assert len(location_buffer) == 1
+
+
+# =============================================================================
+# TEST_WRITE_LOCATIONS
+# =============================================================================
+
+class TestWriteLocations:
+    """Donor index yalnızca DB'ye yazılan konumlarla güncellenir."""
+
+    @pytest.mark.asyncio
+    async def test_skipped_pings_do_not_reach_index(self):
+        index = DonorIndex()
+        index.load([
+            DonorEntry("u1", "A+", ANTALYA_LAT, ANTALYA_LNG, "t1"),
+            DonorEntry("u2", "A+", ANTALYA_LAT, ANTALYA_LNG, "t2"),
+        ], [])
+        db = AsyncMock()
+        # u2'nin ping'i DB'deki konumdan eski: UPDATE yalnızca u1'i döndürür
+        db.execute.return_value = MagicMock(scalars=MagicMock(return_value=MagicMock(all=MagicMock(return_value=["u1"]))))
+        callbacks = []
+        now = datetime.now(timezone.utc)
+
+        with patch.object(location_buffer_service, "donor_index", index), \
+             patch.object(location_buffer_service, "run_after_commit", side_effect=lambda session, cb: callbacks.append(cb)):
+            count = await write_locations(db, [
+                PendingLocation("u1", 36.9, 30.72, now),
+                PendingLocation("u2", 36.9, 30.72, now),
+            ])
+            for callback in callbacks:
+                callback()
+
+        assert count == 1
+        assert (index.get("u1").latitude, index.get("u1").longitude) == (36.9, 30.72)
+        assert (index.get("u2").latitude, index.get("u2").longitude) == (ANTALYA_LAT, ANTALYA_LNG)
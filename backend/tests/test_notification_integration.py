@@ -21,6 +21,11 @@ from app.constants import (
 from app.core.security import hash_password
 from app.services import blood_request_service, donation_service
 from app.services.notification_service import create_notification
+from app.utils.fcm import PushOutcome
+
+
+def _all_sent(pushes):
+    return [PushOutcome.SENT] * len(pushes)
 
 
 # =============================================================================
@@ -168,8 +173,8 @@ async def test_create_request_sends_new_request_notification(
     test_donor.location = create_point(36.8970, 30.7134)  # Hastane yakını
     await db_session.flush()
 
-    # Mock send_push_notification to avoid Firebase calls
-    with patch("app.utils.fcm.send_push_notification", return_value=True):
+    # Mock send_push_batch to avoid Firebase calls
+    with patch("app.utils.fcm.send_push_batch", side_effect=_all_sent):
         # Talep oluştur
         blood_request = await blood_request_service.create_request(
             db=db_session,
@@ -218,8 +223,8 @@ async def test_create_commitment_sends_donor_found_notification(
     test_donor.location = create_point(36.8970, 30.7134)
     await db_session.flush()
 
-    # Mock send_push_notification
-    with patch("app.utils.fcm.send_push_notification", return_value=True):
+    # Mock send_push_batch
+    with patch("app.utils.fcm.send_push_batch", side_effect=_all_sent):
         # Taahhüt oluştur
         commitment = await donation_service.create_commitment(
             db=db_session,
@@ -268,8 +273,8 @@ async def test_arrived_sends_donor_arrived_notification(
     """
     update_commitment_status(ARRIVED) çağrıldığında talep sahibine DONOR_ARRIVED bildirimi gider.
     """
-    # Mock send_push_notification
-    with patch("app.utils.fcm.send_push_notification", return_value=True):
+    # Mock send_push_batch
+    with patch("app.utils.fcm.send_push_batch", side_effect=_all_sent):
         # Durumu ARRIVED olarak güncelle
         commitment = await donation_service.update_commitment_status(
             db=db_session,
@@ -330,8 +335,8 @@ async def test_donation_complete_sends_notification_to_donor(
     db_session.add(qr_code)
     await db_session.flush()
 
-    # Mock send_push_notification
-    with patch("app.utils.fcm.send_push_notification", return_value=True):
+    # Mock send_push_batch
+    with patch("app.utils.fcm.send_push_batch", side_effect=_all_sent):
         # Bağışı doğrula ve tamamla
         donation = await donation_service.verify_and_complete_donation(
             db=db_session,
@@ -386,8 +391,8 @@ async def test_request_fulfilled_sends_notification_to_requester(
     db_session.add(qr_code)
     await db_session.flush()
 
-    # Mock send_push_notification
-    with patch("app.utils.fcm.send_push_notification", return_value=True):
+    # Mock send_push_batch
+    with patch("app.utils.fcm.send_push_batch", side_effect=_all_sent):
         # Bağışı doğrula ve tamamla
         donation = await donation_service.verify_and_complete_donation(
             db=db_session,
@@ -431,8 +436,8 @@ async def test_timeout_sends_no_show_notification(
     test_commitment.timeout_minutes = 60
     await db_session.flush()
 
-    # Mock send_push_notification
-    with patch("app.utils.fcm.send_push_notification", return_value=True):
+    # Mock send_push_batch
+    with patch("app.utils.fcm.send_push_batch", side_effect=_all_sent):
         # Timeout kontrolü yap
         timeout_count = await donation_service.check_timeouts(db_session)
 
@@ -481,8 +486,8 @@ async def test_redirect_sends_redirect_to_bank_notification(
     db_session.add(excess_commitment)
     await db_session.flush()
 
-    # Mock send_push_notification
-    with patch("app.utils.fcm.send_push_notification", return_value=True):
+    # Mock send_push_batch
+    with patch("app.utils.fcm.send_push_batch", side_effect=_all_sent):
         # Fazla bağışçıları yönlendir
         redirected = await donation_service.redirect_excess_donors(
             db=db_session,
@@ -516,8 +521,8 @@ async def test_notifications_include_push_when_fcm_token_exists(
     """
     FCM token varsa bildirim push notification olarak da gönderilir.
     """
-    # Mock send_push_notification
-    mock_push = patch("app.utils.fcm.send_push_notification", return_value=True)
+    # Mock send_push_batch
+    mock_push = patch("app.utils.fcm.send_push_batch", side_effect=_all_sent)
     mock_push.start()
 
     try:
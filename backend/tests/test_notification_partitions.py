@@ -0,0 +1,230 @@
+"""
+Notification Partition Testleri.
+
+Bu dosya, app/services/notification_partition_service.py (ay hesapları,
+partition oluşturma/silme) ve app/background/notification_partition_maintainer.py
+fonksiyonlarını test eder.
+TestNotificationPartitionsDb dışındaki testler DB gerektirmez.
+"""
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.notification_partition_service import (
+    add_months,
+    drop_expired_notification_partitions,
+    ensure_current_notification_partitions,
+    ensure_notification_partitions,
+    list_notification_partitions,
+    month_start,
+    notification_retention_cutoff,
+    partition_name,
+    recent_notification_cutoff,
+)
+
+
+NOW = datetime(2026, 3, 16, 14, 30, tzinfo=timezone.utc)
+
+
+def _mock_db(existing):
+    """İlk execute partition listesini döner, sonrakiler DDL'dir."""
+    listing = MagicMock()
+    listing.scalars.return_value.all.return_value = existing
+    db = AsyncMock()
+    db.execute.side_effect = [listing] + [MagicMock() for _ in range(20)]
+    return db
+
+
+def _statements(db):
+    return [str(call.args[0]) for call in db.execute.await_args_list[1:]]
+
+
+# =============================================================================
+# TEST_MONTH_HELPERS
+# =============================================================================
+
+class TestMonthHelpers:
+    """Ay sınırları ve partition adları."""
+
+    def test_month_start_truncates_to_utc_month(self):
+        assert month_start(NOW) == datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+    def test_add_months_crosses_year_boundaries(self):
+        march = datetime(2026, 3, 1, tzinfo=timezone.utc)
+        assert add_months(march, 10) == datetime(2027, 1, 1, tzinfo=timezone.utc)
+        assert add_months(march, -3) == datetime(2025, 12, 1, tzinfo=timezone.utc)
+
+    def test_partition_name(self):
+        assert partition_name(datetime(2026, 3, 1, tzinfo=timezone.utc)) == "notifications_y2026m03"
+
+    def test_cutoffs(self):
+        with patch("app.services.notification_partition_service.settings") as mock_settings:
+            mock_settings.NOTIFICATION_RETENTION_MONTHS = 6
+            assert notification_retention_cutoff(NOW) == datetime(2025, 9, 1, tzinfo=timezone.utc)
+        assert recent_notification_cutoff(NOW) == datetime(2026, 2, 1, tzinfo=timezone.utc)
+
+
+# =============================================================================
+# TEST_PARTITION_MAINTENANCE
+# =============================================================================
+
+class TestPartitionMaintenance:
+    """Eksik partition oluşturma ve süresi dolanları silme."""
+
+    @pytest.mark.asyncio
+    async def test_ensure_creates_only_missing_months(self):
+        db = _mock_db(["notifications_y2026m03", "notifications_y2026m04"])
+
+        created = await ensure_notification_partitions(db, months_ahead=3, now=NOW)
+
+        assert created == ["notifications_y2026m05", "notifications_y2026m06"]
+        statements = _statements(db)
+        assert len(statements) == 2
+        assert "notifications_y2026m05 PARTITION OF notifications" in statements[0]
+        assert "FROM ('2026-05-01T00:00:00+00:00') TO ('2026-06-01T00:00:00+00:00')" in statements[0]
+
+    @pytest.mark.asyncio
+    async def test_drop_detaches_partitions_past_retention_concurrently(self):
+        listing = MagicMock()
+        listing.all.return_value = [
+            ("notifications_y2025m08", False),
+            ("notifications_y2025m09", False),
+            ("notifications_y2026m03", False),
+        ]
+        connection = AsyncMock()
+        connection.execute.side_effect = [listing, MagicMock(), MagicMock()]
+
+        dropped = await drop_expired_notification_partitions(connection, retention_months=6, now=NOW)
+
+        # Eylül 2025 hâlâ saklama süresi içinde
+        assert dropped == ["notifications_y2025m08"]
+        assert _statements(connection) == [
+            "ALTER TABLE notifications DETACH PARTITION notifications_y2025m08 CONCURRENTLY",
+            "DROP TABLE notifications_y2025m08",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_drop_finalizes_interrupted_concurrent_detach(self):
+        listing = MagicMock()
+        listing.all.return_value = [
+            ("notifications_y2025m07", False),
+            ("notifications_y2025m08", True),
+        ]
+        connection = AsyncMock()
+        connection.execute.side_effect = [listing] + [MagicMock() for _ in range(4)]
+
+        dropped = await drop_expired_notification_partitions(connection, retention_months=6, now=NOW)
+
+        assert dropped == ["notifications_y2025m07", "notifications_y2025m08"]
+        assert _statements(connection) == [
+            "ALTER TABLE notifications DETACH PARTITION notifications_y2025m07 CONCURRENTLY",
+            "DROP TABLE notifications_y2025m07",
+            "ALTER TABLE notifications DETACH PARTITION notifications_y2025m08 FINALIZE",
+            "DROP TABLE notifications_y2025m08",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_default_partition_is_never_listed(self):
+        db = _mock_db(["notifications_default", "notifications_y2026m03"])
+
+        assert await list_notification_partitions(db) == ["notifications_y2026m03"]
+
+
+class TestEnsureCurrentPartitions:
+    """Bakım job'ından bağımsız, bildirim yazımı öncesi partition garantisi."""
+
+    @pytest.fixture(autouse=True)
+    def _reset_ensured_months(self):
+        from app.services import notification_partition_service
+
+        notification_partition_service._ensured_months.clear()
+        yield
+        notification_partition_service._ensured_months.clear()
+
+    @pytest.mark.asyncio
+    async def test_creates_missing_months_and_logs_error(self):
+        db = _mock_db([])
+        with patch("app.services.notification_partition_service.run_after_commit") as after_commit, \
+                patch("app.services.notification_partition_service.logger") as logger:
+            created = await ensure_current_notification_partitions(db, now=NOW)
+
+        assert created == ["notifications_y2026m03", "notifications_y2026m04"]
+        logger.error.assert_called_once()
+        after_commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_month_is_remembered_only_after_commit(self):
+        callbacks = []
+        with patch(
+            "app.services.notification_partition_service.run_after_commit",
+            side_effect=lambda db, callback: callbacks.append(callback),
+        ):
+            db = _mock_db(["notifications_y2026m03", "notifications_y2026m04"])
+            assert await ensure_current_notification_partitions(db, now=NOW) == []
+            # Commit olmadan (ör. rollback) bir sonraki yazım tekrar kontrol eder
+            db = _mock_db(["notifications_y2026m03", "notifications_y2026m04"])
+            await ensure_current_notification_partitions(db, now=NOW)
+            assert db.execute.await_count == 1
+
+            callbacks[-1]()
+            db = _mock_db([])
+            assert await ensure_current_notification_partitions(db, now=NOW) == []
+            db.execute.assert_not_awaited()
+
+
+class TestPartitionMaintainer:
+    """Bakım job'ı silmeyi transaction dışında yapar, ardından sayaçları uzlaştırır."""
+
+    @pytest.mark.asyncio
+    async def test_drops_on_autocommit_connection_and_reconciles_after_drop(self):
+        from app.background.notification_partition_maintainer import maintain_notification_partitions
+
+        session = AsyncMock()
+        connection = AsyncMock()
+        connection.execution_options = AsyncMock(return_value=connection)
+        engine = MagicMock()
+        engine.connect.return_value.__aenter__ = AsyncMock(return_value=connection)
+        engine.connect.return_value.__aexit__ = AsyncMock(return_value=None)
+        drop = AsyncMock(side_effect=[[], ["notifications_y2025m08"]])
+        with patch("app.background.notification_partition_maintainer.AsyncSessionLocal") as session_local, \
+                patch("app.background.notification_partition_maintainer.engine", engine), \
+                patch(
+                    "app.background.notification_partition_maintainer.ensure_notification_partitions",
+                    AsyncMock(return_value=[]),
+                ), \
+                patch(
+                    "app.background.notification_partition_maintainer.drop_expired_notification_partitions",
+                    drop,
+                ), \
+                patch(
+                    "app.background.notification_partition_maintainer.reconcile_unread_counts",
+                    AsyncMock(return_value=0),
+                ) as reconcile:
+            session_local.return_value.__aenter__ = AsyncMock(return_value=session)
+            session_local.return_value.__aexit__ = AsyncMock(return_value=None)
+
+            assert await maintain_notification_partitions() == ([], [])
+            reconcile.assert_not_called()
+
+            assert await maintain_notification_partitions() == ([], ["notifications_y2025m08"])
+            reconcile.assert_awaited_once_with(session)
+
+        connection.execution_options.assert_awaited_with(isolation_level="AUTOCOMMIT")
+        assert drop.await_args.args[0] is connection
+        # İki partition oluşturma + bir uzlaştırma commit'i
+        assert session.commit.await_count == 3
+
+
+# =============================================================================
+# TEST_NOTIFICATION_PARTITIONS (DB)
+# =============================================================================
+
+class TestNotificationPartitionsDb:
+    """Migration sonrası partition yapısı."""
+
+    @pytest.mark.asyncio
+    async def test_current_month_partition_exists(self, db_session: AsyncSession):
+        assert await ensure_notification_partitions(db_session, months_ahead=0) == []
+        assert partition_name(month_start()) in await list_notification_partitions(db_session)
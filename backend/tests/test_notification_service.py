@@ -175,6 +175,34 @@ class TestRenderNotificationTemplate:
 
         assert "Geçersiz bildirim türü" in str(exc_info.value)
 
+    def test_missing_placeholder_kept_and_extra_keys_ignored(self):
+        """Context'te olmayan placeholder metinde kalır, fazla anahtar yok sayılır."""
+        title, message = notification_service.render_notification_template(
+            "NEW_REQUEST", {"blood_type": "0+", "unused": "x"}
+        )
+
+        assert message == "Yakınınızda 0+ kan ihtiyacı! {hospital_name}"
+
+    def test_all_templates_compiled(self):
+        """Tüm şablonlar import anında derlenir."""
+        assert set(notification_service.COMPILED_TEMPLATES) == set(NOTIFICATION_TEMPLATES)
+        assert notification_service.COMPILED_TEMPLATES["NEW_REQUEST"][1].fields == {
+            "blood_type", "hospital_name"
+        }
+
+    def test_render_is_memoized_per_context(self):
+        """Aynı (tür, context) tekrar render edilmez."""
+        notification_service._render_compiled.cache_clear()
+        context = {"blood_type": "B-", "hospital_name": "Memo Hastanesi"}
+
+        first = notification_service.render_notification_template("NEW_REQUEST", context)
+        second = notification_service.render_notification_template("NEW_REQUEST", dict(context))
+
+        assert first == second
+        info = notification_service._render_compiled.cache_info()
+        assert info.hits == 1
+        assert info.misses == 1
+
 
 # =============================================================================
 # TESTS: create_notification
@@ -253,6 +281,110 @@ class TestCreateNotification:
         assert notification.title == "Bağış Tamamlandı"
 
 
+# =============================================================================
+# TESTS: create_notifications_bulk
+# =============================================================================
+
+class TestCreateNotificationsBulk:
+    """create_notifications_bulk testleri."""
+
+    @pytest.mark.asyncio
+    async def test_creates_one_row_per_recipient(
+        self,
+        db_session: AsyncSession,
+        test_user_for_notification: User,
+        test_user: User,
+        test_blood_request_for_notification: BloodRequest
+    ):
+        """Tüm alıcılar için aynı içerikte satır oluşturulur, ID'ler alıcı sırasındadır."""
+        from sqlalchemy import select
+
+        recipients = [
+            (str(test_user_for_notification.id), None),
+            (str(test_user.id), None),
+        ]
+
+        notification_ids = await notification_service.create_notifications_bulk(
+            db=db_session,
+            recipients=recipients,
+            notification_type=NotificationType.NEW_REQUEST.value,
+            context={"blood_type": "B+", "hospital_name": "Test Hastanesi"},
+            request_id=str(test_blood_request_for_notification.id),
+        )
+
+        assert len(notification_ids) == 2
+        result = await db_session.execute(
+            select(Notification).where(Notification.id.in_(notification_ids))
+        )
+        by_id = {n.id: n for n in result.scalars().all()}
+        assert [by_id[i].user_id for i in notification_ids] == [user_id for user_id, _ in recipients]
+        for notification in by_id.values():
+            assert notification.title == "Yeni Kan Talebi"
+            assert "B+" in notification.message
+            assert notification.blood_request_id == str(test_blood_request_for_notification.id)
+            assert notification.is_push_sent is False
+
+    @pytest.mark.asyncio
+    async def test_empty_recipients_returns_empty_list(self, db_session: AsyncSession):
+        """Alıcı yoksa INSERT yapılmaz."""
+        notification_ids = await notification_service.create_notifications_bulk(
+            db=db_session,
+            recipients=[],
+            notification_type=NotificationType.NO_SHOW.value,
+            context={},
+        )
+
+        assert notification_ids == []
+
+
+class TestPruneFcmTokens:
+    """prune_fcm_tokens testleri."""
+
+    @pytest.mark.asyncio
+    async def test_clears_matching_tokens_only(
+        self,
+        db_session: AsyncSession,
+        test_user_for_notification: User,
+        test_user: User
+    ):
+        """Sadece hâlâ aynı token'ı taşıyan kullanıcı ve bildirimler temizlenir."""
+        from sqlalchemy import select
+        from app.services.push_dispatch_service import prune_fcm_tokens
+
+        test_user_for_notification.fcm_token = "dead-token"
+        test_user.fcm_token = "fresh-token"
+        await db_session.flush()
+        notification_ids = await notification_service.create_notifications_bulk(
+            db=db_session,
+            recipients=[(str(test_user_for_notification.id), None)],
+            notification_type=NotificationType.NO_SHOW.value,
+            context={},
+        )
+        await db_session.execute(
+            Notification.__table__.update()
+            .where(Notification.id == notification_ids[0])
+            .values(fcm_token="dead-token")
+        )
+
+        pruned = await prune_fcm_tokens(db_session, [
+            (str(test_user_for_notification.id), "dead-token"),
+            (str(test_user.id), "old-token"),
+        ])
+
+        assert pruned == 1
+        tokens = dict((await db_session.execute(
+            select(User.id, User.fcm_token).where(
+                User.id.in_([test_user_for_notification.id, test_user.id])
+            )
+        )).all())
+        assert tokens[test_user_for_notification.id] is None
+        assert tokens[test_user.id] == "fresh-token"
+        notification_token = (await db_session.execute(
+            select(Notification.fcm_token).where(Notification.id == notification_ids[0])
+        )).scalar_one()
+        assert notification_token is None
+
+
 # =============================================================================
 # TESTS: get_user_notifications
 # =============================================================================
@@ -321,6 +453,41 @@ class TestGetUserNotifications:
         assert total == 3  # unread_only=True olduğunda total de unread'leri sayar
         assert unread == 3
 
+    @pytest.mark.asyncio
+    async def test_get_user_notifications_counts_survive_page_past_end(
+        self,
+        db_session: AsyncSession,
+        test_user_for_notification: User
+    ):
+        """Window aggregate toplamları okunmuşları ayırmalı ve boş sayfada da dönmeli."""
+        user_id = str(test_user_for_notification.id)
+        created = []
+        for i in range(4):
+            created.append(await notification_service.create_notification(
+                db=db_session,
+                user_id=user_id,
+                notification_type=NotificationType.NEW_REQUEST.value,
+                context={"blood_type": "A+", "hospital_name": f"Hastane {i}"}
+            ))
+        await notification_service.mark_as_read(
+            db=db_session,
+            user_id=user_id,
+            notification_ids=[str(created[0].id)]
+        )
+
+        rows, total, unread = await notification_service.get_user_notifications(
+            db=db_session, user_id=user_id, page=1, size=3
+        )
+        assert len(rows) == 3
+        assert (total, unread) == (4, 3)
+        assert rows[0].created_at >= rows[-1].created_at
+
+        rows, total, unread = await notification_service.get_user_notifications(
+            db=db_session, user_id=user_id, page=5, size=3
+        )
+        assert rows == []
+        assert (total, unread) == (4, 3)
+
     @pytest.mark.asyncio
     async def test_notification_not_visible_to_other_user(
         self,
@@ -381,6 +548,69 @@ class TestGetUnreadCount:
         assert count == 3
 
 
+class TestUnreadCounters:
+    """notification_counters bakımı ve uzlaştırma testleri."""
+
+    @pytest.mark.asyncio
+    async def test_counter_follows_create_and_mark_read(
+        self,
+        db_session: AsyncSession,
+        test_user_for_notification: User
+    ):
+        """Sayaç oluşturma, toplu oluşturma ve okundu işaretleme ile güncellenir."""
+        user_id = str(test_user_for_notification.id)
+        first = await notification_service.create_notification(
+            db=db_session,
+            user_id=user_id,
+            notification_type=NotificationType.NO_SHOW.value,
+            context={},
+        )
+        await notification_service.create_notifications_bulk(
+            db=db_session,
+            recipients=[(user_id, None), (user_id, None)],
+            notification_type=NotificationType.NO_SHOW.value,
+            context={},
+        )
+        assert await notification_service.get_unread_count(db_session, user_id) == 3
+
+        await notification_service.mark_as_read(db_session, user_id, [str(first.id)])
+        # Aynı bildirimi tekrar okumak sayacı düşürmez
+        await notification_service.mark_as_read(db_session, user_id, [str(first.id)])
+        assert await notification_service.get_unread_count(db_session, user_id) == 2
+
+        await notification_service.mark_all_as_read(db_session, user_id)
+        assert await notification_service.get_unread_count(db_session, user_id) == 0
+
+    @pytest.mark.asyncio
+    async def test_reconcile_fixes_drift(
+        self,
+        db_session: AsyncSession,
+        test_user_for_notification: User
+    ):
+        """Sapmış sayaç notifications tablosundan düzeltilir."""
+        from sqlalchemy import update
+        from app.models import NotificationCounter
+
+        user_id = str(test_user_for_notification.id)
+        for _ in range(2):
+            await notification_service.create_notification(
+                db=db_session,
+                user_id=user_id,
+                notification_type=NotificationType.NO_SHOW.value,
+                context={},
+            )
+        await db_session.execute(
+            update(NotificationCounter)
+            .where(NotificationCounter.user_id == user_id)
+            .values(unread_count=7)
+        )
+
+        fixed = await notification_service.reconcile_unread_counts(db_session, [user_id])
+
+        assert fixed == 1
+        assert await notification_service.get_unread_count(db_session, user_id) == 2
+
+
 # =============================================================================
 # TESTS: mark_as_read
 # =============================================================================
@@ -422,6 +652,55 @@ class TestMarkAsRead:
         )
         assert unread == 1
 
+    @pytest.mark.asyncio
+    async def test_mark_as_read_falls_back_to_older_partitions(
+        self,
+        db_session: AsyncSession,
+        test_user_for_notification: User
+    ):
+        """Son iki ayda bulunamayan ID saklama süresinin kalanında aranır."""
+        from datetime import timedelta
+        from sqlalchemy import text, update
+        from app.services.notification_partition_service import add_months, month_start, partition_name
+
+        month = add_months(month_start(), -3)
+        await db_session.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF notifications "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            )
+        )
+        user_id = str(test_user_for_notification.id)
+        recent = await notification_service.create_notification(
+            db=db_session,
+            user_id=user_id,
+            notification_type=NotificationType.NEW_REQUEST.value,
+            context={"blood_type": "A+", "hospital_name": "Yeni"}
+        )
+        old = await notification_service.create_notification(
+            db=db_session,
+            user_id=user_id,
+            notification_type=NotificationType.NEW_REQUEST.value,
+            context={"blood_type": "A+", "hospital_name": "Eski"}
+        )
+        await db_session.execute(
+            update(Notification)
+            .where(Notification.id == old.id)
+            .values(created_at=month + timedelta(days=1))
+            .execution_options(synchronize_session=False)
+        )
+
+        updated = await notification_service.mark_as_read(
+            db=db_session,
+            user_id=user_id,
+            notification_ids=[str(recent.id), str(old.id)]
+        )
+
+        assert updated == 2
+        assert await notification_service.get_unread_count(db=db_session, user_id=user_id) == 0
+        found = await notification_service.get_notification_by_id(db_session, str(old.id))
+        assert found is not None and found.is_read
+
 
 # =============================================================================
 # TESTS: mark_all_as_read
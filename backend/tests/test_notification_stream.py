@@ -0,0 +1,273 @@
+"""
+Notification Stream Testleri.
+
+Bu dosya, app/services/notification_stream_service.py (NotificationBroker,
+SSE olay üretimi, NOTIFY payload dağıtımı, Last-Event-ID tekrar sorgusu)
+ve create_notification yayın yolunu test eder.
+TestGetNotificationsSince dışındaki testler DB gerektirmez.
+"""
+import asyncio
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants import NotificationType
+from app.models import User
+from app.services import notification_service
+from app.services.notification_stream_service import (
+    NotificationBroker,
+    dispatch_notify_payload,
+    format_sse,
+    get_notifications_since,
+    notification_broker,
+    stream_notification_events,
+)
+
+
+def _event(notification_id: str) -> dict:
+    return {
+        "id": notification_id,
+        "notification_type": "DONOR_FOUND",
+        "title": "Bağışçı bulundu",
+        "message": "Bir bağışçı talebinize yanıt verdi.",
+        "request_id": "r1",
+        "donation_id": None,
+        "is_read": False,
+        "read_at": None,
+        "created_at": "2026-03-16T12:00:00+00:00",
+    }
+
+
+def _replay_row(notification_id: str):
+    return SimpleNamespace(_mapping=_event(notification_id))
+
+
+@pytest.fixture
+def running_broker():
+    notification_broker.start()
+    yield notification_broker
+    notification_broker.stop()
+
+
+# =============================================================================
+# TEST_NOTIFICATION_BROKER
+# =============================================================================
+
+class TestNotificationBroker:
+    """Kullanıcı bazlı dağıtım ve yavaş tüketici davranışı."""
+
+    def test_publish_reaches_only_target_user(self):
+        broker = NotificationBroker()
+        first = broker.subscribe("u1", max_size=10)
+        second = broker.subscribe("u1", max_size=10)
+        other = broker.subscribe("u2", max_size=10)
+
+        assert broker.publish("u1", _event("n1")) == 2
+        assert first.queue.qsize() == 1
+        assert second.queue.qsize() == 1
+        assert other.queue.empty()
+
+    def test_full_queue_closes_subscription(self):
+        broker = NotificationBroker()
+        subscription = broker.subscribe("u1", max_size=1)
+
+        broker.publish("u1", _event("n1"))
+        assert broker.publish("u1", _event("n2")) == 0
+
+        assert subscription.closed is True
+        assert broker.subscriber_count == 0
+
+    def test_stop_closes_all_subscriptions(self):
+        broker = NotificationBroker()
+        broker.start()
+        subscription = broker.subscribe("u1", max_size=10)
+
+        broker.stop()
+
+        assert broker.is_running is False
+        assert subscription.closed is True
+        assert subscription.queue.get_nowait() is None
+
+    def test_dispatch_notify_payload_routes_by_user_id(self, running_broker):
+        subscription = running_broker.subscribe("u1", max_size=10)
+
+        delivered = dispatch_notify_payload(json.dumps({"user_id": "u1", **_event("n1")}))
+
+        assert delivered == 1
+        event = subscription.queue.get_nowait()
+        assert event["id"] == "n1"
+        assert "user_id" not in event
+
+
+# =============================================================================
+# TEST_STREAM_EVENTS
+# =============================================================================
+
+class TestStreamNotificationEvents:
+    """SSE mesaj formatı, tekrar gönderim ve heartbeat."""
+
+    def test_format_sse(self):
+        assert format_sse("{}", event="notification", event_id="n1") == (
+            "id: n1\nevent: notification\ndata: {}\n\n"
+        )
+
+    @pytest.mark.asyncio
+    async def test_replay_then_live_without_duplicates(self, running_broker):
+        subscription = running_broker.subscribe("u1", max_size=10)
+        # n2 hem tekrar sorgusunda hem canlı kuyrukta
+        running_broker.publish("u1", _event("n2"))
+        running_broker.publish("u1", _event("n3"))
+
+        stream = stream_notification_events(
+            subscription, [_replay_row("n1"), _replay_row("n2")], heartbeat_seconds=5
+        )
+        messages = [await stream.__anext__() for _ in range(4)]
+        await stream.aclose()
+
+        assert messages[0].startswith("retry:")
+        assert [message.split("\n")[0] for message in messages[1:]] == ["id: n1", "id: n2", "id: n3"]
+        payload = json.loads(messages[3].split("data: ")[1])
+        assert payload["request_id"] == "r1"
+        # Kapanınca abonelik kaldırılır
+        assert running_broker.subscriber_count == 0
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_when_idle_and_ends_on_close(self, running_broker):
+        subscription = running_broker.subscribe("u1", max_size=10)
+        stream = stream_notification_events(subscription, [], heartbeat_seconds=0.01)
+
+        assert (await stream.__anext__()).startswith("retry:")
+        assert await stream.__anext__() == ": ping\n\n"
+
+        subscription.close()
+        with pytest.raises(StopAsyncIteration):
+            await asyncio.wait_for(stream.__anext__(), timeout=1)
+
+
+# =============================================================================
+# TEST_CREATE_NOTIFICATION_PUBLISH
+# =============================================================================
+
+class TestCreateNotificationPublish:
+    """create_notification yalnızca broker çalışırken NOTIFY gönderir."""
+
+    @pytest.fixture(autouse=True)
+    def partitions_ensured(self):
+        # Partition kontrolü DB sorgusu yapar; burada yalnızca yazım yolu test edilir
+        with patch(
+            "app.services.notification_service.ensure_current_notification_partitions",
+            AsyncMock(return_value=[]),
+        ):
+            yield
+
+    @staticmethod
+    def _mock_db():
+        db = MagicMock()
+        db.flush = AsyncMock()
+        db.refresh = AsyncMock()
+        db.execute = AsyncMock()
+        return db
+
+    @pytest.mark.asyncio
+    async def test_publishes_when_broker_running(self, running_broker):
+        db = self._mock_db()
+        with patch(
+            "app.services.notification_service.publish_notifications", AsyncMock()
+        ) as publish:
+            notification = await notification_service.create_notification(
+                db=db,
+                user_id="u1",
+                notification_type="DONATION_COMPLETE",
+                context={"points": "50"},
+            )
+
+        publish.assert_awaited_once_with(db, [notification.id])
+
+    @pytest.mark.asyncio
+    async def test_skips_notify_when_broker_stopped(self):
+        db = self._mock_db()
+        with patch(
+            "app.services.notification_service.publish_notifications", AsyncMock()
+        ) as publish:
+            await notification_service.create_notification(
+                db=db,
+                user_id="u1",
+                notification_type="DONATION_COMPLETE",
+                context={"points": "50"},
+            )
+
+        publish.assert_not_called()
+
+
+# =============================================================================
+# TEST_GET_NOTIFICATIONS_SINCE (DB)
+# =============================================================================
+
+@pytest_asyncio.fixture
+async def stream_user(db_session: AsyncSession) -> User:
+    """Test kullanıcısı oluşturur."""
+    from app.core.security import hash_password
+    from app.constants import UserRole
+
+    user = User(
+        phone_number="+905559998866",
+        password_hash=hash_password("Test1234!"),
+        full_name="Stream Test User",
+        date_of_birth=datetime(1990, 5, 15, tzinfo=timezone.utc),
+        blood_type="O+",
+        role=UserRole.USER.value,
+        is_active=True
+    )
+    db_session.add(user)
+    await db_session.flush()
+    return user
+
+
+class TestGetNotificationsSince:
+    """Last-Event-ID tekrar sorgusu."""
+
+    @pytest.mark.asyncio
+    async def test_returns_notifications_after_last_event_id(
+        self,
+        db_session: AsyncSession,
+        stream_user: User
+    ):
+        ids = []
+        for i in range(3):
+            notification = await notification_service.create_notification(
+                db=db_session,
+                user_id=str(stream_user.id),
+                notification_type=NotificationType.NEW_REQUEST.value,
+                context={"blood_type": "A+", "hospital_name": f"Hastane {i}"}
+            )
+            ids.append(str(notification.id))
+
+        # Aynı transaction'da created_at eşit, sıra id ile belirlenir
+        ordered = sorted(ids)
+        rows = await get_notifications_since(db_session, str(stream_user.id), ordered[0], limit=10)
+
+        assert [row.id for row in rows] == ordered[1:]
+        assert rows[0].notification_type == NotificationType.NEW_REQUEST.value
+
+    @pytest.mark.asyncio
+    async def test_unknown_or_missing_last_event_id_skips_replay(
+        self,
+        db_session: AsyncSession,
+        stream_user: User
+    ):
+        await notification_service.create_notification(
+            db=db_session,
+            user_id=str(stream_user.id),
+            notification_type=NotificationType.NEW_REQUEST.value,
+            context={"blood_type": "A+", "hospital_name": "Hastane"}
+        )
+
+        assert await get_notifications_since(db_session, str(stream_user.id), None, limit=10) == []
+        assert await get_notifications_since(
+            db_session, str(stream_user.id), "00000000-0000-0000-0000-000000000000", limit=10
+        ) == []
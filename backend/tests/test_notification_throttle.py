@@ -0,0 +1,246 @@
+"""
+Notification Throttle Testleri.
+
+Bu dosya, app/services/notification_throttle_service.py (NotificationThrottle
+kararları, create_request_notifications collapse ve push sınırı) fonksiyonlarını
+test eder.
+TestCreateRequestNotificationsDb dışındaki testler DB gerektirmez.
+"""
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import BloodRequest, Hospital, Notification, User
+from app.services.notification_throttle_service import (
+    NotificationThrottle,
+    create_request_notifications,
+    notification_throttle,
+)
+
+
+NOW = datetime(2026, 3, 16, 12, 0, tzinfo=timezone.utc)
+KEY = ("h1", "A+")
+
+
+def _throttle(max_pushes: int = 2) -> NotificationThrottle:
+    return NotificationThrottle(window=timedelta(minutes=60), max_pushes=max_pushes)
+
+
+# =============================================================================
+# TEST_NOTIFICATION_THROTTLE
+# =============================================================================
+
+class TestNotificationThrottle:
+    """Push sınırı, tekilleştirme ve durum yaşam süresi."""
+
+    def test_unknown_donors_are_delivered(self):
+        decision = _throttle().decide([("u1", "t1"), ("u2", None)], KEY, NOW)
+
+        assert decision.deliver == [("u1", "t1"), ("u2", None)]
+        assert decision.collapse == []
+
+    def test_push_cap_drops_token_but_keeps_notification(self):
+        throttle = _throttle(max_pushes=2)
+        throttle.load("u1", [NOW - timedelta(minutes=30), NOW - timedelta(minutes=10)], {}, NOW)
+        # Pencere dışındaki push sayılmaz
+        throttle.load("u2", [NOW - timedelta(minutes=90), NOW - timedelta(minutes=10)], {}, NOW)
+
+        decision = throttle.decide([("u1", "t1"), ("u2", "t2")], KEY, NOW)
+
+        assert decision.deliver == [("u1", None), ("u2", "t2")]
+        assert decision.capped == 1
+
+    def test_same_hospital_and_blood_type_collapses(self):
+        throttle = _throttle()
+        throttle.load("u1", [], {KEY: ("n1", NOW - timedelta(minutes=5))}, NOW)
+        throttle.load("u2", [], {("h2", "A+"): ("n2", NOW - timedelta(minutes=5))}, NOW)
+        throttle.load("u3", [], {KEY: ("n3", NOW - timedelta(minutes=61))}, NOW)
+
+        decision = throttle.decide([("u1", "t1"), ("u2", "t2"), ("u3", "t3")], KEY, NOW)
+
+        assert decision.collapse == [("u1", "n1", "t1")]
+        assert decision.deliver == [("u2", "t2"), ("u3", "t3")]
+
+    def test_record_updates_known_donors_only(self):
+        throttle = _throttle(max_pushes=1)
+        throttle.load("u1", [], {}, NOW)
+
+        throttle.record([("u1", "n1", True), ("u2", "n2", True)], KEY, NOW)
+
+        assert throttle.knows("u1", NOW)
+        assert not throttle.knows("u2", NOW)
+        decision = throttle.decide([("u1", "t1")], ("h2", "B+"), NOW)
+        assert decision.deliver == [("u1", None)]
+
+    def test_state_expires_after_window(self):
+        throttle = _throttle()
+        throttle.load("u1", [], {}, NOW)
+
+        later = NOW + timedelta(minutes=60)
+        assert not throttle.knows("u1", later)
+        throttle.decide([], KEY, later)
+        assert len(throttle) == 0
+
+
+# =============================================================================
+# TEST_CREATE_REQUEST_NOTIFICATIONS
+# =============================================================================
+
+class TestCreateRequestNotifications:
+    """Bellekteki durumla collapse ve push sınırı (mock DB)."""
+
+    @pytest.fixture(autouse=True)
+    def running_throttle(self):
+        notification_throttle.reset()
+        notification_throttle.start()
+        yield notification_throttle
+        notification_throttle.reset()
+
+    @pytest.mark.asyncio
+    async def test_collapses_and_caps_without_loading_known_donors(self, running_throttle):
+        running_throttle.load("u1", [], {KEY: ("n-old", NOW - timedelta(minutes=5))}, NOW)
+        running_throttle.load("u2", [NOW - timedelta(minutes=1)] * 3, {}, NOW)
+        running_throttle.load("u3", [], {}, NOW)
+
+        db = AsyncMock()
+        blood_request = SimpleNamespace(id="r2", hospital_id="h1", blood_type="A+")
+        commit_callbacks = []
+
+        with patch(
+            "app.services.notification_throttle_service.reopen_notifications",
+            AsyncMock(return_value=["n-old"]),
+        ) as reopen, patch(
+            "app.services.notification_throttle_service.create_notifications_bulk",
+            AsyncMock(return_value=["n2", "n3"]),
+        ) as bulk, patch(
+            "app.services.notification_throttle_service.run_after_commit",
+            side_effect=lambda session, callback: commit_callbacks.append(callback),
+        ):
+            decision = await create_request_notifications(
+                db,
+                blood_request,
+                [("u1", "t1"), ("u2", "t2"), ("u3", "t3")],
+                context={"blood_type": "A+", "hospital_name": "AKD"},
+                now=NOW,
+            )
+
+        # Bilinen bağışçılar için yükleme sorgusu yok; collapse bildirimi yeniden açılır
+        db.execute.assert_not_awaited()
+        assert reopen.await_args.args[1] == ["n-old"]
+        assert reopen.await_args.kwargs["request_id"] == "r2"
+        assert bulk.await_args.args[1] == [("u2", None), ("u3", "t3")]
+        assert bulk.await_args.kwargs["request_id"] == "r2"
+        assert decision.capped == 1
+        assert [entry[0] for entry in decision.collapse] == ["u1"]
+
+        for callback in commit_callbacks:
+            callback()
+        followup = running_throttle.decide([("u3", "t3")], KEY, NOW + timedelta(minutes=1))
+        assert followup.collapse == [("u3", "n3", "t3")]
+
+    @pytest.mark.asyncio
+    async def test_missing_collapse_target_is_delivered(self, running_throttle):
+        running_throttle.load("u1", [], {KEY: ("n-gone", NOW - timedelta(minutes=5))}, NOW)
+
+        db = AsyncMock()
+        blood_request = SimpleNamespace(id="r2", hospital_id="h1", blood_type="A+")
+
+        with patch(
+            "app.services.notification_throttle_service.reopen_notifications",
+            AsyncMock(return_value=[]),
+        ), patch(
+            "app.services.notification_throttle_service.create_notifications_bulk",
+            AsyncMock(return_value=["n1"]),
+        ) as bulk, patch("app.services.notification_throttle_service.run_after_commit"):
+            decision = await create_request_notifications(
+                db, blood_request, [("u1", "t1")], context={}, now=NOW
+            )
+
+        assert bulk.await_args.args[1] == [("u1", "t1")]
+        assert decision.collapse == []
+
+
+# =============================================================================
+# TEST_CREATE_REQUEST_NOTIFICATIONS (DB)
+# =============================================================================
+
+@pytest_asyncio.fixture
+async def throttle_setup(db_session: AsyncSession):
+    """Bağışçı, hastane ve aynı hastanede iki A+ talebi oluşturur."""
+    from geoalchemy2 import WKTElement
+    from app.core.security import hash_password
+    from app.constants import UserRole
+
+    donor = User(
+        phone_number="+905559998855",
+        password_hash=hash_password("Test1234!"),
+        full_name="Throttle Test Donor",
+        date_of_birth=datetime(1990, 5, 15, tzinfo=timezone.utc),
+        blood_type="O+",
+        role=UserRole.USER.value,
+        is_active=True
+    )
+    hospital = Hospital(
+        name="Test Hastanesi Throttle",
+        hospital_code="THT-001",
+        address="Test Adres Throttle",
+        location=WKTElement("POINT(30.0 36.0)", srid=4326, extended=False),
+        city="Antalya",
+        district="Muratpaşa",
+        phone_number="+902421234568",
+        geofence_radius_meters=5000,
+        is_active=True
+    )
+    db_session.add_all([donor, hospital])
+    await db_session.flush()
+
+    requests = []
+    for code in ("KAN-991", "KAN-992"):
+        request = BloodRequest(
+            requester_id=donor.id,
+            hospital_id=hospital.id,
+            blood_type="A+",
+            request_type="WHOLE_BLOOD",
+            priority="NORMAL",
+            units_needed=1,
+            units_collected=0,
+            status="ACTIVE",
+            request_code=code,
+            location=WKTElement("POINT(30.0 36.0)", srid=4326, extended=False)
+        )
+        db_session.add(request)
+        requests.append(request)
+    await db_session.flush()
+    return donor, requests
+
+
+class TestCreateRequestNotificationsDb:
+    """DB'den yüklenen durumla tekilleştirme."""
+
+    @pytest.mark.asyncio
+    async def test_second_request_at_same_hospital_collapses(
+        self,
+        db_session: AsyncSession,
+        throttle_setup
+    ):
+        notification_throttle.reset()
+        donor, (first, second) = throttle_setup
+        context = {"blood_type": "A+", "hospital_name": "Test Hastanesi Throttle"}
+
+        await create_request_notifications(db_session, first, [(str(donor.id), None)], context)
+        decision = await create_request_notifications(db_session, second, [(str(donor.id), None)], context)
+
+        assert decision.deliver == []
+        assert len(decision.collapse) == 1
+
+        rows = await db_session.execute(
+            select(Notification.blood_request_id, func.count())
+            .where(Notification.user_id == donor.id)
+            .group_by(Notification.blood_request_id)
+        )
+        assert rows.all() == [(second.id, 1)]
@@ -0,0 +1,109 @@
+"""
+Pagination Utility Testleri.
+
+Bu dosya, app/utils/pagination.py keyset (cursor) pagination yardımcılarını test eder.
+Tüm testler pure-Python'dır, DB gerektirmez.
+"""
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Column, DateTime, MetaData, String, Table
+from sqlalchemy.dialects import postgresql
+
+from app.core.exceptions import BadRequestException
+from app.utils.pagination import (
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+    next_cursor_for,
+    page_count,
+    should_count,
+)
+
+
+_items = Table(
+    "items",
+    MetaData(),
+    Column("id", String, primary_key=True),
+    Column("created_at", DateTime(timezone=True)),
+)
+
+
+class TestCursorEncoding:
+    """encode_cursor / decode_cursor testleri."""
+
+    def test_datetime_roundtrip(self):
+        created_at = datetime(2025, 3, 15, 10, 30, 0, 123456, tzinfo=timezone.utc)
+        cursor = encode_cursor(created_at, "abc-123")
+        assert decode_cursor(cursor) == (created_at, "abc-123")
+
+    def test_float_roundtrip(self):
+        cursor = encode_cursor(1234.5678901, "abc")
+        assert decode_cursor(cursor, float) == (1234.5678901, "abc")
+
+    def test_cursor_is_url_safe(self):
+        cursor = encode_cursor(datetime.now(timezone.utc), "a" * 36)
+        assert "=" not in cursor
+        assert "+" not in cursor
+        assert "/" not in cursor
+
+    @pytest.mark.parametrize("cursor", ["", "not-base64!!", encode_cursor("x", "1"), "WzFd"])
+    def test_invalid_cursor_raises(self, cursor):
+        with pytest.raises(BadRequestException):
+            decode_cursor(cursor)
+
+
+class TestKeysetCondition:
+    """keyset_condition SQL üretim testleri."""
+
+    def _compile(self, expr) -> str:
+        return str(expr.compile(dialect=postgresql.dialect()))
+
+    def test_descending_uses_less_than(self):
+        sql = self._compile(
+            keyset_condition(_items.c.created_at, _items.c.id, datetime.now(timezone.utc), "x")
+        )
+        assert "items.created_at <" in sql
+        assert "items.id <" in sql
+
+    def test_ascending_uses_greater_than(self):
+        sql = self._compile(
+            keyset_condition(_items.c.created_at, _items.c.id, datetime.now(timezone.utc), "x", descending=False)
+        )
+        assert "items.created_at >" in sql
+        assert "items.id >" in sql
+
+
+class TestPageHelpers:
+    """next_cursor_for, should_count ve page_count testleri."""
+
+    def test_next_cursor_none_for_partial_page(self):
+        items = [SimpleNamespace(created_at=datetime.now(timezone.utc), id="1")]
+        assert next_cursor_for(items, size=20) is None
+        assert next_cursor_for([], size=20) is None
+
+    def test_next_cursor_uses_last_item(self):
+        created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        items = [
+            SimpleNamespace(created_at=datetime(2025, 1, 2, tzinfo=timezone.utc), id="2"),
+            SimpleNamespace(created_at=created_at, id="1"),
+        ]
+        cursor = next_cursor_for(items, size=2)
+        assert decode_cursor(cursor) == (created_at, "1")
+
+    def test_next_cursor_custom_key(self):
+        rows = [("a", 10.0), ("b", 20.0)]
+        cursor = next_cursor_for(rows, size=2, key=lambda row: (row[1], row[0]))
+        assert decode_cursor(cursor, float) == (20.0, "b")
+
+    def test_should_count_defaults(self):
+        assert should_count(None, None) is True
+        assert should_count("cursor", None) is False
+        assert should_count("cursor", True) is True
+        assert should_count(None, False) is False
+
+    def test_page_count(self):
+        assert page_count(None, 20) is None
+        assert page_count(0, 20) == 0
+        assert page_count(41, 20) == 3
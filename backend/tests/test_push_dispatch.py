@@ -0,0 +1,398 @@
+"""
+Push Dispatch Testleri.
+
+Bu dosya, app/services/push_dispatch_service.py (PushQueue, send_pushes),
+create_notification kuyruk yolu ve app/background/push_sender.py
+fonksiyonlarını test eder.
+Tüm testler DB gerektirmez.
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.notification_service import create_notification, create_notifications_bulk
+from app.services.push_dispatch_service import (
+    PendingPush,
+    PushQueue,
+    PushReport,
+    dispatch_pushes,
+    push_queue,
+    send_pushes,
+)
+from app.utils.fcm import PushMessage, PushOutcome
+
+
+def _push(notification_id: str, attempts: int = 0) -> PendingPush:
+    return PendingPush(
+        notification_id=notification_id,
+        user_id=f"u{notification_id}",
+        message=PushMessage(fcm_token=f"token-{notification_id}", title="T", body="B"),
+        attempts=attempts,
+    )
+
+
+# =============================================================================
+# TEST_PUSH_QUEUE
+# =============================================================================
+
+class TestPushQueue:
+    """FIFO sırası, parça boyutu ve uyandırma davranışı."""
+
+    def test_drain_respects_limit_and_order(self):
+        queue = PushQueue()
+        for i in range(5):
+            queue.enqueue(_push(str(i)))
+
+        first = queue.drain(3)
+        assert [entry.notification_id for entry in first] == ["0", "1", "2"]
+        assert len(queue) == 2
+
+    def test_requeue_puts_entries_back_in_front(self):
+        queue = PushQueue()
+        for i in range(4):
+            queue.enqueue(_push(str(i)))
+
+        failed = queue.drain(2)
+        queue.requeue(failed)
+
+        assert [entry.notification_id for entry in queue.drain(10)] == ["0", "1", "2", "3"]
+
+    @pytest.mark.asyncio
+    async def test_wait_returns_when_push_enqueued(self):
+        queue = PushQueue()
+        queue.start()
+
+        waiter = asyncio.create_task(queue.wait(timeout=5))
+        await asyncio.sleep(0)
+        queue.enqueue(_push("1"))
+
+        await asyncio.wait_for(waiter, timeout=1)
+        assert len(queue) == 1
+
+    def test_retry_later_holds_push_until_backoff_elapses(self):
+        queue = PushQueue()
+        with patch("app.services.push_dispatch_service.time.monotonic", return_value=100.0):
+            queue.retry_later([_push("1", attempts=1), _push("2", attempts=2)], base_delay=2.0)
+            assert queue.drain(10) == []
+            assert len(queue) == 2
+
+        with patch("app.services.push_dispatch_service.time.monotonic", return_value=102.0):
+            assert [entry.notification_id for entry in queue.drain(10)] == ["1"]
+
+        with patch("app.services.push_dispatch_service.time.monotonic", return_value=104.0):
+            assert [entry.notification_id for entry in queue.drain(10)] == ["2"]
+
+    def test_stop_releases_delayed_retries_for_final_flush(self):
+        queue = PushQueue()
+        queue.start()
+        with patch("app.services.push_dispatch_service.time.monotonic", return_value=100.0):
+            queue.retry_later([_push("1", attempts=1)], base_delay=60.0)
+            queue.stop()
+            assert [entry.notification_id for entry in queue.drain(10)] == ["1"]
+
+    @pytest.mark.asyncio
+    async def test_wait_times_out_when_empty(self):
+        queue = PushQueue()
+        queue.start()
+
+        await queue.wait(timeout=0.01)
+        assert len(queue) == 0
+
+
+# =============================================================================
+# TEST_CREATE_NOTIFICATION_QUEUE
+# =============================================================================
+
+class TestCreateNotificationQueue:
+    """create_notification push kuyruğu yolu."""
+
+    @pytest.fixture(autouse=True)
+    def partitions_ensured(self):
+        # Partition kontrolü DB sorgusu yapar; burada yalnızca yazım yolu test edilir
+        with patch(
+            "app.services.notification_service.ensure_current_notification_partitions",
+            AsyncMock(return_value=[]),
+        ):
+            yield
+
+    @pytest.fixture(autouse=True)
+    def running_queue(self):
+        push_queue.clear()
+        push_queue.start()
+        yield push_queue
+        push_queue.stop()
+        push_queue.clear()
+
+    @staticmethod
+    def _mock_db():
+        db = MagicMock()
+        db.flush = AsyncMock()
+        db.refresh = AsyncMock()
+        db.execute = AsyncMock()
+        return db
+
+    @pytest.mark.asyncio
+    async def test_enqueues_after_commit_without_inline_send(self):
+        db = self._mock_db()
+        commit_callbacks = []
+
+        with patch(
+            "app.services.push_dispatch_service.run_after_commit",
+            side_effect=lambda session, callback: commit_callbacks.append(callback),
+        ), patch("app.utils.fcm.send_push_notification") as inline_send:
+            notification = await create_notification(
+                db=db,
+                user_id="u1",
+                notification_type="DONATION_COMPLETE",
+                context={"points": "50"},
+                fcm_token="token-u1",
+            )
+
+        inline_send.assert_not_called()
+        assert notification.is_push_sent is False
+        # Commit'e kadar kuyruğa girmez
+        assert len(push_queue) == 0
+
+        for callback in commit_callbacks:
+            callback()
+
+        entries = push_queue.drain(10)
+        assert len(entries) == 1
+        assert entries[0].message.fcm_token == "token-u1"
+        assert entries[0].message.data["notification_type"] == "DONATION_COMPLETE"
+
+    @pytest.mark.asyncio
+    async def test_no_token_skips_queue(self):
+        db = self._mock_db()
+
+        await create_notification(
+            db=db,
+            user_id="u1",
+            notification_type="DONATION_COMPLETE",
+            context={"points": "50"},
+            fcm_token=None,
+        )
+
+        assert len(push_queue) == 0
+
+
+class TestCreateNotificationsBulkQueue:
+    """create_notifications_bulk tek INSERT ve kuyruk yolu."""
+
+    @pytest.fixture(autouse=True)
+    def partitions_ensured(self):
+        # Partition kontrolü DB sorgusu yapar; burada yalnızca yazım yolu test edilir
+        with patch(
+            "app.services.notification_service.ensure_current_notification_partitions",
+            AsyncMock(return_value=[]),
+        ):
+            yield
+
+    @pytest.fixture(autouse=True)
+    def running_queue(self):
+        push_queue.clear()
+        push_queue.start()
+        yield push_queue
+        push_queue.stop()
+        push_queue.clear()
+
+    @pytest.mark.asyncio
+    async def test_single_insert_and_pushes_only_for_tokens(self):
+        db = AsyncMock()
+        db.execute.return_value.scalars = MagicMock(
+            return_value=MagicMock(all=MagicMock(return_value=["n1", "n2", "n3"]))
+        )
+
+        with patch(
+            "app.services.push_dispatch_service.run_after_commit",
+            side_effect=lambda session, callback: callback(),
+        ):
+            notification_ids = await create_notifications_bulk(
+                db,
+                [("u1", "token-u1"), ("u2", None), ("u3", "token-u3")],
+                notification_type="NEW_REQUEST",
+                context={"blood_type": "A+", "hospital_name": "AKD"},
+                request_id="r1",
+            )
+
+        assert notification_ids == ["n1", "n2", "n3"]
+        # Bildirim INSERT'i + okunmamış sayaç upsert'i
+        assert db.execute.await_count == 2
+        rows = db.execute.await_args_list[0].args[1]
+        assert [row["user_id"] for row in rows] == ["u1", "u2", "u3"]
+        assert all("A+" in row["message"] for row in rows)
+
+        entries = push_queue.drain(10)
+        assert [entry.notification_id for entry in entries] == ["n1", "n3"]
+        assert entries[1].message.data["request_id"] == "r1"
+
+
+# =============================================================================
+# TEST_SEND_PUSHES
+# =============================================================================
+
+class TestSendPushes:
+    """send_pushes toplu gönderim, token temizliği ve tekrar deneme."""
+
+    @pytest.mark.asyncio
+    async def test_marks_only_successful_pushes(self):
+        db = AsyncMock()
+        outcomes = [PushOutcome.SENT, PushOutcome.FAILED, PushOutcome.SENT]
+        with patch("app.utils.fcm.send_push_batch", return_value=outcomes) as batch:
+            report = await send_pushes(db, [_push("1"), _push("2"), _push("3")])
+
+        assert report.sent == 2
+        assert report.retry == []
+        batch.assert_called_once()
+        db.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_unregistered_tokens_are_pruned(self):
+        db = AsyncMock()
+        with patch(
+            "app.utils.fcm.send_push_batch",
+            return_value=[PushOutcome.UNREGISTERED, PushOutcome.SENT],
+        ), patch(
+            "app.services.push_dispatch_service.prune_fcm_tokens", AsyncMock(return_value=1)
+        ) as prune:
+            report = await send_pushes(db, [_push("1"), _push("2")])
+
+        prune.assert_awaited_once_with(db, [("u1", "token-1")])
+        assert report.sent == 1
+        assert report.pruned == 1
+
+    @pytest.mark.asyncio
+    async def test_transient_failures_retry_until_max_attempts(self):
+        db = AsyncMock()
+        with patch(
+            "app.utils.fcm.send_push_batch",
+            return_value=[PushOutcome.TRANSIENT, PushOutcome.TRANSIENT],
+        ), patch("app.services.push_dispatch_service.settings") as mock_settings:
+            mock_settings.PUSH_MAX_ATTEMPTS = 3
+            report = await send_pushes(db, [_push("1"), _push("2", attempts=2)])
+
+        assert [(entry.notification_id, entry.attempts) for entry in report.retry] == [("1", 1)]
+        assert report.sent == 0
+        db.execute.assert_not_called()
+
+
+class TestDispatchPushes:
+    """Kuyruk yokken push'lar istek içinde, thread'de ve tekrar denenerek gönderilir."""
+
+    @pytest.fixture(autouse=True)
+    def stopped_queue(self):
+        push_queue.stop()
+        push_queue.clear()
+        yield
+        push_queue.clear()
+
+    @pytest.mark.asyncio
+    async def test_sends_inline_through_worker_thread(self):
+        db = AsyncMock()
+        with patch(
+            "app.services.push_dispatch_service.asyncio.to_thread",
+            AsyncMock(return_value=[PushOutcome.SENT]),
+        ) as to_thread:
+            assert await dispatch_pushes(db, [_push("1")]) == 1
+
+        to_thread.assert_awaited_once()
+        assert len(push_queue) == 0
+
+    @pytest.mark.asyncio
+    async def test_transient_failures_are_retried_with_backoff(self):
+        db = AsyncMock()
+        reports = [
+            PushReport(retry=[_push("1", attempts=1)]),
+            PushReport(retry=[_push("1", attempts=2)]),
+            PushReport(sent=1),
+        ]
+        with patch(
+            "app.services.push_dispatch_service.send_pushes", AsyncMock(side_effect=reports)
+        ) as send, patch(
+            "app.services.push_dispatch_service.asyncio.sleep", AsyncMock()
+        ) as sleep, patch("app.services.push_dispatch_service.settings") as mock_settings:
+            mock_settings.PUSH_RETRY_BASE_SECONDS = 2.0
+            assert await dispatch_pushes(db, [_push("1")]) == 1
+
+        assert send.await_count == 3
+        assert [call.args[0] for call in sleep.await_args_list] == [2.0, 4.0]
+
+    @pytest.mark.asyncio
+    async def test_running_queue_defers_to_commit(self):
+        db = AsyncMock()
+        push_queue.start()
+        with patch("app.services.push_dispatch_service.run_after_commit") as after_commit, \
+                patch("app.services.push_dispatch_service.send_pushes", AsyncMock()) as send:
+            assert await dispatch_pushes(db, [_push("1")]) == 0
+
+        after_commit.assert_called_once()
+        send.assert_not_awaited()
+
+
+# =============================================================================
+# TEST_PUSH_SENDER
+# =============================================================================
+
+class TestFlushPushQueue:
+    """flush_push_queue parça boyutu ve commit davranışı."""
+
+    @pytest.fixture(autouse=True)
+    def empty_queue(self):
+        push_queue.clear()
+        yield
+        push_queue.clear()
+
+    @pytest.mark.asyncio
+    async def test_empty_queue_skips_db(self):
+        from app.background.push_sender import flush_push_queue
+
+        with patch("app.background.push_sender.AsyncSessionLocal") as session_local:
+            assert await flush_push_queue() == 0
+        session_local.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_sends_in_batches_and_commits(self):
+        from app.background.push_sender import flush_push_queue
+
+        for i in range(5):
+            push_queue.enqueue(_push(str(i)))
+
+        session = AsyncMock()
+        with patch("app.background.push_sender.AsyncSessionLocal") as session_local, \
+                patch("app.background.push_sender.settings") as mock_settings, \
+                patch(
+                    "app.background.push_sender.send_pushes",
+                    AsyncMock(side_effect=lambda db, entries: PushReport(sent=len(entries))),
+                ) as send:
+            session_local.return_value.__aenter__ = AsyncMock(return_value=session)
+            session_local.return_value.__aexit__ = AsyncMock(return_value=None)
+            mock_settings.PUSH_BATCH_SIZE = 2
+
+            assert await flush_push_queue() == 5
+
+        assert [len(call.args[1]) for call in send.await_args_list] == [2, 2, 1]
+        assert session.commit.await_count == 3
+        assert len(push_queue) == 0
+
+    @pytest.mark.asyncio
+    async def test_transient_failures_are_delayed(self):
+        from app.background.push_sender import flush_push_queue
+
+        push_queue.enqueue(_push("1"))
+        retry = [_push("1", attempts=1)]
+
+        session = AsyncMock()
+        with patch("app.background.push_sender.AsyncSessionLocal") as session_local, \
+                patch(
+                    "app.background.push_sender.send_pushes",
+                    AsyncMock(return_value=PushReport(retry=retry)),
+                ):
+            session_local.return_value.__aenter__ = AsyncMock(return_value=session)
+            session_local.return_value.__aexit__ = AsyncMock(return_value=None)
+
+            assert await flush_push_queue() == 0
+
+        # Bekleme süresi dolmadığı için hemen drain edilemez
+        assert len(push_queue) == 1
+        assert push_queue.drain(10) == []
@@ -16,7 +16,7 @@ from fastapi import FastAPI, Request
 from fastapi.testclient import TestClient
 from starlette.responses import JSONResponse
 
-from app.middleware.rate_limiter import RateLimiterMiddleware
+from app.middleware.rate_limiter import RateLimiterMiddleware, cleanup_rate_limiters
 from app.core.exceptions import RateLimitException
 
 
@@ -203,6 +203,15 @@ class TestRateLimiterInternalMethods:
         assert "old_ip" not in middleware._requests
         assert "new_ip" in middleware._requests
 
+    def test_cleanup_rate_limiters_drops_entries_outside_period(self, middleware):
+        """Periyodik job, limit penceresi dışındaki kayıtları silmeli."""
+        middleware._requests["stale_ip"] = [time.time() - middleware.period_seconds - 1]
+        middleware._requests["active_ip"] = [time.time()]
+
+        assert cleanup_rate_limiters() >= 1
+        assert "stale_ip" not in middleware._requests
+        assert "active_ip" in middleware._requests
+
 
 class TestRateLimiterDisabled:
     """Test rate limiter when disabled."""
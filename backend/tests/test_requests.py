@@ -25,6 +25,7 @@ from app.auth import create_access_token
 from app.constants import UserRole, RequestStatus, CommitmentStatus
 from app.utils.location import create_point
 from app.services.blood_request_service import find_nearby_donors
+from app.services.donor_index_service import track_commitment_started
 
 
 # ---------------------------------------------------------------------------
@@ -1287,6 +1288,7 @@ class TestRequestEndpoints:
         )
         db_session.add(active_commitment)
         await db_session.flush()
+        await track_commitment_started(db_session, donor.id)
 
         donors = await find_nearby_donors(db_session, visible_request.id)
         donor_ids = {item.id for item in donors}
@@ -1,105 +1,26 @@
-"""Tests for background timeout checker task."""
-import asyncio
+"""Tests for the commitment timeout job."""
 import pytest
 from unittest.mock import AsyncMock, patch
 
 from app.background.timeout_checker import (
-    run_timeout_checker,
-    stop_timeout_checker,
+    check_commitment_timeouts,
+    timeout_check_interval_minutes,
     TIMEOUT_CHECK_INTERVAL_MINUTES,
 )
 
 
-class TestTimeoutChecker:
-    """Timeout checker background task testleri."""
-
-    @pytest.mark.asyncio
-    async def test_timeout_checker_runs_periodically(self):
-        """Task'ın periyodik çalıştığını verify et."""
-        # Arrange - Mock'ları hazırla
-        call_count = 0
-
-        async def mock_check_timeouts(db):
-            nonlocal call_count
-            call_count += 1
-            return 0
-
-        # Sleep'i hızlandırmak için kısalt
-        original_sleep = asyncio.sleep
-        sleep_calls = []
-
-        async def fast_sleep(seconds):
-            sleep_calls.append(seconds)
-            if len(sleep_calls) >= 2:  # 2 döngü sonra durdur
-                stop_timeout_checker()
-            await original_sleep(0.01)  # Çok kısa bekleme
-
-        with patch("app.background.timeout_checker.check_timeouts", side_effect=mock_check_timeouts):
-            with patch("app.background.timeout_checker.AsyncSessionLocal") as mock_session_local:
-                # Mock session context manager
-                mock_session = AsyncMock()
-                mock_session.commit = AsyncMock()
-                mock_session_local.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-                mock_session_local.return_value.__aexit__ = AsyncMock(return_value=None)
-
-                with patch("asyncio.sleep", side_effect=fast_sleep):
-                    # Act - Task'ı başlat
-                    await run_timeout_checker()
-
-        # Assert - En az 2 kez check_timeouts çağrıldı
-        assert call_count >= 2
-
-    @pytest.mark.asyncio
-    async def test_timeout_checker_can_be_stopped(self):
-        """stop_timeout_checker çalışıyor mu."""
-        # Arrange
-        from app.background import timeout_checker
-
-        # Reset state
-        timeout_checker.TASK_RUNNING = False
+def _patch_session():
+    """AsyncSessionLocal'ı mock session döndürecek şekilde patch'ler."""
+    patcher = patch("app.background.timeout_checker.AsyncSessionLocal")
+    mock_session_local = patcher.start()
+    mock_session = AsyncMock()
+    mock_session_local.return_value.__aenter__ = AsyncMock(return_value=mock_session)
+    mock_session_local.return_value.__aexit__ = AsyncMock(return_value=None)
+    return patcher, mock_session
 
-        # Act - Task'ı başlat ve durdur
-        timeout_checker.TASK_RUNNING = True
-        stop_timeout_checker()
 
-        # Assert
-        assert timeout_checker.TASK_RUNNING is False
-
-    @pytest.mark.asyncio
-    async def test_timeout_checker_handles_db_errors(self):
-        """DB hatası durumunda continue ediyor mu."""
-        # Arrange
-        call_count = 0
-
-        async def mock_check_timeouts_error(db):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                raise Exception("Database connection error")
-            return 0
-
-        original_sleep = asyncio.sleep
-        sleep_calls = []
-
-        async def fast_sleep(seconds):
-            sleep_calls.append(seconds)
-            if len(sleep_calls) >= 2:
-                stop_timeout_checker()
-            await original_sleep(0.01)
-
-        with patch("app.background.timeout_checker.check_timeouts", side_effect=mock_check_timeouts_error):
-            with patch("app.background.timeout_checker.AsyncSessionLocal") as mock_session_local:
-                mock_session = AsyncMock()
-                mock_session.commit = AsyncMock()
-                mock_session_local.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-                mock_session_local.return_value.__aexit__ = AsyncMock(return_value=None)
-
-                with patch("asyncio.sleep", side_effect=fast_sleep):
-                    # Act
-                    await run_timeout_checker()
-
-        # Assert - Hata sonrası da devam etti
-        assert call_count >= 2
+class TestTimeoutChecker:
+    """Timeout checker job testleri."""
 
     @pytest.mark.asyncio
     async def test_timeout_checker_logs_timeouts(self, caplog):
@@ -107,36 +28,77 @@ class TestTimeoutChecker:
         import logging
         caplog.set_level(logging.INFO)
 
-        async def mock_check_timeouts_with_timeouts(db):
-            return 3  # 3 timeout bulundu
-
-        sleep_count = 0
+        patcher, _ = _patch_session()
+        try:
+            with patch("app.background.timeout_checker.check_timeouts", AsyncMock(return_value=3)):
+                assert await check_commitment_timeouts() == 3
+        finally:
+            patcher.stop()
 
-        async def stop_on_first_sleep(seconds):
-            nonlocal sleep_count
-            sleep_count += 1
-            if sleep_count >= 1:
-                stop_timeout_checker()
-            return None  # Sleep yerine direkt dön
-
-        with patch("app.background.timeout_checker.check_timeouts", side_effect=mock_check_timeouts_with_timeouts):
-            with patch("app.background.timeout_checker.AsyncSessionLocal") as mock_session_local:
-                mock_session = AsyncMock()
-                mock_session.commit = AsyncMock()
-                mock_session_local.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-                mock_session_local.return_value.__aexit__ = AsyncMock(return_value=None)
+        assert any("3 commitment(s) timed out" in record.message for record in caplog.records)
 
-                with patch("asyncio.sleep", side_effect=stop_on_first_sleep):
-                    await run_timeout_checker()
+    @pytest.mark.asyncio
+    async def test_timeout_checker_propagates_db_errors(self):
+        """DB hatası job runner'a iletilmeli (backoff ve metrik runner'da)."""
+        patcher, _ = _patch_session()
+        try:
+            with patch(
+                "app.background.timeout_checker.check_timeouts",
+                AsyncMock(side_effect=Exception("Database connection error")),
+            ):
+                with pytest.raises(Exception, match="Database connection error"):
+                    await check_commitment_timeouts()
+        finally:
+            patcher.stop()
 
-        # Assert
-        assert any("3 commitment(s) timed out" in record.message for record in caplog.records)
+    @pytest.mark.asyncio
+    async def test_timeout_checker_reconciles_only_with_running_scheduler(self):
+        """Uzlaştırma yalnızca commitment scheduler çalışırken yapılmalı."""
+        patcher, _ = _patch_session()
+        try:
+            with patch("app.background.timeout_checker.check_timeouts", AsyncMock(return_value=0)), \
+                    patch(
+                        "app.background.timeout_checker.reconcile_commitment_deadlines",
+                        AsyncMock(return_value=0),
+                    ) as reconcile, \
+                    patch("app.background.timeout_checker.commitment_scheduler") as scheduler:
+                scheduler.is_running = False
+                await check_commitment_timeouts()
+                reconcile.assert_not_awaited()
+
+                scheduler.is_running = True
+                await check_commitment_timeouts()
+                reconcile.assert_awaited_once()
+        finally:
+            patcher.stop()
 
     @pytest.mark.asyncio
     async def test_timeout_checker_interval_configuration(self):
         """Interval konfigürasyonu doğru mu."""
         # Assert
         assert TIMEOUT_CHECK_INTERVAL_MINUTES == 5
+        with patch("app.background.timeout_checker.commitment_scheduler") as scheduler:
+            scheduler.is_running = False
+            assert timeout_check_interval_minutes() == TIMEOUT_CHECK_INTERVAL_MINUTES
+
+    @pytest.mark.asyncio
+    async def test_expire_overdue_commitments_runs_batches_until_partial(self):
+        """Batch dolu döndükçe yeni transaction'da tekrar çağrılmalı."""
+        from app.background.timeout_checker import expire_overdue_commitments
+
+        check = AsyncMock(side_effect=[2, 2, 1])
+        with patch("app.background.timeout_checker.check_timeouts", check), \
+                patch("app.background.timeout_checker.settings") as mock_settings, \
+                patch("app.background.timeout_checker.AsyncSessionLocal") as mock_session_local:
+            mock_settings.TIMEOUT_BATCH_SIZE = 2
+            mock_session = AsyncMock()
+            mock_session_local.return_value.__aenter__ = AsyncMock(return_value=mock_session)
+            mock_session_local.return_value.__aexit__ = AsyncMock(return_value=None)
+
+            assert await expire_overdue_commitments() == 5
+
+        assert check.await_count == 3
+        assert mock_session.commit.await_count == 3
 
     # Not: check_timeouts fonksiyonunun DB entegrasyonu test_donations.py'de zaten test edildi
-    # Bu dosya sadece background task runner'ı test eder
\ No newline at end of file
+    # Bu dosya sadece timeout job'ını test eder; periyodik çalıştırma test_jobs.py'de
\ No newline at end of file
@@ -18,6 +18,8 @@ from app.services.user_service import (
     soft_delete_user,
     get_user_stats,
 )
+from app.services.location_buffer_service import PendingLocation, write_locations
+from app.utils.location import extract_coordinates
 from app.core.exceptions import ConflictException
 from app.core.security import hash_password
 
@@ -304,6 +306,41 @@ async def test_update_user_location_boundaries(db_session, test_user):
     assert test_user.location is not None
 
 
+@pytest.mark.asyncio
+async def test_write_locations_bulk_updates_users(db_session, test_user, another_user):
+    """Buffer'daki konumlar tek UPDATE ... FROM (VALUES ...) ile yazılır."""
+    recorded_at = datetime.now(timezone.utc)
+    count = await write_locations(db_session, [
+        PendingLocation(str(test_user.id), 36.8969, 30.7133, recorded_at),
+        PendingLocation(str(another_user.id), 36.8832, 30.7056, recorded_at),
+    ])
+    assert count == 2
+
+    await db_session.refresh(test_user)
+    await db_session.refresh(another_user)
+    assert extract_coordinates(test_user.location) == pytest.approx((36.8969, 30.7133))
+    assert extract_coordinates(another_user.location) == pytest.approx((36.8832, 30.7056))
+    assert test_user.location_updated_at == recorded_at
+
+
+@pytest.mark.asyncio
+async def test_write_locations_skips_older_pings(db_session, test_user):
+    """Başka worker'ın geç yazdığı eski ping daha yeni konumu ezmez."""
+    newer = datetime.now(timezone.utc)
+    assert await write_locations(db_session, [
+        PendingLocation(str(test_user.id), 36.8969, 30.7133, newer),
+    ]) == 1
+
+    count = await write_locations(db_session, [
+        PendingLocation(str(test_user.id), 36.8832, 30.7056, newer - timedelta(seconds=30)),
+    ])
+    assert count == 0
+
+    await db_session.refresh(test_user)
+    assert extract_coordinates(test_user.location) == pytest.approx((36.8969, 30.7133))
+    assert test_user.location_updated_at == newer
+
+
 @pytest.mark.asyncio
 async def test_update_user_location_invalid_latitude_too_high(db_session, test_user):
     """Geçersiz enlem (90'dan büyük) ValueError fırlatır."""
@@ -180,8 +180,11 @@ class TestUserEndpoints:
             headers={"Authorization": f"Bearer {token}"}
         )
         assert response.status_code == 200
-        # Location is in WKT format, not directly in response
-        assert "phone_number" in response.json()
+        data = response.json()
+        assert "phone_number" in data
+        assert data["latitude"] == 36.8969
+        assert data["longitude"] == 30.7133
+        assert data["location_status"] == "ACCEPTED"
 
     async def test_update_location_invalid_latitude(self, client: AsyncClient):
         """Geçersiz enlem 422 dönmeli."""
@@ -2,8 +2,14 @@
 
 import pytest
 
-from app.utils.validators import can_donate_to, get_compatible_donors
+from app.utils.validators import (
+    can_donate_to,
+    compatible_donor_mask,
+    compatible_recipient_mask,
+    get_compatible_donors,
+)
 from app.constants.blood_types import (
+    BLOOD_TYPE_BITS,
     BloodType,
     can_donate as constants_can_donate,
     get_compatible_donors as constants_get_compatible_donors,
@@ -103,3 +109,20 @@ def test_can_donate_to_matches_constants_logic():
     for donor in blood_types:
         for recipient in blood_types:
             assert can_donate_to(donor, recipient) is constants_can_donate(donor, recipient)
+
+
+def test_compatibility_masks_match_can_donate_to():
+    blood_types = BloodType.all_values()
+
+    for donor in blood_types:
+        for recipient in blood_types:
+            expected = can_donate_to(donor, recipient)
+            assert bool(compatible_donor_mask(recipient) & BLOOD_TYPE_BITS[donor]) is expected
+            assert bool(compatible_recipient_mask(donor) & BLOOD_TYPE_BITS[recipient]) is expected
+
+
+def test_compatibility_masks_normalize_and_reject_invalid():
+    assert compatible_recipient_mask(" o- ") == 0xFF
+    assert compatible_donor_mask("ab+") == 0xFF
+    assert compatible_donor_mask("X+") == 0
+    assert compatible_recipient_mask("") == 0
@@ -0,0 +1,51 @@
+"""Tests for the wave dispatcher periodic job."""
+import logging
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.background.wave_dispatcher import dispatch_waves
+
+
+def _patch_session():
+    session_patch = patch("app.background.wave_dispatcher.AsyncSessionLocal")
+    mock_session_local = session_patch.start()
+    mock_session = AsyncMock()
+    mock_session.commit = AsyncMock()
+    mock_session_local.return_value.__aenter__ = AsyncMock(return_value=mock_session)
+    mock_session_local.return_value.__aexit__ = AsyncMock(return_value=None)
+    return session_patch, mock_session
+
+
+class TestWaveDispatcher:
+    """Wave dispatcher job testleri."""
+
+    @pytest.mark.asyncio
+    async def test_dispatch_waves_commits_and_logs_expansions(self, caplog):
+        """Halka genişletildiğinde commit edip log yazıyor mu."""
+        caplog.set_level(logging.INFO)
+
+        session_patch, session = _patch_session()
+        try:
+            with patch("app.background.wave_dispatcher.advance_dispatch_waves", AsyncMock(return_value=2)):
+                assert await dispatch_waves() == 2
+        finally:
+            session_patch.stop()
+
+        session.commit.assert_awaited_once()
+        assert any("2 request(s) expanded" in record.message for record in caplog.records)
+
+    @pytest.mark.asyncio
+    async def test_dispatch_waves_propagates_errors_to_job_runner(self):
+        """Hata yutulmaz; job runner kaydeder ve backoff ile tekrar dener."""
+        session_patch, session = _patch_session()
+        try:
+            with patch(
+                "app.background.wave_dispatcher.advance_dispatch_waves",
+                AsyncMock(side_effect=Exception("Database connection error")),
+            ):
+                with pytest.raises(Exception, match="Database connection error"):
+                    await dispatch_waves()
+        finally:
+            session_patch.stop()
+
+        session.commit.assert_not_awaited()